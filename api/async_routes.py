@@ -0,0 +1,249 @@
+"""
+비동기(ASGI) API 엔드포인트
+Flask 블루프린트와 같은 처리 함수를 사용하되, 외부기관 호출·증명 생성·체인 조회를
+이벤트 루프에서 await 하여 요청마다 스레드를 점유하지 않습니다.
+"""
+
+import asyncio
+
+import aiohttp
+from quart import Blueprint, Response, current_app, jsonify, request
+
+from utils.metrics import time_stage
+from utils.rate_limiter import PARTNER_KEY_HEADER, PRIORITY_HEADER, AdmissionRejected, RateLimited
+from utils.tracing import inject_headers
+from utils import wire_format
+from utils.zkp_utils import zkp_utils
+from . import bank, customer, external, regrade
+from .common import NDJSON_MIMETYPE, check_required_fields, rejection_response, wants_ndjson
+
+# 엔드포인트 이름(bank.loan_request 등)이 Flask 앱과 같도록 같은 블루프린트 이름을 사용합니다
+async_bank_bp = Blueprint('bank', __name__)
+async_external_bp = Blueprint('external', __name__)
+async_customer_bp = Blueprint('customer', __name__)
+
+
+def respond(result):
+    """처리 함수의 (본문, 상태 코드) 결과를 응답으로 변환합니다."""
+    body, status = result
+    return jsonify(body), status
+
+
+async def run_proof_job(fn, *args):
+    """증명 생성이 포함된 작업을 증명 생성 풀에서 실행하고 결과를 기다립니다."""
+    return await asyncio.wrap_future(zkp_utils.submit(fn, *args))
+
+
+# ----------------------------------------------------------------------
+# 은행
+# ----------------------------------------------------------------------
+
+@async_bank_bp.route('/loan-request', methods=['POST'])
+async def loan_request():
+    """대출 요청을 처리합니다. 외부기관 호출은 공유 HTTP 세션으로 await 합니다."""
+    try:
+        data = await request.get_json()
+
+        error = check_required_fields(data, bank.LOAN_REQUEST_FIELDS)
+        if error:
+            return respond(error)
+
+        inquiry_request = bank.build_inquiry_request(data)
+
+        try:
+            mimetype = wire_format.service_wire_format()
+            with time_stage('external_http'):
+                while True:
+                    body, headers = wire_format.request_payload(inquiry_request, mimetype)
+                    async with current_app.http_session.post(
+                        bank.CREDIT_INQUIRY_URL, data=body, headers=inject_headers(bank.inquiry_headers(headers))
+                    ) as external_response:
+                        external_data = wire_format.decode(
+                            await external_response.read(), external_response.content_type
+                        ) if external_response.status == 200 else None
+                    # 외부기관이 바이너리 형식을 지원하지 않으면 JSON으로 다시 보냅니다
+                    if external_response.status != 415 or mimetype == wire_format.JSON:
+                        break
+                    mimetype = wire_format.JSON
+            response = bank.build_loan_response(inquiry_request, external_response.status, external_data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            response = bank.build_connection_error_response(inquiry_request, e)
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_bank_bp.route('/credit-criteria', methods=['GET'])
+async def get_credit_criteria():
+    """은행의 신용등급 기준을 조회합니다."""
+    try:
+        return respond(bank.handle_credit_criteria())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_bank_bp.route('/credit-criteria/what-if', methods=['POST'])
+async def criteria_what_if():
+    """신용등급 기준 변경안의 포트폴리오 영향을 계산합니다 (배열 계산은 스레드에서 실행)."""
+    try:
+        data = await request.get_json()
+        return respond(await asyncio.to_thread(bank.handle_criteria_what_if, data))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_bank_bp.route('/verify-nft', methods=['POST'])
+async def verify_nft():
+    """NFT를 검증하여 대출 승인 여부를 결정합니다."""
+    try:
+        return respond(bank.handle_verify_nft(await request.get_json()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_bank_bp.route('/loan-status/<request_id>', methods=['GET'])
+async def get_loan_status(request_id):
+    """대출 요청의 처리 상태를 조회합니다."""
+    try:
+        return respond(bank.handle_loan_status(request_id))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ----------------------------------------------------------------------
+# 외부기관
+# ----------------------------------------------------------------------
+
+@async_external_bp.route('/credit-inquiry', methods=['POST'])
+async def credit_inquiry():
+    """
+    신용정보를 조회하고 ZK-Proof를 생성하여 NFT를 발행합니다. 속도 제한과 수용 제어는 Flask 앱과 같습니다.
+    재사용할 NFT가 있으면 증명 생성 풀을 거치지 않고 스레드에서 처리합니다.
+    """
+    try:
+        data = await request.get_json()
+        with external.admit_credit_inquiry(data, request.headers.get(PRIORITY_HEADER),
+                                           request.headers.get(PARTNER_KEY_HEADER),
+                                           request.remote_addr) as needs_proof:
+            if not needs_proof:
+                return respond(await asyncio.to_thread(external.handle_credit_inquiry, data))
+            return respond(await run_proof_job(external.handle_credit_inquiry, data))
+    except (RateLimited, AdmissionRejected) as e:
+        body, status, headers = rejection_response(e)
+        return jsonify(body), status, headers
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_external_bp.route('/generate-proof', methods=['POST'])
+async def generate_proof():
+    """신용정보를 기반으로 ZK-Proof를 생성합니다."""
+    try:
+        return respond(await run_proof_job(external.handle_generate_proof, await request.get_json()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_external_bp.route('/mint-nft', methods=['POST'])
+async def mint_nft():
+    """ZK-Proof를 기반으로 NFT를 발행합니다 (체인 발행은 web3 호출이 블로킹이므로 스레드에서 실행)."""
+    try:
+        return respond(await asyncio.to_thread(external.handle_mint_nft, await request.get_json()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_external_bp.route('/proof/<proof_id>', methods=['GET'])
+async def get_proof(proof_id):
+    """특정 ZK-Proof 정보를 조회합니다."""
+    try:
+        return respond(external.handle_get_proof(proof_id))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_external_bp.route('/my-nft', methods=['POST'])
+async def get_my_nft():
+    """고객이 자신의 NFT를 조회합니다."""
+    try:
+        return respond(await asyncio.to_thread(external.handle_my_nft, await request.get_json()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_external_bp.route('/regrade', methods=['POST'])
+async def regrade_nfts():
+    """등급이 바뀐 고객만 재증명·재발행하고 나머지는 유효기간을 연장합니다 (재증명은 백그라운드 작업으로 실행)."""
+    try:
+        data = await request.get_json(silent=True)
+        return respond(await asyncio.to_thread(regrade.handle_regrade, data))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_external_bp.route('/regrade/<job_id>', methods=['GET'])
+async def regrade_status(job_id):
+    """재등급 작업 상태를 조회합니다 (작업을 받은 워커에서만 조회됩니다)."""
+    try:
+        return respond(regrade.handle_regrade_status(job_id))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ----------------------------------------------------------------------
+# 고객
+# ----------------------------------------------------------------------
+
+@async_customer_bp.route('/nft/<token_id>', methods=['GET'])
+async def get_nft_info(token_id):
+    """특정 NFT의 정보를 조회합니다."""
+    try:
+        return respond(await asyncio.to_thread(customer.handle_nft_info, token_id))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_customer_bp.route('/transfer-nft', methods=['POST'])
+async def transfer_nft():
+    """NFT를 다른 주소로 전송합니다."""
+    try:
+        return respond(customer.handle_transfer_nft(await request.get_json()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_customer_bp.route('/my-nfts/<customer_address>', methods=['GET'])
+async def get_customer_nfts(customer_address):
+    """특정 고객이 소유한 NFT를 커서 기반 페이지 또는 NDJSON 스트림으로 조회합니다."""
+    try:
+        if wants_ndjson(request.args, request.accept_mimetypes):
+            return Response(customer.stream_customer_nfts(customer_address), mimetype=NDJSON_MIMETYPE)
+        return respond(customer.handle_customer_nfts(customer_address, request.args))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_customer_bp.route('/nft/<token_id>/verify', methods=['GET', 'POST'])
+async def verify_nft_ownership(token_id):
+    """NFT 소유권을 검증합니다."""
+    try:
+        data = await request.get_json() if request.method == 'POST' else None
+        return respond(await asyncio.to_thread(
+            customer.handle_verify_nft_ownership, token_id, request.method, request.args, data
+        ))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_customer_bp.route('/nft/<token_id>/loan-eligibility', methods=['GET', 'POST'])
+async def check_loan_eligibility(token_id):
+    """NFT를 기반으로 대출 자격을 확인합니다."""
+    try:
+        data = await request.get_json() if request.method == 'POST' else None
+        return respond(await asyncio.to_thread(
+            customer.handle_loan_eligibility, token_id, request.method, request.args, data
+        ))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -6,16 +6,30 @@
 from flask import Blueprint, request, jsonify
 import json
 import os
+import threading
+import time
 from datetime import datetime
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.credit_scoring import Portfolio, merge_criteria, portfolio_cache, what_if
+from utils.credit_store import credit_data_backend, credit_store
+from utils.logging_utils import get_logger
+from utils.metrics import time_stage, timed
+from utils.rate_limiter import PARTNER_KEY_HEADER, PRIORITY_HEADER, INTERACTIVE
+from utils.tracing import inject_headers
+from utils import wire_format
+from .common import check_required_fields, load_json_cached
+
 bank_bp = Blueprint('bank', __name__)
+logger = get_logger('bank')
 
 # Mock 데이터 로드
 def load_bank_criteria():
     """은행의 신용등급 기준을 로드합니다."""
     try:
-        with open('data/bank_criteria.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_cached('data/bank_criteria.json')
     except FileNotFoundError:
         # 기본 기준 반환
         return {
@@ -35,6 +49,227 @@ def load_bank_criteria():
             }
         }
 
+# 외부기관 신용정보 조회 API
+CREDIT_INQUIRY_URL = 'http://localhost:5000/api/external/credit-inquiry'
+# 외부기관이 발급한 제휴기관 키 (외부기관 PARTNER_KEYS에 등록되어야 대화형 우선순위를 받습니다)
+BANK_PARTNER_KEY = os.getenv('BANK_PARTNER_KEY')
+
+LOAN_REQUEST_FIELDS = ['customer_id', 'customer_name', 'requested_amount', 'purpose', 'customer_address']
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """외부기관 호출에 사용하는 연결 풀 세션을 반환합니다 (연결을 요청마다 새로 맺지 않습니다)."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            pool_size = int(os.getenv('EXTERNAL_HTTP_POOL_SIZE') or 20)
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+            session.mount('https://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+            _http_session = session
+        return _http_session
+
+def build_inquiry_request(data):
+    """대출 요청으로부터 외부기관 신용정보 조회 요청을 생성합니다."""
+    customer_id = data['customer_id']
+    customer_name = data['customer_name']
+    requested_amount = data['requested_amount']
+    
+    # 외부기관에 신용정보 조회 요청을 위한 정보 생성
+    request_id = f'REQ_{customer_id}_{int(datetime.now().timestamp())}'
+    inquiry_request = {
+        'request_id': request_id,  # 대출 요청 ID 추가
+        'customer_id': customer_id,
+        'customer_name': customer_name,
+        'requested_amount': requested_amount,
+        'purpose': data['purpose'],
+        'customer_address': data['customer_address'],  # NFT 발행용 주소
+        'request_timestamp': datetime.now().isoformat(), # 요청시간 - 타임스탬프자동생성
+        'bank_id': "BANK_001" # 은행id - 목업데이터 고정
+    }
+    
+    logger.info('대출 요청 접수', loan_request_id=request_id, customer_id=customer_id,
+                customer_name=customer_name, requested_amount=requested_amount)
+    
+    return inquiry_request
+
+def inquiry_headers(headers):
+    """외부기관 조회 요청 헤더에 제휴기관 키와 우선순위를 넣습니다."""
+    # 고객이 기다리는 대출 심사이므로 배치 요청보다 먼저 수용됩니다
+    headers[PRIORITY_HEADER] = INTERACTIVE
+    if BANK_PARTNER_KEY:
+        headers[PARTNER_KEY_HEADER] = BANK_PARTNER_KEY
+    return headers
+
+def build_loan_response(inquiry_request, status_code, external_data):
+    """
+    외부기관 응답으로 대출 승인 여부를 결정합니다.
+    
+    Args:
+        inquiry_request: build_inquiry_request로 생성한 조회 요청
+        status_code: 외부기관 응답 상태 코드
+        external_data: 외부기관 응답 본문 (상태 코드가 200일 때)
+    """
+    request_id = inquiry_request['request_id']
+    requested_amount = inquiry_request['requested_amount']
+    logger.info('외부기관 응답 수신', loan_request_id=request_id, status_code=status_code)
+    
+    if status_code != 200:
+        # 외부기관 API 호출 실패
+        logger.warning('외부기관 신용정보 조회 실패', loan_request_id=request_id, status_code=status_code)
+        return {
+            'status': 'error',
+            'request_id': request_id,
+            'message': '외부기관 신용정보 조회 중 오류가 발생했습니다.',
+            'error_code': status_code
+        }
+    
+    logger.debug('외부기관 데이터 수신', loan_request_id=request_id, credit_grade=external_data['credit_grade'],
+                 max_loan_amount=external_data['max_loan_amount'], token_id=external_data['token_id'])
+    
+    # 외부기관에서 받은 NFT 정보로 대출 승인 여부 결정
+    if external_data['approval_eligible']:
+        approval_status = 'approved'
+        message = f'대출이 승인되었습니다. NFT 토큰 ID: {external_data["token_id"]}'
+    else:
+        approval_status = 'rejected'
+        message = f'신용등급 기준에 미달하여 대출이 거절되었습니다. 최대 대출 가능 금액: {external_data["max_loan_amount"]:,}원'
+    
+    response = {
+        'status': 'completed',
+        'request_id': request_id,
+        'approval_status': approval_status,
+        'message': message,
+        'nft_token_id': external_data['token_id'],
+        'credit_grade': external_data['credit_grade'],
+        'max_loan_amount': external_data['max_loan_amount'],
+        'approved_amount': min(requested_amount, external_data['max_loan_amount']),
+        'completed_at': datetime.now().isoformat(),
+        'external_response': external_data
+    }
+    logger.info('대출 심사 완료', loan_request_id=request_id, approval_status=approval_status,
+                requested_amount=requested_amount)
+    return response
+
+def build_connection_error_response(inquiry_request, error):
+    """외부기관 연결 실패 응답을 생성합니다."""
+    logger.warning('외부기관 연결 실패', loan_request_id=inquiry_request['request_id'], error=str(error))
+    return {
+        'status': 'error',
+        'request_id': inquiry_request['request_id'],
+        'message': '외부기관 연결 중 오류가 발생했습니다.',
+        'error': str(error)
+    }
+
+def handle_credit_criteria():
+    """은행의 신용등급 기준 응답을 생성합니다."""
+    criteria = load_bank_criteria()
+    
+    response = {
+        'bank_id': 'BANK_001',
+        'bank_name': 'zk-nft 은행',
+        'criteria': criteria,
+        'last_updated': datetime.now().isoformat()
+    }
+    
+    return response, 200
+
+def load_portfolio():
+    """
+    현재 신용정보 전체를 일괄 평가용 열 배열로 불러옵니다.
+    저장소를 사용하는 경우 새 적재가 있을 때까지 불러온 배열을 재사용합니다.
+    """
+    if credit_data_backend() == 'sqlite':
+        metadata = credit_store.metadata()
+        key = (credit_store.path, metadata.get('last_ingest_id'), metadata.get('last_updated'), credit_store.count())
+        return portfolio_cache.get(key, lambda: Portfolio.from_store(credit_store))
+    from .external import load_credit_data
+    return Portfolio.from_customers(load_credit_data()['customers'])
+
+@timed('criteria_what_if')
+def handle_criteria_what_if(data):
+    """신용등급 기준 변경안의 포트폴리오 영향 분석 요청을 처리합니다."""
+    error = check_required_fields(data, ['criteria'])
+    if error:
+        return error
+    
+    base_criteria = load_bank_criteria()
+    scenario_criteria = merge_criteria(base_criteria, data['criteria'])
+    
+    started = time.perf_counter()
+    with time_stage('portfolio_load'):
+        portfolio = load_portfolio()
+    result = what_if(portfolio, base_criteria, scenario_criteria)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    logger.info('신용등급 기준 변경 영향 분석', customers=len(portfolio),
+                changed_customers=result['changed_customers'], elapsed_ms=elapsed_ms)
+    
+    return {
+        'status': 'success',
+        'bank_id': base_criteria.get('bank_id', 'BANK_001'),
+        'scenario_criteria': scenario_criteria,
+        'elapsed_ms': elapsed_ms,
+        **result
+    }, 200
+
+def handle_verify_nft(data):
+    """NFT 검증 요청을 처리합니다."""
+    error = check_required_fields(data, ['token_id', 'customer_address', 'requested_amount'])
+    if error:
+        return error
+    
+    token_id = data['token_id']
+    requested_amount = data['requested_amount']
+    
+    # 실제 구현에서는 블록체인에서 NFT 정보를 조회하고 검증합니다
+    # 여기서는 Mock 응답을 반환합니다
+    mock_nft_data = {
+        'token_id': token_id,
+        'credit_grade': 'B',
+        'credit_score': 750,
+        'max_loan_amount': 50000000,
+        'issued_date': '2024-01-15T10:30:00Z',
+        'issuer': 'EXTERNAL_AGENCY_001'
+    }
+    
+    # 대출 승인 여부 결정
+    if requested_amount <= mock_nft_data['max_loan_amount']:
+        approval_status = 'approved'
+        message = '대출이 승인되었습니다.'
+    else:
+        approval_status = 'rejected'
+        message = f'요청 금액이 신용등급 한도를 초과합니다. 최대 대출 가능 금액: {mock_nft_data["max_loan_amount"]:,}원'
+    
+    response = {
+        'token_id': token_id,
+        'nft_data': mock_nft_data,
+        'requested_amount': requested_amount,
+        'approval_status': approval_status,
+        'message': message,
+        'verified_at': datetime.now().isoformat()
+    }
+    
+    return response, 200
+
+def handle_loan_status(request_id):
+    """대출 요청 처리 상태 응답을 생성합니다."""
+    # 실제 구현에서는 데이터베이스에서 상태를 조회합니다
+    # 여기서는 Mock 응답을 반환합니다
+    mock_status = {
+        'request_id': request_id,
+        'status': 'completed',
+        'nft_token_id': f'NFT_{request_id}',
+        'credit_grade': 'B',
+        'approved_amount': 50000000,
+        'created_at': '2024-01-15T10:00:00Z',
+        'completed_at': '2024-01-15T10:30:00Z'
+    }
+    
+    return mock_status, 200
+
 @bank_bp.route('/loan-request', methods=['POST'])
 def loan_request():
     """
@@ -51,98 +286,37 @@ def loan_request():
     try:
         data = request.get_json()
         
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['customer_id', 'customer_name', 'requested_amount', 'purpose', 'customer_address']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        customer_id = data['customer_id']
-        customer_name = data['customer_name']
-        requested_amount = data['requested_amount']
-        purpose = data['purpose']
-        customer_address = data['customer_address']
-        
-        # 외부기관에 신용정보 조회 요청을 위한 정보 생성
-        request_id = f'REQ_{customer_id}_{int(datetime.now().timestamp())}'
-        inquiry_request = {
-            'request_id': request_id,  # 대출 요청 ID 추가
-            'customer_id': customer_id,
-            'customer_name': customer_name,
-            'requested_amount': requested_amount,
-            'purpose': purpose,
-            'customer_address': customer_address,  # NFT 발행용 주소
-            'request_timestamp': datetime.now().isoformat(), # 요청시간 - 타임스탬프자동생성
-            'bank_id': "BANK_001" # 은행id - 목업데이터 고정
-        }
+        error = check_required_fields(data, LOAN_REQUEST_FIELDS)
+        if error:
+            return jsonify(error[0]), error[1]
         
-        print(f"🏦 [BANK] 대출 요청 접수: {customer_name}({customer_id}) - {requested_amount:,}원")
-        print(f"🏦 [BANK] Request ID 생성: {request_id}")
-        print(f"🏦 [BANK] 외부기관 요청 준비 완료")
+        inquiry_request = build_inquiry_request(data)
         
         # 실제 외부기관 API 호출
-        import requests
-        
         try:
-            print(f"🏦 [BANK] 외부기관 API 호출 시작...")
             # 외부기관 API 호출
-            external_response = requests.post(
-                'http://localhost:5000/api/external/credit-inquiry',
-                json=inquiry_request,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
-            print(f"🏦 [BANK] 외부기관 API 응답 수신: {external_response.status_code}")
-            
-            if external_response.status_code == 200:
-                external_data = external_response.json()
-                print(f"🏦 [BANK] 외부기관 데이터 수신 완료")
-                print(f"🏦 [BANK] 신용등급: {external_data['credit_grade']}, 최대대출한도: {external_data['max_loan_amount']:,}원")
-                print(f"🏦 [BANK] NFT 토큰 ID: {external_data['token_id']}")
-                
-                # 외부기관에서 받은 NFT 정보로 대출 승인 여부 결정
-                if external_data['approval_eligible']:
-                    approval_status = 'approved'
-                    message = f'대출이 승인되었습니다. NFT 토큰 ID: {external_data["token_id"]}'
-                    print(f"🏦 [BANK] 대출 승인 결정: {requested_amount:,}원 승인")
-                else:
-                    approval_status = 'rejected'
-                    message = f'신용등급 기준에 미달하여 대출이 거절되었습니다. 최대 대출 가능 금액: {external_data["max_loan_amount"]:,}원'
-                    print(f"🏦 [BANK] 대출 거절 결정: 신용등급 기준 미달")
-                
-                response = {
-                    'status': 'completed',
-                    'request_id': request_id,
-                    'approval_status': approval_status,
-                    'message': message,
-                    'nft_token_id': external_data['token_id'],
-                    'credit_grade': external_data['credit_grade'],
-                    'max_loan_amount': external_data['max_loan_amount'],
-                    'approved_amount': min(requested_amount, external_data['max_loan_amount']),
-                    'completed_at': datetime.now().isoformat(),
-                    'external_response': external_data
-                }
-                print(f"🏦 [BANK] 고객에게 최종 결과 반환: {approval_status}")
-                print(f"🏦 [BANK] ==========================================")
-            else:
-                # 외부기관 API 호출 실패
-                response = {
-                    'status': 'error',
-                    'request_id': request_id,
-                    'message': '외부기관 신용정보 조회 중 오류가 발생했습니다.',
-                    'error_code': external_response.status_code
-                }
+            # SERVICE_WIRE_FORMAT에 따라 MessagePack/CBOR로 보내고, 외부기관이 지원하지 않으면 JSON으로 다시 보냅니다
+            mimetype = wire_format.service_wire_format()
+            with time_stage('external_http'):
+                while True:
+                    body, headers = wire_format.request_payload(inquiry_request, mimetype)
+                    external_response = get_http_session().post(
+                        CREDIT_INQUIRY_URL,
+                        data=body,
+                        headers=inject_headers(inquiry_headers(headers)),
+                        timeout=30
+                    )
+                    if external_response.status_code != 415 or mimetype == wire_format.JSON:
+                        break
+                    mimetype = wire_format.JSON
+            external_data = wire_format.decode(
+                external_response.content, external_response.headers.get('Content-Type')
+            ) if external_response.status_code == 200 else None
+            response = build_loan_response(inquiry_request, external_response.status_code, external_data)
                 
         except requests.exceptions.RequestException as e:
             # 네트워크 오류 등
-            response = {
-                'status': 'error',
-                'request_id': request_id,
-                'message': '외부기관 연결 중 오류가 발생했습니다.',
-                'error': str(e)
-            }
+            response = build_connection_error_response(inquiry_request, e)
         
         return jsonify(response), 200
         
@@ -155,16 +329,28 @@ def get_credit_criteria():
     은행의 신용등급 기준을 조회합니다.
     """
     try:
-        criteria = load_bank_criteria()
+        body, status = handle_credit_criteria()
+        return jsonify(body), status
         
-        response = {
-            'bank_id': 'BANK_001',
-            'bank_name': 'zk-nft 은행',
-            'criteria': criteria,
-            'last_updated': datetime.now().isoformat()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bank_bp.route('/credit-criteria/what-if', methods=['POST'])
+def criteria_what_if():
+    """
+    신용등급 기준 변경안을 전체 고객에 적용했을 때의 등급 이동, 대출 한도, 수수료 변화를 계산합니다.
+    
+    Request Body:
+    {
+        "criteria": {
+            "credit_score_ranges": {"B": {"min": 720}},
+            "loan_limits": {"C": 25000000}
         }
-        
-        return jsonify(response), 200
+    }
+    """
+    try:
+        body, status = handle_criteria_what_if(request.get_json())
+        return jsonify(body), status
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -181,48 +367,8 @@ def verify_nft():
     }
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['token_id', 'customer_address', 'requested_amount']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        token_id = data['token_id']
-        requested_amount = data['requested_amount']
-        
-        # 실제 구현에서는 블록체인에서 NFT 정보를 조회하고 검증합니다
-        # 여기서는 Mock 응답을 반환합니다
-        mock_nft_data = {
-            'token_id': token_id,
-            'credit_grade': 'B',
-            'credit_score': 750,
-            'max_loan_amount': 50000000,
-            'issued_date': '2024-01-15T10:30:00Z',
-            'issuer': 'EXTERNAL_AGENCY_001'
-        }
-        
-        # 대출 승인 여부 결정
-        if requested_amount <= mock_nft_data['max_loan_amount']:
-            approval_status = 'approved'
-            message = '대출이 승인되었습니다.'
-        else:
-            approval_status = 'rejected'
-            message = f'요청 금액이 신용등급 한도를 초과합니다. 최대 대출 가능 금액: {mock_nft_data["max_loan_amount"]:,}원'
-        
-        response = {
-            'token_id': token_id,
-            'nft_data': mock_nft_data,
-            'requested_amount': requested_amount,
-            'approval_status': approval_status,
-            'message': message,
-            'verified_at': datetime.now().isoformat()
-        }
-        
-        return jsonify(response), 200
+        body, status = handle_verify_nft(request.get_json())
+        return jsonify(body), status
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -233,19 +379,8 @@ def get_loan_status(request_id):
     대출 요청의 처리 상태를 조회합니다.
     """
     try:
-        # 실제 구현에서는 데이터베이스에서 상태를 조회합니다
-        # 여기서는 Mock 응답을 반환합니다
-        mock_status = {
-            'request_id': request_id,
-            'status': 'completed',
-            'nft_token_id': f'NFT_{request_id}',
-            'credit_grade': 'B',
-            'approved_amount': 50000000,
-            'created_at': '2024-01-15T10:00:00Z',
-            'completed_at': '2024-01-15T10:30:00Z'
-        }
-        
-        return jsonify(mock_status), 200
+        body, status = handle_loan_status(request_id)
+        return jsonify(body), status
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500 
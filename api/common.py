@@ -0,0 +1,117 @@
+"""
+API 공통 유틸리티
+Flask 블루프린트와 비동기(ASGI) 블루프린트가 함께 사용하는 요청 검증, 페이지 조회, NDJSON 함수를 제공합니다.
+"""
+
+import os
+import json
+import math
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.rate_limiter import RateLimited
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# 목록 조회 페이지 크기
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+# 경로 → (수정 시각, 내용)
+_json_file_cache: Dict[str, Tuple[int, object]] = {}
+_json_file_lock = threading.Lock()
+
+
+def check_required_fields(data: Optional[Dict], required_fields: List[str]) -> Optional[Tuple[Dict, int]]:
+    """
+    요청 본문과 필수 필드를 확인합니다.
+    
+    Args:
+        data: 요청 본문
+        required_fields: 필수 필드 목록
+        
+    Returns:
+        오류 응답 (본문, 상태 코드) 또는 None
+    """
+    if not data:
+        return {'error': 'Request body is required'}, 400
+    
+    for field in required_fields:
+        if field not in data:
+            return {'error': f'Missing required field: {field}'}, 400
+    
+    return None
+
+
+def parse_page_args(args) -> Tuple[Optional[Tuple[Optional[str], int]], Optional[Tuple[Dict, int]]]:
+    """
+    커서 기반 페이지 조회 파라미터(cursor, limit)를 읽습니다.
+    
+    Args:
+        args: 쿼리 파라미터
+    
+    Returns:
+        ((cursor, limit), None) 또는 (None, 오류 응답 (본문, 상태 코드))
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_LIMIT))
+    except (TypeError, ValueError):
+        return None, ({'error': 'Invalid limit parameter'}, 400)
+    if limit < 1:
+        return None, ({'error': 'Invalid limit parameter'}, 400)
+    return (args.get('cursor') or None, min(limit, MAX_PAGE_LIMIT)), None
+
+
+def wants_ndjson(args, accept_mimetypes) -> bool:
+    """?format=ndjson 또는 Accept 헤더로 NDJSON 스트리밍을 요청했는지 확인합니다."""
+    if args.get('format') == 'ndjson':
+        return True
+    return accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def ndjson_lines(items: Iterable[Dict]) -> Iterator[str]:
+    """항목을 한 줄에 하나씩 NDJSON으로 직렬화합니다. 항목 단위로 생성하므로 메모리 사용량이 일정합니다."""
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False, default=str) + '\n'
+
+
+def rejection_response(error) -> Tuple[Dict, int, Dict[str, str]]:
+    """
+    속도 제한(429) 또는 수용 거절(503) 응답을 생성합니다.
+    
+    Args:
+        error: RateLimited 또는 AdmissionRejected
+        
+    Returns:
+        (본문, 상태 코드, 헤더)
+    """
+    retry_after = str(max(1, math.ceil(error.retry_after)))
+    if isinstance(error, RateLimited):
+        body = {'error': 'Rate limit exceeded', 'limit': error.dimension, 'retry_after': int(retry_after)}
+        return body, 429, {'Retry-After': retry_after}
+    body = {'error': 'Service busy, please retry later', 'priority': error.priority, 'retry_after': int(retry_after)}
+    return body, 503, {'Retry-After': retry_after}
+
+def load_json_cached(path: str):
+    """
+    JSON 파일을 읽고 수정 시각이 바뀔 때까지 메모리에 보관합니다.
+    반환값은 요청 사이에 공유되므로 수정하지 않아야 합니다.
+    
+    Args:
+        path: 파일 경로
+        
+    Returns:
+        파일 내용
+        
+    Raises:
+        FileNotFoundError: 파일이 없는 경우
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _json_file_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _json_file_lock:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        _json_file_cache[path] = (mtime, data)
+    return data
@@ -3,53 +3,290 @@
 NFT 정보 조회, NFT 전송 등의 기능을 제공합니다.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 import json
 import os
 from datetime import datetime
 
+from utils.nft_index import NFTIndex, nft_index
+from . import external
+from .common import NDJSON_MIMETYPE, check_required_fields, ndjson_lines, parse_page_args, wants_ndjson
+
 customer_bp = Blueprint('customer', __name__)
 
-@customer_bp.route('/nft/<token_id>', methods=['GET'])
-def get_nft_info(token_id):
+# 색인에 NFT가 없는 고객에게 보여줄 Mock NFT 목록
+MOCK_CUSTOMER_NFTS = [
+    {
+        'token_id': 'NFT_PROOF_CUST_001_1705312200',
+        'name': 'Credit Grade B NFT',
+        'credit_grade': 'B',
+        'max_loan_amount': 50000000,
+        'issued_date': '2024-01-15T10:30:00Z',
+        'issuer': 'EXTERNAL_AGENCY_001'
+    },
+    {
+        'token_id': 'NFT_PROOF_CUST_001_1705312500',
+        'name': 'Credit Grade A NFT',
+        'credit_grade': 'A',
+        'max_loan_amount': 100000000,
+        'issued_date': '2024-01-15T11:15:00Z',
+        'issuer': 'EXTERNAL_AGENCY_001'
+    }
+]
+
+def customer_nft_source(customer_address):
+    """고객 NFT 목록을 조회할 색인을 반환합니다. 발행 이력이 없으면 Mock 목록을 사용합니다."""
+    if nft_index.count(customer_address):
+        return nft_index
+    mock_index = NFTIndex()
+    for nft in MOCK_CUSTOMER_NFTS:
+        mock_index.add(customer_address, nft)
+    return mock_index
+
+# 체인에 발행하지 않은 NFT의 Mock 소유자
+MOCK_OWNER = '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
+
+def read_chain_nft(token_id):
     """
-    특정 NFT의 정보를 조회합니다.
+    체인에 발행된 NFT의 소유자와 신용등급 데이터를 읽습니다.
+    
+    Returns:
+        (체인 데이터 또는 None, 오류 응답 또는 None) - 체인에 발행하지 않은 토큰이면 (None, None)
     """
-    try:
-        # 실제 구현에서는 블록체인에서 NFT 정보를 조회합니다
-        # 여기서는 Mock NFT 정보를 반환합니다
-        mock_nft_info = {
+    chain_data = external.read_chain_nft(token_id)
+    if chain_data is not None and chain_data['status'] != 'success':
+        return None, ({'error': chain_data['message']}, 502)
+    return chain_data, None
+
+def handle_nft_info(token_id):
+    """NFT 정보 응답을 생성합니다."""
+    chain_data, error = read_chain_nft(token_id)
+    if error:
+        return error
+    if chain_data is not None:
+        return {
             'token_id': token_id,
-            'name': 'Credit Grade B NFT',
+            'chain_token_id': chain_data['token_id'],
+            'name': f'Credit Grade {chain_data["credit_grade"]} NFT',
             'description': 'Zero-Knowledge Proof based credit grade NFT',
-            'image': f'https://api.example.com/nft/{token_id}/image',
+            'token_uri': chain_data['token_uri'],
             'attributes': [
-                {
-                    'trait_type': 'Credit Grade',
-                    'value': 'B'
-                },
-                {
-                    'trait_type': 'Max Loan Amount',
-                    'value': 50000000
-                },
-                {
-                    'trait_type': 'Issuer',
-                    'value': 'EXTERNAL_AGENCY_001'
-                },
-                {
-                    'trait_type': 'Issue Date',
-                    'value': '2024-01-15T10:30:00Z'
-                }
+                {'trait_type': 'Credit Grade', 'value': chain_data['credit_grade']},
+                {'trait_type': 'Max Loan Amount', 'value': chain_data['max_loan_amount']},
+                {'trait_type': 'Issue Date', 'value': datetime.fromtimestamp(chain_data['issued_at']).isoformat()}
             ],
-            'owner': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6',
-            'proof_id': f'PROOF_{token_id}',
-            'customer_id': 'CUST_001',
-            'blockchain_tx_hash': f'0x{token_id[:64]}',
-            'created_at': '2024-01-15T10:30:00Z'
+            'owner': chain_data['owner'],
+            'proof_id': chain_data['proof_id'],
+            'customer_id': chain_data['customer_id'],
+            'is_valid': chain_data['is_valid']
+        }, 200
+    
+    # 체인에 발행하지 않은 NFT는 Mock NFT 정보를 반환합니다
+    mock_nft_info = {
+        'token_id': token_id,
+        'name': 'Credit Grade B NFT',
+        'description': 'Zero-Knowledge Proof based credit grade NFT',
+        'image': f'https://api.example.com/nft/{token_id}/image',
+        'attributes': [
+            {
+                'trait_type': 'Credit Grade',
+                'value': 'B'
+            },
+            {
+                'trait_type': 'Max Loan Amount',
+                'value': 50000000
+            },
+            {
+                'trait_type': 'Issuer',
+                'value': 'EXTERNAL_AGENCY_001'
+            },
+            {
+                'trait_type': 'Issue Date',
+                'value': '2024-01-15T10:30:00Z'
+            }
+        ],
+        'owner': MOCK_OWNER,
+        'proof_id': f'PROOF_{token_id}',
+        'customer_id': 'CUST_001',
+        'blockchain_tx_hash': f'0x{token_id[:64]}',
+        'created_at': '2024-01-15T10:30:00Z'
+    }
+    
+    return mock_nft_info, 200
+
+def handle_transfer_nft(data):
+    """NFT 전송 요청을 처리합니다."""
+    error = check_required_fields(data, ['token_id', 'from_address', 'to_address'])
+    if error:
+        return error
+    
+    token_id = data['token_id']
+    from_address = data['from_address']
+    to_address = data['to_address']
+    customer_signature = data.get('customer_signature', '')
+    
+    # 실제 구현에서는 블록체인에서 NFT 전송을 실행합니다
+    # 여기서는 Mock 전송을 시뮬레이션합니다
+    
+    # 전송 성공 시뮬레이션
+    transfer_success = True
+    
+    if transfer_success:
+        nft_index.transfer(token_id, to_address)
+        response = {
+            'token_id': token_id,
+            'from_address': from_address,
+            'to_address': to_address,
+            'status': 'transferred',
+            'blockchain_tx_hash': f'0x{token_id}_{int(datetime.now().timestamp())}',
+            'transfer_timestamp': datetime.now().isoformat(),
+            'message': 'NFT가 성공적으로 전송되었습니다.'
         }
         
-        return jsonify(mock_nft_info), 200
+        return response, 200
+    else:
+        return {'error': 'NFT 전송에 실패했습니다.'}, 400
+
+def handle_customer_nfts(customer_address, args=None):
+    """
+    고객 NFT 목록 응답을 커서 기반 페이지로 생성합니다.
+    
+    Args:
+        customer_address: 고객 주소
+        args: 쿼리 파라미터 (cursor, limit)
+    """
+    page_args, error = parse_page_args(args or {})
+    if error:
+        return error
+    cursor, limit = page_args
+    
+    source = customer_nft_source(customer_address)
+    try:
+        nfts, next_cursor = source.page(customer_address, cursor, limit)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    
+    response = {
+        'customer_address': customer_address,
+        'total_nfts': source.count(customer_address),
+        'nfts': nfts,
+        'limit': limit,
+        'next_cursor': next_cursor,
+        'retrieved_at': datetime.now().isoformat()
+    }
+    
+    return response, 200
+
+def stream_customer_nfts(customer_address):
+    """고객 NFT 목록을 NDJSON 줄 단위로 생성합니다 (포트폴리오 크기와 관계없이 메모리가 일정합니다)."""
+    return ndjson_lines(customer_nft_source(customer_address).iter_owner(customer_address))
+
+def handle_verify_nft_ownership(token_id, method, args, data):
+    """
+    NFT 소유권 검증 요청을 처리합니다.
+    
+    Args:
+        token_id: NFT 토큰 ID
+        method: HTTP 메서드
+        args: 쿼리 파라미터 (GET)
+        data: 요청 본문 (POST)
+    """
+    if method == 'GET':
+        customer_address = args.get('address')
+        if not customer_address:
+            return {'error': 'Missing required parameter: address'}, 400
+        customer_signature = ''
+    else:
+        error = check_required_fields(data, ['customer_address'])
+        if error:
+            return error
+        
+        customer_address = data['customer_address']
+        customer_signature = data.get('customer_signature', '')
+    
+    # 체인에 발행된 NFT는 ownerOf로 검증하고, 그 외에는 Mock 소유자와 비교합니다
+    chain_data, error = read_chain_nft(token_id)
+    if error:
+        return error
+    owner = chain_data['owner'] if chain_data is not None else MOCK_OWNER
+    is_owner = customer_address.lower() == owner.lower()
+    
+    response = {
+        'token_id': token_id,
+        'customer_address': customer_address,
+        'is_owner': is_owner,
+        'verified_at': datetime.now().isoformat(),
+        'message': 'NFT 소유권이 확인되었습니다.' if is_owner else 'NFT 소유자가 아닙니다.'
+    }
+    
+    return response, 200
+
+def handle_loan_eligibility(token_id, method, args, data):
+    """
+    NFT 기반 대출 자격 확인 요청을 처리합니다.
+    
+    Args:
+        token_id: NFT 토큰 ID
+        method: HTTP 메서드
+        args: 쿼리 파라미터 (GET)
+        data: 요청 본문 (POST)
+    """
+    if method == 'GET':
+        customer_address = args.get('address')
+        requested_amount = args.get('amount')
+        if not customer_address:
+            return {'error': 'Missing required parameter: address'}, 400
+        if not requested_amount:
+            return {'error': 'Missing required parameter: amount'}, 400
+        try:
+            requested_amount = int(requested_amount)
+        except ValueError:
+            return {'error': 'Invalid amount parameter'}, 400
+    else:
+        error = check_required_fields(data, ['requested_amount', 'customer_address'])
+        if error:
+            return error
         
+        requested_amount = data['requested_amount']
+        customer_address = data['customer_address']
+    
+    # 체인에 발행된 NFT는 컨트랙트의 신용등급 데이터로, 그 외에는 Mock 데이터로 검증합니다
+    chain_data, error = read_chain_nft(token_id)
+    if error:
+        return error
+    nft_data = chain_data if chain_data is not None else {
+        'credit_grade': 'B',
+        'max_loan_amount': 50000000,
+        'owner': MOCK_OWNER,
+        'is_valid': True
+    }
+    
+    is_owner = customer_address.lower() == nft_data['owner'].lower()
+    is_eligible = nft_data['is_valid'] and requested_amount <= nft_data['max_loan_amount']
+    
+    response = {
+        'token_id': token_id,
+        'customer_address': customer_address,
+        'requested_amount': requested_amount,
+        'is_owner': is_owner,
+        'is_eligible': is_eligible and is_owner,
+        'max_loan_amount': nft_data['max_loan_amount'],
+        'credit_grade': nft_data['credit_grade'],
+        'checked_at': datetime.now().isoformat(),
+        'message': '대출 자격이 확인되었습니다.' if (is_eligible and is_owner) else '대출 자격이 없습니다.'
+    }
+    
+    return response, 200
+
+@customer_bp.route('/nft/<token_id>', methods=['GET'])
+def get_nft_info(token_id):
+    """
+    특정 NFT의 정보를 조회합니다.
+    """
+    try:
+        body, status = handle_nft_info(token_id)
+        return jsonify(body), status
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -67,81 +304,26 @@ def transfer_nft():
     }
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['token_id', 'from_address', 'to_address']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        token_id = data['token_id']
-        from_address = data['from_address']
-        to_address = data['to_address']
-        customer_signature = data.get('customer_signature', '')
-        
-        # 실제 구현에서는 블록체인에서 NFT 전송을 실행합니다
-        # 여기서는 Mock 전송을 시뮬레이션합니다
-        
-        # 전송 성공 시뮬레이션
-        transfer_success = True
-        
-        if transfer_success:
-            response = {
-                'token_id': token_id,
-                'from_address': from_address,
-                'to_address': to_address,
-                'status': 'transferred',
-                'blockchain_tx_hash': f'0x{token_id}_{int(datetime.now().timestamp())}',
-                'transfer_timestamp': datetime.now().isoformat(),
-                'message': 'NFT가 성공적으로 전송되었습니다.'
-            }
-            
-            return jsonify(response), 200
-        else:
-            return jsonify({'error': 'NFT 전송에 실패했습니다.'}), 400
-        
+        body, status = handle_transfer_nft(request.get_json())
+        return jsonify(body), status
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @customer_bp.route('/my-nfts/<customer_address>', methods=['GET'])
 def get_customer_nfts(customer_address):
     """
-    특정 고객이 소유한 모든 NFT를 조회합니다.
+    특정 고객이 소유한 NFT를 조회합니다.
+    
+    ?cursor=...&limit=50: 커서 기반 페이지 조회 (응답의 next_cursor로 다음 페이지 요청)
+    ?format=ndjson 또는 Accept: application/x-ndjson: 전체 목록을 한 줄에 하나씩 스트리밍
     """
     try:
-        # 실제 구현에서는 블록체인에서 고객의 NFT 목록을 조회합니다
-        # 여기서는 Mock NFT 목록을 반환합니다
-        mock_nfts = [
-            {
-                'token_id': 'NFT_PROOF_CUST_001_1705312200',
-                'name': 'Credit Grade B NFT',
-                'credit_grade': 'B',
-                'max_loan_amount': 50000000,
-                'issued_date': '2024-01-15T10:30:00Z',
-                'issuer': 'EXTERNAL_AGENCY_001'
-            },
-            {
-                'token_id': 'NFT_PROOF_CUST_001_1705312500',
-                'name': 'Credit Grade A NFT',
-                'credit_grade': 'A',
-                'max_loan_amount': 100000000,
-                'issued_date': '2024-01-15T11:15:00Z',
-                'issuer': 'EXTERNAL_AGENCY_001'
-            }
-        ]
-        
-        response = {
-            'customer_address': customer_address,
-            'total_nfts': len(mock_nfts),
-            'nfts': mock_nfts,
-            'retrieved_at': datetime.now().isoformat()
-        }
-        
-        return jsonify(response), 200
-        
+        if wants_ndjson(request.args, request.accept_mimetypes):
+            return Response(stream_with_context(stream_customer_nfts(customer_address)), mimetype=NDJSON_MIMETYPE)
+        body, status = handle_customer_nfts(customer_address, request.args)
+        return jsonify(body), status
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -154,39 +336,10 @@ def verify_nft_ownership(token_id):
     POST: {"customer_address": "0x...", "customer_signature": "서명 데이터"}
     """
     try:
-        if request.method == 'GET':
-            customer_address = request.args.get('address')
-            if not customer_address:
-                return jsonify({'error': 'Missing required parameter: address'}), 400
-            customer_signature = ''
-        else:
-            data = request.get_json()
-            if not data:
-                return jsonify({'error': 'Request body is required'}), 400
-            
-            required_fields = ['customer_address']
-            for field in required_fields:
-                if field not in data:
-                    return jsonify({'error': f'Missing required field: {field}'}), 400
-            
-            customer_address = data['customer_address']
-            customer_signature = data.get('customer_signature', '')
-        
-        # 실제 구현에서는 블록체인에서 NFT 소유권을 검증합니다
-        # 여기서는 Mock 검증을 시뮬레이션합니다
-        mock_owner = '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
-        is_owner = customer_address.lower() == mock_owner.lower()
-        
-        response = {
-            'token_id': token_id,
-            'customer_address': customer_address,
-            'is_owner': is_owner,
-            'verified_at': datetime.now().isoformat(),
-            'message': 'NFT 소유권이 확인되었습니다.' if is_owner else 'NFT 소유자가 아닙니다.'
-        }
-        
-        return jsonify(response), 200
-        
+        data = request.get_json() if request.method == 'POST' else None
+        body, status = handle_verify_nft_ownership(token_id, request.method, request.args, data)
+        return jsonify(body), status
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -199,54 +352,9 @@ def check_loan_eligibility(token_id):
     POST: {"requested_amount": 10000000, "customer_address": "0x..."}
     """
     try:
-        if request.method == 'GET':
-            customer_address = request.args.get('address')
-            requested_amount = request.args.get('amount')
-            if not customer_address:
-                return jsonify({'error': 'Missing required parameter: address'}), 400
-            if not requested_amount:
-                return jsonify({'error': 'Missing required parameter: amount'}), 400
-            try:
-                requested_amount = int(requested_amount)
-            except ValueError:
-                return jsonify({'error': 'Invalid amount parameter'}), 400
-        else:
-            data = request.get_json()
-            if not data:
-                return jsonify({'error': 'Request body is required'}), 400
-            
-            required_fields = ['requested_amount', 'customer_address']
-            for field in required_fields:
-                if field not in data:
-                    return jsonify({'error': f'Missing required field: {field}'}), 400
-            
-            requested_amount = data['requested_amount']
-            customer_address = data['customer_address']
-        
-        # 실제 구현에서는 블록체인에서 NFT 정보를 조회하고 검증합니다
-        # 여기서는 Mock 검증을 시뮬레이션합니다
-        mock_nft_data = {
-            'credit_grade': 'B',
-            'max_loan_amount': 50000000,
-            'owner': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
-        }
-        
-        is_owner = customer_address.lower() == mock_nft_data['owner'].lower()
-        is_eligible = requested_amount <= mock_nft_data['max_loan_amount']
-        
-        response = {
-            'token_id': token_id,
-            'customer_address': customer_address,
-            'requested_amount': requested_amount,
-            'is_owner': is_owner,
-            'is_eligible': is_eligible and is_owner,
-            'max_loan_amount': mock_nft_data['max_loan_amount'],
-            'credit_grade': mock_nft_data['credit_grade'],
-            'checked_at': datetime.now().isoformat(),
-            'message': '대출 자격이 확인되었습니다.' if (is_eligible and is_owner) else '대출 자격이 없습니다.'
-        }
-        
-        return jsonify(response), 200
-        
+        data = request.get_json() if request.method == 'POST' else None
+        body, status = handle_loan_eligibility(token_id, request.method, request.args, data)
+        return jsonify(body), status
+    
     except Exception as e:
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
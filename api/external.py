@@ -7,18 +7,35 @@ from flask import Blueprint, request, jsonify
 import json
 import os
 import hashlib
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import subprocess
 import tempfile
+import uuid
+
+from utils.credit_circuit import (
+    GRADE_CODES, circuit_version, commitment_salt, credit_commitment, format_field, random_salt, uses_commitment
+)
+from utils.credit_store import credit_data_backend, credit_store
+from utils.logging_utils import get_logger
+from utils.metrics import ADMISSION_REJECTIONS, NFT_REGISTRY_LOOKUPS, time_stage, timed
+from utils.nft_index import nft_index
+from utils.proof_store import circuit_hash, proof_store, proof_store_enabled
+from utils.rate_limiter import (
+    PARTNER_KEY_HEADER, PRIORITY_HEADER, AdmissionRejected, RateLimited, admission_controller, identify_partner,
+    rate_limiter, request_priority
+)
+from utils.zkp_utils import zkp_utils
+from .common import check_required_fields, load_json_cached, rejection_response
 
 external_bp = Blueprint('external', __name__)
+logger = get_logger('external')
 
 # Mock 신용정보 데이터 로드
 def load_credit_data():
     """Mock 신용정보 데이터를 로드합니다."""
     try:
-        with open('data/credit_data.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_cached('data/credit_data.json')
     except FileNotFoundError:
         # 기본 Mock 데이터 반환
         return {
@@ -53,6 +70,15 @@ def load_credit_data():
             }
         }
 
+def get_customer_credit(customer_id):
+    """
+    고객의 신용정보를 조회합니다.
+    CREDIT_DATA_BACKEND=sqlite이면 신용정보 저장소에서 해당 고객만 조회합니다.
+    """
+    if credit_data_backend() == 'sqlite':
+        return credit_store.get(customer_id)
+    return load_credit_data()['customers'].get(customer_id)
+
 def calculate_credit_grade(credit_score):
     """신용점수를 기반으로 신용등급을 계산합니다."""
     if credit_score >= 800:
@@ -69,6 +95,9 @@ def calculate_credit_grade(credit_score):
 # Mock NFT 저장소 (실제로는 데이터베이스 사용)
 nft_storage = {}
 
+# NFT 유효기간 (일)
+NFT_VALIDITY_DAYS = 30
+
 def get_existing_nft(customer_id, customer_address):
     """고객의 기존 NFT를 조회합니다."""
     key = f"{customer_id}_{customer_address}"
@@ -87,6 +116,740 @@ def save_nft(customer_id, customer_address, nft_data):
     """NFT를 저장합니다."""
     key = f"{customer_id}_{customer_address}"
     nft_storage[key] = nft_data
+    index_nft(customer_address, nft_data)
+
+def index_nft(customer_address, nft_metadata):
+    """발행한 NFT를 고객 NFT 목록 색인에 추가합니다."""
+    attributes = {attr['trait_type']: attr['value'] for attr in nft_metadata.get('attributes', [])}
+    nft_index.add(customer_address, {
+        'token_id': nft_metadata['token_id'],
+        'name': nft_metadata['name'],
+        'credit_grade': attributes.get('Credit Grade'),
+        'max_loan_amount': attributes.get('Max Loan Amount'),
+        'issued_date': attributes.get('Issue Date'),
+        'issuer': attributes.get('Issuer')
+    })
+
+# CreditGradeNFT 발행 함수 ABI (blockchain/contracts/CreditGradeNFT.sol)
+MINT_FUNCTION = 'mintCreditGradeNFT'
+CREDIT_NFT_MINT_ABI = [{
+    'type': 'function',
+    'name': MINT_FUNCTION,
+    'stateMutability': 'nonpayable',
+    'inputs': [
+        {'name': 'to', 'type': 'address'},
+        {'name': 'tokenURI', 'type': 'string'},
+        {'name': 'creditGrade', 'type': 'string'},
+        {'name': 'maxLoanAmount', 'type': 'uint256'},
+        {'name': 'proofId', 'type': 'string'},
+        {'name': 'customerId', 'type': 'string'}
+    ],
+    'outputs': [{'name': '', 'type': 'uint256'}]
+}]
+# NFT 조회 함수와 체인 조회 캐시를 무효화하는 이벤트 ABI
+CREDIT_NFT_ABI = CREDIT_NFT_MINT_ABI + [
+    {'type': 'function', 'name': 'ownerOf', 'stateMutability': 'view',
+     'inputs': [{'name': 'tokenId', 'type': 'uint256'}], 'outputs': [{'name': '', 'type': 'address'}]},
+    {'type': 'function', 'name': 'tokenURI', 'stateMutability': 'view',
+     'inputs': [{'name': 'tokenId', 'type': 'uint256'}], 'outputs': [{'name': '', 'type': 'string'}]},
+    {'type': 'function', 'name': 'getCreditGradeData', 'stateMutability': 'view',
+     'inputs': [{'name': 'tokenId', 'type': 'uint256'}],
+     'outputs': [{'name': '', 'type': 'tuple', 'components': [
+         {'name': 'creditGrade', 'type': 'string'},
+         {'name': 'maxLoanAmount', 'type': 'uint256'},
+         {'name': 'proofId', 'type': 'string'},
+         {'name': 'customerId', 'type': 'string'},
+         {'name': 'issuedAt', 'type': 'uint256'},
+         {'name': 'isValid', 'type': 'bool'}
+     ]}]},
+    {'type': 'event', 'name': 'Transfer', 'anonymous': False, 'inputs': [
+        {'name': 'from', 'type': 'address', 'indexed': True},
+        {'name': 'to', 'type': 'address', 'indexed': True},
+        {'name': 'tokenId', 'type': 'uint256', 'indexed': True}
+    ]},
+    {'type': 'event', 'name': 'CreditGradeNFTMinted', 'anonymous': False, 'inputs': [
+        {'name': 'tokenId', 'type': 'uint256', 'indexed': True},
+        {'name': 'customerId', 'type': 'string', 'indexed': True},
+        {'name': 'creditGrade', 'type': 'string', 'indexed': False},
+        {'name': 'maxLoanAmount', 'type': 'uint256', 'indexed': False},
+        {'name': 'proofId', 'type': 'string', 'indexed': False}
+    ]},
+    {'type': 'event', 'name': 'CreditGradeNFTTransferred', 'anonymous': False, 'inputs': [
+        {'name': 'tokenId', 'type': 'uint256', 'indexed': True},
+        {'name': 'from', 'type': 'address', 'indexed': True},
+        {'name': 'to', 'type': 'address', 'indexed': True}
+    ]}
+]
+# ERC-721 Transfer(address,address,uint256) 이벤트 토픽
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+# 확정을 기다리는 발행 NFT (token_id -> nft_metadata, 확정 핸들러가 상태를 갱신)
+pending_mints = {}
+# 확정된 NFT의 체인 토큰 ID (token_id -> chain_token_id, 프로세스별)
+chain_token_ids = {}
+_chain_indexing_started = False
+
+def chain_minting_enabled():
+    """배포된 컨트랙트 주소(CONTRACT_ADDRESS)와 발행자 개인키(PRIVATE_KEY)가 설정되어 있으면 NFT를 체인에 발행합니다."""
+    contract_address = (os.getenv('CONTRACT_ADDRESS') or '').lower()
+    private_key = os.getenv('PRIVATE_KEY') or ''
+    return contract_address not in ('', '0x' + '0' * 40) and private_key not in ('', 'your-private-key-here')
+
+def start_mint_tracking():
+    """
+    mint 확정 핸들러를 등록하고 확정 추적기를 시작합니다.
+    재시작 전에 대기 중이던 발행 트랜잭션도 이때부터 다시 추적합니다.
+    
+    Returns:
+        추적 중인 트랜잭션 수
+    """
+    from utils.confirmation_tracker import confirmation_tracker
+    
+    confirmation_tracker.register_handler('mint', on_mint_confirmed)
+    confirmation_tracker.start()
+    start_chain_indexing(confirmation_tracker)
+    return confirmation_tracker.pending_count()
+
+def start_chain_indexing(tracker):
+    """
+    확정 추적기와 같은 블록 구독으로 NFT 컨트랙트 이벤트 인덱서를 시작합니다.
+    새 블록마다 전송·발행 이벤트를 읽어 체인 조회 캐시에서 바뀐 토큰의 항목을 무효화합니다.
+    
+    Args:
+        tracker: 블록 구독을 제공하는 확정 추적기
+    """
+    global _chain_indexing_started
+    if _chain_indexing_started:
+        return
+    _chain_indexing_started = True
+    
+    async def subscribe():
+        tracker.async_utils.add_block_listener(index_chain_events)
+    
+    tracker.facade.run(subscribe())
+
+async def index_chain_events(block):
+    """블록 리스너: 해당 블록까지의 NFT 컨트랙트 이벤트를 체인 조회 캐시에 반영합니다."""
+    import asyncio
+    from utils.blockchain_utils import blockchain_utils
+    
+    result = await asyncio.to_thread(
+        blockchain_utils.index_contract_events, credit_nft_address(), CREDIT_NFT_ABI, block['number']
+    )
+    if result['status'] == 'error':
+        logger.warning('NFT 이벤트 인덱싱 실패', block_number=block['number'], error=result['error'])
+
+def credit_nft_address():
+    """CreditGradeNFT 컨트랙트 주소 (CONTRACT_ADDRESS, 체크섬 형식)"""
+    from web3 import Web3
+    
+    return Web3.to_checksum_address(os.getenv('CONTRACT_ADDRESS'))
+
+def read_chain_nft(token_id):
+    """
+    체인에 발행된 NFT의 소유자, tokenURI, 신용등급 데이터를 체인 조회 캐시를 거쳐 읽습니다.
+    
+    Args:
+        token_id: 서비스 토큰 ID (확정된 발행의 체인 토큰 ID로 바꿉니다) 또는 체인 토큰 ID 숫자
+        
+    Returns:
+        조회 결과, 체인 발행을 쓰지 않거나 체인에 발행된 토큰이 아니면 None
+    """
+    from utils.blockchain_utils import blockchain_utils
+    
+    chain_token_id = int(token_id) if str(token_id).isdigit() else chain_token_ids.get(token_id)
+    if chain_token_id is None or not chain_minting_enabled():
+        return None
+    address = credit_nft_address()
+    info = blockchain_utils.get_nft_info(address, CREDIT_NFT_ABI, chain_token_id)
+    if info['status'] != 'success':
+        return info
+    grade_data = blockchain_utils.get_credit_grade_data(address, CREDIT_NFT_ABI, chain_token_id)
+    if grade_data['status'] != 'success':
+        return grade_data
+    return {**grade_data, 'owner': info['owner'], 'token_uri': info['token_uri']}
+
+def submit_mint(nft_metadata):
+    """
+    NFT 발행 트랜잭션을 보내고 채굴을 기다리지 않고 반환합니다.
+    결과는 nft_metadata의 mint_status/transaction_hash에 기록하며, 확정되면 on_mint_confirmed가 갱신합니다.
+    
+    Args:
+        nft_metadata: 발행할 NFT 메타데이터
+        
+    Returns:
+        발행 결과 (status: pending 또는 error)
+    """
+    from web3 import Web3
+    from eth_account import Account
+    from utils.blockchain_utils import blockchain_utils
+    
+    start_mint_tracking()
+    attributes = {attr['trait_type']: attr['value'] for attr in nft_metadata.get('attributes', [])}
+    private_key = os.getenv('PRIVATE_KEY')
+    try:
+        to_address = Web3.to_checksum_address(nft_metadata['customer_address'])
+    except ValueError as e:
+        result = {'status': 'error', 'message': f'Invalid customer address: {e}', 'error': str(e)}
+    else:
+        result = blockchain_utils.mint_nft(
+            credit_nft_address(), CREDIT_NFT_ABI, to_address,
+            f'https://api.example.com/nft/{nft_metadata["token_id"]}', Account.from_key(private_key).address,
+            private_key, wait_for_receipt=False, function_name=MINT_FUNCTION,
+            extra_args=(attributes.get('Credit Grade'), int(attributes.get('Max Loan Amount') or 0),
+                        nft_metadata['proof_id'], nft_metadata['customer_id']),
+            metadata={'token_id': nft_metadata['token_id']}
+        )
+    
+    nft_metadata['mint_status'] = result['status']
+    if result['status'] == 'pending':
+        nft_metadata['transaction_hash'] = result['transaction_hash']
+        pending_mints[nft_metadata['token_id']] = nft_metadata
+        logger.info('NFT 발행 트랜잭션 전송', token_id=nft_metadata['token_id'],
+                    transaction_hash=result['transaction_hash'])
+    else:
+        logger.error('NFT 발행 트랜잭션 전송 실패', token_id=nft_metadata['token_id'], error=result.get('error'))
+    return result
+
+def on_mint_confirmed(tx_hash, receipt, result):
+    """
+    확정 추적기의 mint 핸들러: 발행 트랜잭션이 확정되거나 실패하면 NFT 상태와 체인 토큰 ID를 기록합니다.
+    
+    Args:
+        tx_hash: 트랜잭션 해시
+        receipt: 트랜잭션 영수증
+        result: 확정 결과 (status: confirmed 또는 failed)
+    """
+    token_id = result['metadata'].get('token_id')
+    nft_metadata = pending_mints.pop(token_id, None)
+    if nft_metadata is None:
+        # 재시작 전에 보낸 발행은 메모리 NFT 저장소에 없으므로 결과만 남깁니다
+        logger.info('NFT 발행 확정 (저장소에 없는 NFT)', token_id=token_id, transaction_hash=tx_hash,
+                    mint_status=result['status'])
+        return
+    
+    nft_metadata['mint_status'] = result['status']
+    nft_metadata['block_number'] = result['block_number']
+    for log in receipt.get('logs', []):
+        topics = [topic.hex() if isinstance(topic, bytes) else str(topic) for topic in log.get('topics', [])]
+        if len(topics) == 4 and topics[0].lower().removeprefix('0x') == TRANSFER_TOPIC[2:]:
+            nft_metadata['chain_token_id'] = int(topics[3], 16)
+            chain_token_ids[token_id] = nft_metadata['chain_token_id']
+            break
+    logger.info('NFT 발행 확정', token_id=token_id, transaction_hash=tx_hash, mint_status=result['status'],
+                chain_token_id=nft_metadata.get('chain_token_id'))
+
+def mint_tx_hash(nft_metadata):
+    """NFT 발행 트랜잭션 해시 (체인에 발행하지 않은 Mock NFT는 토큰 ID에서 만든 값)"""
+    return nft_metadata.get('transaction_hash') or \
+        f'0x{hashlib.sha256(nft_metadata["token_id"].encode()).hexdigest()[:64]}'
+
+def input_binding(customer_id, credit_score, credit_grade, max_loan_amount, salt=None):
+    """
+    proof_data에 넣을 입력 바인딩 필드와 공개 입력을 만듭니다.
+    커밋먼트 회로(ZKP_CIRCUIT_VERSION=v3)에서는 Poseidon 커밋먼트를,
+    그 외 회로에서는 입력별 SHA-256 해시를 사용합니다.
+    
+    Args:
+        salt: 커밋먼트 솔트 (기본값: 고객별 솔트, 서버의 신용정보로 만든 증명에만 사용)
+    """
+    if uses_commitment():
+        salt = commitment_salt(customer_id) if salt is None else salt
+        commitment = format_field(credit_commitment(credit_score, credit_grade, max_loan_amount, salt))
+        return {'commitment': commitment, 'public_inputs': [commitment]}
+    hashes = {
+        'credit_score_hash': hashlib.sha256(str(credit_score).encode()).hexdigest(),
+        'credit_grade_hash': hashlib.sha256(credit_grade.encode()).hexdigest(),
+        'max_loan_amount_hash': hashlib.sha256(str(max_loan_amount).encode()).hexdigest()
+    }
+    return {**hashes, 'public_inputs': list(hashes.values())}
+
+def prove_credit(customer_id, credit_score, credit_grade, max_loan_amount, inquiry_id, salt=None, valid_until=None):
+    """
+    신용등급 ZK-Proof를 생성하거나 증명 저장소에서 찾습니다.
+    같은 회로 산출물·신용등급·입력 바인딩의 증명이 보관 기간 안에 있으면 증명 생성을 건너뜁니다.
+    
+    Args:
+        customer_id: 고객 ID
+        credit_score: 신용점수
+        credit_grade: 신용등급
+        max_loan_amount: 최대 대출 한도
+        inquiry_id: 조회 ID (새 증명 ID는 같은 초의 다른 증명과 겹치지 않도록 임의 접미사를 붙입니다)
+        salt: 커밋먼트 솔트 (기본값: 고객별 솔트, 호출자가 보낸 입력이면 random_salt()를 넘깁니다)
+        valid_until: 증명을 쓰는 NFT의 만료 시각 (재사용하거나 저장한 증명을 적어도 이때까지 보관합니다)
+        
+    Returns:
+        (proof_data, 저장된 증명을 재사용했는지)
+    """
+    version = circuit_version()
+    artifact_hash = circuit_hash(version)
+    binding = input_binding(customer_id, credit_score, credit_grade, max_loan_amount, salt)
+    # 저장소 키: 커밋먼트 회로는 커밋먼트, 그 외 회로는 고객 ID와 입력 해시
+    input_key = binding.get('commitment') or \
+        hashlib.sha256('|'.join([str(customer_id), *binding['public_inputs']]).encode()).hexdigest()
+    if proof_store_enabled():
+        stored = proof_store.find(artifact_hash, credit_grade, input_key)
+        if stored is not None:
+            if valid_until is not None:
+                proof_store.extend(stored['proof_id'], valid_until.timestamp())
+            return stored['proof_data'], True
+    
+    # Mock ZK-Proof 생성 (실제로는 ZoKrates를 사용)
+    with time_stage('prove'):
+        proof_data = {
+            'proof_id': f'PROOF_{inquiry_id}_{uuid.uuid4().hex[:8]}',
+            'customer_id': customer_id,
+            **binding,
+            'proof_timestamp': datetime.now().isoformat(),
+            'circuit_version': version,
+            'zk_proof': {
+                'a': ['0x1234567890abcdef', '0xabcdef1234567890'],
+                'b': [['0x1111111111111111', '0x2222222222222222'], ['0x3333333333333333', '0x4444444444444444']],
+                'c': ['0x5555555555555555', '0x6666666666666666']
+            }
+        }
+        verified = zkp_utils.verify_credit_score_proof(proof_data)['is_valid']
+    # 재사용을 꺼도 GET /proof/<proof_id>와 NFT 재사용을 위해 저장합니다
+    proof_store.put(artifact_hash, version, credit_grade, input_key, proof_data, verified,
+                    expires_at=valid_until.timestamp() if valid_until is not None else None)
+    return proof_data, False
+
+def issue_credit_nft(customer_id, customer_address, credit_score, credit_grade, max_loan_amount, **log_fields):
+    """
+    신용등급 ZK-Proof를 생성하고 NFT를 발행·저장합니다.
+    
+    Args:
+        customer_id: 고객 ID
+        customer_address: 고객 지갑 주소
+        credit_score: 신용점수
+        credit_grade: 신용등급
+        max_loan_amount: 최대 대출 한도
+        **log_fields: 로그에 함께 남길 필드 (loan_request_id 등)
+        
+    Returns:
+        (inquiry_id, proof_data, nft_metadata)
+    """
+    current_time = datetime.now()
+    inquiry_id = f'INQ_{customer_id}_{int(current_time.timestamp())}'
+    expires = current_time + timedelta(days=NFT_VALIDITY_DAYS)
+    proof_data, reused = prove_credit(customer_id, credit_score, credit_grade, max_loan_amount, inquiry_id,
+                                      valid_until=expires)
+    if reused:
+        logger.info('저장된 ZK-Proof 재사용 - 증명 생성 생략', inquiry_id=inquiry_id,
+                    proof_id=proof_data['proof_id'], **log_fields)
+    else:
+        logger.info('ZK-Proof 생성 완료', inquiry_id=inquiry_id, proof_id=proof_data['proof_id'], **log_fields)
+    
+    # 새로운 NFT 발행
+    with time_stage('mint'):
+        issue_date = current_time.isoformat()
+        expiry_date = expires.isoformat()
+    
+        token_id = f'NFT_{proof_data["proof_id"]}_{int(current_time.timestamp())}'
+    
+        nft_metadata = {
+            'token_id': token_id,
+            'name': f'Credit Grade {credit_grade} NFT',
+            'description': f'Zero-Knowledge Proof based credit grade NFT for customer {customer_id}',
+            'image': f'https://api.example.com/nft/{token_id}/image',
+            'attributes': [
+                {
+                    'trait_type': 'Credit Grade',
+                    'value': credit_grade
+                },
+                {
+                    'trait_type': 'Max Loan Amount',
+                    'value': max_loan_amount
+                },
+                {
+                    'trait_type': 'Issuer',
+                    'value': 'EXTERNAL_AGENCY_001'
+                },
+                {
+                    'trait_type': 'Issue Date',
+                    'value': issue_date
+                },
+                {
+                    'trait_type': 'Expiry Date',
+                    'value': expiry_date
+                },
+                {
+                    'trait_type': 'Validity Period',
+                    'value': f'{NFT_VALIDITY_DAYS} days'
+                }
+            ],
+            'proof_id': proof_data['proof_id'],
+            'customer_id': customer_id,
+            'customer_address': customer_address,
+            'issue_date': issue_date,
+            'expiry_date': expiry_date,
+            'is_valid': True
+        }
+    
+        if 'commitment' in proof_data:
+            nft_metadata['commitment'] = proof_data['commitment']
+    
+        # 체인 발행은 채굴을 기다리지 않고, 확정 추적기가 확정 시 상태를 갱신합니다
+        if chain_minting_enabled():
+            submit_mint(nft_metadata)
+    
+        # NFT 저장
+        save_nft(customer_id, customer_address, nft_metadata)
+    logger.info('NFT 발행 완료', token_id=token_id, customer_address=customer_address,
+                expiry_date=expiry_date, **log_fields)
+    
+    return inquiry_id, proof_data, nft_metadata
+
+def find_reusable_nft(customer_id, customer_address):
+    """
+    재사용할 수 있는 기존 NFT와 저장된 증명을 찾습니다.
+    만료되지 않았고, 증명 저장소에 검증된 증명이 남아 있고, 체인 발행에 실패하지 않은 NFT만 재사용합니다.
+    
+    Returns:
+        (NFT 메타데이터, 저장된 증명), 재사용할 NFT가 없으면 (기존 NFT 또는 None, None)
+    """
+    existing_nft = get_existing_nft(customer_id, customer_address)
+    stored_proof = proof_store.get(existing_nft['proof_id']) \
+        if existing_nft and is_nft_valid(existing_nft) \
+        and existing_nft.get('mint_status') not in ('error', 'failed') else None
+    if stored_proof is not None and not stored_proof['verified']:
+        stored_proof = None
+    return existing_nft, stored_proof
+
+def handle_credit_inquiry(data):
+    """신용정보 조회 및 NFT 발행 요청을 처리합니다."""
+    error = check_required_fields(data, ['customer_id', 'customer_name', 'requested_amount', 'purpose', 'request_id', 'customer_address'])
+    if error:
+        return error
+    
+    customer_id = data['customer_id']
+    customer_name = data['customer_name']
+    requested_amount = data['requested_amount']
+    request_id = data['request_id']
+    customer_address = data['customer_address']
+    
+    logger.info('신용정보 조회 요청 접수', loan_request_id=request_id, customer_id=customer_id,
+                customer_name=customer_name, requested_amount=requested_amount)
+    
+    existing_nft, stored_proof = find_reusable_nft(customer_id, customer_address)
+    reuse_nft = stored_proof is not None
+    
+    if reuse_nft:
+        # 기존 NFT가 유효하면 재사용
+        NFT_REGISTRY_LOOKUPS.labels('hit').inc()
+        logger.info('유효한 기존 NFT 발견', loan_request_id=request_id, token_id=existing_nft['token_id'])
+        
+        # NFT에서 신용정보 추출
+        credit_grade = None
+        max_loan_amount = None
+        
+        for attr in existing_nft['attributes']:
+            if attr['trait_type'] == 'Credit Grade':
+                credit_grade = attr['value']
+            elif attr['trait_type'] == 'Max Loan Amount':
+                max_loan_amount = attr['value']
+        
+        logger.debug('NFT에서 신용정보 추출', loan_request_id=request_id, credit_grade=credit_grade,
+                     max_loan_amount=max_loan_amount)
+        
+        # 기존 NFT 재사용
+        token_id = existing_nft['token_id']
+        nft_metadata = existing_nft
+        proof_data = stored_proof['proof_data']
+        inquiry_id = f'INQ_{customer_id}_{int(datetime.now().timestamp())}'
+        
+    else:
+        # 새로운 신용정보 조회 및 NFT 생성
+        NFT_REGISTRY_LOOKUPS.labels('miss').inc()
+        logger.debug('기존 NFT 없음, 만료 또는 증명 없음 - 새로운 신용정보 조회', loan_request_id=request_id)
+        
+        # Mock 신용정보 데이터에서 고객 정보 조회
+        with time_stage('credit_lookup'):
+            customer_info = get_customer_credit(customer_id)
+        
+        if customer_info is None:
+            return {'error': 'Customer not found'}, 404
+        
+        credit_grade = calculate_credit_grade(customer_info['credit_score'])
+        
+        logger.debug('신용정보 조회 완료', loan_request_id=request_id,
+                     credit_score=customer_info['credit_score'], credit_grade=credit_grade)
+        
+        # 신용등급별 대출 한도 설정
+        loan_limits = {
+            "A": 100000000,  # 1억원
+            "B": 50000000,   # 5천만원
+            "C": 20000000,   # 2천만원
+            "D": 5000000,    # 5백만원
+            "E": 0
+        }
+        
+        max_loan_amount = loan_limits.get(credit_grade, 0)
+        logger.debug('대출 한도 계산', loan_request_id=request_id, max_loan_amount=max_loan_amount)
+    
+    # ZK-Proof 생성 (재사용할 NFT가 없거나 만료된 경우에만)
+    if not reuse_nft:
+        inquiry_id, proof_data, nft_metadata = issue_credit_nft(
+            customer_id, customer_address, customer_info['credit_score'], credit_grade, max_loan_amount,
+            loan_request_id=request_id
+        )
+        token_id = nft_metadata['token_id']
+    else:
+        logger.info('기존 NFT 재사용 - ZK-Proof 및 NFT 생성 생략', loan_request_id=request_id, token_id=token_id)
+    
+    # credit_score 처리 (재사용 시에는 NFT에서 추출, 새로 생성 시에는 customer_info에서)
+    if reuse_nft:
+        # 재사용 시: NFT에서 credit_score 추출 (실제로는 NFT에 저장되어 있어야 함)
+        credit_score = 750  # Mock 값 (실제로는 NFT에서 추출)
+    else:
+        # 새로 생성 시: customer_info에서 가져옴
+        credit_score = customer_info['credit_score']
+    
+    response = {
+        'inquiry_id': inquiry_id,
+        'request_id': request_id,  # 대출 요청 ID 연결
+        'customer_id': customer_id,
+        'customer_name': customer_name,
+        'credit_score': credit_score,
+        'credit_grade': credit_grade,
+        'max_loan_amount': max_loan_amount,
+        'requested_amount': requested_amount,
+        'approval_eligible': requested_amount <= max_loan_amount,
+        'inquiry_timestamp': datetime.now().isoformat(),
+        'agency_id': 'EXTERNAL_AGENCY_001',
+        'proof_id': proof_data['proof_id'],
+        'token_id': token_id,
+        'nft_metadata': nft_metadata,
+        'blockchain_tx_hash': mint_tx_hash(nft_metadata),
+        'status': 'completed'
+    }
+    
+    logger.info('신용정보 조회 완료', loan_request_id=request_id, approval_eligible=response['approval_eligible'])
+    
+    return response, 200
+
+def handle_generate_proof(data):
+    """ZK-Proof 생성 요청을 처리합니다."""
+    error = check_required_fields(data, ['customer_id', 'credit_score', 'credit_grade', 'max_loan_amount'])
+    if error:
+        return error
+    
+    inquiry_id = data.get('inquiry_id', f'INQ_{data["customer_id"]}_{int(datetime.now().timestamp())}')
+    customer_id = data['customer_id']
+    credit_score = data['credit_score']
+    credit_grade = data['credit_grade']
+    max_loan_amount = data['max_loan_amount']
+    
+    if credit_grade not in GRADE_CODES:
+        return {'error': f'Invalid credit_grade: {credit_grade}'}, 400
+    
+    # 호출자가 보낸 입력이므로 고객별 솔트 대신 무작위 솔트로 커밋먼트를 만들고, 솔트는 호출자에게만 돌려줍니다
+    # (고객별 솔트를 쓰면 NFT에 기록된 커밋먼트를 신용점수 대입으로 맞춰 볼 수 있습니다)
+    salt = random_salt() if uses_commitment() else None
+    proof_data, reused = prove_credit(customer_id, credit_score, credit_grade, max_loan_amount, inquiry_id, salt)
+    
+    response = {
+        'proof_id': proof_data['proof_id'],
+        'status': 'generated',
+        'reused': reused,
+        'proof_data': proof_data,
+        'message': 'ZK-Proof가 성공적으로 생성되었습니다.'
+    }
+    if salt is not None:
+        response['salt'] = str(salt)
+    
+    return response, 200
+
+@timed('mint')
+def handle_mint_nft(data):
+    """NFT 발행 요청을 처리합니다."""
+    error = check_required_fields(data, ['customer_id', 'credit_grade', 'max_loan_amount', 'customer_address'])
+    if error:
+        return error
+    
+    proof_id = data.get('proof_id', f'PROOF_{data["customer_id"]}_{int(datetime.now().timestamp())}')
+    customer_id = data['customer_id']
+    credit_grade = data['credit_grade']
+    max_loan_amount = data['max_loan_amount']
+    customer_address = data['customer_address']
+    
+    # CONTRACT_ADDRESS와 PRIVATE_KEY가 설정되어 있으면 체인에 발행하고, 아니면 Mock NFT를 발행합니다
+    token_id = f'NFT_{proof_id}_{int(datetime.now().timestamp())}'
+    
+    nft_metadata = {
+        'token_id': token_id,
+        'name': f'Credit Grade {credit_grade} NFT',
+        'description': f'Zero-Knowledge Proof based credit grade NFT for customer {customer_id}',
+        'image': f'https://api.example.com/nft/{token_id}/image',
+        'attributes': [
+            {
+                'trait_type': 'Credit Grade',
+                'value': credit_grade
+            },
+            {
+                'trait_type': 'Max Loan Amount',
+                'value': max_loan_amount
+            },
+            {
+                'trait_type': 'Issuer',
+                'value': 'EXTERNAL_AGENCY_001'
+            },
+            {
+                'trait_type': 'Issue Date',
+                'value': datetime.now().isoformat()
+            }
+        ],
+        'proof_id': proof_id,
+        'customer_id': customer_id,
+        'customer_address': customer_address
+    }
+    
+    if chain_minting_enabled():
+        result = submit_mint(nft_metadata)
+        if result['status'] != 'pending':
+            return {'error': result['message']}, 502
+    
+    index_nft(customer_address, nft_metadata)
+    
+    pending = nft_metadata.get('mint_status') == 'pending'
+    response = {
+        'token_id': token_id,
+        'status': 'pending' if pending else 'minted',
+        'nft_metadata': nft_metadata,
+        'blockchain_tx_hash': mint_tx_hash(nft_metadata),
+        'message': 'NFT 발행 트랜잭션을 전송했습니다. 확정되면 발행이 완료됩니다.' if pending
+                   else 'NFT가 성공적으로 발행되었습니다.'
+    }
+    
+    return response, 200
+
+def handle_get_proof(proof_id):
+    """증명 저장소의 ZK-Proof 정보 응답을 생성합니다."""
+    stored = proof_store.get(proof_id)
+    if stored is None:
+        return {'error': 'Proof not found'}, 404
+    
+    response = {
+        **stored['proof_data'],
+        'status': 'verified' if stored['verified'] else 'unverified',
+        'metadata': {
+            'circuit_version': stored['circuit_version'],
+            'circuit_hash': stored['circuit_hash'],
+            'credit_grade': stored['credit_grade'],
+            'created_at': datetime.fromtimestamp(stored['created_at']).isoformat(),
+            'expires_at': datetime.fromtimestamp(stored['expires_at']).isoformat()
+        }
+    }
+    
+    return response, 200
+
+def handle_my_nft(data):
+    """고객 NFT 조회 요청을 처리합니다."""
+    error = check_required_fields(data, ['customer_id', 'customer_address'])
+    if error:
+        return error
+    
+    customer_id = data['customer_id']
+    customer_address = data['customer_address']
+    
+    logger.debug('NFT 조회 요청', customer_id=customer_id, customer_address=customer_address)
+    
+    # 기존 NFT 조회
+    existing_nft = get_existing_nft(customer_id, customer_address)
+    
+    if not existing_nft:
+        return {
+            'status': 'not_found',
+            'message': '해당 고객의 NFT를 찾을 수 없습니다.',
+            'customer_id': customer_id,
+            'customer_address': customer_address
+        }, 404
+    
+    # 유효기간 확인
+    is_valid = is_nft_valid(existing_nft)
+    
+    if not is_valid:
+        logger.info('NFT 유효기간 만료', customer_id=customer_id, token_id=existing_nft['token_id'])
+        return {
+            'status': 'expired',
+            'message': 'NFT 유효기간이 만료되었습니다. 새로운 신용정보 조회가 필요합니다.',
+            'nft_data': existing_nft,
+            'customer_id': customer_id,
+            'customer_address': customer_address
+        }, 200
+    
+    # 체인에 발행된 NFT는 컨트랙트의 유효 여부도 확인합니다
+    chain_data = read_chain_nft(existing_nft['token_id'])
+    if chain_data is not None and chain_data['status'] == 'success' and not chain_data['is_valid']:
+        logger.info('체인에서 무효화된 NFT', customer_id=customer_id, token_id=existing_nft['token_id'])
+        return {
+            'status': 'revoked',
+            'message': '체인에서 무효화된 NFT입니다. 새로운 신용정보 조회가 필요합니다.',
+            'nft_data': existing_nft,
+            'chain_data': chain_data,
+            'customer_id': customer_id,
+            'customer_address': customer_address
+        }, 200
+    
+    logger.debug('NFT 조회 완료', customer_id=customer_id, token_id=existing_nft['token_id'])
+    
+    response = {
+        'status': 'valid',
+        'message': 'NFT가 유효합니다.',
+        'nft_data': existing_nft,
+        'customer_id': customer_id,
+        'customer_address': customer_address
+    }
+    if chain_data is not None:
+        response['chain_data'] = chain_data
+    return response, 200
+
+@contextmanager
+def admit_credit_inquiry(data, priority_header=None, partner_key=None, remote_addr=None):
+    """
+    신용정보 조회 요청에 은행·고객별 속도 제한과 증명 작업 수용 제어를 적용합니다.
+    은행 식별자와 허용 우선순위는 요청 본문이 아니라 X-Partner-Key로 확인한 제휴기관 설정에서 가져옵니다.
+    새 증명이 필요한 요청만 블록이 끝날 때까지 증명 작업 자리를 점유하며,
+    재사용할 NFT가 있는 요청은 증명 생성 풀 포화와 관계없이 수용합니다.
+    
+    Args:
+        data: 요청 본문
+        priority_header: X-Request-Priority 헤더 값 (interactive 또는 batch)
+        partner_key: X-Partner-Key 헤더 값
+        remote_addr: 접속 주소 (제휴기관 키가 없는 호출자의 속도 제한 키)
+        
+    Yields:
+        새 증명이 필요한지 여부
+        
+    Raises:
+        RateLimited: bank_id 또는 customer_id 한도를 넘은 경우
+        AdmissionRejected: 증명 생성 풀이 해당 우선순위 한도에 도달한 경우
+    """
+    bank_id, max_priority = identify_partner(partner_key, remote_addr)
+    priority = request_priority(priority_header, max_priority)
+    if not data:
+        yield False
+        return
+    limited = rate_limiter.check({
+        'customer_id': data.get('customer_id'),
+        'bank_id': bank_id
+    })
+    if limited:
+        ADMISSION_REJECTIONS.labels(reason=f'rate_limit_{limited[0]}', priority=priority).inc()
+        logger.warning('요청 속도 한도 초과', limit=limited[0], bank_id=bank_id,
+                       customer_id=data.get('customer_id'))
+        raise RateLimited(*limited)
+    if find_reusable_nft(data.get('customer_id'), data.get('customer_address'))[1] is not None:
+        yield False
+        return
+    try:
+        with admission_controller.admit(priority):
+            yield True
+    except AdmissionRejected:
+        ADMISSION_REJECTIONS.labels(reason='prover_saturated', priority=priority).inc()
+        logger.warning('증명 생성 풀 포화로 요청 거절', priority=priority,
+                       in_flight=admission_controller.in_flight)
+        raise
 
 @external_bp.route('/credit-inquiry', methods=['POST'])
 def credit_inquiry():
@@ -103,197 +866,21 @@ def credit_inquiry():
         "bank_id": "BANK_001",
         "customer_address": "0x..." (NFT 발행용)
     }
+    
+    Headers:
+        X-Request-Priority: interactive (대출 심사) 또는 batch (기본값)
+        X-Partner-Key: 제휴기관 키 (PARTNER_KEYS에 등록된 은행만 interactive로 처리)
     """
     try:
         data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['customer_id', 'customer_name', 'requested_amount', 'purpose', 'request_id', 'customer_address']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        customer_id = data['customer_id']
-        customer_name = data['customer_name']
-        requested_amount = data['requested_amount']
-        request_id = data['request_id']
-        customer_address = data['customer_address']
-        
-        print(f"🏛️ [EXTERNAL] 신용정보 조회 요청 접수: {customer_name}({customer_id})")
-        print(f"🏛️ [EXTERNAL] Request ID: {request_id}")
-        print(f"🏛️ [EXTERNAL] 요청 금액: {requested_amount:,}원")
-        
-        # 기존 NFT 확인 (만료 체크)
-        existing_nft = get_existing_nft(customer_id, customer_address)
-        
-        if existing_nft and is_nft_valid(existing_nft):
-            # 기존 NFT가 유효하면 재사용
-            print(f"🏛️ [EXTERNAL] 기존 NFT 발견: {existing_nft['token_id']}")
-            print(f"🏛️ [EXTERNAL] NFT 유효기간 확인: 유효함")
-            
-            # NFT에서 신용정보 추출
-            credit_grade = None
-            max_loan_amount = None
-            
-            for attr in existing_nft['attributes']:
-                if attr['trait_type'] == 'Credit Grade':
-                    credit_grade = attr['value']
-                elif attr['trait_type'] == 'Max Loan Amount':
-                    max_loan_amount = attr['value']
-            
-            print(f"🏛️ [EXTERNAL] NFT에서 신용정보 추출: {credit_grade}등급, {max_loan_amount:,}원")
-            
-            # 기존 NFT 재사용
-            token_id = existing_nft['token_id']
-            nft_metadata = existing_nft
-            proof_data = {
-                'proof_id': existing_nft['proof_id'],
-                'zk_proof': {
-                    'a': ['0x1234567890abcdef', '0xabcdef1234567890'],
-                    'b': [['0x1111111111111111', '0x2222222222222222'], ['0x3333333333333333', '0x4444444444444444']],
-                    'c': ['0x5555555555555555', '0x6666666666666666']
-                }
-            }
-            inquiry_id = f'INQ_{customer_id}_{int(datetime.now().timestamp())}'
-            
-        else:
-            # 새로운 신용정보 조회 및 NFT 생성
-            print(f"🏛️ [EXTERNAL] 기존 NFT 없음 또는 만료됨 - 새로운 신용정보 조회 시작")
-            
-            # Mock 신용정보 데이터에서 고객 정보 조회
-            credit_data = load_credit_data()
-            
-            if customer_id not in credit_data['customers']:
-                return jsonify({'error': 'Customer not found'}), 404
-            
-            customer_info = credit_data['customers'][customer_id]
-            credit_grade = calculate_credit_grade(customer_info['credit_score'])
-            
-            print(f"🏛️ [EXTERNAL] 신용정보 조회 완료: {customer_info['credit_score']}점 → {credit_grade}등급")
-            
-            # 신용등급별 대출 한도 설정
-            loan_limits = {
-                "A": 100000000,  # 1억원
-                "B": 50000000,   # 5천만원
-                "C": 20000000,   # 2천만원
-                "D": 5000000,    # 5백만원
-                "E": 0
-            }
-            
-            max_loan_amount = loan_limits.get(credit_grade, 0)
-            print(f"🏛️ [EXTERNAL] 대출 한도 계산: {max_loan_amount:,}원")
-        
-        # ZK-Proof 생성 (기존 NFT가 없거나 만료된 경우에만)
-        if not (existing_nft and is_nft_valid(existing_nft)):
-            inquiry_id = f'INQ_{customer_id}_{int(datetime.now().timestamp())}'
-            proof_data = {
-                'proof_id': f'PROOF_{inquiry_id}',
-                'customer_id': customer_id,
-                'credit_score_hash': hashlib.sha256(str(customer_info['credit_score']).encode()).hexdigest(),
-                'credit_grade_hash': hashlib.sha256(credit_grade.encode()).hexdigest(),
-                'max_loan_amount_hash': hashlib.sha256(str(max_loan_amount).encode()).hexdigest(),
-                'proof_timestamp': datetime.now().isoformat(),
-                'zk_proof': {
-                    'a': ['0x1234567890abcdef', '0xabcdef1234567890'],
-                    'b': [['0x1111111111111111', '0x2222222222222222'], ['0x3333333333333333', '0x4444444444444444']],
-                    'c': ['0x5555555555555555', '0x6666666666666666']
-                }
-            }
-            print(f"🏛️ [EXTERNAL] ZK-Proof 생성 완료: {proof_data['proof_id']}")
-            print(f"🏛️ [EXTERNAL] Inquiry ID: {inquiry_id}")
-            
-            # 새로운 NFT 발행
-            current_time = datetime.now()
-            issue_date = current_time.isoformat()
-            expiry_date = (current_time.replace(day=current_time.day + 30)).isoformat()  # 1개월 후
-            
-            token_id = f'NFT_{proof_data["proof_id"]}_{int(current_time.timestamp())}'
-            print(f"🏛️ [EXTERNAL] 새로운 NFT 생성: {token_id}")
-            
-            nft_metadata = {
-                'token_id': token_id,
-                'name': f'Credit Grade {credit_grade} NFT',
-                'description': f'Zero-Knowledge Proof based credit grade NFT for customer {customer_id}',
-                'image': f'https://api.example.com/nft/{token_id}/image',
-                'attributes': [
-                    {
-                        'trait_type': 'Credit Grade',
-                        'value': credit_grade
-                    },
-                    {
-                        'trait_type': 'Max Loan Amount',
-                        'value': max_loan_amount
-                    },
-                    {
-                        'trait_type': 'Issuer',
-                        'value': 'EXTERNAL_AGENCY_001'
-                    },
-                    {
-                        'trait_type': 'Issue Date',
-                        'value': issue_date
-                    },
-                    {
-                        'trait_type': 'Expiry Date',
-                        'value': expiry_date
-                    },
-                    {
-                        'trait_type': 'Validity Period',
-                        'value': '30 days'
-                    }
-                ],
-                'proof_id': proof_data['proof_id'],
-                'customer_id': customer_id,
-                'customer_address': customer_address,
-                'issue_date': issue_date,
-                'expiry_date': expiry_date,
-                'is_valid': True
-            }
-            
-            # NFT 저장
-            save_nft(customer_id, customer_address, nft_metadata)
-            print(f"🏛️ [EXTERNAL] NFT 발행 완료: {token_id}")
-            print(f"🏛️ [EXTERNAL] 블록체인 주소: {customer_address}")
-            print(f"🏛️ [EXTERNAL] 유효기간: {issue_date} ~ {expiry_date}")
-        else:
-            print(f"🏛️ [EXTERNAL] 기존 NFT 재사용: {token_id}")
-            print(f"🏛️ [EXTERNAL] ZK-Proof 및 NFT 생성 생략")
-        
-        # credit_score 처리 (재사용 시에는 NFT에서 추출, 새로 생성 시에는 customer_info에서)
-        if existing_nft and is_nft_valid(existing_nft):
-            # 재사용 시: NFT에서 credit_score 추출 (실제로는 NFT에 저장되어 있어야 함)
-            credit_score = 750  # Mock 값 (실제로는 NFT에서 추출)
-        else:
-            # 새로 생성 시: customer_info에서 가져옴
-            credit_score = customer_info['credit_score']
-        
-        response = {
-            'inquiry_id': inquiry_id,
-            'request_id': request_id,  # 대출 요청 ID 연결
-            'customer_id': customer_id,
-            'customer_name': customer_name,
-            'credit_score': credit_score,
-            'credit_grade': credit_grade,
-            'max_loan_amount': max_loan_amount,
-            'requested_amount': requested_amount,
-            'approval_eligible': requested_amount <= max_loan_amount,
-            'inquiry_timestamp': datetime.now().isoformat(),
-            'agency_id': 'EXTERNAL_AGENCY_001',
-            'proof_id': proof_data['proof_id'],
-            'token_id': token_id,
-            'nft_metadata': nft_metadata,
-            'blockchain_tx_hash': f'0x{hashlib.sha256(token_id.encode()).hexdigest()[:64]}',
-            'status': 'completed'
-        }
-        
-        approval_status = "승인 가능" if requested_amount <= max_loan_amount else "승인 불가"
-        print(f"🏛️ [EXTERNAL] 승인 가능 여부: {approval_status}")
-        print(f"🏛️ [EXTERNAL] 은행으로 결과 전송 완료")
-        print(f"🏛️ [EXTERNAL] ==========================================")
-        
-        return jsonify(response), 200
-        
+        with admit_credit_inquiry(data, request.headers.get(PRIORITY_HEADER),
+                                  request.headers.get(PARTNER_KEY_HEADER), request.remote_addr):
+            body, status = handle_credit_inquiry(data)
+        return jsonify(body), status
+        
+    except (RateLimited, AdmissionRejected) as e:
+        body, status, headers = rejection_response(e)
+        return jsonify(body), status, headers
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -312,46 +899,8 @@ def generate_proof():
     }
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['customer_id', 'credit_score', 'credit_grade', 'max_loan_amount']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        inquiry_id = data.get('inquiry_id', f'INQ_{data["customer_id"]}_{int(datetime.now().timestamp())}')
-        customer_id = data['customer_id']
-        credit_score = data['credit_score']
-        credit_grade = data['credit_grade']
-        max_loan_amount = data['max_loan_amount']
-        
-        # 실제 구현에서는 ZoKrates를 사용하여 ZK-Proof를 생성합니다
-        # 여기서는 Mock proof를 생성합니다
-        proof_data = {
-            'proof_id': f'PROOF_{inquiry_id}',
-            'customer_id': customer_id,
-            'credit_score_hash': hashlib.sha256(str(credit_score).encode()).hexdigest(),
-            'credit_grade_hash': hashlib.sha256(credit_grade.encode()).hexdigest(),
-            'max_loan_amount_hash': hashlib.sha256(str(max_loan_amount).encode()).hexdigest(),
-            'proof_timestamp': datetime.now().isoformat(),
-            'zk_proof': {
-                'a': ['0x1234567890abcdef', '0xabcdef1234567890'],
-                'b': [['0x1111111111111111', '0x2222222222222222'], ['0x3333333333333333', '0x4444444444444444']],
-                'c': ['0x5555555555555555', '0x6666666666666666']
-            }
-        }
-        
-        response = {
-            'proof_id': proof_data['proof_id'],
-            'status': 'generated',
-            'proof_data': proof_data,
-            'message': 'ZK-Proof가 성공적으로 생성되었습니다.'
-        }
-        
-        return jsonify(response), 200
+        body, status = handle_generate_proof(request.get_json())
+        return jsonify(body), status
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -371,63 +920,8 @@ def mint_nft():
     }
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['customer_id', 'credit_grade', 'max_loan_amount', 'customer_address']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        proof_id = data.get('proof_id', f'PROOF_{data["customer_id"]}_{int(datetime.now().timestamp())}')
-        customer_id = data['customer_id']
-        credit_grade = data['credit_grade']
-        max_loan_amount = data['max_loan_amount']
-        customer_address = data['customer_address']
-        
-        # 실제 구현에서는 블록체인에 NFT를 발행합니다
-        # 여기서는 Mock NFT 발행을 시뮬레이션합니다
-        token_id = f'NFT_{proof_id}_{int(datetime.now().timestamp())}'
-        
-        nft_metadata = {
-            'token_id': token_id,
-            'name': f'Credit Grade {credit_grade} NFT',
-            'description': f'Zero-Knowledge Proof based credit grade NFT for customer {customer_id}',
-            'image': f'https://api.example.com/nft/{token_id}/image',
-            'attributes': [
-                {
-                    'trait_type': 'Credit Grade',
-                    'value': credit_grade
-                },
-                {
-                    'trait_type': 'Max Loan Amount',
-                    'value': max_loan_amount
-                },
-                {
-                    'trait_type': 'Issuer',
-                    'value': 'EXTERNAL_AGENCY_001'
-                },
-                {
-                    'trait_type': 'Issue Date',
-                    'value': datetime.now().isoformat()
-                }
-            ],
-            'proof_id': proof_id,
-            'customer_id': customer_id,
-            'customer_address': customer_address
-        }
-        
-        response = {
-            'token_id': token_id,
-            'status': 'minted',
-            'nft_metadata': nft_metadata,
-            'blockchain_tx_hash': f'0x{hashlib.sha256(token_id.encode()).hexdigest()[:64]}',
-            'message': 'NFT가 성공적으로 발행되었습니다.'
-        }
-        
-        return jsonify(response), 200
+        body, status = handle_mint_nft(request.get_json())
+        return jsonify(body), status
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -438,19 +932,8 @@ def get_proof(proof_id):
     특정 ZK-Proof 정보를 조회합니다.
     """
     try:
-        # 실제 구현에서는 데이터베이스에서 proof 정보를 조회합니다
-        # 여기서는 Mock 응답을 반환합니다
-        mock_proof = {
-            'proof_id': proof_id,
-            'customer_id': 'CUST_001',
-            'credit_score_hash': hashlib.sha256('750'.encode()).hexdigest(),
-            'credit_grade_hash': hashlib.sha256('B'.encode()).hexdigest(),
-            'max_loan_amount_hash': hashlib.sha256('50000000'.encode()).hexdigest(),
-            'proof_timestamp': '2024-01-15T10:30:00Z',
-            'status': 'verified'
-        }
-        
-        return jsonify(mock_proof), 200
+        body, status = handle_get_proof(proof_id)
+        return jsonify(body), status
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -467,54 +950,45 @@ def get_my_nft():
     }
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body is required'}), 400
-        
-        required_fields = ['customer_id', 'customer_address']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        customer_id = data['customer_id']
-        customer_address = data['customer_address']
+        body, status = handle_my_nft(request.get_json())
+        return jsonify(body), status
         
-        print(f"🏛️ [EXTERNAL] NFT 조회 요청: {customer_id} ({customer_address})")
-        
-        # 기존 NFT 조회
-        existing_nft = get_existing_nft(customer_id, customer_address)
-        
-        if not existing_nft:
-            return jsonify({
-                'status': 'not_found',
-                'message': '해당 고객의 NFT를 찾을 수 없습니다.',
-                'customer_id': customer_id,
-                'customer_address': customer_address
-            }), 404
-        
-        # 유효기간 확인
-        is_valid = is_nft_valid(existing_nft)
-        
-        if not is_valid:
-            print(f"🏛️ [EXTERNAL] NFT 유효기간 만료: {existing_nft['token_id']}")
-            return jsonify({
-                'status': 'expired',
-                'message': 'NFT 유효기간이 만료되었습니다. 새로운 신용정보 조회가 필요합니다.',
-                'nft_data': existing_nft,
-                'customer_id': customer_id,
-                'customer_address': customer_address
-            }), 200
-        
-        print(f"🏛️ [EXTERNAL] NFT 조회 완료: {existing_nft['token_id']}")
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@external_bp.route('/regrade', methods=['POST'])
+def regrade():
+    """
+    신용정보 갱신 후 유효한 NFT의 등급을 다시 계산해, 등급이 바뀐 고객만 ZK-Proof를 재생성하고
+    NFT를 재발행합니다. 등급이 같은 고객은 정책에 따라 유효기간만 연장합니다.
+    
+    재증명은 백그라운드에서 실행하고 작업 ID와 함께 202를 반환합니다 (GET /regrade/<job_id>로 상태 조회).
+    
+    Request Body (선택):
+    {
+        "ingest_id": "신용정보 적재 작업 ID",
+        "dry_run": false
+    }
+    """
+    from .regrade import handle_regrade
+    
+    try:
+        body, status = handle_regrade(request.get_json(silent=True))
+        return jsonify(body), status
         
-        return jsonify({
-            'status': 'valid',
-            'message': 'NFT가 유효합니다.',
-            'nft_data': existing_nft,
-            'customer_id': customer_id,
-            'customer_address': customer_address
-        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@external_bp.route('/regrade/<job_id>', methods=['GET'])
+def regrade_status(job_id):
+    """
+    재등급 작업 상태를 조회합니다. 작업은 프로세스별로 보관되므로 작업을 받은 워커에서만 조회됩니다.
+    """
+    from .regrade import handle_regrade_status
+    
+    try:
+        body, status = handle_regrade_status(job_id)
+        return jsonify(body), status
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,276 @@
+"""
+NFT 재등급 작업
+신용정보가 갱신된 뒤 유효한 NFT마다 현재 신용점수로 등급을 다시 계산해, 은행 기준(bank_criteria.json)의
+등급 경계를 넘은 고객만 ZK-Proof 재생성과 NFT 재발행 대상으로 증명 생성 풀에 넣습니다.
+등급이 그대로인 고객은 정책이 허용하면 증명 없이 유효기간만 연장합니다.
+
+재증명은 요청을 기다리게 하지 않고 백그라운드 작업으로 실행하며, 작업 ID로 진행 상태를 조회합니다.
+NFT 저장소(external.nft_storage)와 작업 목록은 프로세스별이므로 여러 워커로 실행하면 각 워커는 자신이 발행한
+NFT만 재등급하고, 작업 상태도 요청을 받은 워커에서만 조회됩니다 (응답의 worker_pid로 확인).
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import wait
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.credit_store import credit_data_backend, credit_store
+from utils.logging_utils import get_logger
+from utils.metrics import timed
+from utils.nft_index import nft_index
+from utils.zkp_utils import zkp_utils
+from . import external
+from .bank import load_bank_criteria
+
+logger = get_logger('regrade')
+
+# 재등급 작업 (job_id -> 작업 상태, 프로세스별). 오래된 완료 작업부터 지웁니다
+MAX_JOBS = 100
+regrade_jobs: 'OrderedDict[str, Dict]' = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def _setting(name: str, default: str) -> str:
+    return os.getenv(name) or default
+
+
+def grade_bands(criteria: Dict) -> List[Tuple[int, str]]:
+    """
+    은행 기준의 신용점수 구간을 (최소 점수, 등급) 목록으로 변환합니다 (최소 점수 내림차순).
+
+    Args:
+        criteria: bank_criteria.json 내용
+    """
+    ranges = criteria.get('credit_score_ranges', {})
+    return sorted(((band['min'], grade) for grade, band in ranges.items()), reverse=True)
+
+
+def grade_for_score(credit_score: int, bands: List[Tuple[int, str]]) -> Optional[str]:
+    """신용점수가 속한 등급을 반환합니다. 어느 구간에도 속하지 않으면 None을 반환합니다."""
+    for minimum, grade in bands:
+        if credit_score >= minimum:
+            return grade
+    return None
+
+
+def recorded_grade(nft: Dict) -> Optional[str]:
+    """NFT에 기록된 신용등급"""
+    for attr in nft.get('attributes', []):
+        if attr['trait_type'] == 'Credit Grade':
+            return attr['value']
+    return None
+
+
+def live_nfts() -> List[Dict]:
+    """유효기간이 남은 NFT 목록 (만료된 NFT는 다음 신용정보 조회에서 다시 발행됩니다)"""
+    return [nft for nft in list(external.nft_storage.values()) if external.is_nft_valid(nft)]
+
+
+def current_credit(customer_ids: List[str]) -> Dict[str, Dict]:
+    """고객들의 현재 신용정보를 한 번에 조회합니다."""
+    if credit_data_backend() == 'sqlite':
+        return credit_store.get_many(customer_ids)
+    customers = external.load_credit_data()['customers']
+    return {customer_id: customers[customer_id] for customer_id in customer_ids if customer_id in customers}
+
+
+def can_extend(nft: Dict, now: datetime) -> bool:
+    """
+    유효기간 연장 정책을 확인합니다.
+
+    - REGRADE_EXTEND_VALIDITY가 켜져 있어야 합니다
+    - 만료까지 REGRADE_EXTEND_WINDOW_DAYS일 이하로 남은 NFT만 연장합니다 (매 실행마다 연장하지 않도록)
+    - 연장 후 유효기간이 증명 생성 시점부터 REGRADE_MAX_PROOF_AGE_DAYS일을 넘으면 연장하지 않고 재증명합니다
+    """
+    if _setting('REGRADE_EXTEND_VALIDITY', 'true').lower() != 'true':
+        return False
+    try:
+        issued = datetime.fromisoformat(nft['issue_date'].replace('Z', '+00:00')).replace(tzinfo=None)
+        expiry = datetime.fromisoformat(nft['expiry_date'].replace('Z', '+00:00')).replace(tzinfo=None)
+    except (KeyError, ValueError):
+        return False
+    window = timedelta(days=float(_setting('REGRADE_EXTEND_WINDOW_DAYS', '7')))
+    max_age = timedelta(days=float(_setting('REGRADE_MAX_PROOF_AGE_DAYS', '90')))
+    new_expiry = now + timedelta(days=external.NFT_VALIDITY_DAYS)
+    return expiry - now <= window and new_expiry - issued <= max_age
+
+
+def extend_validity(nft: Dict, now: datetime) -> str:
+    """
+    NFT 유효기간을 연장합니다 (증명과 발행 없이 메타데이터만 갱신).
+    저장된 증명의 보관 기한도 새 만료일까지 늘립니다. 증명이 없으면 다음 신용정보 조회 때 재발행됩니다.
+
+    Returns:
+        새 만료일
+    """
+    expiry = now + timedelta(days=external.NFT_VALIDITY_DAYS)
+    if not external.proof_store.extend(nft['proof_id'], expiry.timestamp()):
+        logger.warning('저장된 증명 없음 - 유효기간만 연장', token_id=nft['token_id'], proof_id=nft['proof_id'])
+    expiry_date = expiry.isoformat()
+    nft['expiry_date'] = expiry_date
+    nft['validity_extensions'] = nft.get('validity_extensions', 0) + 1
+    for attr in nft.get('attributes', []):
+        if attr['trait_type'] == 'Expiry Date':
+            attr['value'] = expiry_date
+    return expiry_date
+
+
+def reissue_nft(nft: Dict, credit_score: int, credit_grade: str, max_loan_amount: int) -> Dict:
+    """
+    새 등급으로 ZK-Proof를 다시 생성하고 NFT를 재발행합니다 (증명 생성 풀에서 실행).
+
+    Returns:
+        재발행 결과 (이전/새 등급과 토큰 ID)
+    """
+    _, _, nft_metadata = external.issue_credit_nft(
+        nft['customer_id'], nft['customer_address'], credit_score, credit_grade, max_loan_amount,
+        regrade_of=nft['token_id']
+    )
+    nft_index.remove(nft['token_id'])
+    return {
+        'customer_id': nft['customer_id'],
+        'previous_grade': recorded_grade(nft),
+        'credit_grade': credit_grade,
+        'previous_token_id': nft['token_id'],
+        'token_id': nft_metadata['token_id']
+    }
+
+
+def plan_regrade(nfts: List[Dict], credit: Dict[str, Dict], criteria: Dict,
+                 changed: Optional[Set[str]] = None, now: Optional[datetime] = None) -> Dict[str, List]:
+    """
+    NFT별 처리 방법을 정합니다.
+
+    Args:
+        nfts: 유효한 NFT 목록
+        credit: 고객 ID → 현재 신용정보
+        criteria: bank_criteria.json 내용
+        changed: 신용정보가 바뀐 고객 ID (지정하면 나머지 고객은 등급을 다시 계산하지 않습니다)
+        now: 기준 시각
+
+    Returns:
+        {'reprove': [(nft, 점수, 등급)], 'extend': [nft], 'unchanged': [nft], 'skipped': [nft]}
+    """
+    now = now or datetime.now()
+    bands = grade_bands(criteria)
+    plan = {'reprove': [], 'extend': [], 'unchanged': [], 'skipped': []}
+    for nft in nfts:
+        customer_id = nft['customer_id']
+        if changed is None or customer_id in changed:
+            info = credit.get(customer_id)
+            if info is None:
+                plan['skipped'].append(nft)
+                continue
+            grade = grade_for_score(info['credit_score'], bands)
+            if grade is not None and grade != recorded_grade(nft):
+                plan['reprove'].append((nft, info['credit_score'], grade))
+                continue
+        plan['extend' if can_extend(nft, now) else 'unchanged'].append(nft)
+    return plan
+
+
+def _register_job(job: Dict) -> None:
+    with _jobs_lock:
+        regrade_jobs[job['job_id']] = job
+        while len(regrade_jobs) > MAX_JOBS:
+            oldest = next((job_id for job_id, item in regrade_jobs.items() if item['status'] != 'running'), None)
+            if oldest is None:
+                break
+            del regrade_jobs[oldest]
+
+
+@timed('regrade')
+def collect_regrade(job: Dict, futures: List, reprove: List) -> None:
+    """
+    재발행 작업이 끝나기를 기다려 작업 상태에 결과를 기록합니다 (백그라운드 스레드에서 실행).
+
+    Args:
+        job: 작업 상태
+        futures: 증명 생성 풀에 넣은 재발행 작업
+        reprove: futures와 같은 순서의 (nft, 점수, 등급) 목록
+    """
+    wait(futures)
+    reissued, errors = [], []
+    for future, (nft, _, _) in zip(futures, reprove):
+        try:
+            reissued.append(future.result())
+        except Exception as e:
+            errors.append({'token_id': nft['token_id'], 'error': str(e)})
+
+    logger.info('재등급 완료', job_id=job['job_id'], ingest_id=job['ingest_id'], reissued=len(reissued),
+                extended=job['extended'], errors=len(errors))
+    with _jobs_lock:
+        job.update({'status': 'completed', 'reproved': len(reissued), 'reissued': reissued, 'errors': errors,
+                    'completed_at': datetime.now().isoformat()})
+
+
+def handle_regrade_status(job_id: str):
+    """재등급 작업 상태를 조회합니다 (작업을 받은 워커에서만 조회됩니다)."""
+    with _jobs_lock:
+        job = regrade_jobs.get(job_id)
+        if job is None:
+            return {'error': f'Regrade job not found in this worker: {job_id}', 'worker_pid': os.getpid()}, 404
+        return dict(job), 200
+
+
+def handle_regrade(data):
+    """
+    재등급 요청을 처리합니다. 대상 선정과 유효기간 연장은 바로 처리하고, 재증명·재발행은 증명 생성 풀에서
+    백그라운드로 실행한 뒤 작업 ID와 함께 202를 반환합니다 (dry_run은 대상 목록만 바로 반환).
+
+    Request Body (선택):
+    {
+        "ingest_id": "신용정보 적재 작업 ID (지정하면 해당 적재에서 바뀐 고객만 재평가)",
+        "dry_run": false
+    }
+    """
+    data = data or {}
+    ingest_id = data.get('ingest_id')
+    dry_run = bool(data.get('dry_run'))
+    criteria = load_bank_criteria()
+    now = datetime.now()
+
+    nfts = live_nfts()
+    changed = {change['customer_id'] for change in credit_store.iter_changes(ingest_id)} if ingest_id else None
+    candidates = sorted({nft['customer_id'] for nft in nfts if changed is None or nft['customer_id'] in changed})
+    plan = plan_regrade(nfts, current_credit(candidates), criteria, changed, now)
+
+    logger.info('재등급 대상 선정', ingest_id=ingest_id, evaluated=len(nfts), reprove=len(plan['reprove']),
+                extend=len(plan['extend']), dry_run=dry_run)
+
+    summary = {
+        'status': 'success',
+        'ingest_id': ingest_id,
+        'dry_run': dry_run,
+        'evaluated': len(nfts),
+        'reproved': len(plan['reprove']),
+        'extended': len(plan['extend']),
+        'unchanged': len(plan['unchanged']),
+        'skipped': len(plan['skipped'])
+    }
+    if dry_run:
+        summary['reprove_tokens'] = [nft['token_id'] for nft, _, _ in plan['reprove']]
+        summary['extend_tokens'] = [nft['token_id'] for nft in plan['extend']]
+        return summary, 200
+
+    for nft in plan['extend']:
+        extend_validity(nft, now)
+
+    loan_limits = criteria.get('loan_limits', {})
+    futures = [
+        zkp_utils.submit(reissue_nft, nft, credit_score, grade, loan_limits.get(grade, 0))
+        for nft, credit_score, grade in plan['reprove']
+    ]
+    job_id = f'REGRADE_{now.strftime("%Y%m%d%H%M%S")}_{uuid.uuid4().hex[:8]}'
+    summary.update({'status': 'running', 'job_id': job_id, 'worker_pid': os.getpid(),
+                    'submitted_at': now.isoformat()})
+    _register_job(summary)
+    threading.Thread(target=collect_regrade, args=(summary, futures, plan['reprove']),
+                     name=f'regrade-{job_id}', daemon=True).start()
+
+    logger.info('재등급 작업 시작', job_id=job_id, ingest_id=ingest_id, reprove=len(futures))
+    with _jobs_lock:
+        return dict(summary), 202
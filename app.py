@@ -5,16 +5,108 @@ zk-nft: Zero-Knowledge Proof 기반 신용등급 NFT 시스템
 """
 
 import os
-from flask import Flask, jsonify
+import time
+import uuid
+from flask import Flask, Response, abort, g, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 # 환경변수 로드
 load_dotenv()
 
+from utils.logging_utils import bind_request_context, get_logger, reset_request_context, setup_logging
+from utils.metrics import observe_request, render_metrics
+from utils.serialization import (
+    AsyncFastJSONProvider, FastJSONProvider, WireFormatRequest, async_wire_format_request_class
+)
+from utils.compression import compress_async_response, compress_response
+from utils.tracing import TRACEPARENT_HEADER, tracer
+from utils import wire_format
+
+def new_request_id(headers):
+    """요청 헤더의 X-Request-ID를 사용하거나 새 요청 ID를 생성합니다."""
+    return headers.get('X-Request-ID') or uuid.uuid4().hex
+
+def route_label(url_rule):
+    """지표 라벨 수가 늘어나지 않도록 실제 경로 대신 URL 규칙을 사용합니다."""
+    return url_rule.rule if url_rule is not None else 'unmatched'
+
+startup_logger = get_logger('startup')
+
+def warm_up(app, include_chain=None):
+    """
+    첫 요청 전에 기준/신용정보 데이터, ZoKrates 산출물, 연결 풀을 미리 준비하고 단계별 소요 시간을 기록합니다.
+    
+    create_app()은 무거운 모듈(web3 등)을 불러오지 않으므로 서버 실행 전에 이 함수를 명시적으로 호출합니다.
+    블록체인 연결은 WARMUP_CHAIN=True일 때만 준비합니다 (pre-fork 서버에서는 fork 이후에 호출하세요).
+    체인 발행이 설정되어 있으면 NFT 발행 확정 추적기도 시작해, 재시작 전에 대기 중이던 발행을 이어서 추적합니다
+    (include_chain=False로 호출하면 fork 이후 워커에서 시작합니다).
+    
+    Args:
+        app: create_app() 또는 create_async_app()으로 생성한 앱
+        include_chain: 블록체인 연결 준비 여부 (기본값: WARMUP_CHAIN 환경변수)
+        
+    Returns:
+        단계별 결과와 소요 시간(ms)
+    """
+    from api import bank, external
+    from utils.credit_circuit import commitment_key, uses_commitment
+    from utils.zkp_utils import zkp_utils
+    
+    track_mints = include_chain is not False and external.chain_minting_enabled()
+    if include_chain is None:
+        include_chain = os.getenv('WARMUP_CHAIN', 'False').lower() == 'true'
+    
+    def load_chain():
+        from utils.blockchain_utils import blockchain_utils
+        return blockchain_utils.connect_to_blockchain()['status']
+    
+    def check_commitment_key():
+        # v3 회로의 고객별 커밋먼트 솔트는 기본값이 아닌 비밀키가 있어야 만들 수 있습니다
+        commitment_key()
+        return 'configured'
+    
+    steps = [
+        ('bank_criteria', lambda: f"{len(bank.load_bank_criteria().get('credit_score_ranges', {}))} grades"),
+        ('credit_data', lambda: f"{len(external.load_credit_data().get('customers', {}))} customers"),
+        ('zokrates_artifacts', lambda: f"{sum(1 for item in zkp_utils.circuit_artifacts().summary().values() if item)} "
+                                       'ZoKrates artifacts mapped'),
+        ('external_http_pool', lambda: type(bank.get_http_session()).__name__)
+    ]
+    if uses_commitment():
+        steps.append(('commitment_key', check_commitment_key))
+    if include_chain:
+        steps.append(('chain', load_chain))
+    if track_mints:
+        steps.append(('mint_tracking', lambda: f'{external.start_mint_tracking()} pending'))
+    
+    timings = app.config.setdefault('STARTUP_TIMINGS', {})
+    results = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            results[name] = {'status': 'success', 'detail': step()}
+        except Exception as e:
+            # 준비 단계 실패로 서버 시작을 막지 않고, 첫 요청에서 다시 시도됩니다
+            results[name] = {'status': 'error', 'detail': str(e)}
+        results[name]['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        timings[f'warm_up.{name}'] = results[name]['duration_ms']
+    if results.get('commitment_key', {}).get('status') == 'error':
+        startup_logger.error('커밋먼트 솔트 비밀키가 설정되지 않아 v3 회로 증명을 만들 수 없습니다',
+                             error=results['commitment_key']['detail'])
+    timings['warm_up'] = round(sum(result['duration_ms'] for result in results.values()), 2)
+    
+    startup_logger.info('워밍업 완료', timings=timings,
+                        failed=[name for name, result in results.items() if result['status'] != 'success'])
+    return {'steps': results, 'timings': timings}
+
 def create_app():
     """Flask 애플리케이션 팩토리 함수"""
+    started = time.perf_counter()
     app = Flask(__name__)
+    # orjson 기반 응답 직렬화, ?fields= 응답 필드 선택, MessagePack/CBOR 협상
+    app.json = FastJSONProvider(app)
+    app.request_class = WireFormatRequest
     
     # CORS 설정
     CORS(app)
@@ -33,6 +125,57 @@ def create_app():
     app.register_blueprint(external_bp, url_prefix='/api/external')
     app.register_blueprint(customer_bp, url_prefix='/api/customer')
     
+    # 구조화 로깅 및 요청 단위 로그 컨텍스트
+    setup_logging()
+    
+    @app.before_request
+    def bind_log_context():
+        g.request_started = time.perf_counter()
+        g.request_id = new_request_id(request.headers)
+        # 상위 서비스(은행 등)의 traceparent를 이어받아 요청 스팬을 시작합니다
+        g.span, g.span_token = tracer.begin_span(
+            f'{request.method} {route_label(request.url_rule)}',
+            traceparent=request.headers.get(TRACEPARENT_HEADER), endpoint=request.endpoint,
+            request_id=g.request_id
+        )
+        g.log_context_token = bind_request_context(endpoint=request.endpoint, request_id=g.request_id,
+                                                   trace_id=g.span.trace_id)
+    
+    @app.before_request
+    def reject_unsupported_body():
+        # 클라이언트가 JSON으로 다시 보낼 수 있도록 설치되지 않은 바이너리 형식은 415로 거절합니다
+        if wire_format.is_unsupported(request.mimetype):
+            abort(415)
+    
+    @app.after_request
+    def add_request_id_header(response):
+        if 'request_id' in g:
+            response.headers['X-Request-ID'] = g.request_id
+        if 'request_started' in g:
+            observe_request(request.method, route_label(request.url_rule), response.status_code,
+                            time.perf_counter() - g.request_started)
+        if 'span' in g:
+            g.span.set_attribute('http.status_code', response.status_code)
+        # 크기 기준 이상의 응답은 Accept-Encoding에 맞춰 brotli/gzip으로 압축합니다
+        return compress_response(response, request.accept_encodings)
+    
+    @app.teardown_request
+    def reset_log_context(error=None):
+        token = g.pop('log_context_token', None)
+        if token is not None:
+            reset_request_context(token)
+        span = g.pop('span', None)
+        if span is not None:
+            if error is not None:
+                span.record_error(error)
+            tracer.end_span(span, g.pop('span_token', None))
+    
+    # Prometheus 지표 엔드포인트
+    @app.route('/metrics')
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
+    
     # 헬스체크 엔드포인트
     @app.route('/health')
     def health_check():
@@ -42,6 +185,11 @@ def create_app():
             'version': '1.0.0'
         })
     
+    # 시작/워밍업 단계별 소요 시간 (ms)
+    @app.route('/health/startup')
+    def startup_timings():
+        return jsonify(app.config.get('STARTUP_TIMINGS', {}))
+    
     # 루트 엔드포인트
     @app.route('/')
     def index():
@@ -50,6 +198,7 @@ def create_app():
             'description': 'Zero-Knowledge Proof 기반 신용등급 NFT 시스템',
             'endpoints': {
                 'health': '/health',
+                'metrics': '/metrics',
                 'bank': '/api/bank',
                 'external': '/api/external',
                 'customer': '/api/customer'
@@ -65,6 +214,142 @@ def create_app():
     def internal_error(error):
         return jsonify({'error': 'Internal server error'}), 500
     
+    app.config['STARTUP_TIMINGS'] = {'create_app': round((time.perf_counter() - started) * 1000, 2)}
+    return app
+
+def create_async_app():
+    """
+    비동기(ASGI) Quart 애플리케이션 팩토리 함수
+    
+    create_app()과 같은 엔드포인트를 제공하며, 외부기관 HTTP 세션과
+    AsyncBlockchainUtils 연결 풀을 이벤트 루프에서 공유합니다.
+    """
+    started = time.perf_counter()
+    import aiohttp
+    from quart import (
+        Quart, Response as AsyncResponse, abort as async_abort, g as async_g, jsonify as async_jsonify,
+        request as async_request
+    )
+    from quart_cors import cors
+    
+    from api.async_routes import async_bank_bp, async_external_bp, async_customer_bp
+    
+    app = Quart(__name__)
+    app = cors(app)
+    app.json = AsyncFastJSONProvider(app)
+    app.request_class = async_wire_format_request_class()
+    
+    # 설정 로드
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+    app.config['BLOCKCHAIN_URL'] = os.getenv('BLOCKCHAIN_URL', 'http://localhost:8545')
+    app.config['CONTRACT_ADDRESS'] = os.getenv('CONTRACT_ADDRESS', '0x0000000000000000000000000000000000000000')
+    
+    app.register_blueprint(async_bank_bp, url_prefix='/api/bank')
+    app.register_blueprint(async_external_bp, url_prefix='/api/external')
+    app.register_blueprint(async_customer_bp, url_prefix='/api/customer')
+    
+    # 구조화 로깅 및 요청 단위 로그 컨텍스트
+    setup_logging()
+    
+    @app.before_request
+    async def bind_log_context():
+        async_g.request_started = time.perf_counter()
+        async_g.request_id = new_request_id(async_request.headers)
+        # 요청마다 별도 태스크(컨텍스트 사본)에서 처리되므로 되돌릴 필요가 없습니다
+        async_g.span, _ = tracer.begin_span(
+            f'{async_request.method} {route_label(async_request.url_rule)}',
+            traceparent=async_request.headers.get(TRACEPARENT_HEADER), endpoint=async_request.endpoint,
+            request_id=async_g.request_id
+        )
+        bind_request_context(endpoint=async_request.endpoint, request_id=async_g.request_id,
+                             trace_id=async_g.span.trace_id)
+    
+    @app.before_request
+    async def reject_unsupported_body():
+        if wire_format.is_unsupported(async_request.mimetype):
+            async_abort(415)
+    
+    @app.after_request
+    async def add_request_id_header(response):
+        if 'request_id' in async_g:
+            response.headers['X-Request-ID'] = async_g.request_id
+        if 'request_started' in async_g:
+            observe_request(async_request.method, route_label(async_request.url_rule), response.status_code,
+                            time.perf_counter() - async_g.request_started)
+        if 'span' in async_g:
+            async_g.span.set_attribute('http.status_code', response.status_code)
+            tracer.end_span(async_g.span)
+        return await compress_async_response(response, async_request.accept_encodings)
+    
+    @app.before_serving
+    async def open_connection_pools():
+        # 연결 풀은 요청을 처리할 이벤트 루프에서 만들어야 합니다 (web3도 이때 불러옵니다)
+        from utils.async_blockchain_utils import AsyncBlockchainUtils
+        
+        app.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=int(os.getenv('ASYNC_HTTP_POOL_SIZE', 100))),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        app.chain = AsyncBlockchainUtils(
+            app.config['BLOCKCHAIN_URL'],
+            ws_url=os.getenv('BLOCKCHAIN_WS_URL') or None
+        )
+    
+    @app.after_serving
+    async def close_connection_pools():
+        await app.http_session.close()
+        await app.chain.close()
+    
+    # Prometheus 지표 엔드포인트
+    @app.route('/metrics')
+    async def metrics():
+        body, content_type = render_metrics()
+        return AsyncResponse(body, content_type=content_type)
+    
+    # 헬스체크 엔드포인트
+    @app.route('/health')
+    async def health_check():
+        return async_jsonify({
+            'status': 'healthy',
+            'service': 'zk-nft',
+            'version': '1.0.0'
+        })
+    
+    @app.route('/health/startup')
+    async def startup_timings():
+        return async_jsonify(app.config.get('STARTUP_TIMINGS', {}))
+    
+    # 블록체인 연결 상태 (체인 조회를 이벤트 루프에서 await)
+    @app.route('/health/chain')
+    async def chain_health_check():
+        result = await app.chain.connect_to_blockchain()
+        return async_jsonify(result), 200 if result['status'] == 'success' else 503
+    
+    # 루트 엔드포인트
+    @app.route('/')
+    async def index():
+        return async_jsonify({
+            'message': 'zk-nft API 서버',
+            'description': 'Zero-Knowledge Proof 기반 신용등급 NFT 시스템',
+            'endpoints': {
+                'health': '/health',
+                'metrics': '/metrics',
+                'bank': '/api/bank',
+                'external': '/api/external',
+                'customer': '/api/customer'
+            }
+        })
+    
+    # 에러 핸들러
+    @app.errorhandler(404)
+    async def not_found(error):
+        return async_jsonify({'error': 'Not found'}), 404
+    
+    @app.errorhandler(500)
+    async def internal_error(error):
+        return async_jsonify({'error': 'Internal server error'}), 500
+    
+    app.config['STARTUP_TIMINGS'] = {'create_app': round((time.perf_counter() - started) * 1000, 2)}
     return app
 
 if __name__ == '__main__':
@@ -0,0 +1,3 @@
+"""
+ZK-NFT 성능 측정 도구
+"""
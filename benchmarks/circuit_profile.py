@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+ZoKrates 회로 제약식 프로파일러
+컴파일 결과(out)의 문장마다 기록된 소스 span으로 R1CS 제약식(out.r1cs)을 소스 식에 귀속시켜,
+제약식 수와 0이 아닌 항 수가 많은 식과 줄을 보고합니다. 증명 시간은 제약식 수에 비례하므로
+어느 식이 비용을 차지하는지 바로 보입니다.
+
+두 회로 버전(산출물 디렉토리 또는 저장한 프로파일 JSON)을 비교해 식별·전체 제약식 수 변화도 계산합니다.
+
+사용 예:
+    python -m benchmarks.circuit_profile profile zokrates --top 10
+    python -m benchmarks.circuit_profile profile zokrates --output runs/circuit_v1.json
+    python -m benchmarks.circuit_profile compare zokrates zokrates/v2
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from utils.zokrates_artifacts import CircuitArtifacts
+
+# (시작 줄, 시작 열, 끝 줄, 끝 열) - 줄과 열은 1부터, 끝 열은 포함하지 않습니다
+Span = Tuple[int, int, int, int]
+
+
+def span_key(span: Optional[Dict]) -> Optional[Span]:
+    """문장의 span 메타데이터를 (시작 줄, 시작 열, 끝 줄, 끝 열)로 변환합니다."""
+    if not span or 'Source' not in span:
+        return None
+    source = span['Source']
+    return source['from']['line'], source['from']['col'], source['to']['line'], source['to']['col']
+
+
+def span_text(lines: List[str], span: Span) -> str:
+    """소스에서 span에 해당하는 식을 잘라 한 줄로 만듭니다."""
+    start_line, start_col, end_line, end_col = span
+    if not lines or end_line > len(lines):
+        return ''
+    if start_line == end_line:
+        text = lines[start_line - 1][start_col - 1:end_col - 1]
+    else:
+        text = '\n'.join([lines[start_line - 1][start_col - 1:]] + lines[start_line:end_line - 1] +
+                         [lines[end_line - 1][:end_col - 1]])
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def find_source(artifacts: CircuitArtifacts, source: Optional[str] = None) -> Optional[str]:
+    """
+    span이 가리키는 소스 파일을 찾습니다.
+    지정한 파일 → 모듈 표의 파일명 → 디렉토리에 .zok 파일이 하나뿐이면 그 파일 순서로 찾습니다.
+    """
+    if source:
+        return source
+    for name in artifacts.program.module_map().values():
+        path = os.path.join(artifacts.directory, name)
+        if os.path.exists(path):
+            return path
+    candidates = [name for name in os.listdir(artifacts.directory) if name.endswith('.zok')]
+    return os.path.join(artifacts.directory, candidates[0]) if len(candidates) == 1 else None
+
+
+def profile_circuit(directory: str, program: str = 'out', source: Optional[str] = None) -> Dict:
+    """
+    회로의 제약식을 소스 식과 줄에 귀속시킵니다.
+
+    Args:
+        directory: 산출물 디렉토리
+        program: 컴파일 결과 파일명
+        source: 소스 파일 (기본값: find_source로 찾음)
+
+    Returns:
+        {'circuit', 'source', 'constraints', 'terms', 'directives', 'wires',
+         'expressions': [{'span', 'text', 'constraints', 'terms', 'directives', 'share'}] (제약식 수 내림차순),
+         'lines': [{'line', 'text', 'constraints', 'terms', 'share'}] (줄 순서)}
+
+    Raises:
+        ValueError: 컴파일 결과가 없거나 제약식 문장 수가 R1CS와 다른 경우
+    """
+    artifacts = CircuitArtifacts(directory, program)
+    try:
+        if artifacts.program is None:
+            raise ValueError(f'{directory}: compiled program {program!r} not found')
+        statements = artifacts.program.statements()
+        constraint_spans = [span_key(body['span']) for kind, body in (next(iter(s.items())) for s in statements)
+                            if kind == 'Constraint']
+        directive_spans = [span_key(s['Directive']['span']) for s in statements if 'Directive' in s]
+
+        # R1CS 제약식은 컴파일 결과의 Constraint 문장과 같은 순서입니다
+        if artifacts.r1cs is not None:
+            if artifacts.r1cs.n_constraints != len(constraint_spans):
+                raise ValueError(f'{directory}: {len(constraint_spans)} constraint statements but '
+                                 f'{artifacts.r1cs.n_constraints} R1CS constraints')
+            terms = artifacts.r1cs.term_counts().sum(axis=1).tolist()
+            wires = artifacts.r1cs.n_wires
+        else:
+            terms = [0] * len(constraint_spans)
+            wires = None
+
+        source_path = find_source(artifacts, source)
+        lines: List[str] = []
+        if source_path:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+    finally:
+        artifacts.close()
+
+    by_span = defaultdict(lambda: {'constraints': 0, 'terms': 0, 'directives': 0})
+    by_line = defaultdict(lambda: {'constraints': 0, 'terms': 0})
+    for span, count in zip(constraint_spans, terms):
+        by_span[span]['constraints'] += 1
+        by_span[span]['terms'] += count
+        line = span[0] if span else None
+        by_line[line]['constraints'] += 1
+        by_line[line]['terms'] += count
+    for span in directive_spans:
+        by_span[span]['directives'] += 1
+
+    total = len(constraint_spans)
+
+    def share(count: int) -> float:
+        return round(count / total, 4) if total else 0.0
+
+    expressions = [
+        {
+            'span': list(span) if span else None,
+            'text': span_text(lines, span) if span else '',
+            'share': share(stats['constraints']),
+            **stats
+        }
+        for span, stats in by_span.items()
+    ]
+    expressions.sort(key=lambda item: (-item['constraints'], -item['terms'], item['span'] or []))
+    return {
+        'circuit': os.path.join(directory, program),
+        'source': source_path,
+        'constraints': total,
+        'terms': int(sum(terms)),
+        'directives': len(directive_spans),
+        'wires': wires,
+        'expressions': expressions,
+        'lines': [
+            {
+                'line': line,
+                'text': re.sub(r'\s+', ' ', lines[line - 1]).strip() if line and line <= len(lines) else '',
+                'share': share(stats['constraints']),
+                **stats
+            }
+            for line, stats in sorted(by_line.items(), key=lambda item: (item[0] is None, item[0] or 0))
+        ]
+    }
+
+
+def compare_profiles(base: Dict, new: Dict) -> Dict:
+    """
+    두 회로 프로파일을 비교합니다. 버전마다 줄 번호가 다르므로 식은 소스 텍스트로 맞춥니다
+    (텍스트가 없으면 span으로 맞춥니다).
+
+    Returns:
+        {'constraints', 'terms', 'wires' ({'base', 'new', 'delta', 'change_pct'}),
+         'expressions': [{'text', 'base', 'new', 'delta'}] (변화량 절댓값 내림차순)}
+    """
+    def totals(name: str) -> Dict:
+        before, after = base.get(name), new.get(name)
+        if before is None or after is None:
+            return {'base': before, 'new': after, 'delta': None, 'change_pct': None}
+        return {
+            'base': before,
+            'new': after,
+            'delta': after - before,
+            'change_pct': round((after - before) / before * 100, 2) if before else None
+        }
+
+    def by_text(profile: Dict) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for item in profile['expressions']:
+            counts[item['text'] or str(item['span'])] += item['constraints']
+        return counts
+
+    before, after = by_text(base), by_text(new)
+    expressions = [
+        {'text': text, 'base': before.get(text, 0), 'new': after.get(text, 0),
+         'delta': after.get(text, 0) - before.get(text, 0)}
+        for text in set(before) | set(after)
+    ]
+    expressions = [item for item in expressions if item['delta'] or item['base'] or item['new']]
+    expressions.sort(key=lambda item: (-abs(item['delta']), item['text']))
+    return {
+        'base': base['circuit'],
+        'new': new['circuit'],
+        'constraints': totals('constraints'),
+        'terms': totals('terms'),
+        'wires': totals('wires'),
+        'expressions': expressions
+    }
+
+
+def load_profile(path: str, source: Optional[str] = None) -> Dict:
+    """산출물 디렉토리면 프로파일을 계산하고, JSON 파일이면 저장한 프로파일을 읽습니다."""
+    if os.path.isdir(path):
+        return profile_circuit(path, source=source)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _print_profile(profile: Dict, top: int) -> None:
+    print(f"🔎 {profile['circuit']}: 제약식 {profile['constraints']:,}개, 항 {profile['terms']:,}개, "
+          f"와이어 {profile['wires']}", file=sys.stderr)
+    for item in profile['expressions'][:top]:
+        location = f"{item['span'][0]}:{item['span'][1]}" if item['span'] else '-'
+        print(f"  {item['constraints']:>6} ({item['share']:>6.1%})  {location:>7}  {item['text']}", file=sys.stderr)
+
+
+def _write_json(obj: Dict, path: Optional[str]) -> None:
+    text = json.dumps(obj, ensure_ascii=False, indent=2)
+    if not path:
+        print(text)
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='ZoKrates 회로 제약식 프로파일러')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    profile_parser = subparsers.add_parser('profile', help='소스 식별 제약식 수 보고')
+    profile_parser.add_argument('directory', nargs='?', default='zokrates', help='산출물 디렉토리 (기본값: zokrates)')
+    profile_parser.add_argument('--program', default='out', help='컴파일 결과 파일명 (기본값: out)')
+    profile_parser.add_argument('--source', help='소스 파일 (기본값: 모듈 표 또는 디렉토리의 .zok 파일)')
+    profile_parser.add_argument('--top', type=int, default=10, help='출력할 식 수 (기본값: 10)')
+    profile_parser.add_argument('--output', help='프로파일 JSON 파일 (기본값: 표준 출력)')
+
+    compare_parser = subparsers.add_parser('compare', help='두 회로 버전 비교')
+    compare_parser.add_argument('base', help='기준 산출물 디렉토리 또는 프로파일 JSON')
+    compare_parser.add_argument('new', help='비교할 산출물 디렉토리 또는 프로파일 JSON')
+    compare_parser.add_argument('--output', help='비교 결과 JSON 파일 (기본값: 표준 출력)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        result = compare_profiles(load_profile(args.base), load_profile(args.new))
+        _write_json(result, args.output)
+        change = result['constraints']
+        print(f"📊 제약식 {change['base']:,} → {change['new']:,} ({change['change_pct']:+.1f}%)", file=sys.stderr)
+        return 0
+
+    profile = profile_circuit(args.directory, args.program, args.source)
+    _write_json(profile, args.output)
+    _print_profile(profile, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+벤치마크용 규모별 신용정보 픽스처
+처음 요청할 때 합성 데이터를 생성해 BENCH_FIXTURE_DIR(기본값: data/fixtures)에 보관하고 이후에는 재사용합니다.
+
+사용 예:
+    path = ensure_fixture('medium', 'sqlite')
+    # 서버: CREDIT_DATA_BACKEND=sqlite CREDIT_STORE_PATH=<path> python run.py
+    # 부하: python -m benchmarks.loadtest run --fixture medium
+"""
+
+import os
+import random
+import hashlib
+from typing import Dict, List
+
+from benchmarks.synthetic_credit import customer_id_for, generate
+from utils.credit_store import CreditStore
+
+FIXTURE_SIZES = {
+    'tiny': 1000,
+    'small': 100000,
+    'medium': 1000000,
+    'large': 5000000
+}
+FIXTURE_EXTENSIONS = {'jsonl': '.jsonl', 'sqlite': '.db', 'columnar': ''}
+DEFAULT_SEED = 42
+
+
+def fixture_dir() -> str:
+    return os.getenv('BENCH_FIXTURE_DIR') or 'data/fixtures'
+
+
+def fixture_path(size: str, fmt: str = 'sqlite', seed: int = DEFAULT_SEED) -> str:
+    """
+    픽스처 파일 경로
+
+    Raises:
+        ValueError: 알 수 없는 크기 또는 형식
+    """
+    if size not in FIXTURE_SIZES:
+        raise ValueError(f'Unknown fixture size: {size} (available: {", ".join(FIXTURE_SIZES)})')
+    if fmt not in FIXTURE_EXTENSIONS:
+        raise ValueError(f'Unknown fixture format: {fmt}')
+    return os.path.join(fixture_dir(), f'credit_{size}_{seed}{FIXTURE_EXTENSIONS[fmt]}')
+
+
+def ensure_fixture(size: str = 'small', fmt: str = 'sqlite', seed: int = DEFAULT_SEED) -> str:
+    """
+    픽스처를 준비합니다. 없으면 생성하며, 생성 중 중단된 파일을 재사용하지 않도록 임시 경로에 만든 뒤 옮깁니다.
+
+    Args:
+        size: tiny, small, medium, large
+        fmt: jsonl, sqlite, columnar
+        seed: 난수 시드
+
+    Returns:
+        픽스처 경로
+    """
+    path = fixture_path(size, fmt, seed)
+    if os.path.exists(path):
+        return path
+    temp_path = f'{path}.partial'
+    generate(FIXTURE_SIZES[size], fmt, temp_path, seed)
+    os.replace(temp_path, path)
+    return path
+
+
+def customer_address_for(customer_id: str) -> str:
+    """고객 ID로 정해지는 테스트용 지갑 주소"""
+    return '0x' + hashlib.sha256(customer_id.encode()).hexdigest()[:40]
+
+
+def sample_customers(size: str, count: int = 1000, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """
+    픽스처에서 부하 테스트에 사용할 고객을 고릅니다. 고객 ID가 번호 순이므로 파일을 읽지 않고 고릅니다.
+
+    Args:
+        size: 픽스처 크기
+        count: 고를 고객 수
+        seed: 난수 시드
+
+    Returns:
+        customer_id, customer_name, customer_address를 가진 고객 목록
+    """
+    total = FIXTURE_SIZES[size]
+    rng = random.Random(seed)
+    ids = [customer_id_for(index) for index in rng.sample(range(1, total + 1), min(count, total))]
+    store_path = fixture_path(size, 'sqlite', seed)
+    names = CreditStore(store_path).get_many(ids) if os.path.exists(store_path) else {}
+    return [
+        {
+            'customer_id': customer_id,
+            'customer_name': names.get(customer_id, {}).get('name', customer_id),
+            'customer_address': customer_address_for(customer_id)
+        }
+        for customer_id in ids
+    ]
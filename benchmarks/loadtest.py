@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+ZK-NFT 부하 테스트
+tests/test_comprehensive.py와 demo_presentation.py의 시나리오(신규 고객, NFT 재사용, 대출 거절,
+낮은 신용등급, Proof 조회 등)를 가중치에 따라 섞어 실행하고 처리량, 지연시간 백분위수, 오류율을 JSON으로 기록합니다.
+
+사용 예:
+    # 초당 20개 시나리오를 60초 동안 도착시키는 개방형(open-loop) 부하
+    python -m benchmarks.loadtest run --rate 20 --duration 60 --concurrency 64 --output runs/v1.json
+
+    # 폐쇄형 부하 (동시 사용자 16명이 쉬지 않고 요청)
+    python -m benchmarks.loadtest run --rate 0 --concurrency 16 --duration 60
+
+    # 합성 신용정보 100만 명 픽스처의 고객으로 부하 (서버는 CREDIT_DATA_BACKEND=sqlite로 실행)
+    python -m benchmarks.loadtest run --fixture medium --rate 50 --duration 60
+
+    # 두 실행 결과 비교 (회귀가 기준을 넘으면 종료 코드 1)
+    python -m benchmarks.loadtest compare runs/v1.json runs/v2.json --threshold 10
+
+개방형 부하에서 지연시간은 예정 도착 시각부터 측정하므로, 서버가 밀려 요청이 대기한 시간도 포함됩니다
+(coordinated omission 방지). 순수 서버 처리 시간은 service_ms로 따로 기록합니다.
+적은 수의 고객으로 높은 부하를 줄 때는 고객별 속도 제한(RATE_LIMIT_CUSTOMER)에 걸리므로
+서버를 RATE_LIMIT_ENABLED=False로 실행하거나 --customers로 고객 수를 늘립니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "http://localhost:5000"
+
+# tests/test_comprehensive.py의 고객
+DEFAULT_CUSTOMERS = [
+    {"customer_id": "CUST_001", "customer_name": "김철수",
+     "customer_address": "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6"},
+    {"customer_id": "CUST_002", "customer_name": "이영희",
+     "customer_address": "0x1234567890abcdef1234567890abcdef12345678"},
+    {"customer_id": "CUST_003", "customer_name": "박민수",
+     "customer_address": "0xabcdef1234567890abcdef1234567890abcdef12"}
+]
+
+# 시나리오 기본 가중치
+DEFAULT_MIX = {
+    "new_customer": 2,
+    "nft_reuse": 5,
+    "nft_lookup": 5,
+    "loan_rejection": 1,
+    "low_credit": 1,
+    "proof_retrieval": 1
+}
+
+# 비교 모드에서 값이 커지면 나빠지는 지표 / 작아지면 나빠지는 지표
+LOWER_IS_BETTER = ("latency_ms.p50", "latency_ms.p95", "latency_ms.p99", "error_rate")
+HIGHER_IS_BETTER = ("throughput_rps",)
+
+
+def _is_ok(status: int, body) -> bool:
+    # 대출 거절도 정상 응답입니다. 429/503은 과부하 신호로, 은행이 200으로 감싼 외부기관 오류
+    # ({"status": "error"})는 처리 실패로 오류에 포함합니다
+    if not 200 <= status < 400:
+        return False
+    return not (isinstance(body, dict) and body.get('status') == 'error')
+
+
+class ScenarioClient:
+    """시나리오가 사용하는 HTTP 클라이언트. 요청별 지연시간과 상태 코드를 기록합니다."""
+
+    def __init__(self, base_url: str, session: requests.Session, timeout: float):
+        self.base_url = base_url.rstrip('/')
+        self.session = session
+        self.timeout = timeout
+        self.calls: List[Dict] = []
+
+    def request(self, method: str, path: str, json_body: Optional[Dict] = None,
+                route: Optional[str] = None, priority: Optional[str] = None) -> Optional[Dict]:
+        """
+        요청을 보내고 JSON 응답을 반환합니다.
+
+        Args:
+            method: HTTP 메서드
+            path: 경로
+            json_body: 요청 본문
+            route: 결과에 기록할 경로 이름 (경로에 ID가 들어가는 경우)
+            priority: X-Request-Priority 헤더 값
+
+        Returns:
+            응답 본문 (JSON이 아니면 None)
+        """
+        headers = {'X-Request-Priority': priority} if priority else None
+        started = time.perf_counter()
+        status = 0
+        body = None
+        try:
+            response = self.session.request(
+                method, self.base_url + path, json=json_body, headers=headers, timeout=self.timeout
+            )
+            status = response.status_code
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            return body
+        except requests.exceptions.RequestException:
+            return None
+        finally:
+            self.calls.append({
+                'route': f"{method} {route or path}",
+                'status': status,
+                'ok': _is_ok(status, body),
+                'latency_ms': (time.perf_counter() - started) * 1000
+            })
+
+
+def _loan_request(client: ScenarioClient, customer: Dict, amount: int, purpose: str) -> Optional[Dict]:
+    return client.request('POST', '/api/bank/loan-request', {
+        **customer, "requested_amount": amount, "purpose": purpose
+    }, priority='interactive')
+
+
+def scenario_new_customer(client: ScenarioClient, rng: random.Random, customers: List[Dict]):
+    """신규 고객 대출 요청 (새 지갑 주소라 기존 NFT가 없으므로 증명 생성과 발행까지 수행)"""
+    customer = dict(rng.choice(customers))
+    customer["customer_address"] = "0x" + "%040x" % rng.getrandbits(160)
+    _loan_request(client, customer, 15000000, "사업자금")
+
+
+def scenario_nft_reuse(client: ScenarioClient, rng: random.Random, customers: List[Dict]):
+    """동일 고객 NFT 재사용 대출 요청"""
+    _loan_request(client, rng.choice(customers), 20000000, "운전자금")
+
+
+def scenario_nft_lookup(client: ScenarioClient, rng: random.Random, customers: List[Dict]):
+    """NFT 조회"""
+    customer = rng.choice(customers)
+    client.request('POST', '/api/external/my-nft', {
+        "customer_id": customer["customer_id"],
+        "customer_address": customer["customer_address"]
+    })
+
+
+def scenario_loan_rejection(client: ScenarioClient, rng: random.Random, customers: List[Dict]):
+    """한도 초과 대출 거절 (모든 등급의 최대 한도를 넘는 금액)"""
+    _loan_request(client, rng.choice(customers), 600000000, "대규모 투자")
+
+
+def scenario_low_credit(client: ScenarioClient, rng: random.Random, customers: List[Dict]):
+    """낮은 신용등급 고객 대출 요청"""
+    customer = next((c for c in customers if c["customer_id"] == "CUST_003"), rng.choice(customers))
+    _loan_request(client, customer, 10000000, "개인사업")
+
+
+def scenario_proof_retrieval(client: ScenarioClient, rng: random.Random, customers: List[Dict]):
+    """ZK-Proof 생성 후 조회"""
+    customer = rng.choice(customers)
+    result = client.request('POST', '/api/external/generate-proof', {
+        "customer_id": customer["customer_id"],
+        "credit_score": 750,
+        "credit_grade": "B",
+        "max_loan_amount": 50000000
+    })
+    proof_id = (result or {}).get('proof_id') or "PROOF_TEST_001"
+    client.request('GET', f'/api/external/proof/{proof_id}', route='/api/external/proof/<proof_id>')
+
+
+SCENARIOS: Dict[str, Callable[[ScenarioClient, random.Random, List[Dict]], None]] = {
+    "new_customer": scenario_new_customer,
+    "nft_reuse": scenario_nft_reuse,
+    "nft_lookup": scenario_nft_lookup,
+    "loan_rejection": scenario_loan_rejection,
+    "low_credit": scenario_low_credit,
+    "proof_retrieval": scenario_proof_retrieval
+}
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """
+    "nft_reuse=5,new_customer=1" 형식의 시나리오 가중치를 읽습니다.
+
+    Raises:
+        ValueError: 알 수 없는 시나리오이거나 가중치가 잘못된 경우
+    """
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Unknown scenario: {name} (available: {", ".join(SCENARIOS)})')
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f'Invalid weight for {name}: {weight}')
+    if not any(mix.values()):
+        raise ValueError('At least one scenario needs a positive weight')
+    return mix
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """정렬된 값에서 nearest-rank 방식으로 백분위수를 구합니다."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[Dict], elapsed: float) -> Dict:
+    """
+    결과 목록을 요약합니다.
+
+    Args:
+        samples: {'latency_ms', 'service_ms', 'ok', 'status'} 목록
+        elapsed: 측정 구간 길이 (초)
+
+    Returns:
+        요청 수, 오류율, 처리량, 지연시간 백분위수
+    """
+    latencies = sorted(s['latency_ms'] for s in samples)
+    services = sorted(s.get('service_ms', s['latency_ms']) for s in samples)
+    errors = sum(1 for s in samples if not s['ok'])
+    status_codes: Dict[str, int] = {}
+    for s in samples:
+        key = str(s['status'])
+        status_codes[key] = status_codes.get(key, 0) + 1
+
+    def distribution(values):
+        return {
+            'p50': _round(percentile(values, 50)),
+            'p95': _round(percentile(values, 95)),
+            'p99': _round(percentile(values, 99)),
+            'max': _round(values[-1] if values else None),
+            'mean': _round(sum(values) / len(values) if values else None)
+        }
+
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_ms': distribution(latencies),
+        'service_ms': distribution(services),
+        'status_codes': status_codes
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class LoadTest:
+    """
+    가중치 시나리오 부하 생성기
+
+    rate > 0이면 개방형 부하: 시나리오가 정해진 도착률(기본 푸아송 도착)로 시작되며
+    concurrency는 동시에 실행할 수 있는 최대 시나리오 수입니다. 모든 자리가 차면 도착한 시나리오는 대기합니다.
+    rate == 0이면 폐쇄형 부하: concurrency개의 가상 사용자가 쉬지 않고 시나리오를 반복합니다.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, mix: Optional[Dict[str, float]] = None,
+                 rate: float = 10.0, concurrency: int = 32, duration: float = 30.0, warmup: float = 0.0,
+                 arrival: str = 'poisson', timeout: float = 30.0, seed: Optional[int] = None,
+                 customers: Optional[List[Dict]] = None):
+        self.base_url = base_url
+        self.mix = mix or dict(DEFAULT_MIX)
+        self.rate = rate
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.arrival = arrival
+        self.timeout = timeout
+        self.seed = seed
+        self.customers = customers or DEFAULT_CUSTOMERS
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_numbers = itertools.count()
+        # (시나리오, 예정 도착 시각, 시작 시각, 종료 시각, 요청 기록)
+        self._results: List[Tuple[str, float, float, float, List[Dict]]] = []
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            self._local.session = session
+            number = next(self._thread_numbers)
+            self._local.rng = random.Random(None if self.seed is None else self.seed * 1000003 + number)
+        return session
+
+    def _run_scenario(self, name: str, scheduled_at: float) -> None:
+        client = ScenarioClient(self.base_url, self._session(), self.timeout)
+        started = time.perf_counter()
+        try:
+            SCENARIOS[name](client, self._local.rng, self.customers)
+        except Exception:
+            client.calls.append({'route': name, 'status': 0, 'ok': False, 'latency_ms': 0.0})
+        finished = time.perf_counter()
+        with self._lock:
+            self._results.append((name, scheduled_at, started, finished, client.calls))
+
+    def _intervals(self, rng: random.Random):
+        while True:
+            yield rng.expovariate(self.rate) if self.arrival == 'poisson' else 1.0 / self.rate
+
+    def _open_loop(self, rng: random.Random, names: List[str], weights: List[float], end: float) -> None:
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='loadtest') as pool:
+            next_arrival = time.perf_counter()
+            for interval in self._intervals(rng):
+                if next_arrival >= end:
+                    break
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._run_scenario, rng.choices(names, weights)[0], next_arrival)
+                next_arrival += interval
+
+    def _closed_loop(self, rng: random.Random, names: List[str], weights: List[float], end: float) -> None:
+        seeds = [rng.random() for _ in range(self.concurrency)]
+
+        def user(user_seed):
+            user_rng = random.Random(user_seed)
+            while time.perf_counter() < end:
+                self._run_scenario(user_rng.choices(names, weights)[0], time.perf_counter())
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='loadtest') as pool:
+            list(pool.map(user, seeds))
+
+    def run(self) -> Dict:
+        """
+        부하를 생성하고 결과 보고서를 반환합니다.
+
+        Returns:
+            meta, summary, scenarios(시나리오별), routes(엔드포인트별) 요약
+        """
+        names = [name for name, weight in self.mix.items() if weight > 0]
+        weights = [self.mix[name] for name in names]
+        rng = random.Random(self.seed)
+        self._results = []
+
+        started_at = datetime.now().isoformat()
+        start = time.perf_counter()
+        measure_from = start + self.warmup
+        end = measure_from + self.duration
+        if self.rate > 0:
+            self._open_loop(rng, names, weights, end)
+        else:
+            self._closed_loop(rng, names, weights, end)
+        finished = time.perf_counter()
+
+        measured = [r for r in self._results if r[1] >= measure_from]
+        # 측정 구간 이후 남은 시나리오가 끝날 때까지 포함해 처리량을 계산합니다
+        elapsed = max(finished - measure_from, 1e-9)
+
+        scenario_samples: Dict[str, List[Dict]] = {}
+        route_samples: Dict[str, List[Dict]] = {}
+        all_samples = []
+        for name, scheduled_at, began, done, calls in measured:
+            sample = {
+                'latency_ms': (done - scheduled_at) * 1000,
+                'service_ms': (done - began) * 1000,
+                'ok': all(call['ok'] for call in calls),
+                'status': max((call['status'] for call in calls), default=0)
+            }
+            all_samples.append(sample)
+            scenario_samples.setdefault(name, []).append(sample)
+            for call in calls:
+                route_samples.setdefault(call['route'], []).append({
+                    'latency_ms': call['latency_ms'], 'ok': call['ok'], 'status': call['status']
+                })
+
+        return {
+            'meta': {
+                'base_url': self.base_url,
+                'started_at': started_at,
+                'mode': 'open' if self.rate > 0 else 'closed',
+                'rate': self.rate,
+                'arrival': self.arrival,
+                'concurrency': self.concurrency,
+                'duration': self.duration,
+                'warmup': self.warmup,
+                'mix': self.mix,
+                'seed': self.seed,
+                'customers': len(self.customers)
+            },
+            'summary': summarize(all_samples, elapsed),
+            'scenarios': {name: summarize(samples, elapsed) for name, samples in sorted(scenario_samples.items())},
+            'routes': {route: summarize(samples, elapsed) for route, samples in sorted(route_samples.items())}
+        }
+
+
+def _metric(section: Dict, path: str) -> Optional[float]:
+    value = section
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def _diff_section(base: Dict, new: Dict, threshold: float) -> Dict:
+    diff = {}
+    for path in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+        before, after = _metric(base, path), _metric(new, path)
+        if before is None or after is None:
+            continue
+        change = ((after - before) / before * 100) if before else (0.0 if after == before else None)
+        worse = after > before if path in LOWER_IS_BETTER else after < before
+        if path == 'error_rate':
+            # 오류율은 비율이므로 퍼센트포인트 차이로 판단합니다
+            regression = worse and (after - before) * 100 > threshold / 10
+        else:
+            regression = worse and (change is None or abs(change) > threshold)
+        diff[path] = {
+            'base': before,
+            'new': after,
+            'change_pct': round(change, 2) if change is not None else None,
+            'regression': regression
+        }
+    return diff
+
+
+def compare_reports(base: Dict, new: Dict, threshold: float = 10.0) -> Dict:
+    """
+    두 실행 결과를 비교합니다.
+
+    Args:
+        base: 기준 보고서
+        new: 비교할 보고서
+        threshold: 회귀로 판단할 변화율 (%). 오류율은 threshold/10 퍼센트포인트
+
+    Returns:
+        summary / scenarios / routes별 지표 변화와 regressions 목록
+    """
+    result = {
+        'threshold_pct': threshold,
+        'summary': _diff_section(base.get('summary', {}), new.get('summary', {}), threshold),
+        'scenarios': {},
+        'routes': {}
+    }
+    for section in ('scenarios', 'routes'):
+        for name in sorted(set(base.get(section, {})) & set(new.get(section, {}))):
+            result[section][name] = _diff_section(base[section][name], new[section][name], threshold)
+
+    regressions = [f'summary.{path}' for path, item in result['summary'].items() if item['regression']]
+    for section in ('scenarios', 'routes'):
+        for name, metrics in result[section].items():
+            regressions += [f'{section}.{name}.{path}' for path, item in metrics.items() if item['regression']]
+    result['regressions'] = regressions
+    return result
+
+
+def load_customers(path: Optional[str]) -> Optional[List[Dict]]:
+    """
+    고객 목록 파일(JSON 배열 또는 credit_data.json 형식)을 읽습니다. 지갑 주소가 없으면 고객 ID로 만듭니다.
+    """
+    if not path:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [{"customer_id": cid, "customer_name": info.get("name", cid)}
+                for cid, info in data.get("customers", {}).items()]
+    for customer in data:
+        customer.setdefault("customer_address", "0x" + customer["customer_id"].encode().hex()[-40:].rjust(40, '0'))
+    return data
+
+
+def _print_summary(report: Dict) -> None:
+    summary = report['summary']
+    latency = summary['latency_ms']
+    print(f"📊 요청 {summary['requests']}건, 처리량 {summary['throughput_rps']} rps, 오류율 {summary['error_rate']:.2%}",
+          file=sys.stderr)
+    print(f"⏱️  p50 {latency['p50']}ms, p95 {latency['p95']}ms, p99 {latency['p99']}ms", file=sys.stderr)
+
+
+def _write_json(obj: Dict, path: Optional[str]) -> None:
+    text = json.dumps(obj, ensure_ascii=False, indent=2)
+    if not path:
+        print(text)
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='ZK-NFT 부하 테스트')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='부하 생성')
+    run_parser.add_argument('--base-url', default=os.getenv('LOADTEST_BASE_URL') or DEFAULT_BASE_URL,
+                            help=f'서버 주소 (기본값: {DEFAULT_BASE_URL})')
+    run_parser.add_argument('--mix', help='시나리오 가중치 (예: nft_reuse=5,new_customer=1, 기본값: 전체 기본 가중치)')
+    run_parser.add_argument('--rate', type=float, default=10.0,
+                            help='초당 시나리오 도착 수 (0이면 폐쇄형 부하, 기본값: 10)')
+    run_parser.add_argument('--arrival', choices=['poisson', 'constant'], default='poisson',
+                            help='개방형 부하의 도착 간격 분포 (기본값: poisson)')
+    run_parser.add_argument('--concurrency', type=int, default=32, help='최대 동시 시나리오 수 (기본값: 32)')
+    run_parser.add_argument('--duration', type=float, default=30.0, help='측정 시간(초) (기본값: 30)')
+    run_parser.add_argument('--warmup', type=float, default=0.0, help='측정에서 제외할 시작 구간(초)')
+    run_parser.add_argument('--timeout', type=float, default=30.0, help='요청 제한 시간(초)')
+    run_parser.add_argument('--seed', type=int, help='난수 시드')
+    run_parser.add_argument('--customers', help='고객 목록 파일 (JSON 배열 또는 credit_data.json 형식)')
+    run_parser.add_argument('--fixture', help='합성 신용정보 픽스처에서 고객 선택 (tiny, small, medium, large)')
+    run_parser.add_argument('--fixture-customers', type=int, default=1000, help='픽스처에서 고를 고객 수 (기본값: 1000)')
+    run_parser.add_argument('--output', help='결과 JSON 파일 (기본값: 표준 출력)')
+
+    compare_parser = subparsers.add_parser('compare', help='두 실행 결과 비교')
+    compare_parser.add_argument('base', help='기준 결과 JSON')
+    compare_parser.add_argument('new', help='비교할 결과 JSON')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help='회귀로 판단할 변화율(%%) (기본값: 10)')
+    compare_parser.add_argument('--output', help='비교 결과 JSON 파일 (기본값: 표준 출력)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.new, 'r', encoding='utf-8') as f:
+            new = json.load(f)
+        result = compare_reports(base, new, args.threshold)
+        _write_json(result, args.output)
+        for regression in result['regressions']:
+            print(f"❌ 회귀: {regression}", file=sys.stderr)
+        return 1 if result['regressions'] else 0
+
+    customers = load_customers(args.customers)
+    if args.fixture:
+        from benchmarks.fixtures import ensure_fixture, sample_customers
+        store_path = ensure_fixture(args.fixture, 'sqlite')
+        customers = sample_customers(args.fixture, args.fixture_customers)
+        print(f"📦 픽스처 {store_path}: 서버를 CREDIT_DATA_BACKEND=sqlite CREDIT_STORE_PATH={store_path}로 실행하세요",
+              file=sys.stderr)
+
+    load_test = LoadTest(
+        base_url=args.base_url, mix=parse_mix(args.mix), rate=args.rate, concurrency=args.concurrency,
+        duration=args.duration, warmup=args.warmup, arrival=args.arrival, timeout=args.timeout,
+        seed=args.seed, customers=customers
+    )
+    report = load_test.run()
+    _write_json(report, args.output)
+    _print_summary(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,7 @@ zk-nft 프로젝트 실행 스크립트
 
 import os
 import sys
+import importlib.util
 import subprocess
 import argparse
 from pathlib import Path
@@ -25,12 +26,8 @@ def check_dependencies():
         'requests', 'dotenv', 'cryptography'
     ]
     
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # 설치 여부만 확인하고 실제로 불러오지는 않습니다 (web3 등은 불러오는 데만 수백 ms가 걸립니다)
+    missing_packages = [package for package in required_packages if importlib.util.find_spec(package) is None]
     
     if missing_packages:
         print(f"❌ 다음 패키지들이 설치되지 않았습니다: {', '.join(missing_packages)}")
@@ -87,6 +84,23 @@ def run_tests():
         print(f"❌ 테스트 실행 중 오류가 발생했습니다: {e}")
         return False
 
+def run_ingest(path, report_path=None):
+    """신용평가사 파일을 신용정보 저장소에 적재합니다."""
+    from utils.credit_ingest import ingest_file
+    
+    print(f"📥 신용정보 적재 중: {path}")
+    result = ingest_file(path, report_path=report_path)
+    if result['status'] != 'success':
+        print(f"❌ {result['message']} ({result['error']})")
+        return False
+    
+    print(f"✅ {result['message']} (적재 ID: {result['ingest_id']})")
+    print(f"   레코드 {result['records']:,}건: 신규 {result['inserted']:,}, 변경 {result['updated']:,}, "
+          f"동일 {result['unchanged']:,}, 거부 {result['rejected']:,} ({result['elapsed_seconds']}초)")
+    for rejection in result['rejections']:
+        print(f"   ⚠️ {rejection['line']}번째 줄: {rejection['error']}")
+    return True
+
 def run_server(host='0.0.0.0', port=5000, debug=True):
     """Flask 서버를 실행합니다."""
     print(f"🚀 zk-nft 서버를 시작합니다...")
@@ -95,14 +109,180 @@ def run_server(host='0.0.0.0', port=5000, debug=True):
     print("🛑 서버를 중지하려면 Ctrl+C를 누르세요.")
     
     try:
-        from app import create_app
+        from app import create_app, warm_up
         app = create_app()
+        report_startup(warm_up(app))
         app.run(host=host, port=port, debug=debug)
     except KeyboardInterrupt:
         print("\n👋 서버가 중지되었습니다.")
     except Exception as e:
         print(f"❌ 서버 실행 중 오류가 발생했습니다: {e}")
 
+def report_startup(result):
+    """워밍업 단계별 결과와 소요 시간을 출력합니다."""
+    timings = result['timings']
+    print(f"⏱️ 앱 생성 {timings.get('create_app', 0):.1f}ms, 워밍업 {timings.get('warm_up', 0):.1f}ms")
+    for name, step in result['steps'].items():
+        mark = '✅' if step['status'] == 'success' else '⚠️'
+        print(f"   {mark} {name}: {step['detail']} ({step['duration_ms']:.1f}ms)")
+
+def compute_server_sizing(cpu_count=None, prover_workers=None):
+    """
+    CPU 수와 증명 생성 풀 크기로 운영 서버의 워커/스레드 수를 계산합니다.
+    
+    증명 생성은 CPU를 오래 점유하므로 서버 전체의 증명 동시성은 prover_workers로 제한하고,
+    나머지 요청은 대부분 I/O 대기(노드, 외부기관 호출)이므로 스레드로 처리합니다.
+    
+    Args:
+        cpu_count: CPU 수 (기본값: os.cpu_count())
+        prover_workers: 서버 전체 증명 생성 동시성 (기본값: ZKP_PROVER_WORKERS 또는 CPU 수)
+    
+    Returns:
+        workers, threads, prover_workers_per_worker
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    if prover_workers is None:
+        prover_workers = int(os.getenv('ZKP_PROVER_WORKERS') or cpu_count)
+    
+    workers = int(os.getenv('GUNICORN_WORKERS') or 0) or max(2, min(cpu_count, prover_workers))
+    prover_per_worker = max(1, prover_workers // workers)
+    # 증명을 기다리며 막힌 스레드 외에도 I/O 요청을 받을 여유 스레드를 둡니다
+    threads = int(os.getenv('GUNICORN_THREADS') or 0) or prover_per_worker * 2 + 4
+    
+    return {
+        'workers': workers,
+        'threads': threads,
+        'prover_workers_per_worker': prover_per_worker
+    }
+
+def run_production_server(host='0.0.0.0', port=5000, workers=None, threads=None):
+    """
+    gunicorn pre-fork 서버로 운영 모드를 실행합니다.
+    
+    create_app()과 ZoKrates 산출물 메모리 매핑을 fork 전에 준비해 워커들이 같은 페이지를 공유합니다.
+    마스터 프로세스에 SIGHUP을 보내면 진행 중인 요청을 마친 뒤 워커를 교체합니다.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ 운영 모드에는 gunicorn이 필요합니다: pip install -r requirements.txt")
+        return
+    
+    # 워커들의 지표를 합산하려면 prometheus_client를 불러오기 전에 공유 디렉토리를 지정해야 합니다
+    from dotenv import load_dotenv
+    load_dotenv()
+    metrics_dir = Path(os.getenv('PROMETHEUS_MULTIPROC_DIR') or 'data/prometheus')
+    # 지난 실행의 지표 파일(*.db)만 지웁니다 (다른 파일이 있는 디렉토리를 지정해도 안전하도록)
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    for stale in metrics_dir.glob('*.db'):
+        stale.unlink()
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = str(metrics_dir)
+    
+    # app 모듈을 먼저 불러와야 .env 설정이 반영됩니다
+    from app import create_app, warm_up
+    from utils.metrics import mark_process_dead
+    from utils.zkp_utils import zkp_utils
+    from utils.blockchain_utils import blockchain_utils
+    from api import external
+    
+    sizing = compute_server_sizing()
+    workers = workers or sizing['workers']
+    threads = threads or sizing['threads']
+    prover_per_worker = sizing['prover_workers_per_worker']
+    
+    app = create_app()
+    # 소켓을 워커들이 나눠 갖지 않도록 블록체인 연결은 fork 이후 워커마다 준비합니다
+    startup = warm_up(app, include_chain=False)
+    
+    def post_fork(server, worker):
+        # 스레드는 fork 후 자식에 복제되지 않으므로 워커마다 다시 시작합니다
+        zkp_utils.prover_workers = prover_per_worker
+        if blockchain_utils.provider_pool is not None and blockchain_utils.provider_pool.health_check_interval > 0:
+            blockchain_utils.provider_pool.start()
+        if os.getenv('WARMUP_CHAIN', 'False').lower() == 'true':
+            blockchain_utils.connect_to_blockchain()
+        if external.chain_minting_enabled():
+            external.start_mint_tracking()
+    
+    def worker_exit(server, worker):
+        zkp_utils.shutdown_prover_pool(wait=False)
+    
+    def child_exit(server, worker):
+        # 종료된 워커의 게이지 값이 합계에 남지 않도록 정리합니다
+        mark_process_dead(worker.pid)
+    
+    class ProductionApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'worker_class': 'gthread',
+                'threads': threads,
+                'preload_app': True,
+                'timeout': int(os.getenv('GUNICORN_TIMEOUT', 120)),
+                'graceful_timeout': int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30)),
+                'keepalive': 5,
+                # 메모리 누수 대비로 워커를 주기적으로 무중단 교체합니다
+                'max_requests': int(os.getenv('GUNICORN_MAX_REQUESTS', 5000)),
+                'max_requests_jitter': int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 500)),
+                'pidfile': os.getenv('GUNICORN_PIDFILE', 'data/gunicorn.pid'),
+                'post_fork': post_fork,
+                'worker_exit': worker_exit,
+                'child_exit': child_exit
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return app
+    
+    print(f"🚀 zk-nft 운영 서버를 시작합니다...")
+    print(f"📍 서버 주소: http://{host}:{port}")
+    print(f"⚙️ 워커 {workers}개 x 스레드 {threads}개, 워커당 증명 생성 {prover_per_worker}개")
+    report_startup(startup)
+    print("🔄 무중단 재시작: kill -HUP $(cat data/gunicorn.pid)")
+    
+    ProductionApplication().run()
+
+def run_async_server(host='0.0.0.0', port=5000):
+    """
+    Hypercorn ASGI 서버로 비동기 애플리케이션을 실행합니다.
+    
+    하나의 이벤트 루프가 외부기관 호출과 체인 조회를 동시에 기다리므로
+    느린 요청이 많아도 요청당 스레드가 필요하지 않습니다.
+    증명 생성은 ZKPUtils 증명 생성 풀에서 실행됩니다.
+    """
+    try:
+        import asyncio
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+    except ImportError:
+        print("❌ 비동기 모드에는 quart와 hypercorn이 필요합니다: pip install -r requirements.txt")
+        return
+    
+    from app import create_async_app, warm_up
+    from utils.zkp_utils import zkp_utils
+    
+    app = create_async_app()
+    report_startup(warm_up(app))
+    
+    config = Config()
+    config.bind = [f'{host}:{port}']
+    config.graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+    config.keep_alive_timeout = 5
+    
+    print(f"🚀 zk-nft 비동기(ASGI) 서버를 시작합니다...")
+    print(f"📍 서버 주소: http://{host}:{port}")
+    print(f"⚙️ 증명 생성 풀: {zkp_utils.prover_workers}개")
+    print("🛑 서버를 중지하려면 Ctrl+C를 누르세요.")
+    
+    try:
+        asyncio.run(serve(app, config))
+    except KeyboardInterrupt:
+        print("\n👋 서버가 중지되었습니다.")
+    finally:
+        zkp_utils.shutdown_prover_pool(wait=False)
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description='zk-nft 프로젝트 실행 스크립트')
@@ -111,6 +291,12 @@ def main():
     parser.add_argument('--host', default='0.0.0.0', help='서버 호스트 (기본값: 0.0.0.0)')
     parser.add_argument('--port', type=int, default=5000, help='서버 포트 (기본값: 5000)')
     parser.add_argument('--no-debug', action='store_true', help='디버그 모드 비활성화')
+    parser.add_argument('--serve', choices=['dev', 'prod', 'async'], default='dev',
+                        help='서버 모드 (dev: Flask 개발 서버, prod: gunicorn pre-fork 서버, async: Hypercorn ASGI 서버)')
+    parser.add_argument('--workers', type=int, help='운영 모드 워커 수 (기본값: CPU 수 기반 자동 계산)')
+    parser.add_argument('--threads', type=int, help='운영 모드 워커당 스레드 수 (기본값: 자동 계산)')
+    parser.add_argument('--ingest', metavar='FILE', help='신용평가사 파일(JSONL/CSV)을 신용정보 저장소에 적재')
+    parser.add_argument('--ingest-report', metavar='FILE', help='적재 시 변경된 고객을 기록할 JSONL 파일')
     
     args = parser.parse_args()
     
@@ -126,6 +312,12 @@ def main():
         setup_environment()
         return
     
+    # 신용정보 적재
+    if args.ingest:
+        if not run_ingest(args.ingest, args.ingest_report):
+            sys.exit(1)
+        return
+    
     # 테스트 실행
     if args.test:
         if not run_tests():
@@ -136,6 +328,13 @@ def main():
     setup_environment()
     
     # 서버 실행
+    if args.serve == 'prod':
+        run_production_server(args.host, args.port, args.workers, args.threads)
+        return
+    if args.serve == 'async':
+        run_async_server(args.host, args.port)
+        return
+    
     debug_mode = not args.no_debug
     run_server(args.host, args.port, debug_mode)
 
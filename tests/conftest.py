@@ -0,0 +1,18 @@
+"""
+테스트 공통 설정
+전역 증명 저장소가 저장소의 data/proof_store.db 대신 임시 경로를 쓰도록 모듈을 가져오기 전에 PROOF_STORE_PATH를 정합니다.
+"""
+
+import os
+import shutil
+import tempfile
+
+_proof_store_dir = tempfile.mkdtemp(prefix='proof_store_')
+os.environ['PROOF_STORE_PATH'] = os.path.join(_proof_store_dir, 'proof_store.db')
+
+
+def pytest_unconfigure(config):
+    """임시 증명 저장소를 지웁니다."""
+    from utils.proof_store import proof_store
+    proof_store.close()
+    shutil.rmtree(_proof_store_dir, ignore_errors=True)
@@ -0,0 +1,93 @@
+"""
+비동기(ASGI) 애플리케이션 테스트
+Quart 앱이 Flask 앱과 같은 처리 함수로 같은 응답을 반환하는지 테스트합니다.
+"""
+
+import asyncio
+import threading
+import pytest
+from api import external
+from app import create_async_app
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def request(method, path, **kwargs):
+    app = create_async_app()
+    async with app.test_app():
+        client = app.test_client()
+        response = await getattr(client, method)(path, **kwargs)
+        return response.status_code, await response.get_json()
+
+
+def test_health_check():
+    """헬스체크 테스트"""
+    status, result = run(request('get', '/health'))
+
+    assert status == 200
+    assert result['status'] == 'healthy'
+
+
+def test_bank_credit_criteria():
+    """은행 신용등급 기준 조회 테스트"""
+    status, result = run(request('get', '/api/bank/credit-criteria'))
+
+    assert status == 200
+    assert result['bank_id'] == 'BANK_001'
+    assert 'criteria' in result
+
+
+def test_generate_proof_runs_on_prover_pool():
+    """증명 생성은 증명 생성 풀에서 실행된 결과를 반환합니다"""
+    data = {
+        'customer_id': 'CUST_001',
+        'credit_score': 750,
+        'credit_grade': 'B',
+        'max_loan_amount': 50000000
+    }
+
+    status, result = run(request('post', '/api/external/generate-proof', json=data))
+
+    assert status == 200
+    assert result['status'] == 'generated'
+    assert result['proof_data']['customer_id'] == 'CUST_001'
+
+
+def test_mint_nft_runs_off_event_loop(monkeypatch):
+    """NFT 발행 처리 함수는 이벤트 루프가 아닌 스레드에서 실행됩니다"""
+    threads = []
+
+    def fake_mint(data):
+        threads.append(threading.current_thread())
+        return {'status': 'pending', 'token_id': data['token_id']}, 200
+
+    monkeypatch.setattr(external, 'handle_mint_nft', fake_mint)
+    status, result = run(request('post', '/api/external/mint-nft', json={'token_id': 'NFT_1'}))
+
+    assert status == 200 and result['token_id'] == 'NFT_1'
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_missing_field():
+    """필수 필드 누락 시 Flask 앱과 같은 오류를 반환합니다"""
+    status, result = run(request('post', '/api/bank/loan-request', json={'customer_id': 'CUST_001'}))
+
+    assert status == 400
+    assert result['error'] == 'Missing required field: customer_name'
+
+
+def test_loan_eligibility_query():
+    """쿼리 파라미터 기반 대출 자격 확인 테스트"""
+    status, result = run(request(
+        'get', '/api/customer/nft/1/loan-eligibility',
+        query_string={'address': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6', 'amount': '10000000'}
+    ))
+
+    assert status == 200
+    assert result['is_eligible'] is True
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,217 @@
+"""
+비동기 블록체인 유틸리티 테스트
+가짜 AsyncWeb3 프로바이더로 동시 조회, 영수증 대기, newHeads/폴링 따라잡기, 동기 파사드를 테스트합니다.
+"""
+
+import asyncio
+import json
+import pytest
+from web3 import AsyncWeb3
+from web3.providers.async_base import AsyncBaseProvider
+from utils.async_blockchain_utils import AsyncBlockchainUtils, SyncBlockchainFacade
+
+ADDRESS = AsyncWeb3.to_checksum_address('0x742d35cc6634c0532925a3b8d4c9db96c4b4d8b6')
+TX_A = '0x' + 'aa' * 32
+TX_B = '0x' + 'bb' * 32
+
+
+class FakeProvider(AsyncBaseProvider):
+    """블록·영수증을 메모리에 두고 호출과 동시 실행 수를 기록하는 가짜 JSON-RPC 프로바이더"""
+
+    def __init__(self, block_number=10, delay=0.0):
+        super().__init__()
+        self.block_number = block_number
+        self.delay = delay
+        self.blocks = {}
+        self.receipts = {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def is_connected(self, show_traceback=False):
+        return True
+
+    async def make_request(self, method, params):
+        self.calls.append(method)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if method == 'eth_blockNumber':
+            result = hex(self.block_number)
+        elif method == 'eth_chainId':
+            result = '0x539'
+        elif method == 'eth_getBalance':
+            result = hex(10 ** 18)
+        elif method == 'eth_getBlockByNumber':
+            number = int(params[0], 16)
+            result = {'number': hex(number), 'hash': '0x' + format(number, '064x'),
+                      'transactions': self.blocks.get(number, [])}
+        elif method == 'eth_getTransactionReceipt':
+            result = self.receipts.get(params[0])
+        else:
+            raise ValueError(f'unexpected method {method}')
+        return {'jsonrpc': '2.0', 'id': 1, 'result': result}
+
+    def mine(self, tx_hash):
+        """다음 블록에 트랜잭션을 넣고 영수증을 만듭니다."""
+        self.block_number += 1
+        self.blocks[self.block_number] = [tx_hash]
+        self.receipts[tx_hash] = {
+            'blockNumber': hex(self.block_number), 'blockHash': '0x' + format(self.block_number, '064x'),
+            'transactionHash': tx_hash, 'transactionIndex': '0x0', 'status': '0x1', 'gasUsed': '0x5208',
+            'logs': []
+        }
+
+
+def make_utils(provider, **kwargs):
+    """가짜 프로바이더에 연결한 AsyncBlockchainUtils"""
+    utils = AsyncBlockchainUtils('http://127.0.0.1:1', **kwargs)
+    utils.w3 = AsyncWeb3(provider)
+    return utils
+
+
+def run(coroutine_factory, utils):
+    """코루틴을 실행하고 유틸리티를 정리합니다."""
+    async def main():
+        try:
+            return await coroutine_factory()
+        finally:
+            await utils.close()
+    return asyncio.run(main())
+
+
+class TestAsyncBlockchainUtils:
+    """비동기 블록체인 유틸리티 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.provider = FakeProvider()
+
+    def test_gathered_reads(self):
+        """여러 조회를 동시에 실행하되 max_in_flight를 넘지 않고 입력 순서대로 돌려줍니다"""
+        self.provider.delay = 0.01
+        utils = make_utils(self.provider, max_in_flight=2)
+
+        async def scenario():
+            connected = await utils.connect_to_blockchain()
+            balances = await utils.get_balances([ADDRESS, 'not-an-address', ADDRESS, ADDRESS, ADDRESS])
+            return connected, balances
+
+        connected, balances = run(scenario, utils)
+        assert connected['status'] == 'success'
+        assert (connected['network_id'], connected['latest_block']) == (1337, 10)
+        assert [item['status'] for item in balances] == ['success', 'error', 'success', 'success', 'success']
+        assert balances[0]['balance_eth'] == 1.0
+        assert self.provider.max_in_flight == 2
+        assert self.provider.calls.count('eth_getBalance') == 4
+
+    def test_wait_for_receipt_polling(self):
+        """영수증 대기는 블록 폴링으로 포함 블록을 찾고, 대기 중인 해시의 영수증만 조회합니다"""
+        utils = make_utils(self.provider, poll_interval=0.01)
+
+        async def scenario():
+            waiter = asyncio.ensure_future(utils.wait_for_receipt(TX_A, timeout=5))
+            await asyncio.sleep(0.05)
+            self.provider.blocks[self.provider.block_number + 1] = [TX_B]
+            self.provider.block_number += 1
+            await asyncio.sleep(0.05)
+            self.provider.mine(TX_A)
+            return await waiter
+
+        receipt = run(scenario, utils)
+        assert receipt['blockNumber'] == 12
+        # 등록 직후 한 번, 포함 블록에서 한 번 (다른 트랜잭션만 있는 블록에서는 조회하지 않음)
+        assert self.provider.calls.count('eth_getTransactionReceipt') == 2
+        assert utils._receipt_waiters == {}
+
+    def test_wait_for_receipt_already_mined(self):
+        """등록 전에 이미 채굴된 트랜잭션은 바로 돌려주고, 시간이 지나면 TimeoutError가 납니다"""
+        self.provider.mine(TX_A)
+        utils = make_utils(self.provider, poll_interval=0.01)
+
+        async def scenario():
+            receipt = await utils.wait_for_receipt(bytes.fromhex('aa' * 32), timeout=1)
+            with pytest.raises(asyncio.TimeoutError):
+                await utils.wait_for_receipt(TX_B, timeout=0.05)
+            return receipt
+
+        receipt = run(scenario, utils)
+        assert receipt['status'] == 1
+        assert utils._receipt_waiters == {}
+
+    def test_catch_up_after_gap(self):
+        """건너뛴 블록은 MAX_CATCHUP_BLOCKS까지 채우고, 예전 블록 번호와 실패한 리스너는 무시합니다"""
+        utils = make_utils(self.provider)
+        seen = []
+
+        async def record(block):
+            seen.append(block['number'])
+
+        async def broken(block):
+            raise RuntimeError('listener failure')
+
+        async def scenario():
+            # 폴링 작업 없이 _on_new_head만 직접 호출합니다
+            utils._block_listeners.extend([broken, record])
+            utils._last_block = 10
+            await utils._on_new_head(14)
+            await utils._on_new_head(12)
+            await utils._on_new_head(14 + 1000)
+
+        run(scenario, utils)
+        assert seen[:4] == [11, 12, 13, 14]
+        assert seen[4] == 14 + 1000 - utils.MAX_CATCHUP_BLOCKS
+        assert seen[-1] == 14 + 1000
+        assert len(seen) == 4 + utils.MAX_CATCHUP_BLOCKS + 1
+
+    def test_new_heads_subscription(self):
+        """newHeads 구독으로 받은 블록 사이의 누락분을 채우고 마지막 블록 번호를 기록합니다"""
+        from websockets.asyncio.server import serve
+
+        self.provider.mine(TX_A)
+        subscriptions = []
+
+        async def handler(ws):
+            subscriptions.append(json.loads(await ws.recv()))
+            await ws.send(json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': '0x1'}))
+            for number in (9, 11):
+                await ws.send(json.dumps({'jsonrpc': '2.0', 'method': 'eth_subscription',
+                                          'params': {'subscription': '0x1', 'result': {'number': hex(number)}}}))
+
+        seen = []
+
+        async def record(block):
+            seen.append(block['number'])
+
+        async def scenario():
+            async with serve(handler, '127.0.0.1', 0) as server:
+                utils.ws_url = f'ws://127.0.0.1:{server.sockets[0].getsockname()[1]}'
+                utils._block_listeners.append(record)
+                utils._last_block = 8
+                await utils._subscribe_new_heads()
+
+        utils = make_utils(self.provider)
+        run(scenario, utils)
+        assert subscriptions[0]['params'] == ['newHeads']
+        assert seen == [9, 10, 11]
+        assert utils._last_block == 11
+
+    def test_sync_facade(self):
+        """동기 파사드는 코루틴을 전용 이벤트 루프에서 실행하고 일반 속성은 그대로 돌려줍니다"""
+        utils = make_utils(self.provider)
+        facade = SyncBlockchainFacade(utils)
+        try:
+            assert facade.get_block_number() == 10
+            assert facade.get_balance(ADDRESS)['balance_wei'] == 10 ** 18
+            assert facade.endpoint_urls == ['http://127.0.0.1:1']
+            assert facade.get_block_number.__name__ == 'get_block_number'
+        finally:
+            facade.close()
+        assert facade._loop is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
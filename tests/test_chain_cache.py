@@ -0,0 +1,172 @@
+"""
+체인 조회 캐시 테스트
+read-through 캐싱, 토큰/블록 워터마크 무효화, LRU 제한과 NFT 조회 API·이벤트 인덱서 연결을 테스트합니다.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from api import customer, external
+from utils.blockchain_utils import blockchain_utils
+from utils.chain_cache import ChainReadCache
+
+CONTRACT = '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
+
+
+class TestChainReadCache:
+    """체인 조회 캐시 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.cache = ChainReadCache(max_entries=3, ttl=0)
+        self.calls = []
+
+    def load(self, function_name, token_id, value=None):
+        def loader():
+            self.calls.append((function_name, token_id))
+            return value if value is not None else f'{function_name}:{token_id}'
+        return self.cache.get_or_load(CONTRACT, function_name, (token_id,), loader)
+
+    def test_repeated_reads_hit_cache(self):
+        """같은 토큰의 반복 조회는 노드를 다시 호출하지 않습니다"""
+        for _ in range(5):
+            assert self.load('tokenURI', 1) == 'tokenURI:1'
+
+        assert self.calls == [('tokenURI', 1)]
+        metrics = self.cache.get_metrics()
+        assert metrics['hits'] == 4
+        assert metrics['misses'] == 1
+
+    def test_non_cacheable_function_bypasses_cache(self):
+        """캐싱 대상이 아닌 함수는 항상 조회합니다"""
+        self.load('ownerOf', 1)
+        self.load('ownerOf', 1)
+
+        assert len(self.calls) == 2
+
+    def test_transfer_event_invalidates_token(self):
+        """전송 이벤트는 해당 토큰의 항목만 무효화합니다"""
+        self.load('getCreditGradeData', 1)
+        self.load('getCreditGradeData', 2)
+
+        self.cache.apply_event({
+            'event': 'Transfer',
+            'address': CONTRACT.lower(),
+            'blockNumber': 5,
+            'args': {'from': '0x0', 'to': '0x1', 'tokenId': 1}
+        })
+        self.load('getCreditGradeData', 1)
+        self.load('getCreditGradeData', 2)
+
+        assert self.calls.count(('getCreditGradeData', 1)) == 2
+        assert self.calls.count(('getCreditGradeData', 2)) == 1
+
+    def test_contract_watermark(self):
+        """워터마크 이전에 조회된 항목은 무효화됩니다"""
+        self.load('tokenURI', 1)
+        self.cache.observe_block(10)
+        self.load('tokenURI', 2)
+
+        assert self.cache.invalidate_contract(CONTRACT, 10) == 1
+        self.load('tokenURI', 1)
+        self.load('tokenURI', 2)
+
+        assert self.calls.count(('tokenURI', 1)) == 2
+        assert self.calls.count(('tokenURI', 2)) == 1
+
+    def test_lru_eviction(self):
+        """최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목을 제거합니다"""
+        for token_id in range(4):
+            self.load('tokenURI', token_id)
+        self.load('tokenURI', 0)
+
+        assert self.cache.get_metrics()['evictions'] >= 1
+        assert self.calls.count(('tokenURI', 0)) == 2
+        assert self.cache.get_metrics()['size'] == 3
+
+
+class FakeCall:
+    """call() 호출을 기록하는 가짜 컨트랙트 함수 호출"""
+
+    def __init__(self, calls, name, value):
+        self.calls = calls
+        self.name = name
+        self.value = value
+
+    def call(self):
+        self.calls.append(self.name)
+        return self.value()
+
+
+class FakeNFTContract:
+    """CreditGradeNFT 조회 함수와 Transfer 이벤트 로그를 흉내 내는 가짜 컨트랙트"""
+
+    def __init__(self, calls, state, logs):
+        self.address = CONTRACT
+        self.functions = SimpleNamespace(
+            ownerOf=lambda token_id: FakeCall(calls, 'ownerOf', lambda: state['owner']),
+            tokenURI=lambda token_id: FakeCall(calls, 'tokenURI', lambda: f'https://api.example.com/nft/{token_id}'),
+            getCreditGradeData=lambda token_id: FakeCall(
+                calls, 'getCreditGradeData',
+                lambda: ('B', 50000000, 'PROOF_1', 'CUST_001', 1705312200, state['is_valid'])
+            )
+        )
+        self.events = SimpleNamespace(Transfer=SimpleNamespace(
+            get_logs=lambda fromBlock, toBlock: [log for log in logs if fromBlock <= log['blockNumber'] <= toBlock]
+        ))
+
+
+class TestChainNFTReads:
+    """체인 NFT 조회 API와 이벤트 인덱서 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.calls = []
+        self.state = {'owner': CONTRACT, 'is_valid': True}
+        self.logs = []
+        contract = FakeNFTContract(self.calls, self.state, self.logs)
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(contract=lambda address, abi: contract))
+
+    @pytest.fixture(autouse=True)
+    def chain(self, monkeypatch):
+        monkeypatch.setenv('CONTRACT_ADDRESS', CONTRACT)
+        monkeypatch.setattr(external, 'chain_minting_enabled', lambda: True)
+        monkeypatch.setattr(blockchain_utils, 'w3', self.w3)
+        monkeypatch.setattr(blockchain_utils, 'chain_cache', ChainReadCache(ttl=0))
+        monkeypatch.setattr(blockchain_utils, '_indexed_blocks', {})
+        monkeypatch.setitem(external.chain_token_ids, 'NFT_PROOF_1', 7)
+
+    def test_nft_views_read_through_cache(self):
+        """NFT 조회 API는 체인 데이터를 쓰고, 신용등급 데이터는 캐시에서 재사용합니다"""
+        body, status = customer.handle_nft_info('NFT_PROOF_1')
+        assert status == 200
+        assert body['chain_token_id'] == 7 and body['owner'] == CONTRACT
+        assert body['attributes'][0] == {'trait_type': 'Credit Grade', 'value': 'B'}
+
+        body, _ = customer.handle_loan_eligibility('NFT_PROOF_1', 'GET',
+                                                   {'address': CONTRACT, 'amount': '1000'}, None)
+        assert body['is_eligible'] is True
+        assert self.calls.count('getCreditGradeData') == 1
+        assert self.calls.count('ownerOf') == 2
+
+        # 체인 발행을 쓰지 않는 토큰은 Mock 정보를 돌려줍니다
+        assert customer.handle_nft_info('NFT_MOCK')[0]['proof_id'] == 'PROOF_NFT_MOCK'
+
+    def test_indexer_invalidates_changed_tokens(self):
+        """블록 리스너가 이벤트를 반영하면 바뀐 토큰의 캐시 항목을 다시 조회합니다"""
+        asyncio.run(external.index_chain_events({'number': 10}))
+        assert customer.handle_nft_info('7')[0]['is_valid'] is True
+
+        self.state['is_valid'] = False
+        self.logs.append({'event': 'Transfer', 'address': CONTRACT, 'blockNumber': 11, 'args': {'tokenId': 7}})
+        assert customer.handle_nft_info('7')[0]['is_valid'] is True
+        asyncio.run(external.index_chain_events({'number': 11}))
+
+        assert customer.handle_nft_info('7')[0]['is_valid'] is False
+        assert self.calls.count('getCreditGradeData') == 2
+        eligibility, _ = customer.handle_loan_eligibility('7', 'GET', {'address': CONTRACT, 'amount': '1'}, None)
+        assert eligibility['is_eligible'] is False
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
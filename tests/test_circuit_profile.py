@@ -0,0 +1,54 @@
+"""
+회로 제약식 프로파일러 테스트
+저장소의 zokrates 산출물로 제약식을 소스 식에 귀속시키고 두 버전을 비교하는 기능을 테스트합니다.
+"""
+
+import os
+import pytest
+from benchmarks.circuit_profile import compare_profiles, profile_circuit, span_text
+
+ZOKRATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'zokrates')
+
+
+class TestCircuitProfile:
+    """회로 제약식 프로파일러 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.profile = profile_circuit(ZOKRATES_DIR)
+
+    def test_span_text(self):
+        """span은 1부터 세는 줄·열이며 끝 열은 포함하지 않습니다"""
+        lines = ['def main() {', '    assert(credit_score <= 1000);', '    assert((a &&', '        b));']
+        assert span_text(lines, (2, 5, 2, 33)) == 'assert(credit_score <= 1000)'
+        assert span_text(lines, (3, 13, 4, 10)) == 'a && b'
+
+    def test_attributes_every_constraint(self):
+        """모든 R1CS 제약식을 소스 식과 줄에 귀속시키고 비용 순으로 정렬합니다"""
+        profile = self.profile
+        assert profile['constraints'] == 4285
+        assert sum(item['constraints'] for item in profile['expressions']) == 4285
+        assert sum(item['constraints'] for item in profile['lines']) == 4285
+        assert profile['terms'] > profile['constraints']
+
+        top = profile['expressions'][0]
+        assert top['text'] == 'credit_score >= 800'
+        assert top['span'][0] == 24
+        counts = [item['constraints'] for item in profile['expressions']]
+        assert counts == sorted(counts, reverse=True)
+
+    def test_compare_versions(self):
+        """두 버전을 소스 텍스트 기준으로 비교합니다"""
+        same = compare_profiles(self.profile, self.profile)
+        assert same['constraints']['delta'] == 0
+        assert all(item['delta'] == 0 for item in same['expressions'])
+
+        smaller = dict(self.profile, circuit='v2', constraints=2000,
+                       expressions=[item for item in self.profile['expressions'] if item['text'] != 'credit_score >= 800'])
+        result = compare_profiles(self.profile, smaller)
+        assert result['constraints']['delta'] == -2285
+        assert result['expressions'][0] == {'text': 'credit_score >= 800', 'base': 765, 'new': 0, 'delta': -765}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
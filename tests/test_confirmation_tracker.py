@@ -0,0 +1,248 @@
+"""
+트랜잭션 확정 추적기 테스트
+블록 단위 일괄 영수증 매칭, 확정 수 계산, 재시작 후 재개를 테스트합니다.
+"""
+
+import os
+import sys
+import json
+import threading
+import subprocess
+import pytest
+from api import external
+from utils.async_blockchain_utils import SyncBlockchainFacade
+from utils.blockchain_utils import blockchain_utils
+from utils.confirmation_tracker import ConfirmationTracker
+
+TX_A = '0x' + 'aa' * 32
+TX_B = '0x' + 'bb' * 32
+TX_OTHER = '0x' + 'cc' * 32
+
+
+class FakeAsyncUtils:
+    """블록 리스너 등록과 영수증 조회만 흉내 내는 가짜 AsyncBlockchainUtils"""
+
+    def __init__(self):
+        self.receipts = {}
+        self.block_number = 0
+        self.listeners = []
+        self.receipt_queries = []
+
+    def add_block_listener(self, listener):
+        self.listeners.append(listener)
+
+    async def get_receipts(self, tx_hashes):
+        tx_hashes = list(tx_hashes)
+        self.receipt_queries.append(sorted(tx_hashes))
+        return {tx_hash: self.receipts.get(tx_hash) for tx_hash in tx_hashes}
+
+    async def get_block_number(self):
+        return self.block_number
+
+    async def close(self):
+        pass
+
+
+def receipt(block_number, status=1):
+    return {
+        'blockNumber': block_number,
+        'blockHash': '0x' + format(block_number, '064x'),
+        'status': status,
+        'gasUsed': 21000
+    }
+
+
+class TestConfirmationTracker:
+    """확정 추적기 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.utils = FakeAsyncUtils()
+        self.facade = SyncBlockchainFacade(self.utils)
+
+    def teardown_method(self):
+        self.facade.close()
+
+    def mine(self, tracker, block_number, transactions):
+        self.utils.block_number = block_number
+        for tx_hash in transactions:
+            self.utils.receipts.setdefault(tx_hash, receipt(block_number))
+        block = {'number': block_number, 'transactions': transactions}
+        self.facade.run(tracker._on_block(block))
+
+    def test_confirms_after_required_blocks(self, tmp_path):
+        """필요한 확정 수에 도달하면 완료됩니다"""
+        tracker = ConfirmationTracker(self.facade, confirmations=2,
+                                      state_file=str(tmp_path / 'pending.json'))
+        tracker.track(TX_A, kind='mint', metadata={'to_address': '0xTO'})
+
+        self.mine(tracker, 10, [TX_A, TX_OTHER])
+        assert tracker.get_status(TX_A)['status'] == 'mined'
+
+        self.mine(tracker, 11, [])
+        result = tracker.wait(TX_A, timeout=1)
+
+        assert result['status'] == 'confirmed'
+        assert result['block_number'] == 10
+        assert result['confirmations'] == 2
+        assert result['metadata'] == {'to_address': '0xTO'}
+        assert tracker.pending_count() == 0
+
+    def test_only_matching_transactions_are_queried(self, tmp_path):
+        """블록에 포함된 대기 트랜잭션만 영수증을 조회합니다"""
+        tracker = ConfirmationTracker(self.facade, confirmations=3,
+                                      state_file=str(tmp_path / 'pending.json'))
+        tracker.track(TX_A)
+        tracker.track(TX_B)
+
+        self.mine(tracker, 5, [TX_A, TX_OTHER])
+
+        assert self.utils.receipt_queries == [[TX_A]]
+        assert tracker.get_status(TX_B)['status'] == 'pending'
+
+    def test_failed_transaction(self, tmp_path):
+        """실패한 트랜잭션은 failed로 완료됩니다"""
+        tracker = ConfirmationTracker(self.facade, confirmations=1,
+                                      state_file=str(tmp_path / 'pending.json'))
+        tracker.track(TX_A)
+        self.utils.receipts[TX_A] = receipt(7, status=0)
+
+        self.mine(tracker, 7, [TX_A])
+
+        assert tracker.wait(TX_A, timeout=1)['status'] == 'failed'
+
+    def test_pending_state_is_persisted_and_resumed(self, tmp_path):
+        """대기 중인 트랜잭션은 저장되고 재시작 시 재개됩니다"""
+        state_file = str(tmp_path / 'pending.json')
+        tracker = ConfirmationTracker(self.facade, confirmations=2, state_file=state_file)
+        tracker.track(TX_A, kind='mint')
+
+        with open(state_file, 'r', encoding='utf-8') as f:
+            assert TX_A in json.load(f)['pending']
+
+        # 중단된 동안 채굴 및 확정됨
+        self.utils.receipts[TX_A] = receipt(20)
+        self.utils.block_number = 25
+
+        handled = threading.Event()
+        restarted = ConfirmationTracker(self.facade, confirmations=2, state_file=state_file)
+        restarted.register_handler('mint', lambda tx_hash, rcpt, result: handled.set())
+        restarted.start()
+
+        assert restarted.get_status(TX_A)['status'] == 'confirmed'
+        assert handled.wait(timeout=1)
+        with open(state_file, 'r', encoding='utf-8') as f:
+            assert json.load(f)['pending'] == {}
+
+    def test_workers_share_state_file(self, tmp_path):
+        """다른 워커가 추적 중인 항목은 보존하고, 종료된 프로세스의 항목만 넘겨받습니다"""
+        finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+        finished.wait()
+        state_file = tmp_path / 'pending.json'
+        entry = {'kind': 'mint', 'metadata': {}, 'confirmations': 1, 'submitted_at': 0,
+                 'mined_block': None, 'block_hash': None}
+        state_file.write_text(json.dumps({'pending': {
+            TX_B: dict(entry, owner=os.getppid()),
+            TX_OTHER: dict(entry, owner=finished.pid)
+        }}))
+
+        tracker = ConfirmationTracker(self.facade, confirmations=1, state_file=str(state_file))
+        tracker.track(TX_A)
+
+        assert tracker.get_status(TX_OTHER)['status'] == 'pending'
+        assert tracker.get_status(TX_B)['status'] == 'not_found'
+        pending = json.loads(state_file.read_text())['pending']
+        assert {tx_hash: entry['owner'] for tx_hash, entry in pending.items()} == {
+            TX_A: os.getpid(), TX_B: os.getppid(), TX_OTHER: os.getpid()
+        }
+
+        self.mine(tracker, 4, [TX_A, TX_OTHER])
+        assert set(json.loads(state_file.read_text())['pending']) == {TX_B}
+
+
+class TestMintTracking:
+    """체인 NFT 발행 확정 추적 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.utils = FakeAsyncUtils()
+        self.facade = SyncBlockchainFacade(self.utils)
+        external.pending_mints.clear()
+
+    def teardown_method(self):
+        self.facade.close()
+        external.pending_mints.clear()
+
+    def nft(self):
+        return {
+            'token_id': 'NFT_PROOF_1', 'proof_id': 'PROOF_1', 'customer_id': 'CUST_001',
+            'customer_address': '0x742d35cc6634c0532925a3b8d4c9db96c4b4d8b6',
+            'attributes': [{'trait_type': 'Credit Grade', 'value': 'B'},
+                           {'trait_type': 'Max Loan Amount', 'value': 50000000}]
+        }
+
+    def test_chain_minting_requires_contract_and_key(self, monkeypatch):
+        """컨트랙트 주소와 발행자 개인키가 모두 설정되어야 체인에 발행합니다"""
+        monkeypatch.setenv('CONTRACT_ADDRESS', '0x' + '0' * 40)
+        monkeypatch.setenv('PRIVATE_KEY', '0x' + '11' * 32)
+        assert not external.chain_minting_enabled()
+
+        monkeypatch.setenv('CONTRACT_ADDRESS', '0x' + '12' * 20)
+        monkeypatch.setenv('PRIVATE_KEY', 'your-private-key-here')
+        assert not external.chain_minting_enabled()
+
+        monkeypatch.setenv('PRIVATE_KEY', '0x' + '11' * 32)
+        assert external.chain_minting_enabled()
+
+    def test_submit_mint_does_not_wait_for_receipt(self, monkeypatch):
+        """발행은 영수증을 기다리지 않는 경로로 보내고 확정을 기다리는 NFT로 기록합니다"""
+        calls = []
+
+        def fake_mint(*args, **kwargs):
+            calls.append((args, kwargs))
+            return {'status': 'pending', 'transaction_hash': TX_A}
+
+        monkeypatch.setenv('CONTRACT_ADDRESS', '0x' + '12' * 20)
+        monkeypatch.setenv('PRIVATE_KEY', '0x' + '11' * 32)
+        monkeypatch.setattr(external, 'start_mint_tracking', lambda: 0)
+        monkeypatch.setattr(blockchain_utils, 'mint_nft', fake_mint)
+        nft = self.nft()
+
+        result = external.submit_mint(nft)
+
+        args, kwargs = calls[0]
+        assert result['status'] == 'pending'
+        assert kwargs['wait_for_receipt'] is False
+        assert kwargs['function_name'] == 'mintCreditGradeNFT'
+        assert kwargs['extra_args'] == ('B', 50000000, 'PROOF_1', 'CUST_001')
+        assert kwargs['metadata'] == {'token_id': 'NFT_PROOF_1'}
+        assert args[2] == '0x742d35Cc6634C0532925A3B8D4C9dB96C4B4d8B6'
+        assert (nft['mint_status'], nft['transaction_hash']) == ('pending', TX_A)
+        assert external.mint_tx_hash(nft) == TX_A
+        assert external.pending_mints['NFT_PROOF_1'] is nft
+
+    def test_mint_handler_records_confirmation(self, tmp_path):
+        """등록된 mint 핸들러가 확정 시 NFT 상태와 체인 토큰 ID를 기록합니다"""
+        nft = self.nft()
+        external.pending_mints[nft['token_id']] = nft
+        tracker = ConfirmationTracker(self.facade, confirmations=1, state_file=str(tmp_path / 'pending.json'))
+        tracker.register_handler('mint', external.on_mint_confirmed)
+        tracker.track(TX_A, kind='mint', metadata={'token_id': nft['token_id']})
+
+        self.utils.receipts[TX_A] = dict(receipt(3), logs=[{'topics': [
+            bytes.fromhex(external.TRANSFER_TOPIC[2:]), b'\x00' * 32, b'\x00' * 32, (7).to_bytes(32, 'big')
+        ]}])
+        self.utils.block_number = 3
+        self.facade.run(tracker._on_block({'number': 3, 'transactions': [TX_A]}))
+        tracker.wait(TX_A, timeout=1)
+
+        for _ in range(100):
+            if 'mint_status' in nft:
+                break
+            threading.Event().wait(0.01)
+        assert (nft['mint_status'], nft['block_number'], nft['chain_token_id']) == ('confirmed', 3, 7)
+        assert external.pending_mints == {}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,50 @@
+"""
+신용등급 회로 버전 테스트
+v2 회로(비트 수 제한 범위 검사 + 한도표)가 v1 회로와 전체 입력 영역에서 같은 입력을 받아들이는지와
+ZKPUtils의 회로 버전 선택을 테스트합니다.
+"""
+
+import os
+import pytest
+from utils import credit_circuit
+from utils.credit_circuit import accepts_v1, accepts_v2, check_equivalence, circuit_inputs
+from utils.zkp_utils import ZKPUtils
+
+
+class TestCreditCircuit:
+    """신용등급 회로 버전 테스트"""
+
+    def test_v2_equivalent_to_v1(self):
+        """두 회로는 신용점수·등급 전체와 대출 금액의 모든 구간 경계에서 같은 결과를 냅니다"""
+        result = check_equivalence()
+        assert result['status'] == 'success', result['mismatches']
+        assert result['accepted'] > 0
+
+        assert accepts_v2(750, 2, 50000000) and not accepts_v2(750, 2, 50000001)
+        assert accepts_v2(1000, 1, 100000000) and not accepts_v2(1001, 1, 100000000)
+        assert accepts_v2(0, 5, 0) and not accepts_v2(0, 5, 1)
+        assert not accepts_v2(800, 2, 0)
+
+    def test_equivalence_detects_differences(self, monkeypatch):
+        """v2 모델의 한도표가 틀리면 불일치를 찾아냅니다"""
+        monkeypatch.setattr(credit_circuit, 'V2_LIMIT_STEPS', (5000000, 15000000, 30000000, 60000000))
+        result = check_equivalence(scores=range(790, 810))
+        assert result['status'] == 'error'
+        assert result['mismatches'][0]['credit_grade'] == 1
+        assert not accepts_v1(800, 1, 110000000)
+
+    def test_zkp_utils_circuit_version(self, monkeypatch):
+        """ZKPUtils는 회로 버전별 작업 디렉토리를 사용하고 증명에 버전을 기록합니다"""
+        zkp = ZKPUtils(circuit_version='v2')
+        assert zkp.workspace_dir == os.path.join(os.getcwd(), 'zokrates', 'v2')
+        assert zkp.create_credit_score_proof(750, 'B', 50000000)['proof_data']['circuit_version'] == 'v2'
+        assert circuit_inputs(750, 'B', 50000000) == ['750', '2', '50000000']
+
+        monkeypatch.setenv('ZKP_CIRCUIT_VERSION', 'v1')
+        assert ZKPUtils().circuit_version == 'v1'
+        with pytest.raises(ValueError):
+            ZKPUtils(circuit_version='v9')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
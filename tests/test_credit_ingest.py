@@ -0,0 +1,77 @@
+"""
+신용정보 적재 테스트
+JSONL/CSV 스트리밍 적재, 레코드 검증, 변경분 병합과 변경 고객 보고를 테스트합니다.
+"""
+
+import gzip
+import json
+import pytest
+from utils.credit_ingest import ingest_file, validate_record
+from utils.credit_store import CreditStore
+
+
+def write_jsonl(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write((record if isinstance(record, str) else json.dumps(record, ensure_ascii=False)) + '\n')
+
+
+class TestCreditIngest:
+    """신용정보 적재 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.base = [
+            {'customer_id': 'CUST_001', 'name': '김철수', 'credit_score': 750, 'income': 50000000,
+             'debt_ratio': 0.3, 'payment_history': 'excellent', 'employment_status': 'full_time'},
+            {'customer_id': 'CUST_002', 'name': '이영희', 'credit_score': 820, 'income': 70000000,
+             'debt_ratio': 0.2, 'payment_history': 'excellent', 'employment_status': 'full_time'}
+        ]
+
+    def test_validate_record(self):
+        """필드 형식과 범위를 검증하고 빈 값은 변경하지 않는 것으로 봅니다"""
+        record, error = validate_record({'customer_id': 'CUST_001', 'credit_score': '780', 'income': ''})
+        assert error is None
+        assert record == {'customer_id': 'CUST_001', 'credit_score': 780}
+
+        assert validate_record({'credit_score': 700})[1] == 'Missing customer_id'
+        assert 'out of range' in validate_record({'customer_id': 'C', 'credit_score': 1200})[1]
+        assert 'Invalid payment_history' in validate_record({'customer_id': 'C', 'payment_history': 'great'})[1]
+        for value in ('NaN', float('nan'), 'inf', '-Infinity'):
+            assert validate_record({'customer_id': 'C', 'debt_ratio': value}) == (None, f'Invalid debt_ratio: {value}')
+        assert validate_record({'customer_id': 'C', 'income': 'inf'})[1] == 'Invalid income: inf'
+
+    def test_ingest_jsonl_in_chunks(self, tmp_path):
+        """JSONL 파일을 청크 단위로 적재하고 잘못된 줄은 거부합니다"""
+        path = tmp_path / 'bureau.jsonl'
+        write_jsonl(path, self.base + ['{not json', {'customer_id': 'CUST_003', 'credit_score': -5}])
+        store = CreditStore(str(tmp_path / 'credit.db'))
+
+        result = ingest_file(str(path), store=store, chunk_size=1)
+
+        assert result['status'] == 'success'
+        assert (result['records'], result['inserted'], result['rejected']) == (4, 2, 2)
+        assert [r['line'] for r in result['rejections']] == [3, 4]
+        assert store.get('CUST_002')['credit_score'] == 820
+
+    def test_delta_reports_only_changed_customers(self, tmp_path):
+        """변경분 적재는 일부 필드만 갱신하고 실제로 바뀐 고객만 보고합니다"""
+        store = CreditStore(str(tmp_path / 'credit.db'))
+        store.upsert_many(self.base)
+        path = tmp_path / 'delta.csv.gz'
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+            f.write('customer_id,credit_score,income\nCUST_001,690,\nCUST_002,820,70000000\nCUST_009,610,1000\n')
+        report = tmp_path / 'changes.jsonl'
+
+        result = ingest_file(str(path), store=store, report_path=str(report))
+
+        assert (result['inserted'], result['updated'], result['unchanged']) == (1, 1, 1)
+        assert store.get('CUST_001')['credit_score'] == 690
+        assert store.get('CUST_001')['income'] == 50000000
+        changes = {c['customer_id']: c for c in store.iter_changes(result['ingest_id'])}
+        assert set(changes) == {'CUST_001', 'CUST_009'}
+        assert (changes['CUST_001']['previous_score'], changes['CUST_001']['credit_score']) == (750, 690)
+        assert len(report.read_text().splitlines()) == 2
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,86 @@
+"""
+일괄 신용 평가 테스트
+벡터화한 등급·대출 조건 계산이 고객별 계산과 같은지, 기준 변경안 분석과 일괄 증명 작업 변환을 테스트합니다.
+"""
+
+import numpy as np
+import pytest
+from api.bank import load_bank_criteria
+from api.external import calculate_credit_grade
+from utils.credit_scoring import (
+    Portfolio, ScoringRules, iter_proof_jobs, merge_criteria, score_portfolio, summarize, what_if
+)
+from utils.credit_store import CreditStore
+
+
+class TestCreditScoring:
+    """일괄 신용 평가 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.criteria = load_bank_criteria()
+        self.rules = ScoringRules(self.criteria)
+        self.customers = {
+            'CUST_001': {'credit_score': 750, 'income': 50000000, 'debt_ratio': 0.3, 'residence_stability': 5},
+            'CUST_002': {'credit_score': 820, 'income': 70000000, 'debt_ratio': 0.2, 'residence_stability': 8},
+            'CUST_003': {'credit_score': 650, 'income': 15000000, 'debt_ratio': 0.5, 'residence_stability': 3},
+            'CUST_004': {'credit_score': 450, 'income': 30000000, 'debt_ratio': 0.4, 'residence_stability': 2},
+            'CUST_005': {'credit_score': 710, 'income': 40000000, 'debt_ratio': 0.9}
+        }
+
+    def test_grades_match_scalar_calculation(self):
+        """구간 경계를 포함해 calculate_credit_grade와 같은 등급을 계산합니다"""
+        credit_score = np.arange(0, 1001)
+        codes = self.rules.grade_codes(credit_score)
+        labels = self.rules.grade_labels(codes)
+        assert all(label == calculate_credit_grade(int(score)) for score, label in zip(credit_score, labels))
+
+    def test_loan_terms_and_eligibility(self):
+        """등급별 한도·금리·수수료를 채우고 추가 기준을 만족하지 못하면 대상에서 제외합니다"""
+        portfolio = Portfolio.from_customers(self.customers)
+        scores = score_portfolio(portfolio, self.rules)
+
+        assert scores['max_loan_amount'].tolist() == [50000000, 100000000, 20000000, 0, 50000000]
+        assert scores['interest_rate'].tolist() == [3.5, 2.5, 5.0, 12.0, 3.5]
+        # CUST_003: 소득 미달, CUST_004: 한도 0, CUST_005: 부채비율 초과 + 거주 기간 없음
+        assert scores['eligible'].tolist() == [True, True, False, False, False]
+
+        summary = summarize(scores, self.rules)
+        assert summary['eligible_customers'] == 2
+        assert summary['total_loan_limit'] == 150000000
+        assert summary['expected_fee_income'] == 50000000 * 0.2 / 100 + 100000000 * 0.1 / 100
+        assert summary['grades']['B']['customers'] == 2
+
+    def test_what_if_transitions(self):
+        """기준 변경안을 적용했을 때의 등급 이동과 한도 변화를 계산합니다"""
+        portfolio = Portfolio.from_customers(self.customers)
+        scenario = merge_criteria(self.criteria, {'credit_score_ranges': {'B': {'min': 720}}})
+        assert scenario['credit_score_ranges']['B']['max'] == 799
+
+        result = what_if(portfolio, self.criteria, scenario)
+
+        assert result['transitions']['B'] == {'B': 1, 'C': 1}
+        assert result['changed_customers'] == 1
+        assert result['sample_changed'] == ['CUST_005']
+        assert result['loan_limit_delta'] == 0  # CUST_005는 원래 부채비율 기준 미달
+        assert result['no_longer_eligible'] == 0
+
+    def test_store_portfolio_to_proof_jobs(self, tmp_path):
+        """저장소에서 불러온 포트폴리오를 일괄 증명 작업으로 변환합니다"""
+        store = CreditStore(str(tmp_path / 'credit.db'))
+        store.upsert_many([{'customer_id': customer_id, **info} for customer_id, info in self.customers.items()])
+        store.upsert_many([{'customer_id': 'CUST_006', 'income': 1}])
+
+        portfolio = Portfolio.from_store(store, batch_size=2)
+        scores = score_portfolio(portfolio, self.rules)
+        jobs = list(iter_proof_jobs(portfolio, scores, self.rules))
+
+        assert len(portfolio) == 6
+        assert summarize(scores, self.rules)['ungraded'] == 1
+        assert [job['customer_id'] for job in jobs] == ['CUST_001', 'CUST_002', 'CUST_003', 'CUST_004', 'CUST_005']
+        assert jobs[1] == {'customer_id': 'CUST_002', 'credit_score': 820, 'credit_grade': 'A',
+                           'max_loan_amount': 100000000}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
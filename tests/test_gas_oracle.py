@@ -0,0 +1,207 @@
+"""
+가스 오라클 테스트
+fee history 캐싱, 긴급도별 수수료 제안, 함수·호출 데이터 길이별 가스 추정 메모이제이션을 테스트합니다.
+"""
+
+import pytest
+from types import SimpleNamespace
+from web3 import Web3
+from utils.blockchain_utils import BlockchainUtils
+from utils.gas_oracle import GasOracle
+
+
+class FakeEth:
+    """fee_history / gas_price 호출 횟수를 기록하는 가짜 eth 모듈"""
+
+    def __init__(self, history=None, gas_price=20 * 10 ** 9):
+        self.history = history
+        self._gas_price = gas_price
+        self.fee_history_calls = 0
+        self.gas_price_calls = 0
+
+    def fee_history(self, block_count, newest_block, percentiles):
+        self.fee_history_calls += 1
+        if self.history is None:
+            raise ValueError('eth_feeHistory not supported')
+        return self.history
+
+    @property
+    def gas_price(self):
+        self.gas_price_calls += 1
+        return self._gas_price
+
+
+class FakeWeb3:
+    def __init__(self, eth):
+        self.eth = eth
+
+
+class FakeFunction:
+    """estimate_gas 호출 횟수를 기록하는 가짜 컨트랙트 함수"""
+
+    def __init__(self, estimate=100000):
+        self.estimate = estimate
+        self.calls = 0
+
+    def estimate_gas(self, tx):
+        self.calls += 1
+        return self.estimate
+
+
+class FakeCallFunction(FakeFunction):
+    """호출 데이터 길이가 정해진 가짜 컨트랙트 함수"""
+
+    def __init__(self, estimate, data_length):
+        super().__init__(estimate)
+        self.data_length = data_length
+
+    def _encode_transaction_data(self):
+        return '0x' + '00' * self.data_length
+
+
+class FakeMintEth:
+    """서명·전송 호출을 받고 정해진 status의 영수증을 돌려주는 가짜 eth 모듈"""
+
+    def __init__(self, status):
+        self.status = status
+        self.account = SimpleNamespace(sign_transaction=lambda tx, key: SimpleNamespace(rawTransaction=b'\x01'))
+
+    def contract(self, address, abi):
+        function = FakeFunction(estimate=100000)
+        function.build_transaction = lambda params: params
+        return SimpleNamespace(functions=SimpleNamespace(mint=lambda to, uri: function))
+
+    def get_transaction_count(self, address):
+        return 0
+
+    def send_raw_transaction(self, raw):
+        return bytes.fromhex('aa' * 32)
+
+    def wait_for_transaction_receipt(self, tx_hash):
+        return SimpleNamespace(status=self.status, gasUsed=120000, blockNumber=5)
+
+
+HISTORY = {
+    'baseFeePerGas': [10 * 10 ** 9, 11 * 10 ** 9, 12 * 10 ** 9],
+    'reward': [
+        [1 * 10 ** 9, 2 * 10 ** 9, 5 * 10 ** 9],
+        [1 * 10 ** 9, 3 * 10 ** 9, 6 * 10 ** 9]
+    ]
+}
+
+
+class TestGasOracle:
+    """가스 오라클 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.eth = FakeEth(HISTORY)
+        self.oracle = GasOracle(FakeWeb3(self.eth), refresh_interval=60)
+
+    def test_fee_history_is_cached(self):
+        """수수료 정보는 샘플링 주기 내에서 재사용됩니다"""
+        for _ in range(5):
+            self.oracle.suggest_fees('standard')
+
+        assert self.eth.fee_history_calls == 1
+        assert self.eth.gas_price_calls == 0
+
+    def test_urgency_tiers(self):
+        """긴급도가 높을수록 수수료가 높아집니다"""
+        slow = self.oracle.suggest_fees('slow')
+        standard = self.oracle.suggest_fees('standard')
+        fast = self.oracle.suggest_fees('fast')
+
+        assert slow['maxPriorityFeePerGas'] <= standard['maxPriorityFeePerGas'] <= fast['maxPriorityFeePerGas']
+        assert slow['maxFeePerGas'] < standard['maxFeePerGas'] < fast['maxFeePerGas']
+
+        # 다음 블록 base fee(12 gwei) 이상을 항상 지불할 수 있어야 함
+        assert slow['maxFeePerGas'] >= 12 * 10 ** 9 + slow['maxPriorityFeePerGas']
+
+    def test_unknown_urgency(self):
+        """알 수 없는 긴급도는 거부됩니다"""
+        with pytest.raises(ValueError):
+            self.oracle.suggest_fees('urgent')
+
+    def test_legacy_fallback(self):
+        """EIP-1559 미지원 노드에서는 gasPrice를 사용합니다"""
+        eth = FakeEth(history=None, gas_price=30 * 10 ** 9)
+        oracle = GasOracle(FakeWeb3(eth), refresh_interval=60)
+
+        fees = oracle.suggest_fees('standard')
+        oracle.suggest_fees('fast')
+
+        assert fees == {'gasPrice': 30 * 10 ** 9}
+        assert eth.gas_price_calls == 1
+
+    def test_gas_estimate_memoised(self):
+        """함수별 가스 추정치는 메모이제이션됩니다"""
+        function = FakeFunction(estimate=100000)
+
+        first = self.oracle.estimate_gas('0xCONTRACT', 'mint', function, '0xFROM')
+        second = self.oracle.estimate_gas('0xCONTRACT', 'mint', function, '0xFROM')
+
+        assert first == second == 120000
+        assert function.calls == 1
+
+    def test_gas_used_raises_estimate(self):
+        """실제 사용량이 추정치를 넘으면 테이블이 보정됩니다"""
+        function = FakeFunction(estimate=100000)
+        self.oracle.estimate_gas('0xCONTRACT', 'mint', function, '0xFROM')
+
+        self.oracle.record_gas_used('0xCONTRACT', 'mint', 150000)
+
+        assert self.oracle.estimate_gas('0xCONTRACT', 'mint', function, '0xFROM') == 180000
+
+    def test_gas_estimate_keyed_by_calldata_length(self):
+        """호출 데이터 워드 수가 다르면 따로 추정하고, 같으면 추정치를 재사용합니다"""
+        short = FakeCallFunction(estimate=100000, data_length=4 + 32 * 4)
+        same_words = FakeCallFunction(estimate=100000, data_length=4 + 32 * 4 - 3)
+        long = FakeCallFunction(estimate=400000, data_length=4 + 32 * 40)
+
+        assert self.oracle.estimate_gas('0xCONTRACT', 'mint', short, '0xFROM') == 120000
+        assert self.oracle.estimate_gas('0xCONTRACT', 'mint', same_words, '0xFROM') == 120000
+        assert self.oracle.estimate_gas('0xCONTRACT', 'mint', long, '0xFROM') == 480000
+        assert (short.calls, same_words.calls, long.calls) == (1, 0, 1)
+
+        self.oracle.record_gas_used('0xCONTRACT', 'mint', 500000, long)
+        assert self.oracle.estimate_gas('0xCONTRACT', 'mint', short, '0xFROM') == 120000
+
+    def test_calldata_words_of_web3_function(self):
+        """web3 컨트랙트 함수는 인코딩한 호출 데이터 길이로 워드 수를 셉니다"""
+        abi = [{'type': 'function', 'name': 'mint', 'stateMutability': 'nonpayable', 'outputs': [],
+                'inputs': [{'name': 'to', 'type': 'address'}, {'name': 'uri', 'type': 'string'}]}]
+        contract = Web3().eth.contract(address='0x' + '11' * 20, abi=abi)
+        to = Web3.to_checksum_address('0x' + '22' * 20)
+
+        short = GasOracle.calldata_words(contract.functions.mint(to, 'ipfs://a'))
+        long = GasOracle.calldata_words(contract.functions.mint(to, 'ipfs://' + 'a' * 200))
+        assert short < long
+        assert GasOracle.calldata_words(FakeFunction()) == 0
+
+    def test_reverted_mint_is_error(self):
+        """채굴됐지만 실패한(status=0) 발행은 성공으로 처리하지 않고 가스 테이블도 바꾸지 않습니다"""
+        utils = BlockchainUtils('http://127.0.0.1:1')
+        utils.w3 = FakeWeb3(FakeMintEth(status=0))
+        utils.gas_oracle = self.oracle
+
+        result = utils.mint_nft('0xCONTRACT', [], '0xTO', 'ipfs://a', '0xFROM', '0xKEY')
+        assert result['status'] == 'error'
+        assert result['message'] == 'NFT minting transaction reverted'
+        assert result['transaction_hash'] == 'aa' * 32
+        assert self.oracle.get_status()['gas_table_size'] == 1
+        assert self.oracle.estimate_gas('0xCONTRACT', 'mint', FakeFunction(), '0xFROM') == 120000
+
+    def test_build_tx_params(self):
+        """트랜잭션 파라미터에 수수료 필드가 포함됩니다"""
+        params = self.oracle.build_tx_params('0xFROM', 7, 120000, 'fast')
+
+        assert params['from'] == '0xFROM'
+        assert params['nonce'] == 7
+        assert params['gas'] == 120000
+        assert 'maxFeePerGas' in params
+        assert 'gasPrice' not in params
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,76 @@
+"""
+부하 테스트 도구 테스트
+백분위수 계산, 시나리오 가중치 해석, 실행 결과 비교, 실제 서버 대상 짧은 실행을 테스트합니다.
+"""
+
+import threading
+import pytest
+from werkzeug.serving import make_server
+from app import create_app
+from benchmarks.loadtest import LoadTest, compare_reports, parse_mix, percentile
+
+
+class TestLoadTest:
+    """부하 테스트 도구 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.report = {
+            'summary': {'error_rate': 0.01, 'throughput_rps': 100.0,
+                        'latency_ms': {'p50': 10.0, 'p95': 40.0, 'p99': 80.0}},
+            'scenarios': {'nft_lookup': {'error_rate': 0.0, 'throughput_rps': 50.0,
+                                         'latency_ms': {'p50': 5.0, 'p95': 10.0, 'p99': 20.0}}},
+            'routes': {}
+        }
+
+    def test_percentile_nearest_rank(self):
+        """nearest-rank 방식으로 백분위수를 구합니다"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 95) == 7.0
+        assert percentile([], 50) is None
+
+    def test_parse_mix(self):
+        """시나리오 가중치를 해석하고 알 수 없는 시나리오를 거부합니다"""
+        assert parse_mix('nft_reuse=5,new_customer') == {'nft_reuse': 5.0, 'new_customer': 1.0}
+        with pytest.raises(ValueError):
+            parse_mix('unknown=1')
+
+    def test_compare_flags_regressions(self):
+        """기준을 넘는 지연시간 증가와 처리량 감소를 회귀로 표시합니다"""
+        new = {
+            'summary': {'error_rate': 0.01, 'throughput_rps': 95.0,
+                        'latency_ms': {'p50': 10.5, 'p95': 60.0, 'p99': 80.0}},
+            'scenarios': {'nft_lookup': {'error_rate': 0.0, 'throughput_rps': 40.0,
+                                         'latency_ms': {'p50': 5.0, 'p95': 10.0, 'p99': 20.0}}},
+            'routes': {}
+        }
+
+        result = compare_reports(self.report, new, threshold=10)
+
+        assert result['summary']['latency_ms.p95']['change_pct'] == 50.0
+        assert result['regressions'] == ['summary.latency_ms.p95', 'scenarios.nft_lookup.throughput_rps']
+        assert compare_reports(self.report, self.report)['regressions'] == []
+
+    def test_open_loop_run_against_server(self):
+        """개방형 부하로 서버에 요청하고 시나리오·엔드포인트별 결과를 기록합니다"""
+        server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            report = LoadTest(
+                base_url=f'http://127.0.0.1:{server.server_port}', mix={'nft_lookup': 1},
+                rate=40, arrival='constant', concurrency=4, duration=0.5, seed=1
+            ).run()
+        finally:
+            server.shutdown()
+
+        assert report['meta']['mode'] == 'open'
+        assert 15 <= report['summary']['requests'] <= 25
+        assert report['summary']['latency_ms']['p50'] is not None
+        assert set(report['summary']['status_codes']) <= {'200', '404'}
+        assert list(report['routes']) == ['POST /api/external/my-nft']
+
+if __name__ == '__main__':
+    pytest.main([__file__])
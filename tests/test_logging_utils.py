@@ -0,0 +1,95 @@
+"""
+구조화 로깅 테스트
+JSON 레코드, 개인정보 마스킹, 요청 단위 샘플링을 테스트합니다.
+"""
+
+import io
+import json
+import hashlib
+import logging
+import pytest
+from utils.logging_utils import (
+    JsonFormatter, PiiRedactor, SamplingFilter, bind_request_context,
+    get_logger, reset_request_context, setup_logging, shutdown_logging
+)
+
+
+def make_record(level=logging.INFO, context=None, **fields):
+    record = logging.LogRecord('zk_nft.test', level, __file__, 1, '대출 요청 접수', None, None)
+    record.fields = fields
+    record.context = context or {}
+    return record
+
+
+class TestStructuredLogging:
+    """구조화 로깅 테스트"""
+
+    def test_json_record_redacts_pii(self):
+        """JSON 레코드의 개인정보 필드는 마스킹됩니다"""
+        formatter = JsonFormatter(PiiRedactor(enabled=True, key='log-test-key'))
+        record = make_record(
+            context={'endpoint': 'bank.loan_request', 'request_id': 'abc'},
+            customer_id='CUST_001', customer_name='김철수', requested_amount=10000000,
+            customer_address='0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
+        )
+
+        entry = json.loads(formatter.format(record))
+
+        assert entry['message'] == '대출 요청 접수'
+        assert entry['endpoint'] == 'bank.loan_request'
+        assert entry['customer_id'] == 'CUST_001'
+        assert entry['customer_name'].startswith('[REDACTED:')
+        assert '10000000' not in json.dumps(entry)
+        assert entry['customer_address'] == '0x742d...d8b6'
+
+    def test_redaction_tags_are_keyed(self):
+        """마스킹 태그는 비밀키 HMAC이라 키 없이 대입으로 되돌릴 수 없고, 기본값 키면 태그를 남기지 않습니다"""
+        redactor = PiiRedactor(key='log-test-key')
+        tagged = redactor.redact({'credit_score': 750, 'credit_grade': 'B'})
+
+        assert tagged == redactor.redact({'credit_score': 750, 'credit_grade': 'B'})
+        assert tagged != PiiRedactor(key='other-key').redact({'credit_score': 750, 'credit_grade': 'B'})
+        assert hashlib.sha256(b'750').hexdigest()[:8] not in tagged['credit_score']
+        assert PiiRedactor(key='your-secret-key-here').redact({'credit_score': 750}) == {'credit_score': '[REDACTED]'}
+
+    def test_sampling_is_per_request(self):
+        """샘플링은 요청 단위로 결정되고 WARNING 이상은 항상 기록됩니다"""
+        sampler = SamplingFilter(default_rate=1.0, endpoint_rates={'bank.loan_request': 0.5})
+
+        kept = 0
+        for i in range(200):
+            context = {'endpoint': 'bank.loan_request', 'request_id': f'req-{i}'}
+            first = sampler.filter(make_record(context=context))
+            assert sampler.filter(make_record(context=context)) == first
+            kept += first
+
+        assert 50 < kept < 150
+        assert sampler.filter(make_record(level=logging.ERROR, context={'endpoint': 'bank.loan_request'}))
+        assert sampler.filter(make_record(context={'endpoint': 'bank.credit_criteria'}))
+
+    def test_queue_logging_with_request_context(self, monkeypatch):
+        """큐 리스너를 통해 요청 컨텍스트가 포함된 레코드가 출력됩니다"""
+        monkeypatch.setenv('LOG_SAMPLE_RATES', 'bank.loan_request=0')
+        shutdown_logging()
+        stream = io.StringIO()
+        setup_logging(stream)
+        logger = get_logger('test')
+
+        token = bind_request_context(endpoint='bank.verify_nft', request_id='req-1')
+        logger.info('NFT 검증', token_id=1)
+        reset_request_context(token)
+
+        token = bind_request_context(endpoint='bank.loan_request', request_id='req-2')
+        logger.info('샘플링으로 제외')
+        reset_request_context(token)
+
+        shutdown_logging()
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        assert len(lines) == 1
+        assert lines[0]['request_id'] == 'req-1'
+        assert lines[0]['token_id'] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
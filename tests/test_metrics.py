@@ -0,0 +1,80 @@
+"""
+Prometheus 지표 테스트
+단계별 지연시간, 서브프로세스 수, /metrics 엔드포인트를 테스트합니다.
+"""
+
+import sys
+import pytest
+from types import SimpleNamespace
+from prometheus_client import REGISTRY
+from api import external
+from app import create_app
+from utils.blockchain_utils import blockchain_utils
+from utils.metrics import run_subprocess, time_stage
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics:
+    """지표 수집 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.client = create_app().test_client()
+
+    def test_time_stage_observes_histogram(self):
+        """단계 실행 시간이 히스토그램에 기록됩니다"""
+        before = sample('zk_nft_stage_duration_seconds_count', stage='test_stage')
+
+        with time_stage('test_stage'):
+            pass
+
+        assert sample('zk_nft_stage_duration_seconds_count', stage='test_stage') == before + 1
+
+    def test_mint_stage_timed_once(self, monkeypatch):
+        """체인 발행 요청 한 번은 mint 단계에 한 번만 기록됩니다"""
+        def unavailable(address, abi):
+            raise ConnectionError('node unavailable')
+
+        monkeypatch.setenv('CONTRACT_ADDRESS', '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6')
+        monkeypatch.setenv('PRIVATE_KEY', '0x' + '11' * 32)
+        monkeypatch.setattr(external, 'start_mint_tracking', lambda: 0)
+        monkeypatch.setattr(blockchain_utils, 'w3', SimpleNamespace(eth=SimpleNamespace(contract=unavailable)))
+        before = sample('zk_nft_stage_duration_seconds_count', stage='mint')
+
+        body, status = external.handle_mint_nft({
+            'customer_id': 'CUST_001', 'credit_grade': 'B', 'max_loan_amount': 50000000,
+            'customer_address': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
+        })
+
+        assert status == 502 and 'node unavailable' in body['error']
+        assert sample('zk_nft_stage_duration_seconds_count', stage='mint') == before + 1
+
+    def test_run_subprocess_counts_runs(self):
+        """서브프로세스 실행 결과별로 횟수가 기록됩니다"""
+        command = sys.executable.split('/')[-1]
+        before = sample('zk_nft_subprocess_runs_total', command=command, status='failed')
+
+        result = run_subprocess([sys.executable, '-c', 'raise SystemExit(1)'])
+
+        assert result.returncode == 1
+        assert sample('zk_nft_subprocess_runs_total', command=command, status='failed') == before + 1
+        assert sample('zk_nft_subprocesses_in_flight') == 0
+
+    def test_metrics_endpoint_exposes_route_latency(self):
+        """/metrics는 URL 규칙 단위의 요청 지연시간을 노출합니다"""
+        self.client.get('/api/customer/nft/TOKEN_1')
+
+        response = self.client.get('/metrics')
+        body = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert 'route="/api/customer/nft/<token_id>"' in body
+        assert 'TOKEN_1' not in body
+        assert 'zk_nft_chain_cache_hit_ratio' in body
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,104 @@
+"""
+NFT 색인 및 목록 조회 테스트
+커서 기반 페이지 조회, NDJSON 스트리밍, 응답 압축을 테스트합니다.
+"""
+
+import gzip
+import json
+import pytest
+from app import create_app
+from utils.nft_index import NFTIndex, nft_index
+
+OWNER = '0x1111111111111111111111111111111111111111'
+
+
+def make_nft(number):
+    return {
+        'token_id': f'NFT_{number:04d}',
+        'name': 'Credit Grade B NFT',
+        'credit_grade': 'B',
+        'max_loan_amount': 50000000,
+        'issued_date': f'2024-01-15T10:{number // 60:02d}:{number % 60:02d}',
+        'issuer': 'EXTERNAL_AGENCY_001'
+    }
+
+
+class TestNFTIndex:
+    """NFT 색인 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.index = NFTIndex()
+        for number in range(25):
+            self.index.add(OWNER, make_nft(number))
+
+    def test_cursor_pagination_visits_every_token_once(self):
+        """커서를 따라가면 모든 NFT를 발행일 순서로 한 번씩 조회합니다"""
+        seen, cursor = [], None
+        while True:
+            items, cursor = self.index.page(OWNER.upper().replace('0X', '0x'), cursor, 10)
+            seen.extend(item['token_id'] for item in items)
+            if cursor is None:
+                break
+
+        assert seen == [f'NFT_{number:04d}' for number in range(25)]
+
+    def test_transfer_moves_token(self):
+        """전송하면 새 소유자의 목록으로 옮겨집니다"""
+        assert self.index.transfer('NFT_0003', '0x2222222222222222222222222222222222222222')
+
+        assert self.index.count(OWNER) == 24
+        items, _ = self.index.page('0x2222222222222222222222222222222222222222')
+        assert [item['token_id'] for item in items] == ['NFT_0003']
+
+    def test_invalid_cursor(self):
+        """잘못된 커서는 ValueError를 발생시킵니다"""
+        with pytest.raises(ValueError):
+            self.index.page(OWNER, 'not-a-cursor')
+
+
+class TestCustomerNFTList:
+    """고객 NFT 목록 API 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.client = create_app().test_client()
+        for number in range(120):
+            nft_index.add(OWNER, make_nft(number))
+
+    def teardown_method(self):
+        nft_index.clear()
+
+    def test_paginated_response(self):
+        """limit과 next_cursor로 페이지를 나누어 조회합니다"""
+        first = self.client.get(f'/api/customer/my-nfts/{OWNER}?limit=100').get_json()
+        second = self.client.get(
+            f'/api/customer/my-nfts/{OWNER}?limit=100&cursor={first["next_cursor"]}'
+        ).get_json()
+
+        assert first['total_nfts'] == 120
+        assert len(first['nfts']) == 100
+        assert len(second['nfts']) == 20
+        assert second['next_cursor'] is None
+        assert self.client.get(f'/api/customer/my-nfts/{OWNER}?cursor=broken').status_code == 400
+
+    def test_ndjson_stream(self):
+        """NDJSON 모드는 NFT를 한 줄에 하나씩 스트리밍합니다"""
+        response = self.client.get(f'/api/customer/my-nfts/{OWNER}', headers={'Accept': 'application/x-ndjson'})
+
+        lines = response.get_data(as_text=True).splitlines()
+        assert response.mimetype == 'application/x-ndjson'
+        assert len(lines) == 120
+        assert json.loads(lines[0])['token_id'] == 'NFT_0000'
+
+    def test_gzip_compression_above_threshold(self):
+        """큰 응답은 gzip으로 압축하고 작은 응답은 그대로 둡니다"""
+        response = self.client.get(f'/api/customer/my-nfts/{OWNER}', headers={'Accept-Encoding': 'gzip'})
+        small = self.client.get('/health', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(json.loads(gzip.decompress(response.data))['nfts']) == 50
+        assert 'Content-Encoding' not in small.headers
+
+if __name__ == '__main__':
+    pytest.main([__file__])
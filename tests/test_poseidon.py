@@ -0,0 +1,105 @@
+"""
+Poseidon 커밋먼트 테스트
+circomlib/ZoKrates와 같은 Poseidon 값을 내는지와 v3 회로의 입력 커밋먼트를 증명·NFT에 쓰는지 테스트합니다.
+"""
+
+import pytest
+from api import external
+from app import create_app, warm_up
+from utils.credit_circuit import circuit_inputs, commitment_key, commitment_salt, credit_commitment, format_field
+from utils.poseidon import FIELD_PRIME, parameters, poseidon
+from utils.zkp_utils import ZKPUtils
+
+
+class TestPoseidon:
+    """Poseidon 커밋먼트 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.zkp = ZKPUtils(circuit_version='v3')
+
+    def test_matches_circomlib(self):
+        """Grain LFSR로 만든 상수와 해시 값이 circomlib poseidon(t=3)과 같습니다"""
+        constants, mds = parameters()
+        assert len(constants) == (8 + 57) * 3
+        assert constants[0] == 0x0ee9a592ba9a9518d05986d656f40c2114c4993c11bb29938d21d47304cd8e6e
+        assert mds[0][0] == 0x109b7f411ba0e4c9b2b70caf5c36a7b194be7c11ad24378bfedb68592ba8118b
+        assert poseidon([1, 2]) == 7853200120776062878684798364095072458815029376092732009249414926327459813530
+        assert poseidon([1, 2 + FIELD_PRIME]) == poseidon([1, 2])
+        with pytest.raises(ValueError):
+            poseidon([1, 2, 3])
+
+    def test_commitment_hides_inputs(self):
+        """같은 입력도 솔트가 다르면 커밋먼트가 다르고, 고객별 솔트는 비밀키로 정해집니다"""
+        salt = commitment_salt('CUST_001', key='k1')
+        assert salt == commitment_salt('CUST_001', key='k1')
+        assert salt != commitment_salt('CUST_001', key='k2')
+        assert salt != commitment_salt('CUST_002', key='k1')
+
+        commitment = credit_commitment(750, 'B', 50000000, salt)
+        assert commitment == credit_commitment(750, 2, 50000000, salt)
+        assert commitment != credit_commitment(750, 'B', 50000000, salt + 1)
+        assert commitment != credit_commitment(751, 'B', 50000000, salt)
+        assert circuit_inputs(750, 'B', 50000000, salt) == ['750', '2', '50000000', str(salt)]
+
+    def test_commitment_proof(self):
+        """v3 증명은 SHA-256 해시 대신 커밋먼트 하나를 공개 입력으로 사용합니다"""
+        result = self.zkp.create_credit_score_proof(750, 'B', 50000000)
+        proof_data = result['proof_data']
+        assert 'credit_score_hash' not in proof_data and 'salt' not in proof_data
+        assert proof_data['public_inputs'] == [proof_data['commitment']]
+        assert proof_data['commitment'] == format_field(credit_commitment(750, 'B', 50000000, int(result['salt'])))
+        assert self.zkp.verify_credit_score_proof(proof_data)['is_valid'] is True
+
+        tampered = dict(proof_data, public_inputs=[format_field(1)])
+        assert self.zkp.verify_credit_score_proof(tampered)['is_valid'] is False
+
+        fixed = self.zkp.create_credit_score_proof(750, 'B', 50000000, salt=42)['proof_data']
+        assert fixed['commitment'] == self.zkp.create_credit_score_proof(750, 'B', 50000000, salt=42)['proof_data']['commitment']
+
+    def test_issued_nft_records_commitment(self, monkeypatch):
+        """v3 회로에서는 발행한 NFT에 커밋먼트를 기록하고, 입력이 같으면 같은 커밋먼트가 나옵니다"""
+        monkeypatch.setenv('ZKP_CIRCUIT_VERSION', 'v3')
+        monkeypatch.setenv('COMMITMENT_SALT_KEY', 'test-key')
+        _, proof_data, nft = external.issue_credit_nft('CUST_P01', '0xP01', 750, 'B', 50000000)
+        assert nft['commitment'] == proof_data['commitment']
+        assert 'credit_score_hash' not in proof_data
+
+        _, again, _ = external.issue_credit_nft('CUST_P01', '0xP01', 750, 'B', 50000000)
+        _, changed, _ = external.issue_credit_nft('CUST_P01', '0xP01', 820, 'A', 100000000)
+        assert again['commitment'] == proof_data['commitment']
+        assert changed['commitment'] != proof_data['commitment']
+
+
+    def test_salt_key_required(self, monkeypatch):
+        """비밀키가 비어 있거나 기본값이면 고객별 솔트를 만들지 않고 워밍업에서 오류로 알립니다"""
+        monkeypatch.setenv('COMMITMENT_SALT_KEY', '')
+        monkeypatch.setenv('SECRET_KEY', 'your-secret-key-here')
+        with pytest.raises(ValueError):
+            commitment_salt('CUST_001')
+        monkeypatch.setenv('SECRET_KEY', 'prod-secret')
+        assert commitment_key() == 'prod-secret'
+
+        monkeypatch.setenv('SECRET_KEY', 'dev-secret-key')
+        monkeypatch.setenv('ZKP_CIRCUIT_VERSION', 'v3')
+        result = warm_up(create_app(), include_chain=False)
+        assert result['steps']['commitment_key']['status'] == 'error'
+
+    def test_generate_proof_uses_random_salt(self, monkeypatch):
+        """호출자가 보낸 입력의 증명은 고객별 솔트 대신 무작위 솔트를 쓰므로 NFT 커밋먼트와 맞춰 볼 수 없습니다"""
+        monkeypatch.setenv('ZKP_CIRCUIT_VERSION', 'v3')
+        monkeypatch.setenv('COMMITMENT_SALT_KEY', 'test-key')
+        _, issued, _ = external.issue_credit_nft('CUST_P02', '0xP02', 750, 'B', 50000000)
+
+        data = {'customer_id': 'CUST_P02', 'credit_score': 750, 'credit_grade': 'B', 'max_loan_amount': 50000000}
+        body, status = external.handle_generate_proof(data)
+        assert status == 200
+        assert 'salt' not in body['proof_data']
+        assert body['proof_data']['commitment'] != issued['commitment']
+        assert body['proof_data']['commitment'] == \
+            format_field(credit_commitment(750, 'B', 50000000, int(body['salt'])))
+        assert external.handle_generate_proof(data)[0]['salt'] != body['salt']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,108 @@
+"""
+ZK-Proof 저장소 테스트
+(회로 산출물 해시, 신용등급, 입력 커밋먼트) 키로 증명을 보관·재사용하고 보관 기간이 지나면 버리는지 테스트합니다.
+"""
+
+import time
+import pytest
+from datetime import datetime
+from api import external
+from utils.proof_store import ProofStore, circuit_hash
+
+
+def make_proof(proof_id):
+    """테스트용 proof_data"""
+    return {'proof_id': proof_id, 'zk_proof': {'a': ['0x1', '0x2']}, 'public_inputs': ['0xabc']}
+
+
+class TestProofStore:
+    """ZK-Proof 저장소 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.artifact_hash = circuit_hash('v1')
+
+    def test_find_by_key(self, tmp_path):
+        """회로 해시·등급·커밋먼트가 모두 같아야 찾고, 증명 ID로도 조회합니다"""
+        store = ProofStore(str(tmp_path / 'proofs.db'), ttl=60)
+        store.put(self.artifact_hash, 'v1', 'B', '0xc1', make_proof('PROOF_1'), True)
+
+        found = store.find(self.artifact_hash, 'B', '0xc1')
+        assert found['proof_data'] == make_proof('PROOF_1')
+        assert found['verified'] is True
+        assert store.find(self.artifact_hash, 'A', '0xc1') is None
+        assert store.find(self.artifact_hash, 'B', '0xc2') is None
+        assert store.find(circuit_hash('v2'), 'B', '0xc1') is None
+        assert store.get('PROOF_1')['credit_grade'] == 'B'
+
+        # 같은 키로 다시 저장하면 이전 증명을 대체합니다
+        store.put(self.artifact_hash, 'v1', 'B', '0xc1', make_proof('PROOF_2'), False)
+        assert store.count() == 1
+        assert store.get('PROOF_1') is None
+        # 검증되지 않은 증명은 재사용하지 않습니다
+        assert store.find(self.artifact_hash, 'B', '0xc1') is None
+        assert store.set_verified('PROOF_2', True) and store.get('PROOF_2')['verified'] is True
+        assert store.find(self.artifact_hash, 'B', '0xc1')['proof_id'] == 'PROOF_2'
+
+    def test_expired_proofs(self, tmp_path):
+        """보관 기간이 지난 증명은 찾지 않고 지웁니다"""
+        store = ProofStore(str(tmp_path / 'proofs.db'), ttl=0.05)
+        store.put(self.artifact_hash, 'v1', 'B', '0xc1', make_proof('PROOF_1'), True)
+        time.sleep(0.1)
+        assert store.find(self.artifact_hash, 'B', '0xc1') is None
+        assert store.get('PROOF_1') is None
+        assert store.purge_expired() == 1
+        assert store.count() == 0
+
+    def test_reissue_skips_proving(self, tmp_path, monkeypatch):
+        """입력이 같은 재발행은 저장된 증명을 재사용하고, 입력이 바뀌면 새로 증명합니다"""
+        monkeypatch.setattr(external, 'proof_store', ProofStore(str(tmp_path / 'proofs.db'), ttl=60))
+        _, first, _ = external.issue_credit_nft('CUST_S01', '0xS01', 750, 'B', 50000000)
+        _, again, nft = external.issue_credit_nft('CUST_S01', '0xS01', 750, 'B', 50000000)
+        _, changed, _ = external.issue_credit_nft('CUST_S01', '0xS01', 760, 'B', 50000000)
+
+        assert again == first
+        assert nft['proof_id'] == first['proof_id']
+        assert changed['proof_id'] != first['proof_id']
+        assert external.proof_store.count() == 2
+
+        body, status = external.handle_get_proof(first['proof_id'])
+        assert status == 200
+        assert body['zk_proof'] == first['zk_proof']
+        assert body['status'] == 'verified'
+        assert body['metadata']['circuit_hash'] == circuit_hash()
+        assert external.handle_get_proof('PROOF_UNKNOWN')[1] == 404
+
+        # 검증되지 않은 증명은 재사용하지 않고 새로 증명합니다
+        external.proof_store.set_verified(first['proof_id'], False)
+        _, reproved, _ = external.issue_credit_nft('CUST_S01', '0xS01', 750, 'B', 50000000)
+        assert reproved['proof_id'] != first['proof_id']
+
+
+    def test_proof_outlives_nft(self, tmp_path, monkeypatch):
+        """저장하거나 재사용한 증명은 NFT 만료일까지 보관하고, 증명이 없는 NFT는 재사용하지 않고 재발행합니다"""
+        store = ProofStore(str(tmp_path / 'proofs.db'), ttl=60)
+        monkeypatch.setattr(external, 'proof_store', store)
+        _, proof_data, nft = external.issue_credit_nft('CUST_001', '0xS02', 750, 'B', 50000000)
+        nft_expiry = datetime.fromisoformat(nft['expiry_date']).timestamp()
+        assert store.get(proof_data['proof_id'])['expires_at'] >= nft_expiry
+
+        later = nft_expiry + 3600
+        assert store.extend(proof_data['proof_id'], later)
+        assert store.get(proof_data['proof_id'])['expires_at'] == later
+        assert not store.extend('PROOF_UNKNOWN', later)
+
+        request = {'customer_id': 'CUST_001', 'customer_name': '김철수', 'requested_amount': 1000,
+                   'purpose': '테스트', 'request_id': 'REQ_S02', 'customer_address': '0xS02'}
+        body, status = external.handle_credit_inquiry(request)
+        assert status == 200 and body['token_id'] == nft['token_id']
+
+        # 증명이 저장소에서 사라지면 mock 증명 대신 새로 발행합니다
+        monkeypatch.setattr(external, 'proof_store', ProofStore(str(tmp_path / 'empty.db'), ttl=60))
+        body, status = external.handle_credit_inquiry(request)
+        assert status == 200 and body['token_id'] != nft['token_id']
+        assert external.proof_store.get(body['proof_id']) is not None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
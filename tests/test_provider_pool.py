@@ -0,0 +1,208 @@
+"""
+JSON-RPC 프로바이더 풀 테스트
+로컬 대역(stand-in) JSON-RPC 서버를 띄워 라우팅, 장애 조치, 계정별 고정을 테스트합니다.
+"""
+
+import asyncio
+import json
+import time
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.async_blockchain_utils import AsyncBlockchainUtils
+from utils.provider_pool import ProviderPool, parse_endpoint_urls
+
+ACCOUNT_A = '0x742d35cc6634c0532925a3b8d4c9db96c4b4d8b6'
+ACCOUNT_B = '0x0000000000000000000000000000000000000001'
+
+
+class StandInNode:
+    """지연시간과 장애를 조절할 수 있는 로컬 JSON-RPC 노드"""
+
+    def __init__(self, delay=0.0, block_number=100):
+        self.delay = delay
+        self.block_number = block_number
+        self.down = False
+        self.calls = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                node.calls.append(body['method'])
+                if node.down:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                time.sleep(node.delay)
+                if body['method'] == 'eth_blockNumber':
+                    result = hex(node.block_number)
+                else:
+                    result = '0x1'
+                payload = json.dumps({'jsonrpc': '2.0', 'id': body['id'], 'result': result}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05},
+                                       daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestProviderPool:
+    """프로바이더 풀 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.fast = StandInNode(delay=0.0)
+        self.slow = StandInNode(delay=0.05)
+        self.pool = ProviderPool([self.slow.url, self.fast.url], health_check_interval=0,
+                                 request_timeout=2, failure_threshold=1)
+        self.pool.check_health()
+
+    def teardown_method(self):
+        self.fast.shutdown()
+        self.slow.shutdown()
+
+    def test_reads_go_to_lowest_latency_node(self):
+        """읽기 요청은 가장 빠른 정상 노드로 라우팅됩니다"""
+        self.fast.calls.clear()
+        self.slow.calls.clear()
+
+        for _ in range(5):
+            self.pool.make_request('eth_chainId', [])
+
+        assert self.fast.calls.count('eth_chainId') == 5
+        assert 'eth_chainId' not in self.slow.calls
+
+    def test_failover_on_error(self):
+        """노드 장애 시 다음 노드로 장애 조치됩니다"""
+        self.fast.down = True
+
+        response = self.pool.make_request('eth_chainId', [])
+
+        assert response['result'] == '0x1'
+        assert 'eth_chainId' in self.slow.calls
+        status = {endpoint['url']: endpoint for endpoint in self.pool.get_status()}
+        assert status[self.fast.url]['healthy'] is False
+
+    def test_health_check_recovers_node(self):
+        """상태 확인으로 복구된 노드는 다시 라우팅됩니다"""
+        self.fast.down = True
+        self.pool.make_request('eth_chainId', [])
+
+        self.fast.down = False
+        self.pool.check_health()
+
+        status = {endpoint['url']: endpoint for endpoint in self.pool.get_status()}
+        assert status[self.fast.url]['healthy'] is True
+
+    def test_lagging_node_is_excluded(self):
+        """블록 높이가 크게 뒤처진 노드는 제외됩니다"""
+        self.fast.block_number = 10
+
+        self.pool.check_health()
+
+        status = {endpoint['url']: endpoint for endpoint in self.pool.get_status()}
+        assert status[self.fast.url]['healthy'] is False
+        assert status[self.slow.url]['healthy'] is True
+
+    def test_writes_are_pinned_per_account(self):
+        """쓰기 요청은 계정별로 같은 노드에 고정됩니다"""
+        self.pool.make_request('eth_getTransactionCount', [ACCOUNT_A, 'pending'])
+        pinned_url = self.fast.url
+
+        # 지연시간 순위가 바뀌어도 고정은 유지됩니다
+        self.fast.delay = 0.1
+        self.slow.delay = 0.0
+        self.pool.check_health()
+        self.fast.calls.clear()
+
+        for _ in range(3):
+            self.pool.make_request('eth_getTransactionCount', [ACCOUNT_A, 'pending'])
+
+        assert self.fast.calls.count('eth_getTransactionCount') == 3
+        assert self.pool._pinned[ACCOUNT_A].url == pinned_url
+
+    def test_pinned_write_fails_over(self):
+        """고정된 노드가 실패하면 다른 노드로 다시 고정됩니다"""
+        self.pool.make_request('eth_getTransactionCount', [ACCOUNT_B, 'pending'])
+        self.fast.down = True
+
+        self.pool.make_request('eth_getTransactionCount', [ACCOUNT_B, 'pending'])
+
+        assert self.pool._pinned[ACCOUNT_B].url == self.slow.url
+
+    def test_all_endpoints_down(self):
+        """모든 노드가 실패하면 ConnectionError가 발생합니다"""
+        self.fast.down = True
+        self.slow.down = True
+
+        with pytest.raises(ConnectionError):
+            self.pool.make_request('eth_chainId', [])
+
+
+def test_parse_endpoint_urls():
+    """엔드포인트 URL 파싱 테스트"""
+    assert parse_endpoint_urls('http://a:8545, http://b:8545') == ['http://a:8545', 'http://b:8545']
+    assert parse_endpoint_urls(['http://a:8545']) == ['http://a:8545']
+
+
+def test_async_utils_accepts_endpoint_list():
+    """비동기 유틸리티는 쉼표로 구분한 BLOCKCHAIN_URL에서 첫 번째 노드에 먼저 연결합니다"""
+    node = StandInNode(block_number=42)
+    chain = AsyncBlockchainUtils(f'{node.url}, http://127.0.0.1:1')
+    assert chain.blockchain_url == node.url
+    assert chain.endpoint_urls[1] == 'http://127.0.0.1:1'
+
+    async def connect():
+        try:
+            return await chain.connect_to_blockchain()
+        finally:
+            await chain.close()
+
+    try:
+        result = asyncio.run(connect())
+        assert result['status'] == 'success', result
+        assert result['latest_block'] == 42
+    finally:
+        node.shutdown()
+
+
+
+def test_async_utils_fail_over_to_next_endpoint():
+    """비동기 유틸리티는 첫 번째 노드가 오류를 내면 다음 노드로 넘어가 다시 시도합니다"""
+    down, up = StandInNode(block_number=1), StandInNode(block_number=7)
+    down.down = True
+    chain = AsyncBlockchainUtils([down.url, up.url])
+
+    async def read():
+        try:
+            return await chain.connect_to_blockchain(), await chain.get_block_number()
+        finally:
+            await chain.close()
+
+    try:
+        connected, block_number = asyncio.run(read())
+        assert connected['status'] == 'success', connected
+        assert (connected['endpoint'], connected['latest_block'], block_number) == (up.url, 7, 7)
+        # 전환 후에는 실패한 노드로 다시 보내지 않습니다
+        assert set(down.calls) == {'eth_blockNumber'}
+        assert up.calls.count('eth_blockNumber') == 2 and 'eth_chainId' in up.calls
+    finally:
+        down.shutdown()
+        up.shutdown()
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,143 @@
+"""
+속도 제한 / 수용 제어 테스트
+토큰 버킷 충전, 공유 SQLite 저장소, 우선순위별 수용 제어, 429/503 응답을 테스트합니다.
+"""
+
+import pytest
+from app import create_app
+from api import external
+from utils.rate_limiter import (
+    AdmissionController, MemoryBucketStore, RateLimiter, SQLiteBucketStore, identify_partner, parse_partners,
+    parse_rule, request_priority
+)
+
+
+class FakeClock:
+    """수동으로 진행하는 테스트용 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """속도 제한과 수용 제어 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.clock = FakeClock()
+
+    def test_token_bucket_refills(self):
+        """버킷 용량만큼 허용한 뒤 충전 속도에 맞춰 다시 허용합니다"""
+        assert parse_rule('2/min') == (2.0, 2 / 60)
+        limiter = RateLimiter(MemoryBucketStore(clock=self.clock), {'customer_id': parse_rule('2/min')})
+
+        assert limiter.check({'customer_id': 'CUST_001'}) is None
+        assert limiter.check({'customer_id': 'CUST_001'}) is None
+        dimension, retry_after = limiter.check({'customer_id': 'CUST_001'})
+        assert dimension == 'customer_id'
+        assert retry_after == pytest.approx(30)
+        assert limiter.check({'customer_id': 'CUST_002'}) is None
+
+        self.clock.now += 30
+        assert limiter.check({'customer_id': 'CUST_001'}) is None
+
+    def test_sqlite_store_is_shared(self, tmp_path):
+        """같은 SQLite 파일을 쓰는 저장소들은 한도를 공유합니다"""
+        path = str(tmp_path / 'rate_limit.db')
+        first = SQLiteBucketStore(path, clock=self.clock)
+        second = SQLiteBucketStore(path, clock=self.clock)
+
+        assert first.take('bank_id:BANK_001', 2, 1)[0]
+        assert second.take('bank_id:BANK_001', 2, 1)[0]
+        allowed, retry_after = first.take('bank_id:BANK_001', 2, 1)
+        assert not allowed
+        assert retry_after == pytest.approx(1)
+
+    def test_batch_shed_before_interactive(self):
+        """포화 상태에서 배치 요청을 먼저 거절하고 대화형 요청은 계속 수용합니다"""
+        controller = AdmissionController(batch_per_worker=1, interactive_per_worker=2, workers=lambda: 2)
+
+        assert controller.try_acquire('batch')
+        assert controller.try_acquire('batch')
+        assert not controller.try_acquire('batch')
+        assert controller.try_acquire('interactive')
+        assert controller.try_acquire('interactive')
+        assert not controller.try_acquire('interactive')
+
+        controller.release()
+        assert controller.try_acquire('interactive')
+        assert controller.in_flight == 4
+
+    def test_credit_inquiry_rejections(self, monkeypatch):
+        """한도를 넘으면 429, 증명 풀이 포화되면 503을 Retry-After와 함께 반환합니다"""
+        monkeypatch.setattr(external, 'rate_limiter', RateLimiter(
+            MemoryBucketStore(clock=self.clock), {'customer_id': parse_rule('1/min')}
+        ))
+        controller = AdmissionController(batch_per_worker=1, interactive_per_worker=2, workers=lambda: 1)
+        monkeypatch.setattr(external, 'admission_controller', controller)
+        client = create_app().test_client()
+        payload = {'customer_id': 'CUST_404', 'bank_id': 'BANK_001'}
+
+        assert client.post('/api/external/credit-inquiry', json=payload).status_code != 429
+        response = client.post('/api/external/credit-inquiry', json=payload)
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '60'
+        assert response.get_json()['limit'] == 'customer_id'
+
+        assert controller.try_acquire('batch')
+        payload['customer_id'] = 'CUST_405'
+        response = client.post('/api/external/credit-inquiry', json=payload)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        # 제휴기관 키 없이 보낸 interactive 헤더는 batch로 처리됩니다
+        monkeypatch.setenv('PARTNER_KEYS', 'bank-key=BANK_001:interactive')
+        interactive = {'X-Request-Priority': 'interactive'}
+        assert client.post('/api/external/credit-inquiry', json={**payload, 'customer_id': 'CUST_406'},
+                           headers=interactive).status_code == 503
+        assert client.post('/api/external/credit-inquiry', json={**payload, 'customer_id': 'CUST_407'},
+                           headers={**interactive, 'X-Partner-Key': 'bank-key'}).status_code != 503
+        assert controller.in_flight == 1
+
+    def test_admission_counts_prover_queue(self):
+        """증명 생성 큐 깊이가 한도에 도달하면 수용한 요청이 없어도 거절합니다"""
+        depth = [0]
+        controller = AdmissionController(batch_per_worker=1, interactive_per_worker=2, workers=lambda: 2,
+                                         queue_depth=lambda: depth[0])
+
+        depth[0] = 2
+        assert not controller.try_acquire('batch')
+        assert controller.try_acquire('interactive')
+        depth[0] = 4
+        assert not controller.try_acquire('interactive')
+        assert controller.in_flight == 1
+
+    def test_partner_identity(self, monkeypatch):
+        """은행 식별자와 최고 우선순위는 제휴기관 키 설정에서 가져옵니다"""
+        monkeypatch.setenv('PARTNER_KEYS', 'k1=BANK_001:interactive, k2=BANK_002')
+
+        assert identify_partner('k1', '10.0.0.1') == ('BANK_001', 'interactive')
+        assert identify_partner('k2', '10.0.0.1') == ('BANK_002', 'batch')
+        assert identify_partner('wrong', '10.0.0.1') == ('anonymous:10.0.0.1', 'batch')
+        assert identify_partner(None) == ('anonymous:unknown', 'batch')
+        assert request_priority('interactive', 'batch') == 'batch'
+        assert request_priority('interactive', 'interactive') == 'interactive'
+        with pytest.raises(ValueError):
+            parse_partners('k3=BANK_003:urgent')
+
+    def test_rejection_refunds_other_buckets(self):
+        """고객 한도로 거절된 요청은 은행 버킷의 토큰을 쓰지 않습니다"""
+        limiter = RateLimiter(MemoryBucketStore(clock=self.clock), {
+            'bank_id': parse_rule('2/min'), 'customer_id': parse_rule('1/min')
+        })
+
+        assert limiter.check({'bank_id': 'BANK_001', 'customer_id': 'CUST_1'}) is None
+        for _ in range(5):
+            assert limiter.check({'bank_id': 'BANK_001', 'customer_id': 'CUST_1'})[0] == 'customer_id'
+        assert limiter.check({'bank_id': 'BANK_001', 'customer_id': 'CUST_2'}) is None
+        assert limiter.check({'bank_id': 'BANK_001', 'customer_id': 'CUST_3'})[0] == 'bank_id'
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,132 @@
+"""
+NFT 재등급 테스트
+등급 경계를 넘은 고객만 재증명 대상으로 고르고, 나머지는 정책에 따라 유효기간만 연장하는지 테스트합니다.
+"""
+
+import os
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from api import external, regrade
+from api.bank import load_bank_criteria
+from utils.credit_store import CreditStore
+
+
+def make_nft(customer_id, grade, issued, expires):
+    """테스트용 NFT 메타데이터"""
+    return {
+        'token_id': f'NFT_{customer_id}',
+        'customer_id': customer_id,
+        'customer_address': f'0x{customer_id}',
+        'proof_id': f'PROOF_{customer_id}',
+        'issue_date': issued.isoformat(),
+        'expiry_date': expires.isoformat(),
+        'is_valid': True,
+        'attributes': [
+            {'trait_type': 'Credit Grade', 'value': grade},
+            {'trait_type': 'Expiry Date', 'value': expires.isoformat()}
+        ]
+    }
+
+
+class TestRegrade:
+    """NFT 재등급 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.criteria = load_bank_criteria()
+        self.now = datetime.now()
+        issued = self.now - timedelta(days=25)
+        self.nfts = [
+            make_nft('CUST_001', 'B', issued, self.now + timedelta(days=5)),
+            make_nft('CUST_002', 'A', issued, self.now + timedelta(days=5)),
+            make_nft('CUST_003', 'C', self.now, self.now + timedelta(days=30))
+        ]
+
+    def test_grade_bands(self):
+        """은행 기준의 점수 구간으로 등급을 계산합니다"""
+        bands = regrade.grade_bands(self.criteria)
+        assert [grade for _, grade in bands] == ['A', 'B', 'C', 'D', 'E']
+        assert regrade.grade_for_score(800, bands) == 'A'
+        assert regrade.grade_for_score(799, bands) == 'B'
+        assert regrade.grade_for_score(0, bands) == 'E'
+
+    def test_only_boundary_crossings_are_reproved(self):
+        """등급이 바뀐 고객만 재증명하고, 만료가 가까운 나머지는 연장합니다"""
+        credit = {'CUST_001': {'credit_score': 690}, 'CUST_002': {'credit_score': 810},
+                  'CUST_003': {'credit_score': 650}}
+
+        plan = regrade.plan_regrade(self.nfts, credit, self.criteria, now=self.now)
+
+        assert [(nft['customer_id'], grade) for nft, _, grade in plan['reprove']] == [('CUST_001', 'C')]
+        assert [nft['customer_id'] for nft in plan['extend']] == ['CUST_002']
+        assert [nft['customer_id'] for nft in plan['unchanged']] == ['CUST_003']
+
+    def test_extension_policy(self, monkeypatch):
+        """연장은 증명 생성일로부터 최대 기간을 넘지 않고, 비활성화할 수 있습니다"""
+        nft = self.nfts[1]
+        monkeypatch.setenv('REGRADE_MAX_PROOF_AGE_DAYS', '40')
+        assert not regrade.can_extend(nft, self.now)
+
+        monkeypatch.setenv('REGRADE_MAX_PROOF_AGE_DAYS', '90')
+        assert regrade.can_extend(nft, self.now)
+        expiry_date = regrade.extend_validity(nft, self.now)
+        assert nft['expiry_date'] == expiry_date
+        assert nft['attributes'][1]['value'] == expiry_date
+        assert nft['validity_extensions'] == 1
+
+        monkeypatch.setenv('REGRADE_EXTEND_VALIDITY', 'false')
+        assert not regrade.can_extend(self.nfts[0], self.now)
+
+    def test_dry_run_limited_to_ingest_changes(self, tmp_path, monkeypatch):
+        """적재 작업 ID를 지정하면 해당 적재에서 바뀐 고객만 재평가합니다"""
+        store = CreditStore(str(tmp_path / 'credit.db'))
+        store.upsert_many([{'customer_id': 'CUST_001', 'credit_score': 750},
+                           {'customer_id': 'CUST_002', 'credit_score': 820}])
+        store.merge_records([{'customer_id': 'CUST_001', 'credit_score': 690},
+                             {'customer_id': 'CUST_002', 'credit_score': 805}], ingest_id='INGEST_TEST')
+        monkeypatch.setenv('CREDIT_DATA_BACKEND', 'sqlite')
+        monkeypatch.setattr(regrade, 'credit_store', store)
+        monkeypatch.setattr(external, 'nft_storage', {nft['token_id']: nft for nft in self.nfts})
+
+        body, status = regrade.handle_regrade({'ingest_id': 'INGEST_TEST', 'dry_run': True})
+
+        assert status == 200
+        assert body['evaluated'] == 3
+        assert body['reprove_tokens'] == ['NFT_CUST_001']
+        assert body['extend_tokens'] == ['NFT_CUST_002']
+        assert body['skipped'] == 0
+
+    def test_reissue_runs_in_background(self, tmp_path, monkeypatch):
+        """재증명은 백그라운드 작업으로 실행하고, 요청은 작업 ID와 함께 바로 202를 반환합니다"""
+        store = CreditStore(str(tmp_path / 'credit.db'))
+        store.upsert_many([{'customer_id': 'CUST_001', 'credit_score': 690}])
+        monkeypatch.setenv('CREDIT_DATA_BACKEND', 'sqlite')
+        monkeypatch.setattr(regrade, 'credit_store', store)
+        monkeypatch.setattr(external, 'nft_storage', {'NFT_CUST_001': self.nfts[0]})
+        release = threading.Event()
+
+        def slow_reissue(nft, credit_score, credit_grade, max_loan_amount):
+            release.wait(5)
+            return {'previous_token_id': nft['token_id'], 'credit_grade': credit_grade}
+
+        monkeypatch.setattr(regrade, 'reissue_nft', slow_reissue)
+
+        body, status = regrade.handle_regrade({})
+        assert status == 202
+        assert body['status'] == 'running' and body['worker_pid'] == os.getpid()
+        assert regrade.handle_regrade_status(body['job_id'])[0]['status'] == 'running'
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while regrade.handle_regrade_status(body['job_id'])[0]['status'] == 'running' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        job, status = regrade.handle_regrade_status(body['job_id'])
+        assert status == 200 and job['status'] == 'completed'
+        assert job['reissued'] == [{'previous_token_id': 'NFT_CUST_001', 'credit_grade': 'C'}]
+        assert regrade.handle_regrade_status('REGRADE_UNKNOWN')[1] == 404
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
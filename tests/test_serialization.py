@@ -0,0 +1,85 @@
+"""
+응답 직렬화 테스트
+orjson 프로바이더와 ?fields= 응답 필드 선택을 테스트합니다.
+"""
+
+import json
+import pytest
+from datetime import datetime
+from app import create_app
+from utils import wire_format
+from utils.serialization import select_fields
+
+LOAN_RESPONSE = {
+    'request_id': 'REQ_001',
+    'approval_status': 'approved',
+    'external_response': {
+        'token_id': 'NFT_001',
+        'nft_metadata': {'token_id': 'NFT_001', 'attributes': [{'trait_type': 'Credit Grade', 'value': 'B'}]}
+    }
+}
+
+
+class TestSelectFields:
+    """응답 필드 선택 테스트"""
+
+    def test_include_nested_paths(self):
+        """점으로 구분한 경로의 필드만 남깁니다"""
+        selected = select_fields(LOAN_RESPONSE, 'request_id,external_response.token_id')
+
+        assert selected == {'request_id': 'REQ_001', 'external_response': {'token_id': 'NFT_001'}}
+
+    def test_exclude_embedded_metadata(self):
+        """-로 시작하는 경로는 제외하며 원본은 수정하지 않습니다"""
+        selected = select_fields(LOAN_RESPONSE, '-external_response.nft_metadata')
+
+        assert selected['external_response'] == {'token_id': 'NFT_001'}
+        assert 'nft_metadata' in LOAN_RESPONSE['external_response']
+
+    def test_error_field_is_kept(self):
+        """오류 응답의 error 필드는 선택과 관계없이 남습니다"""
+        assert select_fields({'error': 'Not found', 'code': 404}, 'code') == {'code': 404, 'error': 'Not found'}
+
+
+class TestFastJSONProvider:
+    """orjson 프로바이더 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.app = create_app()
+        self.client = self.app.test_client()
+
+    def test_fields_query_parameter(self):
+        """?fields=로 응답 필드를 선택합니다"""
+        response = self.client.get('/api/customer/nft/TOKEN_1?fields=token_id,owner')
+
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'token_id': 'TOKEN_1', 'owner': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'
+        }
+
+    def test_large_integers_fall_back_to_stdlib(self):
+        """64비트를 넘는 정수도 직렬화합니다"""
+        token_id = 2 ** 200
+
+        with self.app.test_request_context():
+            body = self.app.json.response({'token_id': token_id, '이름': '신용등급'}).get_data()
+
+        assert json.loads(body) == {'token_id': token_id, '이름': '신용등급'}
+
+    def test_binary_response_falls_back_to_json(self):
+        """MessagePack을 요청해도 바이너리로 표현할 수 없는 값이 있으면 JSON으로 응답합니다"""
+        headers = {'Accept': wire_format.MSGPACK}
+
+        with self.app.test_request_context(headers=headers):
+            binary = self.app.json.response({'token_id': 2 ** 200})
+        with self.app.test_request_context(headers=headers):
+            fallback = self.app.json.response({'issued_at': datetime(2024, 1, 15, 10, 0)})
+
+        assert binary.mimetype == wire_format.MSGPACK
+        assert wire_format.decode(binary.get_data(), binary.mimetype) == {'token_id': 2 ** 200}
+        assert fallback.mimetype == wire_format.JSON
+        assert json.loads(fallback.get_data()) == {'issued_at': '2024-01-15T10:00:00'}
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,53 @@
+"""
+시작 성능 테스트
+지연 import, 워밍업 단계 기록, JSON 데이터 캐시를 테스트합니다.
+"""
+
+import os
+import sys
+import json
+import subprocess
+import pytest
+from app import create_app, warm_up
+from api.common import load_json_cached
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup:
+    """앱 시작 및 워밍업 테스트"""
+
+    def test_create_app_does_not_import_web3(self):
+        """create_app()은 블록체인 기능을 쓰기 전까지 web3를 불러오지 않습니다"""
+        code = "import sys, app; app.create_app(); print('web3' in sys.modules, 'eth_account' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=60)
+
+        assert result.stdout.strip().splitlines()[-1] == 'False False'
+
+    def test_warm_up_records_timings(self):
+        """워밍업은 단계별 결과와 소요 시간을 기록하고 /health/startup으로 노출합니다"""
+        app = create_app()
+
+        result = warm_up(app, include_chain=False)
+        timings = app.test_client().get('/health/startup').get_json()
+
+        assert set(result['steps']) == {'bank_criteria', 'credit_data', 'zokrates_artifacts', 'external_http_pool'}
+        assert result['steps']['credit_data']['status'] == 'success'
+        assert 'create_app' in timings
+        assert 'warm_up.credit_data' in timings
+
+    def test_json_cache_reloads_after_change(self, tmp_path):
+        """JSON 데이터는 파일이 바뀔 때만 다시 읽습니다"""
+        path = tmp_path / 'criteria.json'
+        path.write_text(json.dumps({'version': 1}))
+
+        first = load_json_cached(str(path))
+        assert load_json_cached(str(path)) is first
+
+        path.write_text(json.dumps({'version': 2}))
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+        assert load_json_cached(str(path)) == {'version': 2}
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,83 @@
+"""
+합성 신용정보 / 신용정보 저장소 테스트
+생성기의 재현성과 값 범위, SQLite·columnar 출력, 저장소 조회, 규모별 픽스처를 테스트합니다.
+"""
+
+import os
+import numpy as np
+import pytest
+from api import external
+from benchmarks import fixtures
+from benchmarks.synthetic_credit import generate, generate_chunks, iter_records, load_columnar
+from utils.credit_store import CreditStore
+
+
+class TestSyntheticCredit:
+    """합성 신용정보 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.chunk = next(generate_chunks(5000, seed=7, chunk_size=5000))
+
+    def test_generator_is_reproducible_and_in_range(self):
+        """같은 시드는 같은 데이터를 만들고 필드 값은 유효 범위 안에 있습니다"""
+        again = next(generate_chunks(5000, seed=7, chunk_size=5000))
+        assert np.array_equal(self.chunk['credit_score'], again['credit_score'])
+        assert self.chunk['credit_score'].min() >= 300 and self.chunk['credit_score'].max() <= 1000
+        assert 0 <= self.chunk['debt_ratio'].min() and self.chunk['debt_ratio'].max() <= 1.2
+
+        record = next(iter_records(self.chunk))
+        assert record['customer_id'] == 'CUST_0000001'
+        assert record['payment_history'] in ('excellent', 'good', 'fair', 'poor')
+        # 신용점수가 높을수록 부채비율이 낮습니다
+        high = self.chunk['credit_score'] >= 800
+        assert self.chunk['debt_ratio'][high].mean() < self.chunk['debt_ratio'][~high].mean()
+
+    def test_sqlite_store_round_trip(self, tmp_path):
+        """SQLite로 생성한 고객을 저장소에서 조회합니다"""
+        path = str(tmp_path / 'credit.db')
+        assert generate(5000, 'sqlite', path, seed=7, chunk_size=5000) == 5000
+
+        store = CreditStore(path)
+        first = next(iter_records(self.chunk))
+        assert store.count() == 5000
+        assert store.get('CUST_0000001') == {k: v for k, v in first.items() if k != 'customer_id'}
+        assert set(store.get_many(['CUST_0000002', 'CUST_9999999'])) == {'CUST_0000002'}
+        assert sum(1 for _ in store.iter_customers(batch_size=700)) == 5000
+        assert store.metadata()['data_source'] == 'synthetic'
+
+    def test_columnar_output_is_memory_mapped(self, tmp_path):
+        """columnar 출력은 열별로 메모리 매핑해 읽습니다"""
+        path = str(tmp_path / 'credit_columns')
+        generate(5000, 'columnar', path, seed=7, chunk_size=5000)
+
+        columns = load_columnar(path, ['credit_score', 'payment_history'])
+        assert isinstance(columns['credit_score'], np.memmap)
+        assert np.array_equal(columns['credit_score'], self.chunk['credit_score'])
+        assert np.array_equal(columns['payment_history'], self.chunk['payment_history'])
+
+    def test_credit_inquiry_lookup_uses_store(self, tmp_path, monkeypatch):
+        """CREDIT_DATA_BACKEND=sqlite이면 신용정보 조회가 저장소를 사용합니다"""
+        store = CreditStore(str(tmp_path / 'credit.db'))
+        store.upsert_many([{'customer_id': 'CUST_0000001', 'name': '홍길동', 'credit_score': 810}])
+        monkeypatch.setattr(external, 'credit_store', store)
+        monkeypatch.setenv('CREDIT_DATA_BACKEND', 'sqlite')
+
+        assert external.get_customer_credit('CUST_0000001')['credit_score'] == 810
+        assert external.get_customer_credit('CUST_001') is None
+
+    def test_fixture_is_generated_once(self, tmp_path, monkeypatch):
+        """픽스처는 처음 요청할 때만 생성하고 고객 표본을 고를 수 있습니다"""
+        monkeypatch.setenv('BENCH_FIXTURE_DIR', str(tmp_path))
+        path = fixtures.ensure_fixture('tiny', 'sqlite')
+        mtime = os.stat(path).st_mtime_ns
+
+        assert fixtures.ensure_fixture('tiny', 'sqlite') == path
+        assert os.stat(path).st_mtime_ns == mtime
+        customers = fixtures.sample_customers('tiny', 10)
+        assert len(customers) == 10
+        assert all(c['customer_name'] != c['customer_id'] for c in customers)
+        assert customers[0]['customer_address'].startswith('0x') and len(customers[0]['customer_address']) == 42
+
+if __name__ == '__main__':
+    pytest.main([__file__])
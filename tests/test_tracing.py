@@ -0,0 +1,126 @@
+"""
+분산 추적 테스트
+traceparent 해석과 전달, 스팬 부모 관계, 증명 생성 풀로의 컨텍스트 전달을 테스트합니다.
+"""
+
+import pytest
+from app import create_app
+from utils import tracing
+from utils.tracing import HttpSpanExporter, Tracer, inject_headers, parse_traceparent
+from utils.zkp_utils import ZKPUtils
+
+UPSTREAM_TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+UPSTREAM_TRACEPARENT = f'00-{UPSTREAM_TRACE_ID}-00f067aa0ba902b7-01'
+
+
+class RecordingProcessor:
+    """종료된 스팬을 메모리에 모으는 테스트용 처리기"""
+
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+
+class TestTracing:
+    """추적 컨텍스트 전달 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.processor = RecordingProcessor()
+        self.tracer = Tracer(processor=self.processor)
+
+    def test_parse_traceparent(self):
+        """올바른 traceparent만 해석합니다"""
+        assert parse_traceparent(UPSTREAM_TRACEPARENT) == (UPSTREAM_TRACE_ID, '00f067aa0ba902b7', True)
+        assert parse_traceparent(f'00-{UPSTREAM_TRACE_ID}-00f067aa0ba902b7-00')[2] is False
+        assert parse_traceparent('00-' + '0' * 32 + '-00f067aa0ba902b7-01') is None
+        assert parse_traceparent('invalid') is None
+        assert parse_traceparent(None) is None
+
+    def test_child_spans_and_header_injection(self):
+        """하위 스팬은 상위 트레이스를 잇고 나가는 요청에 자신의 traceparent를 전달합니다"""
+        span, token = self.tracer.begin_span('POST /api/bank/loan-request', traceparent=UPSTREAM_TRACEPARENT)
+        with self.tracer.start_span('external_http') as child:
+            headers = inject_headers({'Content-Type': 'application/json'})
+        self.tracer.end_span(span, token)
+
+        assert child.trace_id == UPSTREAM_TRACE_ID
+        assert child.parent_id == span.span_id
+        assert span.parent_id == '00f067aa0ba902b7'
+        assert headers['traceparent'] == child.traceparent
+        assert [s.name for s in self.processor.spans] == ['external_http', 'POST /api/bank/loan-request']
+        assert inject_headers() == {}
+
+    def test_error_marks_span(self):
+        """예외가 발생한 스팬은 오류로 표시됩니다"""
+        with pytest.raises(ValueError):
+            with self.tracer.start_span('prove'):
+                raise ValueError('circuit failed')
+
+        assert self.processor.spans[0].status == 'error'
+        assert self.processor.spans[0].attributes['error.type'] == 'ValueError'
+
+    def test_http_exporter_sends_otlp_json(self):
+        """http 내보내기는 OTLP/JSON 본문(resourceSpans)을 POST 합니다"""
+        posted = []
+
+        class FakeResponse:
+            def raise_for_status(self):
+                pass
+
+        class FakeSession:
+            def post(self, url, json, timeout):
+                posted.append((url, json))
+                return FakeResponse()
+
+        with pytest.raises(ValueError):
+            with self.tracer.start_span('credit_inquiry', customer_count=2):
+                with self.tracer.start_span('prove', cached=False):
+                    raise ValueError('circuit failed')
+        exporter = HttpSpanExporter('http://collector:4318/v1/traces')
+        exporter.session = FakeSession()
+        exporter.export([span.to_dict() for span in self.processor.spans])
+
+        url, body = posted[0]
+        resource_spans = body['resourceSpans'][0]
+        prove, inquiry = resource_spans['scopeSpans'][0]['spans']
+        assert url == 'http://collector:4318/v1/traces'
+        assert resource_spans['resource']['attributes'] == [{'key': 'service.name', 'value': {'stringValue': 'zk-nft'}}]
+        assert (prove['traceId'], prove['parentSpanId']) == (inquiry['traceId'], inquiry['spanId'])
+        assert 'parentSpanId' not in inquiry
+        assert int(prove['endTimeUnixNano']) >= int(prove['startTimeUnixNano'])
+        assert {'key': 'cached', 'value': {'boolValue': False}} in prove['attributes']
+        assert {'key': 'customer_count', 'value': {'intValue': '2'}} in inquiry['attributes']
+        assert prove['status'] == {'code': 2, 'message': 'circuit failed'}
+        assert inquiry['status'] == {'code': 2, 'message': 'circuit failed'}
+
+    def test_prover_job_inherits_trace(self):
+        """증명 생성 풀 작업은 제출한 요청의 트레이스를 이어받습니다"""
+        zkp_utils = ZKPUtils(prover_workers=1)
+
+        with self.tracer.start_span('POST /api/external/credit-inquiry') as span:
+            job_trace_id = zkp_utils.submit(lambda: inject_headers()['traceparent']).result(timeout=5)
+
+        assert parse_traceparent(job_trace_id)[0] == span.trace_id
+        zkp_utils.shutdown_prover_pool()
+
+    def test_request_continues_upstream_trace(self):
+        """요청 스팬은 traceparent 헤더의 트레이스를 이어받습니다"""
+        client = create_app().test_client()
+        original = tracing.tracer.processor
+        tracing.tracer.processor = self.processor
+        try:
+            response = client.get('/health', headers={'traceparent': UPSTREAM_TRACEPARENT})
+        finally:
+            tracing.tracer.processor = original
+
+        request_span = self.processor.spans[-1]
+        assert response.status_code == 200
+        assert request_span.name == 'GET /health'
+        assert request_span.trace_id == UPSTREAM_TRACE_ID
+        assert request_span.attributes['http.status_code'] == 200
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,79 @@
+"""
+바이너리 전송 형식 테스트
+MessagePack/CBOR 인코딩, 16진수 필드 복원, 요청·응답 협상을 테스트합니다.
+"""
+
+import pytest
+from datetime import datetime
+from app import create_app
+from utils import wire_format
+
+PROOF_DATA = {
+    'proof_id': 'PROOF_INQ_CUST_001_1705312200',
+    'credit_score_hash': 'c2b8e7a1d3f4' * 5 + 'abcd',
+    'zk_proof': {
+        'a': ['0x' + '0a' * 32, '0x1234567890abcdef'],
+        'c': ['0x5555555555555555', '0x6666666666666666']
+    },
+    'customer_address': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6',
+    'max_loan_amount': 50000000
+}
+
+
+class TestWireFormat:
+    """바이너리 전송 형식 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.client = create_app().test_client()
+
+    @pytest.mark.parametrize('mimetype', [wire_format.MSGPACK, wire_format.CBOR])
+    def test_round_trip_restores_hex_strings(self, mimetype):
+        """16진수 필드는 원시 바이트로 전송되고 원래 문자열로 복원됩니다"""
+        encoded = wire_format.encode(PROOF_DATA, mimetype)
+
+        assert wire_format.decode(encoded, mimetype) == PROOF_DATA
+        assert len(encoded) < len(wire_format.encode(PROOF_DATA, wire_format.JSON))
+        assert bytes.fromhex('0a' * 32) in encoded
+
+    @pytest.mark.parametrize('mimetype', [wire_format.MSGPACK, wire_format.CBOR])
+    def test_large_integers_round_trip(self, mimetype):
+        """64비트를 넘는 정수는 확장 타입(CBOR는 bignum)으로 보내고 그대로 복원합니다"""
+        values = {'token_id': 2 ** 200, 'negative': -2 ** 70, 'edges': [2 ** 64, -2 ** 63 - 1, 2 ** 64 - 1]}
+
+        assert wire_format.decode(wire_format.encode(values, mimetype), mimetype) == values
+
+    def test_unencodable_values_fall_back_to_json(self):
+        """바이너리 형식으로 표현할 수 없는 값이 있으면 JSON으로 대체합니다"""
+        body, mimetype = wire_format.encode_with_fallback({'issued_at': datetime(2024, 1, 15)}, wire_format.MSGPACK)
+        assert mimetype == wire_format.JSON
+        assert wire_format.decode(body, mimetype) == {'issued_at': '2024-01-15 00:00:00'}
+
+        body, headers = wire_format.request_payload({'token_id': 2 ** 200}, wire_format.MSGPACK)
+        assert headers['Content-Type'] == wire_format.MSGPACK
+        assert wire_format.decode(body, headers['Content-Type']) == {'token_id': 2 ** 200}
+
+    def test_binary_request_and_response(self):
+        """MessagePack 본문을 받아 Accept에 맞게 MessagePack으로 응답합니다"""
+        body, headers = wire_format.request_payload(
+            {'customer_id': 'CUST_001', 'credit_grade': 'B', 'max_loan_amount': 50000000,
+             'customer_address': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6'},
+            wire_format.MSGPACK
+        )
+
+        response = self.client.post('/api/external/mint-nft', data=body, headers=headers)
+
+        assert response.status_code == 200
+        assert response.mimetype == wire_format.MSGPACK
+        result = wire_format.decode(response.data, response.mimetype)
+        assert result['nft_metadata']['attributes'][0]['value'] == 'B'
+        assert result['blockchain_tx_hash'].startswith('0x') and len(result['blockchain_tx_hash']) == 66
+
+    def test_json_remains_default(self):
+        """Accept가 없거나 JSON을 선호하면 JSON으로 응답합니다"""
+        assert self.client.get('/health').mimetype == wire_format.JSON
+        response = self.client.get('/health', headers={'Accept': 'application/json, application/msgpack;q=0.5'})
+        assert response.mimetype == wire_format.JSON
+
+if __name__ == '__main__':
+    pytest.main([__file__])
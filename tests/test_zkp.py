@@ -196,6 +196,21 @@ class TestZKPUtils:
         except ValueError:
             pytest.fail(f"Invalid timestamp format: {timestamp}")
 
+    def test_submit_credit_score_proof(self):
+        """증명 생성 스레드 풀 제출 테스트"""
+        zkp_utils = ZKPUtils(prover_workers=2)
+
+        futures = [
+            zkp_utils.submit_credit_score_proof(750, "B", 50000000)
+            for _ in range(4)
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+        assert all(result['status'] == 'success' for result in results)
+        assert zkp_utils.prover_queue_depth() == 0
+
+        zkp_utils.shutdown_prover_pool()
+
 class TestZKPIntegration:
     """ZKP 통합 테스트"""
     
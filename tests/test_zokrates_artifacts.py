@@ -0,0 +1,91 @@
+"""
+ZoKrates 산출물 판독기 테스트
+저장소의 zokrates/out, out.r1cs, out.wtns 헤더 검증, 복사 없는 배열 제공, 프로세스 안 witness 검사를 테스트합니다.
+"""
+
+import os
+import shutil
+import pytest
+from utils.zokrates_artifacts import (
+    ArtifactFormatError, CircuitArtifacts, ProgramFile, R1CSFile, WitnessFile, check_witness
+)
+
+ZOKRATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'zokrates')
+BN254_PRIME = 0x30644e72e131a029b85045b68181585d2833e84879b9709143e1f593f0000001
+
+
+class TestZokratesArtifacts:
+    """ZoKrates 산출물 판독기 테스트"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.artifacts = CircuitArtifacts(ZOKRATES_DIR)
+
+    def teardown_method(self):
+        self.artifacts.close()
+
+    def test_headers(self):
+        """세 파일의 헤더에서 곡선, 제약식 수, 와이어 수를 읽습니다"""
+        program, r1cs, witness = self.artifacts.program, self.artifacts.r1cs, self.artifacts.witness
+
+        assert program.curve == 'bn128'
+        assert program.constraint_count == r1cs.n_constraints == 4285
+        assert r1cs.prime == witness.prime == BN254_PRIME
+        assert r1cs.n_prv_in == 3
+        assert r1cs.n_wires == len(witness) == 4270
+        assert [argument['private'] for argument in program.arguments()] == [True, True, True]
+
+    def test_zero_copy_views(self):
+        """witness 값과 제약식 항은 파일 매핑을 그대로 가리키는 읽기 전용 배열입니다"""
+        values = self.artifacts.witness.values_view()
+        assert values.shape == (4270, 32)
+        assert not values.flags.writeable
+        assert self.artifacts.witness.value(0) == 1
+        assert int(self.artifacts.witness.limbs()[1, 0]) == self.artifacts.witness.value(1)
+
+        a, b, c = self.artifacts.r1cs.constraint_terms(0)
+        assert not a.flags.writeable
+        assert self.artifacts.r1cs.constraint(0) == ([(4, 1)], [(4, 1)], [(4, 1)])
+        assert self.artifacts.r1cs.term_counts().shape == (4285, 3)
+
+    def test_check_witness(self, tmp_path):
+        """저장된 witness는 모든 제약식을 만족하고, 값을 바꾸면 위반을 찾아냅니다"""
+        assert self.artifacts.check_witness()['violations'] == 0
+
+        path = tmp_path / 'out.wtns'
+        shutil.copy(os.path.join(ZOKRATES_DIR, 'out.wtns'), path)
+        witness = WitnessFile(str(path))
+        offset = witness._values_offset + witness.field_size  # credit_score (와이어 1)
+        witness.close()
+        with open(path, 'r+b') as f:
+            f.seek(offset)
+            f.write((1200).to_bytes(2, 'little'))
+
+        with WitnessFile(str(path)) as tampered:
+            assert tampered.value(1) == 1200
+            result = check_witness(self.artifacts.r1cs, tampered)
+        assert result['status'] == 'error'
+        assert result['violations'] > 0
+
+    def test_rejects_invalid_files(self, tmp_path):
+        """매직, 버전, 구획 크기가 맞지 않는 파일은 거부합니다"""
+        data = open(os.path.join(ZOKRATES_DIR, 'out.r1cs'), 'rb').read()
+        cases = {
+            'magic.r1cs': b'wtns' + data[4:],
+            'version.r1cs': data[:4] + (2).to_bytes(4, 'little') + data[8:],
+            'truncated.r1cs': data[:len(data) // 2]
+        }
+        for name, content in cases.items():
+            path = tmp_path / name
+            path.write_bytes(content)
+            with pytest.raises(ArtifactFormatError):
+                R1CSFile(str(path))
+
+        path = tmp_path / 'out'
+        path.write_bytes(data)
+        with pytest.raises(ArtifactFormatError):
+            ProgramFile(str(path))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -1,9 +1,28 @@
 """
 유틸리티 패키지
 zk-nft 시스템에서 사용하는 공통 유틸리티 함수들을 포함합니다.
+
+web3 등 무거운 의존성을 앱 시작 시점에 불러오지 않도록 하위 모듈은 처음 사용할 때 불러옵니다.
 """
 
-from .zkp_utils import *
-from .blockchain_utils import *
+import importlib
+import importlib.util
+
+__all__ = ['zkp_utils', 'blockchain_utils']
+
+# 패키지 속성으로 제공하던 이름을 정의한 하위 모듈 (앞쪽 모듈 우선)
+_LAZY_MODULES = ('zkp_utils', 'blockchain_utils')
+
 
-__all__ = ['zkp_utils', 'blockchain_utils'] 
\ No newline at end of file
+def __getattr__(name):
+    # 다른 하위 모듈(from utils import wire_format 등)은 일반 import 경로로 불러오게 둡니다
+    if name.startswith('__') or (name not in _LAZY_MODULES and importlib.util.find_spec(f'{__name__}.{name}')):
+        raise AttributeError(name)
+    for module_name in _LAZY_MODULES:
+        module = importlib.import_module(f'.{module_name}', __name__)
+        if name == module_name or hasattr(module, name):
+            # 예전처럼 utils.zkp_utils는 모듈이 아니라 전역 인스턴스를 가리킵니다
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
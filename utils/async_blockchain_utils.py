@@ -0,0 +1,608 @@
+"""
+비동기 블록체인 유틸리티 함수들
+AsyncWeb3를 사용하여 블로킹 없이 다수의 블록체인 작업을 동시에 처리합니다.
+"""
+
+import os
+import json
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+from web3 import AsyncWeb3
+
+from .gas_oracle import GasOracle
+from .provider_pool import parse_endpoint_urls
+
+
+class AsyncBlockchainUtils:
+    """비동기 블록체인 유틸리티 클래스"""
+
+    # 재연결 후 한 번에 따라잡을 최대 블록 수
+    MAX_CATCHUP_BLOCKS = 256
+
+    def __init__(self, blockchain_url: str = "http://localhost:8545",
+                 ws_url: Optional[str] = None, max_in_flight: int = 256,
+                 request_timeout: float = 30, poll_interval: float = 1.0):
+        """
+        비동기 블록체인 유틸리티 초기화
+
+        Args:
+            blockchain_url: 블록체인 노드 HTTP URL (쉼표로 구분한 목록이면 첫 번째 노드에 연결하고,
+                연결 오류나 HTTP 오류가 나면 다음 노드로 넘어가 다시 시도합니다)
+            ws_url: newHeads 구독용 WebSocket URL (없으면 블록 번호 폴링)
+            max_in_flight: 동시에 처리할 최대 RPC 수
+            request_timeout: RPC 요청 타임아웃 (초)
+            poll_interval: WebSocket이 없을 때의 블록 폴링 주기 (초)
+        """
+        self.endpoint_urls = parse_endpoint_urls(blockchain_url) or ['http://localhost:8545']
+        self.blockchain_url = self.endpoint_urls[0]
+        self.ws_url = ws_url
+        self.max_in_flight = max_in_flight
+        self.request_timeout = request_timeout
+        self.poll_interval = poll_interval
+
+        self.providers = [AsyncWeb3.AsyncHTTPProvider(url) for url in self.endpoint_urls]
+        self._active = 0
+        self.provider = self.providers[0]
+        self.w3 = AsyncWeb3(self.provider)
+        self.gas_oracle = GasOracle(None)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._receipt_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._block_listeners: List[Callable[[Dict], Awaitable[None]]] = []
+        self._head_task: Optional[asyncio.Task] = None
+        self._last_block: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # 연결 관리
+    # ------------------------------------------------------------------
+
+    async def _ensure_session(self) -> None:
+        """모든 RPC가 재사용할 HTTP 세션을 준비합니다."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+            for provider in self.providers:
+                await provider.cache_async_session(self._session)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    async def _call(self, awaitable_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """동시 실행 한도 내에서 RPC를 실행합니다. 노드 오류가 나면 다음 노드로 넘어가 다시 시도합니다."""
+        await self._ensure_session()
+        async with self._semaphore:
+            for attempt in range(len(self.providers)):
+                active = self._active
+                try:
+                    return await awaitable_factory()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if attempt == len(self.providers) - 1:
+                        raise
+                    self._failover(active)
+
+    def _failover(self, failed: int) -> None:
+        """실패한 노드가 아직 활성 노드이면 다음 노드로 전환합니다 (동시에 실패한 호출이 여러 번 넘기지 않도록)."""
+        if self._active != failed:
+            return
+        self._active = (failed + 1) % len(self.providers)
+        self.provider = self.providers[self._active]
+        self.blockchain_url = self.endpoint_urls[self._active]
+        self.w3.provider = self.provider
+
+    async def close(self) -> None:
+        """구독 작업과 HTTP 세션을 정리합니다."""
+        if self._head_task:
+            self._head_task.cancel()
+            try:
+                await self._head_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._head_task = None
+
+        for waiters in self._receipt_waiters.values():
+            for future in waiters:
+                if not future.done():
+                    future.cancel()
+        self._receipt_waiters.clear()
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def connect_to_blockchain(self) -> Dict:
+        """
+        블록체인에 연결합니다.
+
+        Returns:
+            연결 결과
+        """
+        try:
+            # 첫 조회에서 응답하지 않는 노드를 건너뛰도록 is_connected 대신 _call로 확인합니다
+            latest_block = await self._call(lambda: self.w3.eth.block_number)
+            network_id = await self._call(lambda: self.w3.eth.chain_id)
+            return {
+                'status': 'success',
+                'message': 'Successfully connected to blockchain',
+                'network_id': network_id,
+                'latest_block': latest_block,
+                'endpoint': self.blockchain_url
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Connection error: {str(e)}',
+                'error': str(e)
+            }
+
+    # ------------------------------------------------------------------
+    # 조회 (동시 실행)
+    # ------------------------------------------------------------------
+
+    async def get_block_number(self) -> int:
+        """
+        최신 블록 번호를 조회합니다.
+
+        Returns:
+            최신 블록 번호
+        """
+        return await self._call(lambda: self.w3.eth.block_number)
+
+    async def get_balance(self, address: str) -> Dict:
+        """
+        특정 주소의 잔액을 조회합니다.
+
+        Args:
+            address: 조회할 주소
+
+        Returns:
+            잔액 정보
+        """
+        try:
+            if not self.w3.is_address(address):
+                return {
+                    'status': 'error',
+                    'message': 'Invalid address format'
+                }
+
+            balance_wei = await self._call(lambda: self.w3.eth.get_balance(address))
+            balance_eth = self.w3.from_wei(balance_wei, 'ether')
+
+            return {
+                'status': 'success',
+                'address': address,
+                'balance_wei': balance_wei,
+                'balance_eth': float(balance_eth)
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Balance check error: {str(e)}',
+                'error': str(e)
+            }
+
+    async def get_balances(self, addresses: List[str]) -> List[Dict]:
+        """
+        여러 주소의 잔액을 동시에 조회합니다.
+
+        Args:
+            addresses: 조회할 주소 목록
+
+        Returns:
+            주소 순서대로 정렬된 잔액 정보 목록
+        """
+        return list(await asyncio.gather(*(self.get_balance(address) for address in addresses)))
+
+    async def get_nft_info(self, contract_address: str, contract_abi: List,
+                           token_id: int) -> Dict:
+        """
+        NFT 정보를 조회합니다.
+
+        Args:
+            contract_address: NFT 컨트랙트 주소
+            contract_abi: 컨트랙트 ABI
+            token_id: 토큰 ID
+
+        Returns:
+            NFT 정보
+        """
+        try:
+            contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
+
+            # ownerOf와 tokenURI를 동시에 조회
+            owner, token_uri = await asyncio.gather(
+                self._call(lambda: contract.functions.ownerOf(token_id).call()),
+                self._call(lambda: contract.functions.tokenURI(token_id).call())
+            )
+
+            return {
+                'status': 'success',
+                'token_id': token_id,
+                'owner': owner,
+                'token_uri': token_uri
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'NFT info retrieval error: {str(e)}',
+                'error': str(e)
+            }
+
+    async def get_nft_infos(self, contract_address: str, contract_abi: List,
+                            token_ids: List[int]) -> List[Dict]:
+        """
+        여러 NFT 정보를 동시에 조회합니다.
+
+        Args:
+            contract_address: NFT 컨트랙트 주소
+            contract_abi: 컨트랙트 ABI
+            token_ids: 토큰 ID 목록
+
+        Returns:
+            토큰 ID 순서대로 정렬된 NFT 정보 목록
+        """
+        return list(await asyncio.gather(
+            *(self.get_nft_info(contract_address, contract_abi, token_id) for token_id in token_ids)
+        ))
+
+    # ------------------------------------------------------------------
+    # 트랜잭션
+    # ------------------------------------------------------------------
+
+    async def _send_contract_transaction(self, contract_address: str, function_name: str,
+                                         contract_function, from_address: str,
+                                         private_key: str, urgency: str) -> Dict:
+        """컨트랙트 함수 트랜잭션을 구성, 서명, 전송하고 영수증을 기다립니다."""
+        if self.gas_oracle.is_stale():
+            await self._call(lambda: self.gas_oracle.refresh_async(self.w3))
+
+        gas_limit = await self._call(lambda: self.gas_oracle.estimate_gas_async(
+            contract_address, function_name, contract_function, from_address
+        ))
+
+        nonce = await self._call(lambda: self.w3.eth.get_transaction_count(from_address))
+        transaction = await contract_function.build_transaction(
+            self.gas_oracle.build_tx_params(from_address, nonce, gas_limit, urgency)
+        )
+
+        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key)
+        tx_hash = await self._call(lambda: self.w3.eth.send_raw_transaction(signed_txn.rawTransaction))
+        tx_receipt = await self.wait_for_receipt(tx_hash)
+        if tx_receipt['status'] == 0:
+            raise RuntimeError(f'transaction {tx_hash.hex()} reverted')
+        self.gas_oracle.record_gas_used(contract_address, function_name, tx_receipt['gasUsed'], contract_function)
+
+        return {
+            'transaction_hash': tx_hash.hex(),
+            'receipt': tx_receipt
+        }
+
+    async def mint_nft(self, contract_address: str, contract_abi: List,
+                       to_address: str, token_uri: str, minter_address: str,
+                       minter_private_key: str, urgency: str = 'standard') -> Dict:
+        """
+        NFT를 발행합니다.
+
+        Args:
+            contract_address: NFT 컨트랙트 주소
+            contract_abi: 컨트랙트 ABI
+            to_address: NFT 수신자 주소
+            token_uri: NFT 메타데이터 URI
+            minter_address: 발행자 주소
+            minter_private_key: 발행자 개인키
+            urgency: 수수료 긴급도 ('slow', 'standard', 'fast')
+
+        Returns:
+            발행 결과
+        """
+        try:
+            contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
+            result = await self._send_contract_transaction(
+                contract_address, 'mint', contract.functions.mint(to_address, token_uri),
+                minter_address, minter_private_key, urgency
+            )
+
+            token_id = await self._call(
+                lambda: contract.functions.tokenOfOwnerByIndex(to_address, 0).call()
+            )
+
+            return {
+                'status': 'success',
+                'message': 'NFT minted successfully',
+                'token_id': token_id,
+                'to_address': to_address,
+                'transaction_hash': result['transaction_hash'],
+                'gas_used': result['receipt']['gasUsed']
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'NFT minting error: {str(e)}',
+                'error': str(e)
+            }
+
+    async def transfer_nft(self, contract_address: str, contract_abi: List,
+                           from_address: str, to_address: str, token_id: int,
+                           from_private_key: str, urgency: str = 'standard') -> Dict:
+        """
+        NFT를 전송합니다.
+
+        Args:
+            contract_address: NFT 컨트랙트 주소
+            contract_abi: 컨트랙트 ABI
+            from_address: 전송자 주소
+            to_address: 수신자 주소
+            token_id: 토큰 ID
+            from_private_key: 전송자 개인키
+            urgency: 수수료 긴급도 ('slow', 'standard', 'fast')
+
+        Returns:
+            전송 결과
+        """
+        try:
+            contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
+            result = await self._send_contract_transaction(
+                contract_address, 'transferFrom',
+                contract.functions.transferFrom(from_address, to_address, token_id),
+                from_address, from_private_key, urgency
+            )
+
+            return {
+                'status': 'success',
+                'message': 'NFT transferred successfully',
+                'token_id': token_id,
+                'from_address': from_address,
+                'to_address': to_address,
+                'transaction_hash': result['transaction_hash'],
+                'gas_used': result['receipt']['gasUsed']
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'NFT transfer error: {str(e)}',
+                'error': str(e)
+            }
+
+    # ------------------------------------------------------------------
+    # 새 블록 구독 및 영수증 대기
+    # ------------------------------------------------------------------
+
+    def add_block_listener(self, listener: Callable[[Dict], Awaitable[None]]) -> None:
+        """
+        새 블록마다 호출될 비동기 콜백을 등록합니다.
+
+        Args:
+            listener: 블록(트랜잭션 해시 포함)을 인자로 받는 코루틴 함수
+        """
+        self._block_listeners.append(listener)
+        self._ensure_head_task()
+
+    def _ensure_head_task(self) -> None:
+        if self._head_task is None or self._head_task.done():
+            self._head_task = asyncio.get_running_loop().create_task(self._follow_heads())
+
+    async def _follow_heads(self) -> None:
+        """newHeads 구독(또는 폴링)으로 새 블록을 따라갑니다."""
+        backoff = 1.0
+        while True:
+            try:
+                if self.ws_url:
+                    await self._subscribe_new_heads()
+                else:
+                    await self._poll_new_heads()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 연결이 끊기면 재연결하며, 놓친 블록은 _on_new_head에서 채웁니다
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def _subscribe_new_heads(self) -> None:
+        import websockets
+
+        async with websockets.connect(self.ws_url, max_size=None) as ws:
+            await ws.send(json.dumps({
+                'jsonrpc': '2.0', 'id': 1,
+                'method': 'eth_subscribe', 'params': ['newHeads']
+            }))
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get('method') != 'eth_subscription':
+                    continue
+                head = message['params']['result']
+                await self._on_new_head(int(head['number'], 16))
+
+    async def _poll_new_heads(self) -> None:
+        while True:
+            await self._on_new_head(await self.get_block_number())
+            await asyncio.sleep(self.poll_interval)
+
+    async def _on_new_head(self, block_number: int) -> None:
+        if self._last_block is None:
+            start = block_number
+        elif block_number <= self._last_block:
+            return
+        else:
+            start = max(self._last_block + 1, block_number - self.MAX_CATCHUP_BLOCKS)
+
+        for number in range(start, block_number + 1):
+            # 영수증 대기나 리스너가 있을 때만 블록을 한 번 조회하여 공유합니다
+            if self._receipt_waiters or self._block_listeners:
+                block = await self._call(lambda n=number: self.w3.eth.get_block(n))
+                await self._match_block_receipts(block)
+                for listener in list(self._block_listeners):
+                    try:
+                        await listener(block)
+                    except Exception:
+                        pass
+            self._last_block = number
+
+    async def get_receipts(self, tx_hashes) -> Dict[str, Any]:
+        """
+        여러 트랜잭션 영수증을 동시에 조회합니다.
+
+        Args:
+            tx_hashes: 트랜잭션 해시 목록
+
+        Returns:
+            해시별 영수증 (아직 채굴되지 않았거나 조회 실패 시 None)
+        """
+        keys = [normalize_tx_hash(tx_hash) for tx_hash in tx_hashes]
+        receipts = await asyncio.gather(
+            *(self._call(lambda h=key: self.w3.eth.get_transaction_receipt(h)) for key in keys),
+            return_exceptions=True
+        )
+        return {
+            key: (None if isinstance(receipt, Exception) else receipt)
+            for key, receipt in zip(keys, receipts)
+        }
+
+    async def _match_block_receipts(self, block: Dict) -> None:
+        """블록에 포함된 트랜잭션 중 대기 중인 해시만 골라 영수증을 조회합니다."""
+        if not self._receipt_waiters:
+            return
+
+        matched = block_transaction_hashes(block) & set(self._receipt_waiters)
+        if not matched:
+            return
+
+        receipts = await self.get_receipts(matched)
+        for tx_hash, receipt in receipts.items():
+            if receipt is not None:
+                self._resolve_waiters(tx_hash, receipt)
+
+    def _resolve_waiters(self, tx_hash: str, receipt) -> None:
+        for future in self._receipt_waiters.pop(tx_hash, []):
+            if not future.done():
+                future.set_result(receipt)
+
+    async def wait_for_receipt(self, tx_hash, timeout: float = 120) -> Any:
+        """
+        트랜잭션 영수증을 기다립니다. 대기는 하나의 블록 구독을 공유합니다.
+
+        Args:
+            tx_hash: 트랜잭션 해시
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            트랜잭션 영수증
+        """
+        key = normalize_tx_hash(tx_hash)
+        future = asyncio.get_running_loop().create_future()
+        self._receipt_waiters.setdefault(key, []).append(future)
+        self._ensure_head_task()
+
+        # 등록 전에 이미 채굴되었을 수 있으므로 한 번 직접 확인합니다
+        try:
+            receipt = await self._call(lambda: self.w3.eth.get_transaction_receipt(key))
+            if receipt is not None:
+                self._resolve_waiters(key, receipt)
+        except Exception:
+            pass
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self._receipt_waiters.get(key)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._receipt_waiters[key]
+
+
+def block_transaction_hashes(block: Dict) -> set:
+    """블록에 포함된 트랜잭션 해시 집합을 정규화된 문자열로 반환합니다."""
+    return {normalize_tx_hash(tx) for tx in block['transactions']}
+
+
+def normalize_tx_hash(tx_hash) -> str:
+    """트랜잭션 해시를 소문자 0x 접두 문자열로 정규화합니다."""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        return '0x' + bytes(tx_hash).hex()
+    if hasattr(tx_hash, 'hex') and not isinstance(tx_hash, str):
+        value = tx_hash.hex()
+        return value if value.startswith('0x') else '0x' + value
+    value = str(tx_hash).lower()
+    return value if value.startswith('0x') else '0x' + value
+
+
+class SyncBlockchainFacade:
+    """
+    AsyncBlockchainUtils를 기존 동기 호출자(Flask 뷰 등)에서 사용하기 위한 파사드
+
+    전용 이벤트 루프 스레드에서 코루틴을 실행하므로 여러 워커 스레드가
+    하나의 연결 풀과 블록 구독을 공유합니다.
+    """
+
+    def __init__(self, async_utils: AsyncBlockchainUtils, timeout: float = 180):
+        """
+        동기 파사드 초기화
+
+        Args:
+            async_utils: 감쌀 AsyncBlockchainUtils 인스턴스
+            timeout: 호출당 최대 대기 시간 (초)
+        """
+        self.async_utils = async_utils
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name='async-blockchain', daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coroutine) -> Any:
+        """
+        코루틴을 이벤트 루프 스레드에서 실행하고 결과를 기다립니다.
+
+        Args:
+            coroutine: 실행할 코루틴
+
+        Returns:
+            코루틴의 결과
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+        return future.result(self.timeout)
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.async_utils, name)
+        if not asyncio.iscoroutinefunction(attribute):
+            return attribute
+
+        def wrapper(*args, **kwargs):
+            return self.run(attribute(*args, **kwargs))
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = attribute.__doc__
+        return wrapper
+
+    def close(self) -> None:
+        """비동기 자원을 정리하고 이벤트 루프 스레드를 종료합니다."""
+        if self._loop is None:
+            return
+        self.run(self.async_utils.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+
+# 전역 비동기 블록체인 유틸리티 인스턴스
+async_blockchain_utils = AsyncBlockchainUtils(
+    os.getenv('BLOCKCHAIN_URL', 'http://localhost:8545'),
+    ws_url=os.getenv('BLOCKCHAIN_WS_URL') or None
+)
+sync_blockchain_utils = SyncBlockchainFacade(async_blockchain_utils)
@@ -6,25 +6,40 @@ Web3를 사용한 블록체인 상호작용 기능을 제공합니다.
 import os
 import json
 import hashlib
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from web3 import Web3
 from eth_account import Account
 import secrets
 
+from .chain_cache import ChainReadCache
+from .gas_oracle import GasOracle
+from .metrics import register_runtime_gauge, timed
+from .tracing import tracer
+from .provider_pool import ProviderPool, parse_endpoint_urls
+
 class BlockchainUtils:
     """블록체인 유틸리티 클래스"""
     
-    def __init__(self, blockchain_url: str = "http://localhost:8545"):
+    def __init__(self, blockchain_url: Union[str, List[str]] = "http://localhost:8545"):
         """
         블록체인 유틸리티 초기화
         
         Args:
-            blockchain_url: 블록체인 노드 URL
+            blockchain_url: 블록체인 노드 URL (쉼표로 구분하거나 목록으로 주면 프로바이더 풀 사용)
         """
         self.blockchain_url = blockchain_url
-        self.w3 = Web3(Web3.HTTPProvider(blockchain_url))
+        endpoint_urls = parse_endpoint_urls(blockchain_url)
+        if len(endpoint_urls) > 1:
+            self.provider_pool = ProviderPool(endpoint_urls)
+            self.w3 = Web3(self.provider_pool)
+        else:
+            self.provider_pool = None
+            self.w3 = Web3(Web3.HTTPProvider(endpoint_urls[0]))
         self.account = None
+        self.gas_oracle = GasOracle(self.w3)
+        self.chain_cache = ChainReadCache()
+        self._indexed_blocks: Dict[str, int] = {}
         
     def connect_to_blockchain(self) -> Dict:
         """
@@ -35,17 +50,21 @@ class BlockchainUtils:
         """
         try:
             if self.w3.is_connected():
-                return {
+                result = {
                     'status': 'success',
                     'message': 'Successfully connected to blockchain',
                     'network_id': self.w3.eth.chain_id,
                     'latest_block': self.w3.eth.block_number
                 }
             else:
-                return {
+                result = {
                     'status': 'error',
                     'message': 'Failed to connect to blockchain'
                 }
+            
+            if self.provider_pool is not None:
+                result['providers'] = self.provider_pool.get_status()
+            return result
         except Exception as e:
             return {
                 'status': 'error',
@@ -112,7 +131,8 @@ class BlockchainUtils:
             }
     
     def deploy_nft_contract(self, contract_abi: List, contract_bytecode: str, 
-                           deployer_address: str, deployer_private_key: str) -> Dict:
+                           deployer_address: str, deployer_private_key: str,
+                           urgency: str = 'standard') -> Dict:
         """
         NFT 컨트랙트를 배포합니다.
         
@@ -121,6 +141,7 @@ class BlockchainUtils:
             contract_bytecode: 컨트랙트 바이트코드
             deployer_address: 배포자 주소
             deployer_private_key: 배포자 개인키
+            urgency: 수수료 긴급도 ('slow', 'standard', 'fast')
             
         Returns:
             배포 결과
@@ -129,16 +150,21 @@ class BlockchainUtils:
             # 컨트랙트 객체 생성
             contract = self.w3.eth.contract(abi=contract_abi, bytecode=contract_bytecode)
             
-            # 가스 추정
-            gas_estimate = contract.constructor().estimate_gas({'from': deployer_address})
+            # 가스 추정 (바이트코드 단위로 메모이제이션)
+            bytecode_key = hashlib.sha256(contract_bytecode.encode()).hexdigest()
+            gas_estimate = self.gas_oracle.estimate_gas(
+                bytecode_key, 'constructor', contract.constructor(), deployer_address
+            )
             
             # 트랜잭션 구성
-            transaction = contract.constructor().build_transaction({
-                'from': deployer_address,
-                'gas': gas_estimate,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address)
-            })
+            transaction = contract.constructor().build_transaction(
+                self.gas_oracle.build_tx_params(
+                    deployer_address,
+                    self.w3.eth.get_transaction_count(deployer_address),
+                    gas_estimate,
+                    urgency
+                )
+            )
             
             # 트랜잭션 서명
             signed_txn = self.w3.eth.account.sign_transaction(transaction, deployer_private_key)
@@ -148,6 +174,9 @@ class BlockchainUtils:
             
             # 트랜잭션 영수증 대기
             tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            if tx_receipt.status == 0:
+                return self._reverted('Contract deployment', tx_hash, tx_receipt)
+            self.gas_oracle.record_gas_used(bytecode_key, 'constructor', tx_receipt.gasUsed, contract.constructor())
             
             return {
                 'status': 'success',
@@ -165,7 +194,9 @@ class BlockchainUtils:
     
     def mint_nft(self, contract_address: str, contract_abi: List, 
                 to_address: str, token_uri: str, minter_address: str, 
-                minter_private_key: str) -> Dict:
+                minter_private_key: str, urgency: str = 'standard',
+                wait_for_receipt: bool = True, function_name: str = 'mint',
+                extra_args: tuple = (), metadata: Optional[Dict] = None) -> Dict:
         """
         NFT를 발행합니다.
         
@@ -176,6 +207,11 @@ class BlockchainUtils:
             token_uri: NFT 메타데이터 URI
             minter_address: 발행자 주소
             minter_private_key: 발행자 개인키
+            urgency: 수수료 긴급도 ('slow', 'standard', 'fast')
+            wait_for_receipt: False이면 채굴을 기다리지 않고 확정 추적기에 등록한 뒤 바로 반환
+            function_name: 발행 함수 이름 (수신자 주소와 token_uri를 먼저 받는 함수)
+            extra_args: token_uri 뒤에 넘길 발행 함수 인자
+            metadata: 확정 추적기에 함께 저장할 메타데이터 (mint 핸들러에 전달)
             
         Returns:
             발행 결과
@@ -185,12 +221,18 @@ class BlockchainUtils:
             contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
             
             # mint 함수 호출을 위한 트랜잭션 구성
-            transaction = contract.functions.mint(to_address, token_uri).build_transaction({
-                'from': minter_address,
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(minter_address)
-            })
+            mint_function = getattr(contract.functions, function_name)(to_address, token_uri, *extra_args)
+            gas_limit = self.gas_oracle.estimate_gas(
+                contract_address, function_name, mint_function, minter_address
+            )
+            transaction = mint_function.build_transaction(
+                self.gas_oracle.build_tx_params(
+                    minter_address,
+                    self.w3.eth.get_transaction_count(minter_address),
+                    gas_limit,
+                    urgency
+                )
+            )
             
             # 트랜잭션 서명
             signed_txn = self.w3.eth.account.sign_transaction(transaction, minter_private_key)
@@ -198,11 +240,33 @@ class BlockchainUtils:
             # 트랜잭션 전송
             tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
             
+            if not wait_for_receipt:
+                # 확정 추적기가 하나의 블록 구독으로 채굴 및 확정을 추적합니다
+                from .confirmation_tracker import confirmation_tracker
+                
+                tracked_hash = confirmation_tracker.track(tx_hash, kind='mint', metadata={
+                    **(metadata or {}),
+                    'contract_address': contract_address,
+                    'to_address': to_address,
+                    'token_uri': token_uri,
+                    'minter_address': minter_address
+                })
+                return {
+                    'status': 'pending',
+                    'message': 'NFT minting transaction submitted',
+                    'to_address': to_address,
+                    'transaction_hash': tracked_hash
+                }
+            
             # 트랜잭션 영수증 대기
             tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            if tx_receipt.status == 0:
+                return self._reverted('NFT minting', tx_hash, tx_receipt)
+            self.gas_oracle.record_gas_used(contract_address, function_name, tx_receipt.gasUsed, mint_function)
             
             # 발행된 토큰 ID 조회
             token_id = contract.functions.tokenOfOwnerByIndex(to_address, 0).call()
+            self._invalidate_after_write(contract_address, token_id, tx_receipt.blockNumber)
             
             return {
                 'status': 'success',
@@ -236,9 +300,9 @@ class BlockchainUtils:
             # 컨트랙트 인스턴스 생성
             contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
             
-            # NFT 정보 조회
+            # NFT 정보 조회 (tokenURI는 발행 후 바뀌지 않으므로 캐시 사용)
             owner = contract.functions.ownerOf(token_id).call()
-            token_uri = contract.functions.tokenURI(token_id).call()
+            token_uri = self._cached_call(contract, 'tokenURI', token_id)
             
             return {
                 'status': 'success',
@@ -253,9 +317,129 @@ class BlockchainUtils:
                 'error': str(e)
             }
     
+    def get_credit_grade_data(self, contract_address: str, contract_abi: List,
+                              token_id: int) -> Dict:
+        """
+        NFT의 신용등급 데이터를 조회합니다. 결과는 체인 조회 캐시를 거칩니다.
+        
+        Args:
+            contract_address: NFT 컨트랙트 주소
+            contract_abi: 컨트랙트 ABI
+            token_id: 토큰 ID
+            
+        Returns:
+            신용등급 데이터
+        """
+        try:
+            contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
+            
+            (credit_grade, max_loan_amount, proof_id,
+             customer_id, issued_at, is_valid) = self._cached_call(contract, 'getCreditGradeData', token_id)
+            
+            return {
+                'status': 'success',
+                'token_id': token_id,
+                'credit_grade': credit_grade,
+                'max_loan_amount': max_loan_amount,
+                'proof_id': proof_id,
+                'customer_id': customer_id,
+                'issued_at': issued_at,
+                'is_valid': is_valid
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Credit grade data retrieval error: {str(e)}',
+                'error': str(e)
+            }
+    
+    def _cached_call(self, contract, function_name: str, *args) -> Any:
+        """캐싱 대상 view 함수는 체인 조회 캐시를 거쳐 호출합니다."""
+        def load():
+            # 캐시에 없어 실제 RPC를 호출한 경우에만 스팬을 남깁니다
+            with tracer.start_span('chain_call', function=function_name):
+                return getattr(contract.functions, function_name)(*args).call()
+        
+        return self.chain_cache.get_or_load(contract.address, function_name, args, load)
+    
+    @staticmethod
+    def _reverted(action: str, tx_hash, tx_receipt) -> Dict:
+        """채굴됐지만 실패한(status=0) 트랜잭션의 결과를 만듭니다."""
+        return {
+            'status': 'error',
+            'message': f'{action} transaction reverted',
+            'error': 'transaction reverted',
+            'transaction_hash': tx_hash.hex(),
+            'gas_used': tx_receipt.gasUsed
+        }
+    
+    def _invalidate_after_write(self, contract_address: str, token_id: int, block_number: int) -> None:
+        """자신이 보낸 트랜잭션으로 바뀐 토큰의 캐시 항목을 무효화합니다."""
+        self.chain_cache.invalidate_token(contract_address, token_id, block_number)
+        self.chain_cache.observe_block(block_number)
+    
+    def index_contract_events(self, contract_address: str, contract_abi: List,
+                              to_block: Optional[int] = None) -> Dict:
+        """
+        마지막으로 처리한 블록 이후의 토큰 이벤트를 읽어 체인 조회 캐시를 무효화합니다.
+        
+        Args:
+            contract_address: NFT 컨트랙트 주소
+            contract_abi: 컨트랙트 ABI
+            to_block: 처리할 마지막 블록 (기본값: 최신 블록)
+            
+        Returns:
+            인덱싱 결과
+        """
+        try:
+            contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
+            if to_block is None:
+                to_block = self.w3.eth.block_number
+            key = contract_address.lower()
+            from_block = self._indexed_blocks.get(key, to_block) + 1
+            
+            applied = 0
+            if from_block <= to_block:
+                for event_name in ChainReadCache.INVALIDATING_EVENTS:
+                    event = getattr(contract.events, event_name, None)
+                    if event is None:
+                        continue
+                    for log in event.get_logs(fromBlock=from_block, toBlock=to_block):
+                        self.chain_cache.apply_event(log)
+                        applied += 1
+            
+            self._indexed_blocks[key] = to_block
+            self.chain_cache.observe_block(to_block)
+            
+            return {
+                'status': 'success',
+                'from_block': from_block,
+                'to_block': to_block,
+                'events_applied': applied
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Event indexing error: {str(e)}',
+                'error': str(e)
+            }
+    
+    def get_chain_cache_metrics(self) -> Dict:
+        """
+        체인 조회 캐시 지표를 조회합니다.
+        
+        Returns:
+            캐시 지표
+        """
+        return {
+            'status': 'success',
+            'metrics': self.chain_cache.get_metrics()
+        }
+    
+    @timed('transfer')
     def transfer_nft(self, contract_address: str, contract_abi: List,
                     from_address: str, to_address: str, token_id: int,
-                    from_private_key: str) -> Dict:
+                    from_private_key: str, urgency: str = 'standard') -> Dict:
         """
         NFT를 전송합니다.
         
@@ -266,6 +450,7 @@ class BlockchainUtils:
             to_address: 수신자 주소
             token_id: 토큰 ID
             from_private_key: 전송자 개인키
+            urgency: 수수료 긴급도 ('slow', 'standard', 'fast')
             
         Returns:
             전송 결과
@@ -275,12 +460,18 @@ class BlockchainUtils:
             contract = self.w3.eth.contract(address=contract_address, abi=contract_abi)
             
             # transfer 함수 호출을 위한 트랜잭션 구성
-            transaction = contract.functions.transferFrom(from_address, to_address, token_id).build_transaction({
-                'from': from_address,
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(from_address)
-            })
+            transfer_function = contract.functions.transferFrom(from_address, to_address, token_id)
+            gas_limit = self.gas_oracle.estimate_gas(
+                contract_address, 'transferFrom', transfer_function, from_address
+            )
+            transaction = transfer_function.build_transaction(
+                self.gas_oracle.build_tx_params(
+                    from_address,
+                    self.w3.eth.get_transaction_count(from_address),
+                    gas_limit,
+                    urgency
+                )
+            )
             
             # 트랜잭션 서명
             signed_txn = self.w3.eth.account.sign_transaction(transaction, from_private_key)
@@ -290,6 +481,10 @@ class BlockchainUtils:
             
             # 트랜잭션 영수증 대기
             tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            if tx_receipt.status == 0:
+                return self._reverted('NFT transfer', tx_hash, tx_receipt)
+            self.gas_oracle.record_gas_used(contract_address, 'transferFrom', tx_receipt.gasUsed, transfer_function)
+            self._invalidate_after_write(contract_address, token_id, tx_receipt.blockNumber)
             
             return {
                 'status': 'success',
@@ -402,5 +597,9 @@ class BlockchainUtils:
                 'error': str(e)
             }
 
-# 전역 블록체인 유틸리티 인스턴스
-blockchain_utils = BlockchainUtils() 
\ No newline at end of file
+# 전역 블록체인 유틸리티 인스턴스 (BLOCKCHAIN_URL에 노드가 여럿이면 프로바이더 풀 사용)
+blockchain_utils = BlockchainUtils(parse_endpoint_urls(os.getenv('BLOCKCHAIN_URL') or 'http://localhost:8545'))
+register_runtime_gauge(
+    'zk_nft_chain_cache_hit_ratio', 'Chain read cache hit ratio of this process',
+    lambda: blockchain_utils.chain_cache.get_metrics()['hit_ratio']
+)
@@ -0,0 +1,222 @@
+"""
+체인 조회 캐시
+발행/소각/전송 이벤트에서만 바뀌는 NFT view 함수 결과를 캐싱합니다.
+이벤트 인덱서 또는 블록 번호 워터마크로 무효화되며 LRU로 크기가 제한됩니다.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import CHAIN_CACHE_LOOKUPS
+
+
+class ChainReadCache:
+    """토큰 단위 무효화를 지원하는 read-through LRU 캐시"""
+
+    # 캐싱 대상 view 함수 (첫 번째 인자가 tokenId)
+    CACHEABLE_FUNCTIONS = {'getCreditGradeData', 'tokenURI', 'creditGradeData'}
+
+    # 토큰 상태를 바꾸는 이벤트
+    INVALIDATING_EVENTS = {'Transfer', 'CreditGradeNFTMinted', 'CreditGradeNFTTransferred'}
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        체인 조회 캐시 초기화
+
+        Args:
+            max_entries: 최대 항목 수 (LRU)
+            ttl: 인덱서가 없을 때를 대비한 최대 보관 시간 (초, 0이면 무제한)
+        """
+        self.max_entries = max_entries if max_entries is not None else \
+            int(os.getenv('CHAIN_CACHE_SIZE', 10000))
+        self.ttl = ttl if ttl is not None else float(os.getenv('CHAIN_CACHE_TTL', 300))
+
+        self._lock = threading.Lock()
+        # key -> (value, loaded_block, loaded_at)
+        self._entries: 'OrderedDict[Tuple, Tuple[Any, int, float]]' = OrderedDict()
+        self._token_keys: Dict[Tuple[str, Any], set] = {}
+        self._token_watermarks: Dict[Tuple[str, Any], int] = {}
+        self._contract_watermarks: Dict[str, int] = {}
+        self.head_block = 0
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    @staticmethod
+    def make_key(contract_address: str, function_name: str, args: Tuple) -> Tuple:
+        return (contract_address.lower(), function_name, tuple(args))
+
+    def _is_valid(self, key: Tuple, loaded_block: int, loaded_at: float) -> bool:
+        contract, _, args = key
+        if loaded_block < self._contract_watermarks.get(contract, 0):
+            return False
+        if args and loaded_block < self._token_watermarks.get((contract, args[0]), 0):
+            return False
+        if self.ttl and time.monotonic() - loaded_at > self.ttl:
+            return False
+        return True
+
+    def get_or_load(self, contract_address: str, function_name: str, args: Tuple,
+                    loader: Callable[[], Any]) -> Any:
+        """
+        캐시된 값을 반환하거나, 없으면 loader로 조회하여 저장합니다.
+
+        Args:
+            contract_address: 컨트랙트 주소
+            function_name: view 함수명
+            args: 함수 인자
+            loader: 캐시 미스 시 실제 체인 조회를 수행하는 함수
+
+        Returns:
+            조회 결과
+        """
+        if function_name not in self.CACHEABLE_FUNCTIONS:
+            return loader()
+
+        key = self.make_key(contract_address, function_name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_valid(key, entry[1], entry[2]):
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                CHAIN_CACHE_LOOKUPS.labels('hit').inc()
+                return entry[0]
+            self.stats['misses'] += 1
+            CHAIN_CACHE_LOOKUPS.labels('miss').inc()
+            # 조회 시작 시점의 블록으로 기록해야 조회 중 발생한 이벤트가 반영됩니다
+            loaded_block = self.head_block
+
+        value = loader()
+
+        with self._lock:
+            loaded_at = time.monotonic()
+            if not self._is_valid(key, loaded_block, loaded_at):
+                return value
+            self._entries[key] = (value, loaded_block, loaded_at)
+            self._entries.move_to_end(key)
+            if args:
+                self._token_keys.setdefault((key[0], args[0]), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget_token_key(evicted)
+                self.stats['evictions'] += 1
+        return value
+
+    def _forget_token_key(self, key: Tuple) -> None:
+        contract, _, args = key
+        if not args:
+            return
+        keys = self._token_keys.get((contract, args[0]))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._token_keys[(contract, args[0])]
+
+    # ------------------------------------------------------------------
+    # 무효화
+    # ------------------------------------------------------------------
+
+    def invalidate_token(self, contract_address: str, token_id: Any,
+                         block_number: Optional[int] = None) -> int:
+        """
+        특정 토큰의 캐시 항목을 무효화합니다.
+
+        Args:
+            contract_address: 컨트랙트 주소
+            token_id: 토큰 ID
+            block_number: 상태가 바뀐 블록 번호 (이보다 이전에 조회된 값은 무효)
+
+        Returns:
+            제거된 항목 수
+        """
+        contract = contract_address.lower()
+        with self._lock:
+            if block_number is not None:
+                token = (contract, token_id)
+                self._token_watermarks[token] = max(self._token_watermarks.get(token, 0), block_number)
+            keys = self._token_keys.pop((contract, token_id), set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.stats['invalidations'] += len(keys)
+            return len(keys)
+
+    def invalidate_contract(self, contract_address: str, block_number: int) -> int:
+        """
+        블록 번호 워터마크 이전에 조회된 컨트랙트의 모든 항목을 무효화합니다.
+
+        Args:
+            contract_address: 컨트랙트 주소
+            block_number: 워터마크 블록 번호
+
+        Returns:
+            제거된 항목 수
+        """
+        contract = contract_address.lower()
+        with self._lock:
+            self._contract_watermarks[contract] = max(
+                self._contract_watermarks.get(contract, 0), block_number
+            )
+            stale = [
+                key for key, entry in self._entries.items()
+                if key[0] == contract and entry[1] < block_number
+            ]
+            for key in stale:
+                del self._entries[key]
+                self._forget_token_key(key)
+            self.stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def apply_event(self, event: Dict) -> None:
+        """
+        이벤트 인덱서가 전달한 컨트랙트 이벤트를 반영합니다.
+
+        Args:
+            event: web3 디코딩 이벤트 (event, address, blockNumber, args.tokenId 포함)
+        """
+        if event.get('event') not in self.INVALIDATING_EVENTS:
+            return
+        token_id = event['args'].get('tokenId')
+        if token_id is None:
+            return
+        self.invalidate_token(event['address'], token_id, event.get('blockNumber'))
+
+    def observe_block(self, block_number: int) -> None:
+        """
+        이벤트 인덱서가 해당 블록까지의 이벤트를 모두 반영했음을 기록합니다.
+
+        Args:
+            block_number: 반영이 끝난 블록 번호
+        """
+        with self._lock:
+            if block_number > self.head_block:
+                self.head_block = block_number
+
+    def clear(self) -> None:
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._entries.clear()
+            self._token_keys.clear()
+
+    def get_metrics(self) -> Dict:
+        """
+        캐시 지표를 조회합니다.
+
+        Returns:
+            적중률, 크기 및 카운터
+        """
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'head_block': self.head_block,
+                'hit_ratio': self.stats['hits'] / lookups if lookups else 0.0,
+                **self.stats
+            }
@@ -0,0 +1,148 @@
+"""
+HTTP 응답 압축
+Accept-Encoding에 따라 brotli(설치된 경우) 또는 gzip으로 일정 크기 이상의 응답을 압축합니다.
+스트리밍 응답은 청크 단위로 압축하므로 전체 본문을 메모리에 모으지 않습니다.
+"""
+
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli가 없으면 gzip만 사용합니다
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/msgpack', 'application/cbor',
+    'application/javascript', 'image/svg+xml'
+}
+
+
+def _setting(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+def supported_encodings() -> tuple:
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """
+    Accept-Encoding에서 사용할 압축 방식을 고릅니다. 같은 순위면 brotli를 우선합니다.
+
+    Args:
+        accept_encodings: werkzeug Accept (request.accept_encodings)
+
+    Returns:
+        'br', 'gzip' 또는 None
+    """
+    return accept_encodings.best_match(supported_encodings())
+
+
+def is_compressible(response) -> bool:
+    """압축 대상 응답인지 확인합니다 (성공 응답, 미압축, 텍스트/구조화 데이터 형식)."""
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=_setting('COMPRESSION_BROTLI_QUALITY', 4))
+        else:
+            # wbits 31: gzip 헤더 포함
+            self._compressor = zlib.compressobj(_setting('COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) if self.encoding == 'br' else self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        # 스트리밍 클라이언트가 청크를 바로 읽을 수 있도록 청크마다 비웁니다
+        return self._compressor.flush() if self.encoding == 'br' else self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish() if self.encoding == 'br' else self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    compressor = _Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks: Iterable, encoding: str) -> Iterator[bytes]:
+    """청크 단위로 압축하며 청크마다 출력을 비웁니다."""
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        if chunk:
+            yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+def _mark_encoded(response, encoding: str) -> None:
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+
+def compress_response(response, accept_encodings):
+    """
+    Flask 응답을 압축합니다. COMPRESSION_MIN_SIZE보다 작은 응답은 그대로 둡니다.
+
+    Args:
+        response: Flask 응답
+        accept_encodings: request.accept_encodings
+
+    Returns:
+        압축된(또는 원래) 응답
+    """
+    if not is_compressible(response):
+        return response
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+        _mark_encoded(response, encoding)
+        return response
+    data = response.get_data()
+    if len(data) < _setting('COMPRESSION_MIN_SIZE', 1024):
+        response.vary.add('Accept-Encoding')
+        return response
+    response.set_data(compress_bytes(data, encoding))
+    _mark_encoded(response, encoding)
+    return response
+
+
+async def compress_async_response(response, accept_encodings):
+    """
+    Quart 응답을 압축합니다. 스트리밍 응답은 압축하지 않고 그대로 보냅니다.
+
+    Args:
+        response: Quart 응답
+        accept_encodings: request.accept_encodings
+
+    Returns:
+        압축된(또는 원래) 응답
+    """
+    from quart.wrappers.response import DataBody
+
+    if not is_compressible(response) or not isinstance(response.response, DataBody):
+        return response
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+    data = await response.get_data()
+    if len(data) < _setting('COMPRESSION_MIN_SIZE', 1024):
+        response.vary.add('Accept-Encoding')
+        return response
+    response.set_data(compress_bytes(data, encoding))
+    _mark_encoded(response, encoding)
+    return response
@@ -0,0 +1,395 @@
+"""
+트랜잭션 확정(confirmation) 추적기
+하나의 블록 구독으로 대기 중인 모든 트랜잭션의 영수증과 확정 수를 추적합니다.
+
+pre-fork 서버에서는 워커마다 추적기가 돌고 대기 목록 파일(PENDING_TX_FILE)을 함께 씁니다.
+파일은 프로세스 간 잠금 안에서 읽고-합치고-쓰며, 항목마다 추적하는 프로세스(owner)를 기록해
+다른 워커의 항목을 지우지 않고, 종료된 프로세스의 항목만 시작하는 워커가 넘겨받습니다.
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from .async_blockchain_utils import (
+    SyncBlockchainFacade, block_transaction_hashes, normalize_tx_hash, sync_blockchain_utils
+)
+from .metrics import PENDING_TRANSACTIONS
+
+try:
+    import fcntl
+except ImportError:  # Windows: 단일 프로세스 서버만 지원
+    fcntl = None
+
+
+def _process_alive(pid) -> bool:
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ConfirmationTracker:
+    """트랜잭션 확정 추적 서비스"""
+
+    # 완료 후에도 wait 호출에 응답하기 위해 보관할 최근 결과 수
+    MAX_COMPLETED = 1000
+
+    def __init__(self, facade: SyncBlockchainFacade, confirmations: Optional[int] = None,
+                 state_file: Optional[str] = None):
+        """
+        확정 추적기 초기화
+
+        Args:
+            facade: 이벤트 루프와 AsyncBlockchainUtils를 제공하는 동기 파사드
+            confirmations: 기본 확정 블록 수
+            state_file: 대기 중인 트랜잭션을 저장할 JSON 파일 경로
+        """
+        self.facade = facade
+        self.async_utils = facade.async_utils
+        self.confirmations = confirmations if confirmations is not None else \
+            int(os.getenv('TX_CONFIRMATIONS', 1))
+        self.state_file = state_file if state_file is not None else \
+            os.getenv('PENDING_TX_FILE', 'data/pending_txs.json')
+
+        # tx_hash -> 추적 정보 (JSON 직렬화 가능한 값만 저장)
+        self._pending: Dict[str, Dict] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._callbacks: Dict[str, List[Callable]] = {}
+        self._handlers: Dict[str, Callable] = {}
+        self._completed: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._file_lock = threading.Lock()
+        self._started = False
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+
+    def register_handler(self, kind: str, handler: Callable[[str, Any, Dict], None]) -> None:
+        """
+        트랜잭션 종류별 확정 핸들러를 등록합니다. 재시작 후 재개된 트랜잭션에도 호출됩니다.
+
+        Args:
+            kind: 트랜잭션 종류 (예: 'mint')
+            handler: (tx_hash, receipt, result)를 인자로 받는 함수
+        """
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        """저장된 대기 트랜잭션을 불러오고 블록 구독을 시작합니다."""
+        if self._started:
+            return
+        self._started = True
+        self.facade.run(self._start())
+
+    async def _start(self) -> None:
+        self._pending.update(self._adopt_state())
+        self.async_utils.add_block_listener(self._on_block)
+
+        # 중단된 동안 채굴된 트랜잭션을 한 번에 확인합니다
+        if self._pending:
+            receipts = await self.async_utils.get_receipts(list(self._pending))
+            latest = await self.async_utils.get_block_number()
+            for tx_hash, receipt in receipts.items():
+                if receipt is not None:
+                    self._pending[tx_hash]['mined_block'] = receipt['blockNumber']
+                    self._pending[tx_hash]['block_hash'] = normalize_tx_hash(receipt['blockHash'])
+            await self._confirm_ready(latest)
+            self._save_state()
+
+    # ------------------------------------------------------------------
+    # 추적 등록 및 대기
+    # ------------------------------------------------------------------
+
+    def track(self, tx_hash, kind: str = 'generic', metadata: Optional[Dict] = None,
+              confirmations: Optional[int] = None,
+              callback: Optional[Callable[[str, Any, Dict], None]] = None) -> str:
+        """
+        트랜잭션을 추적 대상으로 등록합니다.
+
+        Args:
+            tx_hash: 트랜잭션 해시
+            kind: 트랜잭션 종류 (등록된 핸들러 선택에 사용)
+            metadata: 함께 저장할 메타데이터 (JSON 직렬화 가능해야 함)
+            confirmations: 필요한 확정 블록 수 (기본값 사용 시 None)
+            callback: 확정 시 (tx_hash, receipt, result)로 호출할 함수 (메모리에만 보관)
+
+        Returns:
+            정규화된 트랜잭션 해시
+        """
+        self.start()
+        key = normalize_tx_hash(tx_hash)
+        self.facade.run(self._track(key, kind, metadata or {}, confirmations, callback))
+        return key
+
+    async def _track(self, key: str, kind: str, metadata: Dict,
+                     confirmations: Optional[int], callback: Optional[Callable]) -> None:
+        self._pending[key] = {
+            'kind': kind,
+            'metadata': metadata,
+            'confirmations': confirmations or self.confirmations,
+            'submitted_at': time.time(),
+            'mined_block': None,
+            'block_hash': None
+        }
+        if callback:
+            self._callbacks.setdefault(key, []).append(callback)
+        self._save_state()
+
+    def wait(self, tx_hash, timeout: float = 120) -> Dict:
+        """
+        트랜잭션이 필요한 확정 수에 도달할 때까지 기다립니다.
+
+        Args:
+            tx_hash: 트랜잭션 해시
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            확정 결과
+        """
+        return self.facade.run(self.wait_async(tx_hash, timeout))
+
+    async def wait_async(self, tx_hash, timeout: float = 120) -> Dict:
+        """
+        트랜잭션 확정을 비동기로 기다립니다.
+
+        Args:
+            tx_hash: 트랜잭션 해시
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            확정 결과
+        """
+        key = normalize_tx_hash(tx_hash)
+        if key in self._completed:
+            return self._completed[key]
+        if key not in self._pending:
+            return {
+                'status': 'error',
+                'message': 'Transaction is not being tracked',
+                'transaction_hash': key
+            }
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return {
+                'status': 'pending',
+                'message': 'Transaction confirmation timed out',
+                'transaction_hash': key
+            }
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[key]
+
+    def get_status(self, tx_hash) -> Dict:
+        """
+        추적 중인 트랜잭션의 상태를 조회합니다.
+
+        Args:
+            tx_hash: 트랜잭션 해시
+
+        Returns:
+            추적 상태
+        """
+        key = normalize_tx_hash(tx_hash)
+        if key in self._completed:
+            completed = self._completed[key]
+            return {
+                'status': completed['status'],
+                'transaction_hash': key,
+                'kind': completed['kind'],
+                'mined_block': completed['block_number'],
+                'confirmations': completed['confirmations']
+            }
+        entry = self._pending.get(key)
+        if entry is None:
+            return {
+                'status': 'not_found',
+                'transaction_hash': key
+            }
+        return {
+            'status': 'mined' if entry['mined_block'] is not None else 'pending',
+            'transaction_hash': key,
+            'kind': entry['kind'],
+            'mined_block': entry['mined_block'],
+            'required_confirmations': entry['confirmations']
+        }
+
+    def pending_count(self) -> int:
+        """추적 중인 트랜잭션 수를 반환합니다."""
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # 블록 처리
+    # ------------------------------------------------------------------
+
+    async def _on_block(self, block: Dict) -> None:
+        if not self._pending:
+            return
+
+        block_number = block['number']
+        changed = False
+
+        # 이 블록에 포함된 대기 트랜잭션만 골라 영수증을 일괄 조회합니다
+        unmined = {h for h, entry in self._pending.items() if entry['mined_block'] is None}
+        matched = block_transaction_hashes(block) & unmined
+        if matched:
+            receipts = await self.async_utils.get_receipts(matched)
+            for tx_hash, receipt in receipts.items():
+                if receipt is None:
+                    continue
+                self._pending[tx_hash]['mined_block'] = receipt['blockNumber']
+                self._pending[tx_hash]['block_hash'] = normalize_tx_hash(receipt['blockHash'])
+                changed = True
+
+        if await self._confirm_ready(block_number):
+            changed = True
+        if changed:
+            self._save_state()
+
+    async def _confirm_ready(self, block_number: int) -> bool:
+        """필요한 확정 수에 도달한 트랜잭션을 완료 처리합니다."""
+        ready = [
+            tx_hash for tx_hash, entry in self._pending.items()
+            if entry['mined_block'] is not None
+            and block_number - entry['mined_block'] + 1 >= entry['confirmations']
+        ]
+        if not ready:
+            return False
+
+        # 재구성(reorg)으로 다른 블록에 포함되었는지 확정 직전에 다시 확인합니다
+        receipts = await self.async_utils.get_receipts(ready)
+        for tx_hash, receipt in receipts.items():
+            entry = self._pending[tx_hash]
+            if receipt is None:
+                entry['mined_block'] = None
+                entry['block_hash'] = None
+                continue
+            if normalize_tx_hash(receipt['blockHash']) != entry['block_hash']:
+                entry['mined_block'] = receipt['blockNumber']
+                entry['block_hash'] = normalize_tx_hash(receipt['blockHash'])
+                if block_number - entry['mined_block'] + 1 < entry['confirmations']:
+                    continue
+
+            self._complete(tx_hash, receipt, block_number)
+        return True
+
+    def _complete(self, tx_hash: str, receipt, block_number: int) -> None:
+        entry = self._pending.pop(tx_hash)
+        succeeded = receipt.get('status', 1) == 1
+        result = {
+            'status': 'confirmed' if succeeded else 'failed',
+            'transaction_hash': tx_hash,
+            'kind': entry['kind'],
+            'metadata': entry['metadata'],
+            'block_number': entry['mined_block'],
+            'confirmations': block_number - entry['mined_block'] + 1,
+            'gas_used': receipt.get('gasUsed'),
+            'receipt': receipt
+        }
+
+        self._completed[tx_hash] = result
+        while len(self._completed) > self.MAX_COMPLETED:
+            self._completed.popitem(last=False)
+
+        for future in self._waiters.pop(tx_hash, []):
+            if not future.done():
+                future.set_result(result)
+
+        # 콜백은 이벤트 루프를 막지 않도록 스레드 풀에서 실행합니다
+        loop = asyncio.get_running_loop()
+        callbacks = self._callbacks.pop(tx_hash, [])
+        handler = self._handlers.get(entry['kind'])
+        if handler:
+            callbacks.append(handler)
+        for callback in callbacks:
+            loop.run_in_executor(None, callback, tx_hash, receipt, result)
+
+    # ------------------------------------------------------------------
+    # 상태 저장
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked_state(self):
+        """스레드 잠금과 프로세스 간 파일 잠금(state_file.lock) 안에서 실행합니다."""
+        with self._file_lock:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(f'{self.state_file}.lock', 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_state(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('pending', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_state(self, pending: Dict[str, Dict]) -> None:
+        # 임시 파일은 프로세스마다 따로 써서 다른 워커의 쓰기와 겹치지 않게 합니다
+        temp_file = f'{self.state_file}.{os.getpid()}.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'pending': pending}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def _adopt_state(self) -> Dict[str, Dict]:
+        """
+        저장된 대기 트랜잭션 중 추적하는 프로세스가 없는 항목(재시작 전이나 종료된 워커의 항목)을 넘겨받습니다.
+
+        Returns:
+            이 프로세스가 추적할 대기 트랜잭션
+        """
+        pid = os.getpid()
+        adopted = {}
+        with self._locked_state():
+            pending = self._read_state()
+            for tx_hash, entry in pending.items():
+                if entry.get('owner') == pid or not _process_alive(entry.get('owner')):
+                    entry['owner'] = pid
+                    adopted[tx_hash] = {key: value for key, value in entry.items() if key != 'owner'}
+            if adopted:
+                self._write_state(pending)
+        return adopted
+
+    def _save_state(self) -> None:
+        # 대기 목록이 바뀔 때마다 저장되므로 여기서 대기 수 지표도 갱신합니다
+        PENDING_TRANSACTIONS.set(len(self._pending))
+        pid = os.getpid()
+        with self._locked_state():
+            # 다른 프로세스의 항목은 그대로 두고 이 프로세스의 항목만 현재 대기 목록으로 바꿉니다
+            pending = {
+                tx_hash: entry for tx_hash, entry in self._read_state().items()
+                if entry.get('owner') != pid and tx_hash not in self._pending
+            }
+            for tx_hash, entry in self._pending.items():
+                pending[tx_hash] = dict(entry, owner=pid)
+            self._write_state(pending)
+
+
+# 전역 확정 추적기 인스턴스
+confirmation_tracker = ConfirmationTracker(sync_blockchain_utils)
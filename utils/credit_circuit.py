@@ -0,0 +1,199 @@
+"""
+신용등급 회로 버전과 참조 모델
+ZoKrates 회로 버전별 작업 디렉토리와 입력 형식, 그리고 각 회로가 받아들이는 입력을 BN254 필드 위에서
+그대로 따라 계산하는 Python 모델을 제공합니다.
+
+v3 회로는 v2와 같은 조건을 검사하고, 비공개 입력과 솔트의 Poseidon 커밋먼트를 공개 출력으로 내보냅니다.
+credit_commitment()는 회로와 같은 값을 계산하므로 증명 밖에서 따로 해시를 만들 필요가 없습니다.
+
+check_equivalence()는 두 모델이 전체 입력 영역에서 같은 입력을 받아들이는지 확인합니다.
+두 회로 모두 신용점수·등급이 정해지면 max_loan_amount에 대해 받아들이는 집합이 구간이므로,
+신용점수와 등급은 전부 나열하고 대출 금액은 구간 경계(±1)만 확인하면 전체 영역을 확인한 것과 같습니다.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+from typing import Dict, Iterable, List, Optional, Union
+
+from .poseidon import FIELD_PRIME, poseidon
+
+# 회로 버전 → 작업 디렉토리 (프로젝트 루트 기준). 각 디렉토리에 credit_score.zok와 컴파일 산출물이 있습니다
+CIRCUIT_VERSIONS = {
+    'v1': 'zokrates',
+    'v2': os.path.join('zokrates', 'v2'),
+    'v3': os.path.join('zokrates', 'v3')
+}
+DEFAULT_CIRCUIT_VERSION = 'v1'
+# 비공개 입력의 커밋먼트를 공개 출력으로 내보내는 회로 버전
+COMMITMENT_VERSIONS = ('v3',)
+
+# 회로 입력의 신용등급 번호
+GRADE_CODES = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5}
+# 등급별 최대 대출 가능 금액 (credit_score.zok와 같은 값)
+GRADE_LIMITS = {1: 100000000, 2: 50000000, 3: 20000000, 4: 5000000, 5: 0}
+MAX_CREDIT_SCORE = 1000
+
+# v2: 등급 경계와 경계를 넘을 때마다 늘어나는 한도, 범위 검사 비트 수
+V2_THRESHOLDS = (500, 600, 700, 800)
+V2_LIMIT_STEPS = (5000000, 15000000, 30000000, 50000000)
+V2_SCORE_BITS = 10
+V2_LOAN_BITS = 27
+
+
+def circuit_version(version: Optional[str] = None) -> str:
+    """
+    사용할 회로 버전 (기본값: ZKP_CIRCUIT_VERSION 또는 v1)
+
+    Raises:
+        ValueError: 알 수 없는 버전
+    """
+    version = version or os.getenv('ZKP_CIRCUIT_VERSION') or DEFAULT_CIRCUIT_VERSION
+    if version not in CIRCUIT_VERSIONS:
+        raise ValueError(f'Unknown circuit version: {version} (available: {", ".join(CIRCUIT_VERSIONS)})')
+    return version
+
+
+def uses_commitment(version: Optional[str] = None) -> bool:
+    """회로가 입력 커밋먼트를 공개 출력으로 내보내는지"""
+    return circuit_version(version) in COMMITMENT_VERSIONS
+
+
+def circuit_inputs(credit_score: int, credit_grade: str, max_loan_amount: int,
+                   salt: Optional[int] = None) -> List[str]:
+    """compute-witness 인자 (신용점수, 등급 번호, 최대 대출 금액, v3는 솔트까지)"""
+    inputs = [str(credit_score), str(GRADE_CODES[credit_grade]), str(max_loan_amount)]
+    if salt is not None:
+        inputs.append(str(salt % FIELD_PRIME))
+    return inputs
+
+
+def random_salt() -> int:
+    """커밋먼트용 무작위 솔트 (필드 원소)"""
+    return secrets.randbelow(FIELD_PRIME)
+
+
+# 커밋먼트 솔트 비밀키로 쓸 수 없는 값 (비어 있거나 env.example·개발용 기본값)
+PLACEHOLDER_KEYS = ('', 'your-secret-key-here', 'dev-secret-key')
+
+
+def commitment_key(key: Optional[str] = None) -> str:
+    """
+    커밋먼트 솔트 비밀키 (key, COMMITMENT_SALT_KEY, SECRET_KEY 순으로 처음 설정된 값)
+
+    Raises:
+        ValueError: 셋 다 비어 있거나 알려진 기본값
+    """
+    for candidate in (key, os.getenv('COMMITMENT_SALT_KEY'), os.getenv('SECRET_KEY')):
+        if candidate and candidate not in PLACEHOLDER_KEYS:
+            return candidate
+    raise ValueError('COMMITMENT_SALT_KEY or SECRET_KEY must be set to a non-default secret '
+                     'to derive commitment salts')
+
+
+def commitment_salt(customer_id: str, key: Optional[str] = None) -> int:
+    """
+    고객별 커밋먼트 솔트
+    서버 비밀키로 고객 ID의 HMAC을 계산하므로 같은 고객의 같은 입력은 같은 커밋먼트가 되고,
+    비밀키 없이는 1001개의 신용점수를 대입해 커밋먼트를 풀 수 없습니다.
+    서버가 가진 신용정보에만 사용하세요. 호출자가 보낸 입력에 쓰면 커밋먼트를 대입으로 맞춰 볼 수 있습니다.
+
+    Args:
+        customer_id: 고객 ID
+        key: 비밀키 (기본값: COMMITMENT_SALT_KEY 또는 SECRET_KEY)
+
+    Raises:
+        ValueError: 비밀키가 설정되지 않음
+    """
+    digest = hmac.new(commitment_key(key).encode(), str(customer_id).encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest, 'big') % FIELD_PRIME
+
+
+def credit_commitment(credit_score: int, credit_grade: Union[str, int], max_loan_amount: int, salt: int) -> int:
+    """
+    v3 회로가 공개 출력으로 내보내는 커밋먼트
+    poseidon([poseidon([신용점수, 등급 번호]), poseidon([최대 대출 금액, 솔트])])
+    """
+    grade = GRADE_CODES[credit_grade] if isinstance(credit_grade, str) else credit_grade
+    return poseidon([poseidon([credit_score, grade]), poseidon([max_loan_amount, salt])])
+
+
+def format_field(value: int) -> str:
+    """ZoKrates proof.json의 공개 입력 형식 (0x + 64자리 16진수)"""
+    return f'0x{value % FIELD_PRIME:064x}'
+
+
+def accepts_v1(credit_score: int, credit_grade: int, max_loan_amount: int) -> bool:
+    """credit_score.zok(v1)가 입력을 받아들이는지 (필드 원소의 정수 비교)"""
+    score, grade, loan = credit_score % FIELD_PRIME, credit_grade % FIELD_PRIME, max_loan_amount % FIELD_PRIME
+    if score > MAX_CREDIT_SCORE or not 1 <= grade <= 5:
+        return False
+    limit_ok = (grade == 5 and loan == 0) or (grade != 5 and loan <= GRADE_LIMITS[grade])
+    bands = ((800, 1001, 1), (700, 800, 2), (600, 700, 3), (500, 600, 4), (0, 500, 5))
+    grade_ok = any(low <= score < high and grade == expected for low, high, expected in bands)
+    return limit_ok and grade_ok
+
+
+def _fits(value: int, bits: int) -> bool:
+    """ZoKrates unpack::<bits>가 성공하는지 (필드 원소가 bits비트 정수인지)"""
+    return value % FIELD_PRIME < (1 << bits)
+
+
+def accepts_v2(credit_score: int, credit_grade: int, max_loan_amount: int) -> bool:
+    """zokrates/v2/credit_score.zok가 입력을 받아들이는지 (회로의 필드 연산을 그대로 따름)"""
+    if not (_fits(credit_score, V2_SCORE_BITS) and _fits(MAX_CREDIT_SCORE - credit_score, V2_SCORE_BITS)
+            and _fits(max_loan_amount, V2_LOAN_BITS)):
+        return False
+    passed = limit = 0
+    for threshold, step in zip(V2_THRESHOLDS, V2_LIMIT_STEPS):
+        shifted = (credit_score - threshold + 1024) % FIELD_PRIME
+        if not _fits(shifted, 11):
+            return False
+        flag = shifted >> 10
+        passed += flag
+        limit += flag * step
+    return (credit_grade - (5 - passed)) % FIELD_PRIME == 0 and _fits(limit - max_loan_amount, V2_LOAN_BITS)
+
+
+def _loan_breakpoints() -> List[int]:
+    points = {0, 1 << V2_LOAN_BITS, FIELD_PRIME - 1}
+    for limit in GRADE_LIMITS.values():
+        points.update({limit, limit - (1 << V2_LOAN_BITS)})
+    return sorted({(point + delta) % FIELD_PRIME for point in points for delta in (-1, 0, 1)})
+
+
+def check_equivalence(scores: Optional[Iterable[int]] = None, grades: Optional[Iterable[int]] = None,
+                      loans: Optional[Iterable[int]] = None) -> Dict:
+    """
+    두 회로가 같은 입력을 받아들이는지 확인합니다.
+
+    기본 영역은 신용점수 0-2047과 필드 끝 값, 등급 번호 -1-7과 필드 끝 값, 대출 금액은 한도·범위 경계의 ±1입니다.
+    2048 이상의 신용점수는 두 회로 모두 첫 범위 검사에서 거부하므로 대표값만 확인합니다.
+
+    Returns:
+        {'status': 'success'/'error', 'checked', 'accepted', 'mismatches' (최대 20개)}
+    """
+    scores = list(scores) if scores is not None else \
+        list(range(2048)) + [(1 << V2_SCORE_BITS) * k for k in (4, 1024)] + [FIELD_PRIME - k for k in (1, 500, 1000)]
+    grades = list(grades) if grades is not None else list(range(-1, 8)) + [FIELD_PRIME - 5, FIELD_PRIME // 2]
+    loans = list(loans) if loans is not None else _loan_breakpoints()
+
+    checked = accepted = 0
+    mismatches = []
+    for score in scores:
+        for grade in grades:
+            for loan in loans:
+                v1, v2 = accepts_v1(score, grade, loan), accepts_v2(score, grade, loan)
+                checked += 1
+                accepted += v1
+                if v1 != v2 and len(mismatches) < 20:
+                    mismatches.append({'credit_score': score, 'credit_grade': grade,
+                                       'max_loan_amount': loan, 'v1': v1, 'v2': v2})
+    return {
+        'status': 'success' if not mismatches else 'error',
+        'message': '두 회로가 같은 입력을 받아들입니다.' if not mismatches else '회로 동작이 다릅니다.',
+        'checked': checked,
+        'accepted': accepted,
+        'mismatches': mismatches
+    }
@@ -0,0 +1,206 @@
+"""
+신용평가사 파일 적재
+JSONL / CSV(.gz 포함) 형식의 신용정보 파일을 한 줄씩 읽어 검증하고, chunk_size 단위 트랜잭션으로
+신용정보 저장소에 병합합니다. 파일 전체를 메모리에 올리지 않으므로 일일 변경분이나 전체 덤프 모두
+일정한 메모리로 적재됩니다.
+
+실제로 값이 바뀐 고객은 저장소의 credit_changes 테이블(적재 작업 ID별)과 선택적인 JSONL 보고서에
+기록되어, 영향을 받는 NFT의 재증명 대상을 고를 수 있습니다.
+"""
+
+import io
+import csv
+import gzip
+import json
+import math
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .credit_store import FIELD_NAMES, CreditStore, credit_store
+from .logging_utils import get_logger
+
+logger = get_logger('credit_ingest')
+
+PAYMENT_HISTORY_VALUES = {'excellent', 'good', 'fair', 'poor'}
+EMPLOYMENT_STATUS_VALUES = {'full_time', 'part_time', 'self_employed', 'unemployed'}
+
+# 필드 → (변환 함수, 최소값, 최대값)
+NUMERIC_RULES = {
+    'credit_score': (int, 0, 1000),
+    'income': (int, 0, None),
+    'debt_ratio': (float, 0.0, 10.0),
+    'residence_stability': (int, 0, None),
+    'credit_history_years': (int, 0, None),
+    'number_of_accounts': (int, 0, None),
+    'recent_inquiries': (int, 0, None)
+}
+CHOICE_RULES = {
+    'payment_history': PAYMENT_HISTORY_VALUES,
+    'employment_status': EMPLOYMENT_STATUS_VALUES
+}
+
+# 결과에 포함할 거부 레코드 예시 수
+MAX_REJECTION_SAMPLES = 20
+
+
+def detect_format(path: str) -> str:
+    """파일 확장자로 형식(jsonl, csv)을 판단합니다. .gz는 압축을 풀고 판단합니다."""
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.lower().endswith('.csv') else 'jsonl'
+
+
+def _open_text(path: str):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def iter_raw_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, object]]:
+    """
+    파일의 레코드를 한 줄씩 반환합니다.
+
+    Args:
+        path: 파일 경로
+        fmt: jsonl 또는 csv (기본값: 확장자로 판단)
+
+    Returns:
+        (줄 번호, 레코드 또는 해석 오류 메시지) 반복자
+    """
+    fmt = fmt or detect_format(path)
+    with _open_text(path) as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, f'Invalid JSON: {e}'
+
+
+def validate_record(raw) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    레코드를 검증하고 저장소 형식으로 변환합니다. 비어 있는 필드는 변경하지 않는 것으로 봅니다.
+
+    Args:
+        raw: JSON 객체 또는 CSV 행
+
+    Returns:
+        (변환된 레코드, None) 또는 (None, 오류 메시지)
+    """
+    if not isinstance(raw, dict):
+        return None, raw if isinstance(raw, str) else 'Record must be an object'
+    customer_id = str(raw.get('customer_id') or '').strip()
+    if not customer_id:
+        return None, 'Missing customer_id'
+
+    record = {'customer_id': customer_id}
+    for name in FIELD_NAMES:
+        value = raw.get(name)
+        if value is None or value == '':
+            continue
+        if name in NUMERIC_RULES:
+            convert, minimum, maximum = NUMERIC_RULES[name]
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return None, f'Invalid {name}: {value}'
+            # NaN은 범위 비교를 모두 통과하므로 무한대와 함께 여기서 거부합니다
+            if not math.isfinite(number):
+                return None, f'Invalid {name}: {value}'
+            value = convert(number)
+            if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+                return None, f'{name} out of range: {value}'
+        elif name in CHOICE_RULES:
+            value = str(value).strip().lower()
+            if value not in CHOICE_RULES[name]:
+                return None, f'Invalid {name}: {value}'
+        else:
+            value = str(value).strip()
+        record[name] = value
+    return record, None
+
+
+def ingest_file(path: str, store: Optional[CreditStore] = None, fmt: Optional[str] = None,
+                chunk_size: int = 5000, report_path: Optional[str] = None,
+                ingest_id: Optional[str] = None) -> Dict:
+    """
+    신용평가사 파일을 저장소에 적재합니다.
+
+    Args:
+        path: JSONL 또는 CSV 파일 (.gz 가능)
+        store: 신용정보 저장소 (기본값: 전역 저장소)
+        fmt: jsonl 또는 csv (기본값: 확장자로 판단)
+        chunk_size: 트랜잭션당 레코드 수
+        report_path: 바뀐 고객을 한 줄씩 기록할 JSONL 파일
+        ingest_id: 적재 작업 ID (기본값: 자동 생성)
+
+    Returns:
+        적재 결과 딕셔너리 (ingest_id, 레코드/신규/변경/동일/거부 수, 거부 예시)
+    """
+    store = store or credit_store
+    ingest_id = ingest_id or f'INGEST_{datetime.now().strftime("%Y%m%d%H%M%S")}_{uuid.uuid4().hex[:8]}'
+    started = time.perf_counter()
+    counts = {'records': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0}
+    rejections: List[Dict] = []
+    report = open(report_path, 'w', encoding='utf-8') if report_path else None
+
+    def flush(batch: List[Dict]) -> None:
+        changes = store.merge_records(batch, ingest_id)
+        inserted = sum(1 for change in changes if change['created'])
+        counts['inserted'] += inserted
+        counts['updated'] += len(changes) - inserted
+        counts['unchanged'] += len({record['customer_id'] for record in batch}) - len(changes)
+        if report:
+            report.writelines(json.dumps(change, ensure_ascii=False) + '\n' for change in changes)
+
+    try:
+        logger.info('신용정보 적재 시작', ingest_id=ingest_id, path=path)
+        batch: List[Dict] = []
+        for line_number, raw in iter_raw_records(path, fmt):
+            counts['records'] += 1
+            record, error = validate_record(raw)
+            if error:
+                counts['rejected'] += 1
+                if len(rejections) < MAX_REJECTION_SAMPLES:
+                    rejections.append({'line': line_number, 'error': error})
+                continue
+            batch.append(record)
+            if len(batch) >= chunk_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except Exception as e:
+        logger.error('신용정보 적재 실패', ingest_id=ingest_id, error=str(e), **counts)
+        return {
+            'status': 'error',
+            'ingest_id': ingest_id,
+            'message': '신용정보 적재 중 오류가 발생했습니다. 이미 커밋된 청크는 유지됩니다.',
+            'error': str(e),
+            **counts
+        }
+    finally:
+        if report:
+            report.close()
+
+    store.set_metadata(last_ingest_id=ingest_id, last_updated=datetime.now().isoformat(),
+                       total_customers=store.count())
+    elapsed = time.perf_counter() - started
+    logger.info('신용정보 적재 완료', ingest_id=ingest_id, elapsed_ms=round(elapsed * 1000, 1), **counts)
+    return {
+        'status': 'success',
+        'ingest_id': ingest_id,
+        'message': f"{counts['inserted'] + counts['updated']}명의 신용정보가 변경되었습니다.",
+        'changed_customers': counts['inserted'] + counts['updated'],
+        'rejections': rejections,
+        'report': report_path,
+        'elapsed_seconds': round(elapsed, 3),
+        **counts
+    }
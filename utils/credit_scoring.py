@@ -0,0 +1,303 @@
+"""
+일괄 신용 평가 (NumPy)
+고객 전체의 신용점수, 소득, 부채비율, 거주 안정성을 열 배열로 불러와 은행 기준(bank_criteria.json)의
+등급, 대출 한도, 금리, 수수료를 한 번의 벡터 연산으로 계산합니다.
+
+결과는 일괄 증명 작업 목록(iter_proof_jobs)으로 바로 변환할 수 있고, 기준 변경안을 포트폴리오 전체에
+적용했을 때의 등급 이동과 한도 변화(what_if)를 수백만 명 규모에서도 몇 초 안에 계산합니다.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .credit_store import CreditStore
+
+# 평가에 사용하는 신용정보 필드
+SCORING_FIELDS = ('credit_score', 'income', 'debt_ratio', 'residence_stability')
+# 어느 점수 구간에도 속하지 않는 고객의 등급 코드
+UNGRADED = -1
+UNGRADED_LABEL = 'ungraded'
+
+
+class ScoringRules:
+    """
+    은행 기준을 등급 코드로 색인하는 배열로 변환한 것
+
+    등급 코드는 최소 점수 오름차순의 위치입니다 (기본 기준에서 E=0 … A=4, 구간 밖은 -1).
+    """
+
+    def __init__(self, criteria: Dict):
+        """
+        Args:
+            criteria: bank_criteria.json 형식의 기준
+        """
+        bands = sorted(criteria.get('credit_score_ranges', {}).items(), key=lambda item: item[1]['min'])
+        loan_limits = criteria.get('loan_limits', {})
+        self.grades: List[str] = [grade for grade, _ in bands]
+        self.minimums = np.array([band['min'] for _, band in bands], dtype=np.int64)
+        # 등급 코드 + 1로 색인하는 표 (0번은 구간 밖 고객)
+        self.loan_limits = np.array([0] + [loan_limits.get(grade, 0) for grade in self.grades], dtype=np.int64)
+        self.interest_rates = np.array([np.nan] + [band.get('interest_rate', np.nan) for _, band in bands])
+        self.processing_fees = np.array([np.nan] + [band.get('processing_fee', np.nan) for _, band in bands])
+        self.additional = criteria.get('additional_criteria', {})
+
+    def grade_codes(self, credit_score: np.ndarray) -> np.ndarray:
+        """신용점수 배열의 등급 코드"""
+        return (np.searchsorted(self.minimums, credit_score, side='right') - 1).astype(np.int8)
+
+    def grade_labels(self, codes: np.ndarray) -> np.ndarray:
+        """등급 코드 배열을 등급 문자열 배열로 변환합니다 (구간 밖은 빈 문자열)."""
+        return np.array([''] + self.grades)[codes + 1]
+
+
+class Portfolio:
+    """
+    고객 전체의 평가용 신용정보 열 배열
+
+    값이 없는 필드는 NaN이며, 신용점수가 없는 고객은 등급을 매기지 않습니다.
+    """
+
+    def __init__(self, customer_ids: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.customer_ids = customer_ids
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    @classmethod
+    def from_customers(cls, customers: Dict[str, Dict]) -> 'Portfolio':
+        """credit_data.json의 customers 항목(고객 ID → 신용정보)으로 만듭니다."""
+        infos = list(customers.values())
+        columns = {
+            field: np.array([info.get(field) for info in infos], dtype=np.float64) for field in SCORING_FIELDS
+        }
+        return cls(np.array(list(customers), dtype=str), cls._normalize(columns))
+
+    @classmethod
+    def from_store(cls, store: CreditStore, batch_size: int = 100000) -> 'Portfolio':
+        """신용정보 저장소 전체를 batch_size개씩 읽어 만듭니다."""
+        ids: List[np.ndarray] = []
+        parts: Dict[str, List[np.ndarray]] = {field: [] for field in SCORING_FIELDS}
+        for rows in store.iter_column_batches(SCORING_FIELDS, batch_size):
+            values = list(zip(*rows))
+            ids.append(np.array(values[0], dtype=str))
+            for field, column in zip(SCORING_FIELDS, values[1:]):
+                parts[field].append(np.array(column, dtype=np.float64))
+        if not ids:
+            return cls(np.array([], dtype=str), cls._normalize({field: np.array([]) for field in SCORING_FIELDS}))
+        return cls(np.concatenate(ids), cls._normalize({field: np.concatenate(parts[field]) for field in parts}))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> 'Portfolio':
+        """
+        열 배열(customer_id 포함)로 만듭니다. 메모리 매핑된 columnar 픽스처를 복사하지 않고 그대로 사용합니다.
+        """
+        return cls(columns['customer_id'], {field: columns[field] for field in SCORING_FIELDS if field in columns})
+
+    @staticmethod
+    def _normalize(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # 신용점수가 없으면 -1로 두어 어느 구간에도 속하지 않게 합니다
+        columns['credit_score'] = np.nan_to_num(columns['credit_score'], nan=-1).astype(np.int64)
+        return columns
+
+
+def score_portfolio(portfolio: Portfolio, rules: ScoringRules) -> Dict[str, np.ndarray]:
+    """
+    포트폴리오 전체의 등급과 대출 조건을 계산합니다.
+
+    추가 기준(additional_criteria)은 소득, 부채비율, 거주 기간에 적용합니다. 근속 기간은 신용정보에
+    필드가 없어 평가하지 않습니다.
+
+    Args:
+        portfolio: 평가할 고객
+        rules: 은행 기준
+
+    Returns:
+        고객 순서의 배열 딕셔너리
+        (grade_code, max_loan_amount, interest_rate, processing_fee(%), fee_amount, eligible)
+    """
+    columns = portfolio.columns
+    codes = rules.grade_codes(columns['credit_score'])
+    index = codes.astype(np.intp) + 1
+    max_loan_amount = rules.loan_limits[index]
+
+    eligible = (codes != UNGRADED) & (max_loan_amount > 0)
+    additional = rules.additional
+    if 'minimum_income' in additional and 'income' in columns:
+        eligible &= columns['income'] >= additional['minimum_income']
+    if 'maximum_debt_ratio' in additional and 'debt_ratio' in columns:
+        eligible &= columns['debt_ratio'] <= additional['maximum_debt_ratio']
+    if 'minimum_residence_years' in additional and 'residence_stability' in columns:
+        eligible &= columns['residence_stability'] >= additional['minimum_residence_years']
+
+    processing_fee = rules.processing_fees[index]
+    return {
+        'grade_code': codes,
+        'max_loan_amount': max_loan_amount,
+        'interest_rate': rules.interest_rates[index],
+        'processing_fee': processing_fee,
+        'fee_amount': np.where(eligible, max_loan_amount * processing_fee / 100, 0.0),
+        'eligible': eligible
+    }
+
+
+def summarize(scores: Dict[str, np.ndarray], rules: ScoringRules) -> Dict:
+    """
+    평가 결과를 등급별로 집계합니다.
+
+    Returns:
+        {'customers', 'ungraded', 'eligible_customers', 'total_loan_limit', 'expected_fee_income',
+         'grades': {등급: {'customers', 'share', 'eligible', 'total_loan_limit', 'interest_rate', 'processing_fee'}}}
+    """
+    index = scores['grade_code'].astype(np.intp) + 1
+    size = len(rules.grades) + 1
+    eligible = scores['eligible']
+    counts = np.bincount(index, minlength=size)
+    eligible_counts = np.bincount(index, weights=eligible, minlength=size)
+    limits = np.bincount(index, weights=np.where(eligible, scores['max_loan_amount'], 0), minlength=size)
+    total = int(counts.sum())
+
+    grades = {}
+    for code, grade in enumerate(rules.grades, 1):
+        grades[grade] = {
+            'customers': int(counts[code]),
+            'share': round(counts[code] / total, 4) if total else 0.0,
+            'eligible': int(eligible_counts[code]),
+            'total_loan_limit': int(limits[code]),
+            'interest_rate': float(rules.interest_rates[code]),
+            'processing_fee': float(rules.processing_fees[code])
+        }
+    return {
+        'customers': total,
+        'ungraded': int(counts[0]),
+        'eligible_customers': int(eligible.sum()),
+        'total_loan_limit': int(limits.sum()),
+        'expected_fee_income': int(round(float(scores['fee_amount'].sum()))),
+        'grades': grades
+    }
+
+
+def merge_criteria(base: Dict, changes: Dict) -> Dict:
+    """
+    기준 변경안을 현재 기준에 덮어씁니다. 딕셔너리 값은 재귀적으로 병합하므로
+    {"credit_score_ranges": {"B": {"min": 720}}}처럼 바꿀 값만 지정할 수 있습니다.
+    """
+    merged = dict(base)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_criteria(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def what_if(portfolio: Portfolio, base_criteria: Dict, scenario_criteria: Dict, sample_size: int = 20) -> Dict:
+    """
+    기준 변경안을 포트폴리오 전체에 적용했을 때의 변화를 계산합니다.
+
+    Args:
+        portfolio: 평가할 고객
+        base_criteria: 현재 기준
+        scenario_criteria: 변경안 (전체 기준)
+        sample_size: 결과에 포함할 등급 변경 고객 ID 수
+
+    Returns:
+        {'base', 'scenario' (summarize 결과), 'transitions' ({이전 등급: {새 등급: 고객 수}}),
+         'changed_customers', 'newly_eligible', 'no_longer_eligible', 'loan_limit_delta',
+         'fee_income_delta', 'sample_changed'}
+    """
+    base_rules, scenario_rules = ScoringRules(base_criteria), ScoringRules(scenario_criteria)
+    base, scenario = score_portfolio(portfolio, base_rules), score_portfolio(portfolio, scenario_rules)
+    base_summary, scenario_summary = summarize(base, base_rules), summarize(scenario, scenario_rules)
+
+    # 두 기준의 등급을 공통 라벨 색인으로 맞춘 뒤 (이전, 새) 쌍을 한 번에 셉니다
+    labels = base_rules.grades + [grade for grade in scenario_rules.grades if grade not in base_rules.grades]
+    labels.append(UNGRADED_LABEL)
+    size = len(labels)
+
+    def label_index(rules: ScoringRules, codes: np.ndarray) -> np.ndarray:
+        lookup = np.array([size - 1] + [labels.index(grade) for grade in rules.grades], dtype=np.intp)
+        return lookup[codes.astype(np.intp) + 1]
+
+    before, after = label_index(base_rules, base['grade_code']), label_index(scenario_rules, scenario['grade_code'])
+    matrix = np.bincount(before * size + after, minlength=size * size).reshape(size, size)
+    transitions = {
+        labels[i]: {labels[j]: int(matrix[i, j]) for j in np.flatnonzero(matrix[i])}
+        for i in range(size) if matrix[i].any()
+    }
+    changed = np.flatnonzero(before != after)
+
+    return {
+        'base': base_summary,
+        'scenario': scenario_summary,
+        'transitions': transitions,
+        'changed_customers': int(len(changed)),
+        'newly_eligible': int((scenario['eligible'] & ~base['eligible']).sum()),
+        'no_longer_eligible': int((base['eligible'] & ~scenario['eligible']).sum()),
+        'loan_limit_delta': scenario_summary['total_loan_limit'] - base_summary['total_loan_limit'],
+        'fee_income_delta': scenario_summary['expected_fee_income'] - base_summary['expected_fee_income'],
+        'sample_changed': [str(customer_id) for customer_id in portfolio.customer_ids[changed[:sample_size]]]
+    }
+
+
+def iter_proof_jobs(portfolio: Portfolio, scores: Dict[str, np.ndarray], rules: ScoringRules,
+                    indices: Optional[Sequence[int]] = None) -> Iterator[Dict]:
+    """
+    평가 결과를 일괄 증명 작업으로 변환합니다 (등급이 있는 고객만).
+
+    Args:
+        portfolio: 평가한 고객
+        scores: score_portfolio 결과
+        rules: 평가에 사용한 기준
+        indices: 작업을 만들 고객 위치 (기본값: 전체)
+
+    Returns:
+        issue_credit_nft 인자와 같은 {'customer_id', 'credit_score', 'credit_grade', 'max_loan_amount'} 반복자
+    """
+    selected = np.arange(len(portfolio)) if indices is None else np.asarray(indices, dtype=np.intp)
+    selected = selected[scores['grade_code'][selected] != UNGRADED]
+    labels = rules.grade_labels(scores['grade_code'][selected])
+    rows = zip(portfolio.customer_ids[selected].tolist(), portfolio.columns['credit_score'][selected].tolist(),
+               labels.tolist(), scores['max_loan_amount'][selected].tolist())
+    for customer_id, credit_score, credit_grade, max_loan_amount in rows:
+        yield {
+            'customer_id': customer_id,
+            'credit_score': int(credit_score),
+            'credit_grade': credit_grade,
+            'max_loan_amount': int(max_loan_amount)
+        }
+
+
+class PortfolioCache:
+    """
+    마지막으로 불러온 포트폴리오를 원본 데이터가 바뀔 때까지 보관합니다.
+    what-if 요청마다 저장소 전체를 다시 읽지 않도록 합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key: Optional[Hashable] = None
+        self._portfolio: Optional[Portfolio] = None
+
+    def get(self, key: Hashable, loader: Callable[[], Portfolio]) -> Portfolio:
+        """
+        Args:
+            key: 원본 데이터의 버전 (저장소 경로, 마지막 적재 ID, 고객 수 등)
+            loader: 캐시가 없거나 버전이 바뀌었을 때 포트폴리오를 불러오는 함수
+        """
+        with self._lock:
+            if self._portfolio is None or self._key != key:
+                self._portfolio = loader()
+                self._key = key
+            return self._portfolio
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = None
+            self._portfolio = None
+
+
+# 전역 포트폴리오 캐시 인스턴스
+portfolio_cache = PortfolioCache()
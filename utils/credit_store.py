@@ -0,0 +1,322 @@
+"""
+신용정보 저장소 (SQLite)
+고객 ID로 색인된 신용정보 테이블을 제공합니다. data/credit_data.json 전체를 읽는 대신
+필요한 고객만 조회하므로 고객 수가 수백만 명이어도 조회 비용과 메모리 사용량이 일정합니다.
+
+CREDIT_DATA_BACKEND=sqlite로 설정하면 신용정보 조회가 CREDIT_STORE_PATH의 저장소를 사용합니다.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# (필드, SQLite 타입) - credit_data.json 고객 항목과 같은 필드
+CREDIT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('name', 'TEXT'),
+    ('credit_score', 'INTEGER'),
+    ('income', 'INTEGER'),
+    ('debt_ratio', 'REAL'),
+    ('payment_history', 'TEXT'),
+    ('employment_status', 'TEXT'),
+    ('residence_stability', 'INTEGER'),
+    ('credit_history_years', 'INTEGER'),
+    ('number_of_accounts', 'INTEGER'),
+    ('recent_inquiries', 'INTEGER')
+)
+FIELD_NAMES = tuple(name for name, _ in CREDIT_FIELDS)
+COLUMNS = ('customer_id',) + FIELD_NAMES
+
+
+class CreditStore:
+    """
+    SQLite 신용정보 저장소
+
+    연결은 스레드·프로세스마다 따로 열고, 대량 적재는 batch_size 단위 트랜잭션으로 나눠
+    메모리 사용량과 잠금 시간을 제한합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 파일 경로
+        """
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            columns = ', '.join(f'{name} {kind}' for name, kind in CREDIT_FIELDS)
+            conn.execute(f'CREATE TABLE IF NOT EXISTS customers (customer_id TEXT PRIMARY KEY, {columns})')
+            conn.execute('CREATE INDEX IF NOT EXISTS customers_credit_score ON customers (credit_score)')
+            conn.execute('CREATE TABLE IF NOT EXISTS store_metadata (key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS credit_changes (ingest_id TEXT NOT NULL, customer_id TEXT NOT NULL, '
+                'previous_score INTEGER, credit_score INTEGER, fields TEXT NOT NULL, '
+                'PRIMARY KEY (ingest_id, customer_id))'
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, customer_id: str) -> Optional[Dict]:
+        """
+        고객 신용정보를 조회합니다.
+
+        Args:
+            customer_id: 고객 ID
+
+        Returns:
+            credit_data.json의 고객 항목과 같은 형식의 딕셔너리 또는 None
+        """
+        row = self._connect().execute(
+            f'SELECT {", ".join(FIELD_NAMES)} FROM customers WHERE customer_id = ?', (customer_id,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_many(self, customer_ids: Sequence[str]) -> Dict[str, Dict]:
+        """여러 고객의 신용정보를 조회합니다 (고객 ID → 신용정보)."""
+        result = {}
+        conn = self._connect()
+        # SQLite 바인딩 변수 한도(999) 안에서 나눠 조회합니다
+        for start in range(0, len(customer_ids), 900):
+            chunk = list(customer_ids[start:start + 900])
+            rows = conn.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM customers WHERE customer_id IN ({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            for row in rows:
+                record = dict(row)
+                result[record.pop('customer_id')] = record
+        return result
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM customers').fetchone()[0]
+
+    def upsert_many(self, records: Iterable[Dict], batch_size: int = 10000) -> int:
+        """
+        고객 신용정보를 일괄 저장합니다. 이미 있는 고객은 덮어씁니다.
+
+        Args:
+            records: customer_id와 신용정보 필드를 가진 딕셔너리
+            batch_size: 트랜잭션당 행 수
+
+        Returns:
+            저장한 행 수
+        """
+        return self.upsert_rows(
+            (tuple(record.get(column) for column in COLUMNS) for record in records), batch_size
+        )
+
+    def upsert_rows(self, rows: Iterable[Sequence], batch_size: int = 10000) -> int:
+        """
+        COLUMNS 순서의 튜플을 일괄 저장합니다 (딕셔너리 변환 없이 적재하는 경로).
+
+        Returns:
+            저장한 행 수
+        """
+        conn = self._connect()
+        placeholders = ', '.join('?' * len(COLUMNS))
+        updates = ', '.join(f'{name} = excluded.{name}' for name in FIELD_NAMES)
+        sql = (f'INSERT INTO customers ({", ".join(COLUMNS)}) VALUES ({placeholders}) '
+               f'ON CONFLICT(customer_id) DO UPDATE SET {updates}')
+        total = 0
+        batch: List[Sequence] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += self._write_batch(conn, sql, batch)
+                batch = []
+        if batch:
+            total += self._write_batch(conn, sql, batch)
+        return total
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, sql: str, batch: List[Sequence]) -> int:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(sql, batch)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(batch)
+
+    def merge_records(self, records: List[Dict], ingest_id: Optional[str] = None) -> List[Dict]:
+        """
+        고객 신용정보를 기존 값과 병합해 저장하고 실제로 바뀐 고객만 반환합니다.
+        레코드에 없는 필드는 기존 값을 유지하므로 일부 필드만 담긴 변경분(delta)도 적용할 수 있습니다.
+        조회·비교·쓰기는 한 트랜잭션에서 이루어집니다.
+
+        Args:
+            records: customer_id와 신용정보 필드를 가진 딕셔너리 목록
+            ingest_id: 지정하면 변경 내역을 credit_changes 테이블에 기록합니다
+
+        Returns:
+            변경 목록 [{'customer_id', 'created', 'fields', 'previous_score', 'credit_score'}]
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            ids = list(dict.fromkeys(record['customer_id'] for record in records))
+            current: Dict[str, Optional[Dict]] = {customer_id: None for customer_id in ids}
+            current.update(self.get_many(ids))
+            changes: Dict[str, Dict] = {}
+            for record in records:
+                customer_id = record['customer_id']
+                before = current[customer_id]
+                merged = dict(before or {})
+                merged.update({name: record[name] for name in FIELD_NAMES if record.get(name) is not None})
+                fields = [name for name in FIELD_NAMES if (before or {}).get(name) != merged.get(name)]
+                if not fields:
+                    continue
+                change = changes.setdefault(customer_id, {
+                    'customer_id': customer_id,
+                    'created': before is None,
+                    'fields': [],
+                    'previous_score': (before or {}).get('credit_score')
+                })
+                change['fields'] = sorted(set(change['fields']) | set(fields))
+                change['credit_score'] = merged.get('credit_score')
+                current[customer_id] = merged
+
+            if changes:
+                placeholders = ', '.join('?' * len(COLUMNS))
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO customers ({", ".join(COLUMNS)}) VALUES ({placeholders})',
+                    [(customer_id,) + tuple(current[customer_id].get(name) for name in FIELD_NAMES)
+                     for customer_id in changes]
+                )
+                if ingest_id:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO credit_changes '
+                        '(ingest_id, customer_id, previous_score, credit_score, fields) VALUES (?, ?, ?, ?, ?)',
+                        [(ingest_id, c['customer_id'], c['previous_score'], c['credit_score'], ','.join(c['fields']))
+                         for c in changes.values()]
+                    )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return list(changes.values())
+
+    def iter_changes(self, ingest_id: str, batch_size: int = 10000) -> Iterator[Dict]:
+        """
+        적재 작업에서 바뀐 고객을 고객 ID 순서로 반환합니다.
+
+        Args:
+            ingest_id: 적재 작업 ID
+
+        Returns:
+            {'customer_id', 'previous_score', 'credit_score', 'fields'} 반복자
+        """
+        conn = self._connect()
+        last = ''
+        while True:
+            rows = conn.execute(
+                'SELECT customer_id, previous_score, credit_score, fields FROM credit_changes '
+                'WHERE ingest_id = ? AND customer_id > ? ORDER BY customer_id LIMIT ?',
+                (ingest_id, last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                change = dict(row)
+                change['fields'] = change['fields'].split(',') if change['fields'] else []
+                yield change
+            last = rows[-1]['customer_id']
+
+    def iter_customers(self, batch_size: int = 10000) -> Iterator[Dict]:
+        """
+        모든 고객을 고객 ID 순서로 반환합니다. batch_size개씩 키 기준으로 이어서 조회하므로
+        조회 중에도 다른 연결의 쓰기를 막지 않습니다.
+        """
+        conn = self._connect()
+        last = ''
+        while True:
+            rows = conn.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM customers WHERE customer_id > ? ORDER BY customer_id LIMIT ?',
+                (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last = rows[-1]['customer_id']
+
+    def iter_column_batches(self, columns: Sequence[str], batch_size: int = 100000) -> Iterator[List[tuple]]:
+        """
+        고객 ID 순서로 지정한 열의 값을 batch_size개씩 반환합니다 (일괄 계산용으로 행 딕셔너리를 만들지 않습니다).
+
+        Args:
+            columns: 신용정보 필드 (각 튜플의 첫 값은 customer_id)
+            batch_size: 한 번에 조회할 행 수
+
+        Returns:
+            (customer_id, 필드 값...) 튜플 목록의 반복자
+        """
+        unknown = [column for column in columns if column not in FIELD_NAMES]
+        if unknown:
+            raise ValueError(f'Unknown credit fields: {", ".join(unknown)}')
+        cursor = self._connect().cursor()
+        cursor.row_factory = None
+        sql = (f'SELECT customer_id, {", ".join(columns)} FROM customers '
+               f'WHERE customer_id > ? ORDER BY customer_id LIMIT ?')
+        last = ''
+        while True:
+            rows = cursor.execute(sql, (last, batch_size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+
+    def set_metadata(self, **values) -> None:
+        conn = self._connect()
+        conn.executemany(
+            'INSERT INTO store_metadata (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            [(key, str(value)) for key, value in values.items()]
+        )
+
+    def metadata(self) -> Dict[str, str]:
+        return {row['key']: row['value'] for row in self._connect().execute('SELECT key, value FROM store_metadata')}
+
+    def import_credit_data(self, data: Dict) -> int:
+        """
+        credit_data.json 형식의 데이터를 저장소에 적재합니다.
+
+        Args:
+            data: {'customers': {고객 ID: 신용정보}, 'metadata': {...}}
+
+        Returns:
+            저장한 행 수
+        """
+        total = self.upsert_many(
+            {'customer_id': customer_id, **info} for customer_id, info in data.get('customers', {}).items()
+        )
+        if data.get('metadata'):
+            self.set_metadata(**data['metadata'])
+        return total
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def credit_data_backend() -> str:
+    """신용정보 조회 방식 (CREDIT_DATA_BACKEND: json 또는 sqlite)"""
+    return (os.getenv('CREDIT_DATA_BACKEND') or 'json').lower()
+
+
+# 전역 신용정보 저장소 인스턴스 (연결은 처음 조회할 때 엽니다)
+credit_store = CreditStore(os.getenv('CREDIT_STORE_PATH') or 'data/credit_store.db')
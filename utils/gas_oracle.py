@@ -0,0 +1,420 @@
+"""
+가스 가격 오라클
+fee history를 주기적으로 샘플링하여 EIP-1559 수수료 제안값을 캐싱하고,
+컨트랙트 함수·호출 데이터 길이별 가스 추정치를 메모이제이션합니다.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class GasOracle:
+    """EIP-1559 수수료 및 가스 한도 오라클"""
+
+    # 긴급도별 priority fee 백분위수
+    URGENCY_PERCENTILES = {
+        'slow': 10,
+        'standard': 50,
+        'fast': 90
+    }
+
+    # 긴급도별 base fee 여유 배수 (블록당 최대 12.5% 상승 기준)
+    BASE_FEE_MULTIPLIERS = {
+        'slow': 1.125,
+        'standard': 1.5,
+        'fast': 2.0
+    }
+
+    # legacy(gasPrice) 네트워크에서의 긴급도별 배수
+    LEGACY_MULTIPLIERS = {
+        'slow': 1.0,
+        'standard': 1.0,
+        'fast': 1.25
+    }
+
+    # 가스 추정 실패 시 사용하는 기본 가스 한도
+    DEFAULT_GAS_LIMIT = 2000000
+
+    def __init__(self, w3, refresh_interval: Optional[float] = None,
+                 block_count: Optional[int] = None, gas_margin: float = 0.2,
+                 min_priority_fee: int = 10 ** 9):
+        """
+        가스 오라클 초기화
+
+        Args:
+            w3: Web3 인스턴스 (비동기 사용 시 None, refresh_async로 갱신)
+            refresh_interval: fee history 샘플링 주기 (초)
+            block_count: 샘플링할 최근 블록 수
+            gas_margin: 가스 추정치에 더할 안전 여유 비율
+            min_priority_fee: priority fee 하한 (wei)
+        """
+        self.w3 = w3
+        self.refresh_interval = refresh_interval if refresh_interval is not None else \
+            float(os.getenv('GAS_ORACLE_INTERVAL', 12))
+        self.block_count = block_count if block_count is not None else \
+            int(os.getenv('GAS_ORACLE_BLOCKS', 20))
+        self.gas_margin = gas_margin
+        self.min_priority_fee = min_priority_fee
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._fees: Optional[Dict] = None
+        self._sampled_at = 0.0
+        self._gas_table: Dict[Tuple[str, str, int], int] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'samples': 0,
+            'sample_errors': 0,
+            'fee_cache_hits': 0,
+            'gas_estimates': 0,
+            'gas_cache_hits': 0
+        }
+
+    # ------------------------------------------------------------------
+    # fee history 샘플링
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """백그라운드 샘플링 스레드를 시작합니다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='gas-oracle', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """백그라운드 샘플링 스레드를 중지합니다."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.refresh_interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.refresh()
+            self._stop_event.wait(self.refresh_interval)
+
+    def refresh(self, blocking: bool = True) -> Optional[Dict]:
+        """
+        fee history를 샘플링하여 캐시를 갱신합니다.
+
+        Args:
+            blocking: 다른 스레드가 갱신 중일 때 완료를 기다릴지 여부
+
+        Returns:
+            갱신된 수수료 정보 (실패 시 기존 캐시)
+        """
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return self._fees
+
+        try:
+            # 대기하는 동안 다른 스레드가 이미 갱신했다면 그대로 사용합니다
+            if self._fees is not None and time.monotonic() - self._sampled_at < self.refresh_interval:
+                return self._fees
+
+            fees = self._sample()
+            with self._lock:
+                self._fees = fees
+                self._sampled_at = time.monotonic()
+                self.stats['samples'] += 1
+        except Exception:
+            with self._lock:
+                self.stats['sample_errors'] += 1
+                # 실패해도 다음 주기까지 재시도를 미룹니다
+                self._sampled_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+        return self._fees
+
+    async def refresh_async(self, async_w3) -> Optional[Dict]:
+        """
+        AsyncWeb3 인스턴스로 fee history를 샘플링하여 캐시를 갱신합니다.
+
+        Args:
+            async_w3: AsyncWeb3 인스턴스
+
+        Returns:
+            갱신된 수수료 정보 (실패 시 기존 캐시)
+        """
+        percentiles = sorted(self.URGENCY_PERCENTILES.values())
+        try:
+            try:
+                history = await async_w3.eth.fee_history(self.block_count, 'latest', percentiles)
+            except Exception:
+                history = None
+
+            if history and history.get('baseFeePerGas'):
+                fees = self.fees_from_history(history, percentiles)
+            else:
+                fees = {
+                    'mode': 'legacy',
+                    'gas_price': int(await async_w3.eth.gas_price)
+                }
+
+            with self._lock:
+                self._fees = fees
+                self._sampled_at = time.monotonic()
+                self.stats['samples'] += 1
+        except Exception:
+            with self._lock:
+                self.stats['sample_errors'] += 1
+                self._sampled_at = time.monotonic()
+
+        return self._fees
+
+    def is_stale(self) -> bool:
+        """캐시된 수수료 정보가 없거나 샘플링 주기가 지났는지 확인합니다."""
+        with self._lock:
+            return self._fees is None or time.monotonic() - self._sampled_at >= self.refresh_interval
+
+    def _sample(self) -> Dict:
+        percentiles = sorted(self.URGENCY_PERCENTILES.values())
+        try:
+            history = self.w3.eth.fee_history(self.block_count, 'latest', percentiles)
+        except Exception:
+            history = None
+
+        if history and history.get('baseFeePerGas'):
+            return self.fees_from_history(history, percentiles)
+
+        # EIP-1559 미지원 네트워크: gasPrice로 대체
+        return {
+            'mode': 'legacy',
+            'gas_price': int(self.w3.eth.gas_price)
+        }
+
+    def fees_from_history(self, history: Dict, percentiles: List[int]) -> Dict:
+        """
+        eth_feeHistory 응답으로부터 긴급도별 수수료 제안값을 계산합니다.
+
+        Args:
+            history: eth_feeHistory 응답
+            percentiles: 요청한 reward 백분위수 목록
+
+        Returns:
+            수수료 정보
+        """
+        # baseFeePerGas의 마지막 값은 다음 블록의 base fee
+        base_fee = int(history['baseFeePerGas'][-1])
+        rewards = history.get('reward') or []
+
+        priority_fees = {}
+        for urgency, percentile in self.URGENCY_PERCENTILES.items():
+            column = percentiles.index(percentile)
+            samples = sorted(
+                int(block_rewards[column]) for block_rewards in rewards
+                if len(block_rewards) > column and int(block_rewards[column]) > 0
+            )
+            if samples:
+                priority_fee = samples[len(samples) // 2]
+            else:
+                priority_fee = self.min_priority_fee
+            priority_fees[urgency] = max(priority_fee, self.min_priority_fee)
+
+        return {
+            'mode': 'eip1559',
+            'base_fee': base_fee,
+            'priority_fees': priority_fees
+        }
+
+    def _current_fees(self) -> Dict:
+        with self._lock:
+            fees = self._fees
+            stale = time.monotonic() - self._sampled_at >= self.refresh_interval
+
+        if fees is None:
+            fees = self.refresh()
+            if fees is None:
+                raise RuntimeError('Gas fee information is unavailable')
+            return fees
+
+        # w3가 없으면(비동기 사용) 호출자가 refresh_async로 갱신합니다
+        if stale and self.w3 is not None and not self._refresh_lock.locked():
+            # 캐시가 있으면 새 값을 기다리지 않고 갱신만 트리거합니다
+            threading.Thread(
+                target=self.refresh, kwargs={'blocking': False},
+                name='gas-oracle-refresh', daemon=True
+            ).start()
+
+        with self._lock:
+            self.stats['fee_cache_hits'] += 1
+        return fees
+
+    def suggest_fees(self, urgency: str = 'standard') -> Dict:
+        """
+        긴급도에 맞는 트랜잭션 수수료 필드를 제안합니다.
+
+        Args:
+            urgency: 긴급도 ('slow', 'standard', 'fast')
+
+        Returns:
+            트랜잭션에 그대로 넣을 수 있는 수수료 필드
+        """
+        if urgency not in self.URGENCY_PERCENTILES:
+            raise ValueError(f'Unknown urgency tier: {urgency}')
+
+        fees = self._current_fees()
+
+        if fees['mode'] == 'legacy':
+            return {
+                'gasPrice': int(fees['gas_price'] * self.LEGACY_MULTIPLIERS[urgency])
+            }
+
+        priority_fee = fees['priority_fees'][urgency]
+        max_fee = int(fees['base_fee'] * self.BASE_FEE_MULTIPLIERS[urgency]) + priority_fee
+        return {
+            'maxFeePerGas': max_fee,
+            'maxPriorityFeePerGas': priority_fee
+        }
+
+    # ------------------------------------------------------------------
+    # 컨트랙트 함수별 가스 추정
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def calldata_words(contract_function) -> int:
+        """
+        호출 데이터 길이를 32바이트 워드 수로 반환합니다 (인코딩할 수 없으면 0).
+        가변 길이 인자(문자열, 바이트)는 워드 단위로 저장·복사 비용이 늘어나므로 가스 테이블 키에 포함합니다.
+        """
+        encode = getattr(contract_function, '_encode_transaction_data', None) or \
+            getattr(contract_function, '_encode_data_in_transaction', None)
+        if encode is None:
+            return 0
+        try:
+            data = encode()
+        except Exception:
+            return 0
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:] if data.startswith('0x') else data)
+        return (len(data) + 31) // 32
+
+    def _gas_key(self, contract_address: str, function_name: str, contract_function) -> Tuple[str, str, int]:
+        return contract_address, function_name, self.calldata_words(contract_function)
+
+    def estimate_gas(self, contract_address: str, function_name: str,
+                     contract_function, from_address: str) -> int:
+        """
+        컨트랙트 함수의 가스 한도를 추정합니다.
+        결과는 (컨트랙트, 함수, 호출 데이터 워드 수)별로 메모이제이션되므로
+        짧은 인자로 추정한 한도를 긴 인자 호출에 쓰지 않습니다.
+
+        Args:
+            contract_address: 컨트랙트 주소 (배포의 경우 바이트코드 식별자)
+            function_name: 함수명
+            contract_function: estimate_gas를 지원하는 web3 함수/생성자 객체
+            from_address: 트랜잭션 발신자 주소
+
+        Returns:
+            안전 여유가 포함된 가스 한도
+        """
+        key = self._gas_key(contract_address, function_name, contract_function)
+        with self._lock:
+            cached = self._gas_table.get(key)
+            if cached is not None:
+                self.stats['gas_cache_hits'] += 1
+                return cached
+
+        try:
+            estimate = contract_function.estimate_gas({'from': from_address})
+            gas_limit = int(estimate * (1 + self.gas_margin))
+        except Exception:
+            # 추정 실패 시에는 캐시하지 않고 기본값을 사용합니다
+            return self.DEFAULT_GAS_LIMIT
+
+        with self._lock:
+            self.stats['gas_estimates'] += 1
+            self._gas_table[key] = max(gas_limit, self._gas_table.get(key, 0))
+            return self._gas_table[key]
+
+    async def estimate_gas_async(self, contract_address: str, function_name: str,
+                                 contract_function, from_address: str) -> int:
+        """
+        비동기 컨트랙트 함수의 가스 한도를 추정합니다. estimate_gas와 같은 테이블을 공유합니다.
+
+        Args:
+            contract_address: 컨트랙트 주소
+            function_name: 함수명
+            contract_function: AsyncWeb3 컨트랙트 함수 객체
+            from_address: 트랜잭션 발신자 주소
+
+        Returns:
+            안전 여유가 포함된 가스 한도
+        """
+        key = self._gas_key(contract_address, function_name, contract_function)
+        with self._lock:
+            cached = self._gas_table.get(key)
+            if cached is not None:
+                self.stats['gas_cache_hits'] += 1
+                return cached
+
+        try:
+            estimate = await contract_function.estimate_gas({'from': from_address})
+        except Exception:
+            return self.DEFAULT_GAS_LIMIT
+
+        self.record_gas_used(contract_address, function_name, estimate, contract_function)
+        with self._lock:
+            self.stats['gas_estimates'] += 1
+            return self._gas_table[key]
+
+    def record_gas_used(self, contract_address: str, function_name: str, gas_used: int,
+                        contract_function=None) -> None:
+        """
+        실제 사용된 가스를 반영하여 메모이제이션 테이블을 보정합니다.
+
+        Args:
+            contract_address: 컨트랙트 주소
+            function_name: 함수명
+            gas_used: 영수증의 gasUsed
+            contract_function: 추정에 쓴 함수 객체 (호출 데이터 워드 수를 구합니다)
+        """
+        key = self._gas_key(contract_address, function_name, contract_function)
+        observed = int(gas_used * (1 + self.gas_margin))
+        with self._lock:
+            if observed > self._gas_table.get(key, 0):
+                self._gas_table[key] = observed
+
+    def build_tx_params(self, from_address: str, nonce: int, gas: int,
+                        urgency: str = 'standard') -> Dict:
+        """
+        트랜잭션 파라미터를 구성합니다.
+
+        Args:
+            from_address: 발신자 주소
+            nonce: 트랜잭션 nonce
+            gas: 가스 한도
+            urgency: 긴급도
+
+        Returns:
+            build_transaction에 전달할 파라미터
+        """
+        params = {
+            'from': from_address,
+            'gas': gas,
+            'nonce': nonce
+        }
+        params.update(self.suggest_fees(urgency))
+        return params
+
+    def get_status(self) -> Dict:
+        """
+        오라클 상태를 조회합니다.
+
+        Returns:
+            캐시된 수수료 및 통계 정보
+        """
+        with self._lock:
+            age = time.monotonic() - self._sampled_at if self._fees else None
+            return {
+                'status': 'success',
+                'fees': self._fees,
+                'age_seconds': age,
+                'gas_table_size': len(self._gas_table),
+                'stats': dict(self.stats)
+            }
@@ -0,0 +1,289 @@
+"""
+구조화 로깅 유틸리티
+JSON 레코드, 큐 기반 비동기 출력, 엔드포인트별 샘플링과 개인정보 마스킹을 제공합니다.
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import hmac
+import hashlib
+import threading
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from .credit_circuit import PLACEHOLDER_KEYS
+
+ROOT_LOGGER = 'zk_nft'
+
+# 요청 단위 컨텍스트 (엔드포인트, 요청 ID) - Flask 스레드와 Quart 태스크 모두에서 격리됩니다
+_request_context: contextvars.ContextVar[Dict] = contextvars.ContextVar('log_request_context', default={})
+
+_setup_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+
+
+def parse_mapping(value: Optional[str]) -> Dict[str, str]:
+    """
+    'a=1,b=2' 형식의 환경변수를 딕셔너리로 변환합니다.
+
+    Args:
+        value: 환경변수 값
+
+    Returns:
+        키-값 딕셔너리
+    """
+    mapping = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            key, _, val = item.partition('=')
+            mapping[key.strip()] = val.strip()
+    return mapping
+
+
+class PiiRedactor:
+    """로그 필드의 개인정보를 마스킹합니다."""
+
+    # 값을 완전히 가리는 필드
+    MASKED_FIELDS = {
+        'customer_name', 'name', 'credit_score', 'credit_grade', 'income', 'debt_ratio',
+        'requested_amount', 'max_loan_amount', 'approved_amount', 'customer_signature'
+    }
+
+    # 앞뒤 일부만 남기는 블록체인 주소 필드
+    ADDRESS_FIELDS = {'customer_address', 'address', 'from_address', 'to_address', 'owner'}
+
+    def __init__(self, enabled: bool = True, key: Optional[str] = None):
+        """
+        Args:
+            enabled: 마스킹 여부
+            key: 마스킹 태그용 비밀키 (기본값: LOG_REDACT_KEY 또는 SECRET_KEY, 기본값 키면 태그 없이 가림)
+        """
+        self.enabled = enabled
+        if key is None:
+            key = os.getenv('LOG_REDACT_KEY') or os.getenv('SECRET_KEY') or ''
+        self.key = key.encode() if key not in PLACEHOLDER_KEYS else None
+
+    def tag(self, value) -> str:
+        """
+        마스킹한 값의 표시 문자열
+        신용점수·등급·금액은 경우의 수가 적어 키 없는 해시는 대입으로 되돌릴 수 있으므로,
+        같은 값끼리 추적할 수 있는 태그는 서버 비밀키 HMAC으로만 만듭니다.
+        """
+        if self.key is None:
+            return '[REDACTED]'
+        digest = hmac.new(self.key, str(value).encode(), hashlib.sha256).hexdigest()[:8]
+        return f'[REDACTED:{digest}]'
+
+    def redact(self, fields: Dict) -> Dict:
+        if not self.enabled:
+            return fields
+        redacted = {}
+        for key, value in fields.items():
+            if value is None:
+                redacted[key] = value
+            elif key in self.MASKED_FIELDS:
+                redacted[key] = self.tag(value)
+            elif key in self.ADDRESS_FIELDS and isinstance(value, str) and len(value) > 10:
+                redacted[key] = f'{value[:6]}...{value[-4:]}'
+            elif isinstance(value, dict):
+                redacted[key] = self.redact(value)
+            else:
+                redacted[key] = value
+        return redacted
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄 JSON으로 변환합니다."""
+
+    def __init__(self, redactor: Optional[PiiRedactor] = None):
+        super().__init__()
+        self.redactor = redactor or PiiRedactor()
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(self.redactor.redact(fields))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    엔드포인트별 샘플링 필터
+
+    요청 ID로 샘플링 여부를 결정하므로 한 요청의 로그는 모두 남거나 모두 빠집니다.
+    WARNING 이상은 항상 통과합니다.
+    """
+
+    def __init__(self, default_rate: float = 1.0, endpoint_rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.default_rate = default_rate
+        self.endpoint_rates = endpoint_rates or {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        context = getattr(record, 'context', None) or {}
+        rate = self.endpoint_rates.get(context.get('endpoint'), self.default_rate)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        key = context.get('request_id') or f'{record.created}'
+        bucket = int(hashlib.md5(key.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return bucket < rate
+
+
+class _ContextQueueHandler(QueueHandler):
+    """요청 컨텍스트를 레코드에 붙인 뒤 큐에 넣습니다 (포맷은 리스너 스레드에서 수행)."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # 샘플링 필터가 엔드포인트를 볼 수 있도록 필터보다 먼저 컨텍스트를 붙입니다
+        record.context = dict(_request_context.get())
+        return super().handle(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 인자 병합만 호출 스레드에서 하고 JSON 직렬화는 리스너 스레드에 맡깁니다
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredLogger:
+    """키워드 인자를 구조화 필드로 기록하는 로거"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def log(self, level: int, message: str, exc_info=None, **fields) -> None:
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, exc_info=exc_info, extra={'fields': fields})
+
+    def debug(self, message: str, **fields) -> None:
+        self.log(logging.DEBUG, message, **fields)
+
+    def info(self, message: str, **fields) -> None:
+        self.log(logging.INFO, message, **fields)
+
+    def warning(self, message: str, **fields) -> None:
+        self.log(logging.WARNING, message, **fields)
+
+    def error(self, message: str, exc_info=None, **fields) -> None:
+        self.log(logging.ERROR, message, exc_info=exc_info, **fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """
+    zk_nft 하위 구조화 로거를 반환합니다.
+
+    Args:
+        name: 로거 이름 (예: 'bank')
+
+    Returns:
+        구조화 로거
+    """
+    return StructuredLogger(logging.getLogger(f'{ROOT_LOGGER}.{name}'))
+
+
+def bind_request_context(**context) -> contextvars.Token:
+    """
+    현재 요청의 로그 컨텍스트(엔드포인트, 요청 ID 등)를 설정합니다.
+
+    Returns:
+        reset_request_context에 전달할 토큰
+    """
+    return _request_context.set(context)
+
+
+def reset_request_context(token: contextvars.Token) -> None:
+    """요청 로그 컨텍스트를 이전 상태로 되돌립니다."""
+    _request_context.reset(token)
+
+
+def setup_logging(stream=None) -> QueueListener:
+    """
+    환경변수 설정으로 zk_nft 로깅을 초기화합니다. 여러 번 호출해도 한 번만 적용됩니다.
+
+    환경변수:
+        LOG_LEVEL: 기본 로그 레벨 (기본값: INFO)
+        LOG_LEVELS: 로거별 레벨 (예: bank=DEBUG,external=WARNING)
+        LOG_SAMPLE_RATE: 기본 샘플링 비율 (0~1)
+        LOG_SAMPLE_RATES: 엔드포인트별 샘플링 비율 (예: bank.loan_request=0.1)
+        LOG_REDACT_PII: 개인정보 마스킹 여부 (기본값: True)
+
+    Args:
+        stream: 출력 스트림 (기본값: stdout)
+
+    Returns:
+        큐 리스너
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel((os.getenv('LOG_LEVEL') or 'INFO').upper())
+        for name, level in parse_mapping(os.getenv('LOG_LEVELS')).items():
+            logging.getLogger(f'{ROOT_LOGGER}.{name}').setLevel(level.upper())
+        root.propagate = False
+
+        redactor = PiiRedactor(os.getenv('LOG_REDACT_PII', 'True').lower() == 'true')
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter(redactor))
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler = _ContextQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(
+            float(os.getenv('LOG_SAMPLE_RATE') or 1.0),
+            {endpoint: float(rate) for endpoint, rate in parse_mapping(os.getenv('LOG_SAMPLE_RATES')).items()}
+        ))
+        root.addHandler(handler)
+
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        # pre-fork 서버에서 fork 전에 초기화되어도 워커마다 출력 스레드가 다시 시작되도록 합니다
+        os.register_at_fork(after_in_child=_restart_listener_in_child)
+        return _listener
+
+
+def _restart_listener_in_child() -> None:
+    global _listener, _setup_lock
+    _setup_lock = threading.Lock()
+    if _listener is not None:
+        _listener = QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 출력하고 리스너를 중지합니다."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            if isinstance(handler, _ContextQueueHandler):
+                root.removeHandler(handler)
+        _listener = None
@@ -0,0 +1,206 @@
+"""
+Prometheus 지표
+라우트별 요청 지연시간, 단계별(신용정보 조회, NFT 저장소, witness, prove, verify, mint, 외부기관 호출)
+지연시간과 큐 깊이, 캐시 적중률, 서브프로세스 수를 수집합니다.
+
+gunicorn 다중 프로세스 모드에서는 PROMETHEUS_MULTIPROC_DIR 환경변수를
+prometheus_client를 불러오기 전에 설정해야 합니다 (run.py --serve prod가 처리).
+"""
+
+import os
+import time
+import functools
+import subprocess
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 다중 프로세스 디렉토리가 지정되어 있으면 첫 지표 파일을 쓰기 전에 있어야 합니다
+if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+from .tracing import tracer
+
+# 증명 생성(수 초)부터 캐시 조회(수 ms)까지 포괄하는 버킷
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REQUEST_LATENCY = Histogram(
+    'zk_nft_request_duration_seconds', 'HTTP request latency by route',
+    ['method', 'route', 'status'], buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    'zk_nft_stage_duration_seconds', 'Latency of individual request stages',
+    ['stage'], buckets=LATENCY_BUCKETS
+)
+NFT_REGISTRY_LOOKUPS = Counter(
+    'zk_nft_nft_registry_lookups_total', 'Existing-NFT registry lookups by result', ['result']
+)
+CHAIN_CACHE_LOOKUPS = Counter(
+    'zk_nft_chain_cache_lookups_total', 'Chain read cache lookups by result', ['result']
+)
+PROOF_STORE_LOOKUPS = Counter(
+    'zk_nft_proof_store_lookups_total', 'Stored ZK-Proof lookups by result', ['result']
+)
+SUBPROCESS_RUNS = Counter(
+    'zk_nft_subprocess_runs_total', 'External processes started (ZoKrates)', ['command', 'status']
+)
+SUBPROCESSES_IN_FLIGHT = Gauge(
+    'zk_nft_subprocesses_in_flight', 'External processes currently running', multiprocess_mode='livesum'
+)
+PROVER_QUEUE_DEPTH = Gauge(
+    'zk_nft_prover_queue_depth', 'Proof jobs queued or running on the prover pool', multiprocess_mode='livesum'
+)
+ADMISSION_REJECTIONS = Counter(
+    'zk_nft_admission_rejections_total', 'Requests rejected by rate limiting or prover admission control',
+    ['reason', 'priority']
+)
+PENDING_TRANSACTIONS = Gauge(
+    'zk_nft_pending_transactions', 'Transactions awaiting confirmation', multiprocess_mode='livesum'
+)
+
+
+@contextmanager
+def time_stage(stage: str):
+    """
+    블록의 실행 시간을 단계별 히스토그램에 기록하고 같은 이름의 추적 스팬을 남깁니다.
+
+    Args:
+        stage: 단계명 (credit_lookup, witness, prove, verify, mint, external_http 등)
+    """
+    started = time.perf_counter()
+    try:
+        with tracer.start_span(stage):
+            yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - started)
+
+
+def timed(stage: str):
+    """
+    함수 실행 시간을 단계별 히스토그램에 기록하는 데코레이터
+
+    Args:
+        stage: 단계명
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    """
+    HTTP 요청 지연시간을 기록합니다.
+
+    Args:
+        method: HTTP 메서드
+        route: URL 규칙 (예: /api/customer/nft/<token_id>)
+        status: 응답 상태 코드
+        duration: 처리 시간 (초)
+    """
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(duration)
+
+
+def run_subprocess(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """
+    서브프로세스를 실행하고 실행 수와 동시 실행 수를 기록합니다.
+
+    Args:
+        cmd: 실행할 명령
+        **kwargs: subprocess.run 인자
+
+    Returns:
+        실행 결과
+    """
+    # docker run ... zokrates <subcommand> 형태에서 하위 명령만 라벨로 사용합니다
+    command = cmd[cmd.index('zokrates') + 1] if 'zokrates' in cmd[:-1] else os.path.basename(cmd[0])
+    SUBPROCESSES_IN_FLIGHT.inc()
+    try:
+        with time_stage(f'subprocess_{command}'):
+            result = subprocess.run(cmd, **kwargs)
+    except Exception:
+        SUBPROCESS_RUNS.labels(command, 'error').inc()
+        raise
+    finally:
+        SUBPROCESSES_IN_FLIGHT.dec()
+    SUBPROCESS_RUNS.labels(command, 'success' if result.returncode == 0 else 'failed').inc()
+    return result
+
+
+class RuntimeCollector:
+    """
+    스크레이프 시점에 현재 프로세스의 캐시 적중률 등을 계산하는 수집기
+
+    다중 프로세스 모드에서는 스크레이프를 처리한 워커의 값이 pid 라벨과 함께 노출됩니다.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Tuple[str, Callable[[], Optional[float]]]] = {}
+
+    def register(self, name: str, documentation: str, source: Callable[[], Optional[float]]) -> None:
+        self._sources[name] = (documentation, source)
+
+    def collect(self):
+        pid = str(os.getpid())
+        for name, (documentation, source) in self._sources.items():
+            try:
+                value = source()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            family = GaugeMetricFamily(name, documentation, labels=['pid'])
+            family.add_metric([pid], value)
+            yield family
+
+
+runtime_collector = RuntimeCollector()
+
+
+def register_runtime_gauge(name: str, documentation: str, source: Callable[[], Optional[float]]) -> None:
+    """
+    스크레이프 시점에 계산되는 게이지를 등록합니다.
+
+    Args:
+        name: 지표 이름
+        documentation: 설명
+        source: 현재 값을 반환하는 함수
+    """
+    runtime_collector.register(name, documentation, source)
+
+
+def is_multiprocess() -> bool:
+    return bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    /metrics 응답 본문과 Content-Type을 생성합니다.
+
+    Returns:
+        (본문, Content-Type)
+    """
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(runtime_collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """종료된 워커의 live 게이지를 정리합니다 (gunicorn child_exit 훅에서 호출)."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid)
+
+
+if not is_multiprocess():
+    REGISTRY.register(runtime_collector)
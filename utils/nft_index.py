@@ -0,0 +1,151 @@
+"""
+NFT 소유자 색인
+소유자 주소별 NFT 목록을 발행일 순으로 정렬해 두고 커서 기반 페이지 조회와 순차 스트리밍을 제공합니다.
+"""
+
+import json
+import base64
+import bisect
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SortKey = Tuple[str, str]
+
+
+def encode_cursor(sort_key: SortKey) -> str:
+    """마지막으로 반환한 항목의 정렬 키를 불투명한 커서 문자열로 변환합니다."""
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """
+    커서 문자열을 정렬 키로 변환합니다.
+
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        issued_date, token_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(issued_date), str(token_id)
+    except Exception:
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+
+class NFTIndex:
+    """
+    소유자 주소 → (발행일, 토큰 ID) 정렬 목록 색인
+
+    페이지 조회는 커서 위치를 이진 탐색하므로 목록 크기와 관계없이 요청한 개수만큼만 복사합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys_by_owner: Dict[str, List[SortKey]] = {}
+        self._tokens: Dict[str, Dict] = {}
+        self._owners: Dict[str, str] = {}
+
+    @staticmethod
+    def _owner_key(owner: str) -> str:
+        return owner.lower()
+
+    @staticmethod
+    def _sort_key(summary: Dict) -> SortKey:
+        return str(summary.get('issued_date') or ''), str(summary['token_id'])
+
+    def add(self, owner: str, summary: Dict) -> None:
+        """
+        NFT를 색인에 추가합니다. 이미 있는 토큰이면 소유자와 요약 정보를 갱신합니다.
+
+        Args:
+            owner: 소유자 주소
+            summary: NFT 요약 정보 (token_id, issued_date 등)
+        """
+        with self._lock:
+            token_id = str(summary['token_id'])
+            if token_id in self._tokens:
+                self.remove(token_id)
+            sort_key = self._sort_key(summary)
+            bisect.insort(self._keys_by_owner.setdefault(self._owner_key(owner), []), sort_key)
+            self._tokens[token_id] = dict(summary)
+            self._owners[token_id] = self._owner_key(owner)
+
+    def remove(self, token_id: str) -> Optional[Dict]:
+        """토큰을 색인에서 제거하고 요약 정보를 반환합니다."""
+        with self._lock:
+            summary = self._tokens.pop(str(token_id), None)
+            if summary is None:
+                return None
+            keys = self._keys_by_owner.get(self._owners.pop(str(token_id)), [])
+            position = bisect.bisect_left(keys, self._sort_key(summary))
+            if position < len(keys) and keys[position] == self._sort_key(summary):
+                del keys[position]
+            return summary
+
+    def transfer(self, token_id: str, to_owner: str) -> bool:
+        """
+        토큰의 소유자를 변경합니다.
+
+        Returns:
+            색인에 있던 토큰이면 True
+        """
+        with self._lock:
+            summary = self.remove(token_id)
+            if summary is None:
+                return False
+            self.add(to_owner, summary)
+            return True
+
+    def count(self, owner: str) -> int:
+        with self._lock:
+            return len(self._keys_by_owner.get(self._owner_key(owner), []))
+
+    def page(self, owner: str, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Dict], Optional[str]]:
+        """
+        소유자의 NFT를 커서 다음부터 limit개 조회합니다.
+
+        Args:
+            owner: 소유자 주소
+            cursor: 이전 페이지의 next_cursor (없으면 처음부터)
+            limit: 최대 개수
+
+        Returns:
+            (NFT 요약 목록, 다음 페이지 커서 또는 None)
+
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        after = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            keys = self._keys_by_owner.get(self._owner_key(owner), [])
+            start = bisect.bisect_right(keys, after) if after else 0
+            selected = keys[start:start + limit]
+            items = [dict(self._tokens[token_id]) for _, token_id in selected]
+            has_more = start + limit < len(keys)
+        next_cursor = encode_cursor(selected[-1]) if selected and has_more else None
+        return items, next_cursor
+
+    def iter_owner(self, owner: str, batch_size: int = 100) -> Iterator[Dict]:
+        """
+        소유자의 NFT를 순서대로 하나씩 반환합니다. 잠금은 batch_size개를 복사하는 동안만 잡습니다.
+
+        Args:
+            owner: 소유자 주소
+            batch_size: 한 번에 복사할 개수
+        """
+        cursor = None
+        while True:
+            items, cursor = self.page(owner, cursor, batch_size)
+            yield from items
+            if cursor is None:
+                return
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys_by_owner.clear()
+            self._tokens.clear()
+            self._owners.clear()
+
+
+# 전역 NFT 색인 인스턴스
+nft_index = NFTIndex()
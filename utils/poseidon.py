@@ -0,0 +1,102 @@
+"""
+Poseidon 해시 (BN254, circomlib/ZoKrates 호환)
+ZoKrates 표준 라이브러리 hashes/poseidon/poseidon과 같은 값을 내는 Python 구현입니다.
+
+상태 폭 t=3(입력 2개), 전체 라운드 8, 부분 라운드 57, S-box x^5를 사용합니다.
+라운드 상수와 MDS 행렬은 Poseidon 참조 구현(generate_parameters_grain)과 같은 Grain LFSR로 만들며,
+처음 사용할 때 한 번 계산해 보관합니다.
+"""
+
+from functools import lru_cache
+from typing import Iterator, List, Sequence, Tuple
+
+# BN254 스칼라 필드 (ZoKrates bn128)
+FIELD_PRIME = 0x30644e72e131a029b85045b68181585d2833e84879b9709143e1f593f0000001
+
+WIDTH = 3
+FULL_ROUNDS = 8
+PARTIAL_ROUNDS = 57
+FIELD_BITS = 254
+
+
+def _grain_bits(width: int, full_rounds: int, partial_rounds: int) -> Iterator[int]:
+    """Grain LFSR 비트열 (소수 필드=1, S-box x^alpha=0, 80비트 초기 상태, 처음 160비트는 버립니다)"""
+    state = [int(bit) for bit in (format(1, '02b') + format(0, '04b') + format(FIELD_BITS, '012b')
+                                  + format(width, '012b') + format(full_rounds, '010b')
+                                  + format(partial_rounds, '010b'))] + [1] * 30
+
+    def step() -> int:
+        bit = state[62] ^ state[51] ^ state[38] ^ state[23] ^ state[13] ^ state[0]
+        state.pop(0)
+        state.append(bit)
+        return bit
+
+    for _ in range(160):
+        step()
+    while True:
+        # 앞 비트가 1일 때만 다음 비트를 내보냅니다
+        bit = step()
+        while bit == 0:
+            step()
+            bit = step()
+        yield step()
+
+
+def _random_int(bits: Iterator[int]) -> int:
+    value = 0
+    for _ in range(FIELD_BITS):
+        value = (value << 1) | next(bits)
+    return value
+
+
+@lru_cache(maxsize=None)
+def parameters(width: int = WIDTH, full_rounds: int = FULL_ROUNDS,
+               partial_rounds: int = PARTIAL_ROUNDS) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...]]:
+    """
+    라운드 상수와 MDS 행렬
+
+    Returns:
+        (라운드별 상수를 이어 붙인 튜플 (길이 (full_rounds + partial_rounds) * width), width x width MDS 행렬)
+    """
+    bits = _grain_bits(width, full_rounds, partial_rounds)
+    constants = []
+    for _ in range((full_rounds + partial_rounds) * width):
+        value = _random_int(bits)
+        while value >= FIELD_PRIME:
+            value = _random_int(bits)
+        constants.append(value)
+
+    # Cauchy 행렬 M[i][j] = 1 / (x_i + y_j)
+    points = [_random_int(bits) % FIELD_PRIME for _ in range(2 * width)]
+    xs, ys = points[:width], points[width:]
+    mds = tuple(tuple(pow(x + y, FIELD_PRIME - 2, FIELD_PRIME) for y in ys) for x in xs)
+    return tuple(constants), mds
+
+
+def permute(state: Sequence[int]) -> List[int]:
+    """Poseidon 순열 (전체 라운드 4회, 부분 라운드 57회, 전체 라운드 4회)"""
+    constants, mds = parameters()
+    p = FIELD_PRIME
+    half = FULL_ROUNDS // 2
+    state = [value % p for value in state]
+    for round_index in range(FULL_ROUNDS + PARTIAL_ROUNDS):
+        offset = round_index * WIDTH
+        state = [(value + constants[offset + i]) % p for i, value in enumerate(state)]
+        if round_index < half or round_index >= half + PARTIAL_ROUNDS:
+            state = [pow(value, 5, p) for value in state]
+        else:
+            state[0] = pow(state[0], 5, p)
+        state = [sum(row[j] * state[j] for j in range(WIDTH)) % p for row in mds]
+    return state
+
+
+def poseidon(inputs: Sequence[int]) -> int:
+    """
+    필드 원소 2개의 Poseidon 해시 (ZoKrates poseidon([a, b])와 같은 값)
+
+    Raises:
+        ValueError: 입력이 2개가 아님
+    """
+    if len(inputs) != WIDTH - 1:
+        raise ValueError(f'Poseidon width {WIDTH} takes {WIDTH - 1} inputs, got {len(inputs)}')
+    return permute([0, *inputs])[0]
@@ -0,0 +1,203 @@
+"""
+ZK-Proof 저장소
+생성한 신용등급 증명을 (회로 산출물 해시, 신용등급, 입력 커밋먼트) 키로 SQLite에 보관합니다.
+입력이 바뀌지 않은 고객의 NFT를 다시 발행할 때는 저장된 증명을 그대로 사용하고,
+GET /api/external/proof/<proof_id>는 이 저장소의 증명을 응답합니다.
+
+회로를 다시 컴파일하거나 setup을 다시 하면 산출물 해시가 바뀌므로 이전 증명은 더 이상 찾지 않으며,
+보관 기간(PROOF_STORE_TTL)이 지난 증명은 조회되지 않고 다음 저장 때 지워집니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+from .credit_circuit import circuit_version as resolve_circuit_version
+from .metrics import PROOF_STORE_LOOKUPS
+from .zkp_utils import ZKPUtils
+
+# 회로 산출물 해시에 사용할 파일 (앞에서부터 처음 있는 파일)
+ARTIFACT_FILES = ('verification.key', 'out', 'credit_score.zok')
+
+COLUMNS = ('proof_id', 'circuit_hash', 'circuit_version', 'credit_grade', 'commitment',
+           'proof_data', 'verified', 'created_at', 'expires_at')
+
+
+@lru_cache(maxsize=32)
+def _file_hash(version: str, path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256(version.encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def circuit_hash(version: Optional[str] = None) -> str:
+    """
+    회로 버전과 산출물(검증 키, 없으면 컴파일 결과나 소스)의 SHA-256
+    파일이 바뀌지 않았으면 다시 읽지 않습니다.
+    """
+    version = resolve_circuit_version(version)
+    workspace = ZKPUtils.workspace_for(version)
+    for name in ARTIFACT_FILES:
+        path = os.path.join(workspace, name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            return _file_hash(version, path, stat.st_mtime_ns, stat.st_size)
+    return hashlib.sha256(version.encode()).hexdigest()
+
+
+class ProofStore:
+    """
+    SQLite ZK-Proof 저장소
+
+    같은 호스트의 워커들이 파일을 공유하며, 연결은 스레드·프로세스마다 따로 엽니다.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite 파일 경로
+            ttl: 증명 보관 기간 (초, 기본값: PROOF_STORE_TTL 또는 30일)
+        """
+        self.path = path
+        self.ttl = ttl if ttl is not None else float(os.getenv('PROOF_STORE_TTL') or 30 * 24 * 3600)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS proofs (proof_id TEXT PRIMARY KEY, circuit_hash TEXT NOT NULL, '
+                'circuit_version TEXT NOT NULL, credit_grade TEXT NOT NULL, commitment TEXT NOT NULL, '
+                'proof_data TEXT NOT NULL, verified INTEGER NOT NULL, created_at REAL NOT NULL, '
+                'expires_at REAL NOT NULL, UNIQUE (circuit_hash, credit_grade, commitment))'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS proofs_expires_at ON proofs (expires_at)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _record(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        record = dict(row)
+        record['proof_data'] = json.loads(record['proof_data'])
+        record['verified'] = bool(record['verified'])
+        return record
+
+    def find(self, circuit_hash: str, credit_grade: str, commitment: str) -> Optional[Dict]:
+        """
+        같은 회로·등급·입력 커밋먼트로 만든 유효한 증명을 찾습니다.
+        검증에 실패했거나 검증되지 않은 증명은 재사용하지 않습니다.
+
+        Returns:
+            저장된 증명 (proof_data, verified, created_at, expires_at 등) 또는 None
+        """
+        row = self._connect().execute(
+            f'SELECT {", ".join(COLUMNS)} FROM proofs '
+            'WHERE circuit_hash = ? AND credit_grade = ? AND commitment = ? AND verified = 1 AND expires_at > ?',
+            (circuit_hash, credit_grade, commitment, time.time())
+        ).fetchone()
+        PROOF_STORE_LOOKUPS.labels('hit' if row is not None else 'miss').inc()
+        return self._record(row)
+
+    def get(self, proof_id: str) -> Optional[Dict]:
+        """증명 ID로 유효한 증명을 조회합니다."""
+        row = self._connect().execute(
+            f'SELECT {", ".join(COLUMNS)} FROM proofs WHERE proof_id = ? AND expires_at > ?',
+            (proof_id, time.time())
+        ).fetchone()
+        return self._record(row)
+
+    def put(self, circuit_hash: str, circuit_version: str, credit_grade: str, commitment: str,
+            proof_data: Dict, verified: bool, expires_at: Optional[float] = None) -> Dict:
+        """
+        증명을 저장합니다. 같은 키의 이전 증명은 대체하고 보관 기간이 지난 증명은 지웁니다.
+
+        Args:
+            expires_at: 최소 보관 기한 (epoch 초, 이 증명을 쓰는 NFT의 만료 시각, 보관 기간보다 길 때만 적용)
+
+        Returns:
+            저장한 증명
+        """
+        now = time.time()
+        record = {
+            'proof_id': proof_data['proof_id'],
+            'circuit_hash': circuit_hash,
+            'circuit_version': circuit_version,
+            'credit_grade': credit_grade,
+            'commitment': commitment,
+            'proof_data': proof_data,
+            'verified': bool(verified),
+            'created_at': now,
+            'expires_at': max(now + self.ttl, expires_at or 0)
+        }
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM proofs WHERE expires_at <= ?', (now,))
+            conn.execute(
+                f'INSERT OR REPLACE INTO proofs ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                [json.dumps(record[name]) if name == 'proof_data' else record[name] for name in COLUMNS]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return record
+
+    def extend(self, proof_id: str, expires_at: float) -> bool:
+        """
+        증명 보관 기한을 적어도 expires_at까지로 늘립니다 (재사용한 증명이 새 NFT보다 먼저 만료되지 않도록).
+
+        Returns:
+            유효한 증명이 있었는지
+        """
+        cursor = self._connect().execute(
+            'UPDATE proofs SET expires_at = MAX(expires_at, ?) WHERE proof_id = ? AND expires_at > ?',
+            (expires_at, proof_id, time.time())
+        )
+        return cursor.rowcount > 0
+
+    def set_verified(self, proof_id: str, verified: bool) -> bool:
+        """증명의 검증 결과를 기록합니다 (없는 증명이면 False)."""
+        cursor = self._connect().execute(
+            'UPDATE proofs SET verified = ? WHERE proof_id = ?', (int(verified), proof_id)
+        )
+        return cursor.rowcount > 0
+
+    def purge_expired(self) -> int:
+        """보관 기간이 지난 증명을 지우고 지운 수를 반환합니다."""
+        return self._connect().execute('DELETE FROM proofs WHERE expires_at <= ?', (time.time(),)).rowcount
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM proofs').fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def proof_store_enabled() -> bool:
+    """증명 재사용 여부 (PROOF_STORE_ENABLED, 꺼도 증명 조회를 위해 저장은 합니다)"""
+    return (os.getenv('PROOF_STORE_ENABLED') or 'true').lower() == 'true'
+
+
+# 전역 증명 저장소 인스턴스 (연결은 처음 조회할 때 엽니다)
+proof_store = ProofStore(os.getenv('PROOF_STORE_PATH') or 'data/proof_store.db')
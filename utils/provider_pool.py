@@ -0,0 +1,267 @@
+"""
+JSON-RPC 프로바이더 풀
+여러 블록체인 노드에 대한 상태 확인, 지연시간 기반 라우팅, 계정별 쓰기 고정 및 장애 조치를 제공합니다.
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+from eth_account import Account
+from web3 import HTTPProvider
+from web3.providers.base import JSONBaseProvider
+
+
+class _Endpoint:
+    """풀에 속한 단일 RPC 엔드포인트의 상태"""
+
+    def __init__(self, url: str, request_timeout: float):
+        self.url = url
+        self.provider = HTTPProvider(url, request_kwargs={'timeout': request_timeout})
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None
+        self.last_block: Optional[int] = None
+        self.requests = 0
+        self.failures = 0
+
+    def record_success(self, elapsed: float, smoothing: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency = smoothing * elapsed + (1 - smoothing) * self.latency
+
+    def record_failure(self, failure_threshold: int) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= failure_threshold:
+            self.healthy = False
+
+    def to_dict(self) -> Dict:
+        return {
+            'url': self.url,
+            'healthy': self.healthy,
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'last_block': self.last_block,
+            'requests': self.requests,
+            'failures': self.failures
+        }
+
+
+class ProviderPool(JSONBaseProvider):
+    """지연시간 기반 라우팅과 장애 조치를 지원하는 Web3 프로바이더"""
+
+    # 계정 nonce 일관성을 위해 같은 노드로 보내야 하는 메서드
+    WRITE_METHODS = {
+        'eth_sendRawTransaction',
+        'eth_sendTransaction',
+        'eth_getTransactionCount'
+    }
+
+    def __init__(self, endpoint_urls: List[str], health_check_interval: Optional[float] = None,
+                 request_timeout: float = 10, failure_threshold: int = 2,
+                 max_block_lag: int = 5, latency_smoothing: float = 0.3):
+        """
+        프로바이더 풀 초기화
+
+        Args:
+            endpoint_urls: RPC 엔드포인트 URL 목록
+            health_check_interval: 상태 확인 주기 (초, 0이면 비활성화)
+            request_timeout: 엔드포인트별 요청 타임아웃 (초)
+            failure_threshold: 비정상으로 판단할 연속 실패 횟수
+            max_block_lag: 최신 노드보다 이만큼 뒤처지면 비정상으로 판단
+            latency_smoothing: 지연시간 지수이동평균 가중치
+        """
+        super().__init__()
+        if not endpoint_urls:
+            raise ValueError('At least one RPC endpoint is required')
+
+        self.endpoints = [_Endpoint(url, request_timeout) for url in endpoint_urls]
+        self.health_check_interval = health_check_interval if health_check_interval is not None else \
+            float(os.getenv('RPC_HEALTH_CHECK_INTERVAL', 15))
+        self.failure_threshold = failure_threshold
+        self.max_block_lag = max_block_lag
+        self.latency_smoothing = latency_smoothing
+
+        self._lock = threading.Lock()
+        self._pinned: Dict[str, _Endpoint] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if self.health_check_interval > 0:
+            self.start()
+
+    def __str__(self) -> str:
+        return f"ProviderPool({', '.join(endpoint.url for endpoint in self.endpoints)})"
+
+    # ------------------------------------------------------------------
+    # 라우팅
+    # ------------------------------------------------------------------
+
+    def _ranked(self) -> List[_Endpoint]:
+        """정상 노드를 지연시간 순으로, 비정상 노드는 최후의 수단으로 뒤에 둡니다."""
+        with self._lock:
+            healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+            unhealthy = [endpoint for endpoint in self.endpoints if not endpoint.healthy]
+        # 측정 전인 노드는 한 번씩 시도되도록 0으로 취급합니다
+        healthy.sort(key=lambda endpoint: endpoint.latency or 0.0)
+        unhealthy.sort(key=lambda endpoint: endpoint.consecutive_failures)
+        return healthy + unhealthy
+
+    def _write_account(self, method: str, params: Any) -> Optional[str]:
+        try:
+            if method == 'eth_getTransactionCount':
+                return str(params[0]).lower()
+            if method == 'eth_sendTransaction':
+                return str(params[0]['from']).lower()
+            if method == 'eth_sendRawTransaction':
+                return Account.recover_transaction(params[0]).lower()
+        except Exception:
+            return None
+        return None
+
+    def _candidates(self, method: str, params: Any) -> List[_Endpoint]:
+        ranked = self._ranked()
+        if method not in self.WRITE_METHODS:
+            return ranked
+
+        account = self._write_account(method, params)
+        if account is None:
+            return ranked
+
+        with self._lock:
+            pinned = self._pinned.get(account)
+            if pinned is None or not pinned.healthy:
+                # 처음이거나 고정된 노드가 비정상이면 가장 빠른 노드로 다시 고정합니다
+                pinned = ranked[0]
+                self._pinned[account] = pinned
+        return [pinned] + [endpoint for endpoint in ranked if endpoint is not pinned]
+
+    def make_request(self, method: str, params: Any) -> Dict:
+        """
+        JSON-RPC 요청을 적절한 노드로 보내고, 실패 시 다음 노드로 장애 조치합니다.
+
+        Args:
+            method: JSON-RPC 메서드
+            params: JSON-RPC 파라미터
+
+        Returns:
+            JSON-RPC 응답
+        """
+        last_error: Optional[Exception] = None
+        candidates = self._candidates(method, params)
+
+        for endpoint in candidates:
+            started = time.perf_counter()
+            try:
+                response = endpoint.provider.make_request(method, params)
+            except Exception as e:
+                last_error = e
+                with self._lock:
+                    endpoint.record_failure(self.failure_threshold)
+                continue
+
+            with self._lock:
+                endpoint.record_success(time.perf_counter() - started, self.latency_smoothing)
+                if method in self.WRITE_METHODS and endpoint is not candidates[0]:
+                    # 장애 조치된 쓰기는 이후에도 같은 노드를 사용하도록 다시 고정합니다
+                    account = self._write_account(method, params)
+                    if account is not None:
+                        self._pinned[account] = endpoint
+            return response
+
+        raise ConnectionError(f'All RPC endpoints failed for {method}: {last_error}')
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        """정상 노드가 하나라도 있는지 확인합니다."""
+        with self._lock:
+            return any(endpoint.healthy for endpoint in self.endpoints)
+
+    # ------------------------------------------------------------------
+    # 상태 확인
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """주기적 상태 확인 스레드를 시작합니다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='rpc-health-check', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """상태 확인 스레드를 중지합니다."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.health_check_interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.check_health()
+            self._stop_event.wait(self.health_check_interval)
+
+    def check_health(self) -> List[Dict]:
+        """
+        모든 노드에 eth_blockNumber를 보내 지연시간과 블록 높이를 확인합니다.
+
+        Returns:
+            노드별 상태 목록
+        """
+        for endpoint in self.endpoints:
+            started = time.perf_counter()
+            try:
+                response = endpoint.provider.make_request('eth_blockNumber', [])
+                block_number = int(response['result'], 16)
+            except Exception:
+                with self._lock:
+                    endpoint.last_block = None
+                    endpoint.record_failure(self.failure_threshold)
+                continue
+
+            with self._lock:
+                endpoint.record_success(time.perf_counter() - started, self.latency_smoothing)
+                endpoint.last_block = block_number
+                endpoint.healthy = True
+
+        # 다른 노드보다 크게 뒤처진 노드는 응답하더라도 라우팅에서 제외합니다
+        with self._lock:
+            heights = [endpoint.last_block for endpoint in self.endpoints if endpoint.last_block is not None]
+            if heights:
+                highest = max(heights)
+                for endpoint in self.endpoints:
+                    if endpoint.last_block is not None and highest - endpoint.last_block > self.max_block_lag:
+                        endpoint.healthy = False
+
+        return self.get_status()
+
+    def get_status(self) -> List[Dict]:
+        """
+        노드별 상태를 조회합니다.
+
+        Returns:
+            노드별 상태 목록
+        """
+        with self._lock:
+            return [endpoint.to_dict() for endpoint in self.endpoints]
+
+
+def parse_endpoint_urls(blockchain_url) -> List[str]:
+    """
+    쉼표로 구분된 URL 문자열 또는 URL 목록을 엔드포인트 목록으로 변환합니다.
+
+    Args:
+        blockchain_url: URL 문자열 또는 목록
+
+    Returns:
+        엔드포인트 URL 목록
+    """
+    if isinstance(blockchain_url, (list, tuple)):
+        urls = blockchain_url
+    else:
+        urls = str(blockchain_url).split(',')
+    return [url.strip() for url in urls if url.strip()]
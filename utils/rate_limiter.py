@@ -0,0 +1,443 @@
+"""
+요청 속도 제한과 증명 작업 수용 제어
+은행(bank_id)·고객(customer_id)별 토큰 버킷으로 요청 속도를 제한하고,
+증명 생성 풀이 포화되면 배치 요청을 대화형(대출 심사) 요청보다 먼저 거절합니다.
+
+은행 식별자와 허용 우선순위는 요청 본문이 아니라 설정된 제휴기관 키(PARTNER_KEYS, X-Partner-Key 헤더)로
+정합니다. 키가 없거나 맞지 않는 호출자는 접속 주소별로 제한하며 배치 우선순위로만 처리합니다.
+
+토큰 버킷 상태는 기본적으로 프로세스 메모리에 두며, gunicorn 워커나 여러 서버가
+한도를 공유해야 하면 RATE_LIMIT_BACKEND=sqlite 또는 redis로 공유 저장소를 사용합니다.
+"""
+
+import os
+import re
+import hmac
+import time
+import math
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - RATE_LIMIT_BACKEND=redis일 때만 필요합니다
+    redis = None
+
+PRIORITY_HEADER = 'X-Request-Priority'
+PARTNER_KEY_HEADER = 'X-Partner-Key'
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+PRIORITIES = (INTERACTIVE, BATCH)
+
+_PERIODS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hour': 3600}
+_RULE_PATTERN = re.compile(r'\s*(\d+)\s*/\s*(\d*)\s*([a-z]+)\s*')
+
+
+def parse_rule(rule: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    "60/min", "5/s", "1000/hour", "10/5min" 형식의 한도를 (버킷 용량, 초당 충전량)으로 변환합니다.
+
+    Args:
+        rule: 한도 문자열 (비어 있거나 0이면 제한 없음)
+
+    Returns:
+        (용량, 초당 충전량) 또는 None
+
+    Raises:
+        ValueError: 잘못된 형식
+    """
+    if not rule or rule.strip() in ('0', 'off', 'none'):
+        return None
+    match = _RULE_PATTERN.fullmatch(rule.lower())
+    if match is None or match.group(3) not in _PERIODS:
+        raise ValueError(f'Invalid rate limit rule: {rule}')
+    count = int(match.group(1))
+    if count == 0:
+        return None
+    seconds = int(match.group(2) or 1) * _PERIODS[match.group(3)]
+    return float(count), count / seconds
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _retry_after(tokens: float, cost: float, rate: float) -> float:
+    return max(0.0, (cost - tokens) / rate)
+
+
+class MemoryBucketStore:
+    """프로세스 메모리 토큰 버킷 저장소"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        """
+        버킷에서 토큰을 꺼냅니다.
+
+        Args:
+            key: 버킷 키
+            capacity: 버킷 용량 (허용 버스트 크기)
+            rate: 초당 충전량
+            cost: 꺼낼 토큰 수 (음수면 꺼낸 토큰을 돌려놓음)
+
+        Returns:
+            (허용 여부, 다시 시도할 때까지 남은 초)
+        """
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+        return allowed, 0.0 if allowed else _retry_after(tokens, cost, rate)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    SQLite 파일 토큰 버킷 저장소
+
+    같은 호스트의 gunicorn 워커들이 한도를 공유합니다. 읽기-수정-쓰기는
+    BEGIN IMMEDIATE 트랜잭션으로 직렬화되며, 시각은 프로세스 사이에서 비교할 수 있도록 벽시계를 사용합니다.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # 연결은 스레드·프로세스마다 따로 엽니다 (fork 이후 부모 연결을 재사용하지 않습니다)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        """MemoryBucketStore.take와 같습니다."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = self._clock()
+            row = conn.execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                'INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, 0.0 if allowed else _retry_after(tokens, cost, rate)
+
+    def clear(self) -> None:
+        self._connect().execute('DELETE FROM rate_limit_buckets')
+
+
+class RedisBucketStore:
+    """
+    Redis 토큰 버킷 저장소 (여러 서버가 한도를 공유)
+
+    충전과 차감은 Lua 스크립트 한 번으로 원자적으로 처리하며, 가득 찬 버킷은 만료시켜 키가 쌓이지 않게 합니다.
+    """
+
+    _SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str, prefix: str = 'zk_nft:rate:', clock: Callable[[], float] = time.time):
+        if redis is None:
+            raise RuntimeError('redis 패키지가 설치되지 않았습니다 (RATE_LIMIT_BACKEND=redis)')
+        self.prefix = prefix
+        self._clock = clock
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        """MemoryBucketStore.take와 같습니다."""
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[capacity, rate, self._clock(), cost])
+        allowed = bool(int(allowed))
+        return allowed, 0.0 if allowed else _retry_after(float(tokens), cost, rate)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(self.prefix + '*'):
+            self._client.delete(key)
+
+
+class RateLimiter:
+    """
+    bank_id / customer_id별 토큰 버킷 속도 제한
+
+    한도는 차원(dimension)마다 따로 지정하며, 요청은 모든 차원의 버킷에서 토큰을 얻어야 통과합니다.
+    """
+
+    def __init__(self, store=None, rules: Optional[Dict[str, Optional[Tuple[float, float]]]] = None,
+                 enabled: bool = True):
+        """
+        Args:
+            store: 토큰 버킷 저장소 (기본값: MemoryBucketStore)
+            rules: 차원 → (용량, 초당 충전량). None이면 해당 차원은 제한하지 않습니다.
+            enabled: False면 모든 요청을 허용합니다
+        """
+        self.store = store or MemoryBucketStore()
+        self.rules = rules or {}
+        self.enabled = enabled
+
+    def check(self, keys: Dict[str, Optional[str]]) -> Optional[Tuple[str, float]]:
+        """
+        요청을 한도에 반영합니다.
+
+        Args:
+            keys: 차원 → 값 (예: {'bank_id': 'BANK_001', 'customer_id': 'CUST_001'})
+
+        Returns:
+            한도를 넘은 경우 (차원, 다시 시도할 때까지 남은 초), 아니면 None
+        """
+        if not self.enabled:
+            return None
+        taken = []
+        for dimension, value in keys.items():
+            rule = self.rules.get(dimension)
+            if rule is None or value is None:
+                continue
+            key = f'{dimension}:{value}'
+            allowed, retry_after = self.store.take(key, *rule)
+            if not allowed:
+                # 거절된 요청은 앞서 통과한 차원의 토큰도 쓰지 않은 것으로 돌려놓습니다
+                for taken_key, taken_rule in taken:
+                    self.store.take(taken_key, *taken_rule, cost=-1)
+                return dimension, retry_after
+            taken.append((key, rule))
+        return None
+
+
+class RateLimited(Exception):
+    """요청 속도 한도를 넘었습니다 (429 응답 대상)."""
+
+    def __init__(self, dimension: str, retry_after: float):
+        super().__init__(f'Rate limit exceeded for {dimension}')
+        self.dimension = dimension
+        self.retry_after = retry_after
+
+
+class AdmissionRejected(Exception):
+    """증명 생성 풀이 포화되어 요청을 수용하지 않았습니다 (503 응답 대상)."""
+
+    def __init__(self, priority: str):
+        super().__init__(f'Prover queue saturated, {priority} request shed')
+        self.priority = priority
+        self.retry_after = float(os.getenv('ADMISSION_RETRY_AFTER') or 1)
+
+
+def _prover_workers() -> int:
+    from .zkp_utils import zkp_utils
+    return max(1, zkp_utils.prover_workers)
+
+
+def _prover_queue_depth() -> int:
+    from .zkp_utils import zkp_utils
+    return zkp_utils.prover_queue_depth()
+
+
+class AdmissionController:
+    """
+    우선순위별 증명 작업 수용 제어
+
+    증명 생성 큐 깊이(실행 중이거나 대기 중인 증명 작업, 재등급 작업 포함)와 수용한 증명 요청 수 중
+    큰 값이 우선순위별 한도에 도달하면 새 요청을 거절합니다.
+    배치 한도를 대화형 한도보다 낮게 두므로 풀이 포화되면 배치 요청이 먼저 거절되고,
+    남은 여유는 대화형 요청이 사용합니다. 한도는 증명 생성 풀 크기(워커당 작업 수)로 정합니다.
+    """
+
+    def __init__(self, batch_per_worker: float = 2, interactive_per_worker: float = 8,
+                 workers: Callable[[], int] = _prover_workers,
+                 queue_depth: Callable[[], int] = _prover_queue_depth):
+        """
+        Args:
+            batch_per_worker: 배치 요청을 받는 증명 워커당 최대 작업 수
+            interactive_per_worker: 대화형 요청을 받는 증명 워커당 최대 작업 수
+            workers: 증명 생성 풀 크기를 반환하는 함수
+            queue_depth: 증명 생성 큐 깊이를 반환하는 함수
+        """
+        self.per_worker = {BATCH: batch_per_worker, INTERACTIVE: interactive_per_worker}
+        self._workers = workers
+        self._queue_depth = queue_depth
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def limit(self, priority: str) -> int:
+        return max(1, math.ceil(self._workers() * self.per_worker[priority]))
+
+    def try_acquire(self, priority: str) -> bool:
+        """
+        작업 자리를 얻습니다. 얻은 경우 반드시 release()를 호출해야 합니다.
+
+        Returns:
+            수용 여부
+        """
+        with self._lock:
+            # 비동기 앱에서는 수용한 요청이 큐에도 들어가므로 합치지 않고 큰 값을 씁니다
+            if max(self._in_flight, self._queue_depth()) >= self.limit(priority):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    @contextmanager
+    def admit(self, priority: str):
+        """
+        작업 자리를 얻어 블록을 실행합니다.
+
+        Raises:
+            AdmissionRejected: 한도에 도달한 경우
+        """
+        if not self.try_acquire(priority):
+            raise AdmissionRejected(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def request_priority(value: Optional[str], max_priority: str = INTERACTIVE) -> str:
+    """
+    X-Request-Priority 헤더 값을 우선순위로 변환합니다 (없거나 알 수 없으면 ADMISSION_DEFAULT_PRIORITY).
+
+    Args:
+        value: 헤더 값
+        max_priority: 호출자에게 허용된 최고 우선순위 (batch면 interactive 요청도 batch로 처리)
+    """
+    value = (value or '').strip().lower()
+    if value not in PRIORITIES:
+        value = (os.getenv('ADMISSION_DEFAULT_PRIORITY') or BATCH).lower()
+    if value == INTERACTIVE and max_priority == INTERACTIVE:
+        return INTERACTIVE
+    return BATCH
+
+
+@lru_cache(maxsize=8)
+def parse_partners(value: str) -> Dict[str, Tuple[str, str]]:
+    """
+    'key1=BANK_001:interactive,key2=BANK_002' 형식의 제휴기관 설정을 변환합니다.
+
+    Returns:
+        키 → (bank_id, 최고 우선순위, 생략하면 batch)
+
+    Raises:
+        ValueError: 잘못된 형식
+    """
+    partners = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        key, _, partner = item.partition('=')
+        bank_id, _, max_priority = partner.partition(':')
+        max_priority = (max_priority or BATCH).strip().lower()
+        if not key.strip() or not bank_id.strip() or max_priority not in PRIORITIES:
+            raise ValueError(f'Invalid PARTNER_KEYS entry: {item.split("=")[-1]}')
+        partners[key.strip()] = (bank_id.strip(), max_priority)
+    return partners
+
+
+def identify_partner(partner_key: Optional[str], remote_addr: Optional[str] = None) -> Tuple[str, str]:
+    """
+    X-Partner-Key 헤더로 호출한 은행과 허용 우선순위를 정합니다.
+
+    Args:
+        partner_key: X-Partner-Key 헤더 값
+        remote_addr: 접속 주소 (키가 없거나 맞지 않는 호출자의 속도 제한 키)
+
+    Returns:
+        (속도 제한에 쓸 bank_id, 최고 우선순위)
+    """
+    if partner_key:
+        for key, partner in parse_partners(os.getenv('PARTNER_KEYS') or '').items():
+            if hmac.compare_digest(key.encode(), partner_key.encode()):
+                return partner
+    return f'anonymous:{remote_addr or "unknown"}', BATCH
+
+
+def create_bucket_store():
+    """RATE_LIMIT_BACKEND(memory, sqlite, redis) 설정으로 토큰 버킷 저장소를 생성합니다."""
+    backend = (os.getenv('RATE_LIMIT_BACKEND') or 'memory').lower()
+    if backend == 'sqlite':
+        return SQLiteBucketStore(os.getenv('RATE_LIMIT_SQLITE_PATH') or 'data/rate_limit.db')
+    if backend == 'redis':
+        return RedisBucketStore(os.getenv('RATE_LIMIT_REDIS_URL') or 'redis://localhost:6379/0')
+    return MemoryBucketStore()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """RATE_LIMIT_* 환경변수로 속도 제한기를 생성합니다."""
+    return RateLimiter(
+        store=create_bucket_store(),
+        rules={
+            'bank_id': parse_rule(os.getenv('RATE_LIMIT_BANK') or '600/min'),
+            'customer_id': parse_rule(os.getenv('RATE_LIMIT_CUSTOMER') or '10/min')
+        },
+        enabled=(os.getenv('RATE_LIMIT_ENABLED') or 'true').lower() == 'true'
+    )
+
+
+def create_admission_controller() -> AdmissionController:
+    """ADMISSION_* 환경변수로 수용 제어기를 생성합니다."""
+    return AdmissionController(
+        batch_per_worker=float(os.getenv('ADMISSION_BATCH_PER_WORKER') or 2),
+        interactive_per_worker=float(os.getenv('ADMISSION_INTERACTIVE_PER_WORKER') or 8)
+    )
+
+
+# 전역 속도 제한기 / 수용 제어기 인스턴스
+rate_limiter = create_rate_limiter()
+admission_controller = create_admission_controller()
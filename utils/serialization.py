@@ -0,0 +1,206 @@
+"""
+API 응답 직렬화 유틸리티
+orjson 기반 JSON 프로바이더(설치되지 않은 경우 표준 json 사용)와 ?fields= 응답 필드 선택,
+MessagePack/CBOR 요청·응답 협상을 제공합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
+
+from . import wire_format
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson이 없으면 표준 json 경로를 사용합니다
+    orjson = None
+
+# 필드 선택과 관계없이 항상 남기는 필드 (오류 응답이 비어 보이지 않도록)
+ALWAYS_INCLUDED_FIELDS = {'error'}
+
+
+def parse_fields(spec: Optional[str]) -> Tuple[List[List[str]], List[List[str]]]:
+    """
+    ?fields= 값을 포함/제외 경로 목록으로 변환합니다.
+
+    'inquiry_id,nft_metadata.token_id'는 해당 필드만 남기고,
+    '-nft_metadata,-external_response.nft_metadata'는 해당 필드만 뺍니다.
+
+    Args:
+        spec: fields 쿼리 파라미터 값
+
+    Returns:
+        (포함 경로 목록, 제외 경로 목록)
+    """
+    includes, excludes = [], []
+    for item in (spec or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        if item.startswith('-'):
+            excludes.append(item[1:].split('.'))
+        else:
+            includes.append(item.split('.'))
+    return includes, excludes
+
+
+def _include(value: Any, paths: List[List[str]]) -> Any:
+    if isinstance(value, list):
+        return [_include(item, paths) for item in value]
+    if not isinstance(value, dict):
+        return value
+    # 경로 끝에 도달한 필드는 통째로, 중간 필드는 하위 경로만 남깁니다
+    children: Dict[str, List[List[str]]] = {}
+    for path in paths:
+        children.setdefault(path[0], []).append(path[1:])
+    selected = {}
+    for key, value_paths in children.items():
+        if key not in value:
+            continue
+        if any(not rest for rest in value_paths):
+            selected[key] = value[key]
+        else:
+            selected[key] = _include(value[key], value_paths)
+    for key in ALWAYS_INCLUDED_FIELDS:
+        if key in value:
+            selected[key] = value[key]
+    return selected
+
+
+def _exclude(value: Any, path: List[str]) -> Any:
+    if isinstance(value, list):
+        return [_exclude(item, path) for item in value]
+    if not isinstance(value, dict) or path[0] not in value:
+        return value
+    trimmed = dict(value)
+    if len(path) == 1:
+        if path[0] not in ALWAYS_INCLUDED_FIELDS:
+            del trimmed[path[0]]
+    else:
+        trimmed[path[0]] = _exclude(value[path[0]], path[1:])
+    return trimmed
+
+
+def select_fields(obj: Any, spec: Optional[str]) -> Any:
+    """
+    응답 객체에서 요청한 필드만 남깁니다. 원본 객체는 수정하지 않습니다.
+
+    Args:
+        obj: 응답 객체 (딕셔너리 또는 딕셔너리 목록)
+        spec: fields 쿼리 파라미터 값
+
+    Returns:
+        필드가 선택된 응답 객체
+    """
+    includes, excludes = parse_fields(spec)
+    if includes:
+        obj = _include(obj, includes)
+    for path in excludes:
+        obj = _exclude(obj, path)
+    return obj
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson으로 직렬화하고 ?fields= 필드 선택을 적용하는 JSON 프로바이더
+
+    기본 프로바이더처럼 키를 정렬하며, 날짜 객체는 orjson 규칙(ISO 8601)으로 직렬화됩니다.
+    """
+
+    def current_request(self):
+        from flask import has_request_context, request
+        return request if has_request_context() else None
+
+    def _orjson_options(self, indent: bool = False) -> int:
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _encode(self, obj: Any, indent: bool = False) -> Optional[bytes]:
+        if orjson is None:
+            return None
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options(indent))
+        except orjson.JSONEncodeError:
+            # 64비트를 넘는 정수(uint256 토큰 ID 등)는 orjson이 처리하지 못하므로 표준 json을 사용합니다
+            return None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        encoded = None if kwargs else self._encode(obj)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        request = self.current_request()
+        if request is not None:
+            fields = request.args.get('fields')
+            if fields:
+                obj = select_fields(obj, fields)
+            # Accept 헤더로 MessagePack/CBOR를 요청한 서비스에는 바이너리 형식으로 응답합니다
+            # (바이너리로 표현할 수 없는 값이 있으면 JSON으로 응답합니다)
+            binary = wire_format.negotiate(request.accept_mimetypes)
+            if binary is not None:
+                body, mimetype = wire_format.encode_with_fallback(obj, binary)
+                if mimetype != wire_format.JSON:
+                    return self._app.response_class(body, mimetype=mimetype)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        encoded = self._encode(obj, indent)
+        if encoded is None:
+            dump_args = {'indent': 2} if indent else {'separators': (',', ':')}
+            body = f'{super().dumps(obj, **dump_args)}\n'
+        else:
+            # 문자열로 되돌리지 않고 바이트 그대로 응답 본문에 씁니다
+            body = encoded + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class AsyncFastJSONProvider(FastJSONProvider):
+    """Quart 애플리케이션용 FastJSONProvider"""
+
+    def current_request(self):
+        from quart import has_request_context, request
+        return request if has_request_context() else None
+
+
+class WireFormatRequest(Request):
+    """MessagePack/CBOR 본문도 get_json()으로 읽을 수 있는 요청 클래스"""
+
+    def get_json(self, force: bool = False, silent: bool = False, cache: bool = True):
+        if not wire_format.is_binary(self.mimetype):
+            return super().get_json(force=force, silent=silent, cache=cache)
+        try:
+            return wire_format.decode(self.get_data(cache=cache), self.mimetype)
+        except Exception as e:
+            if silent:
+                return None
+            raise BadRequest(f'Failed to decode {self.mimetype} body: {e}')
+
+
+def async_wire_format_request_class():
+    """Quart 애플리케이션용 WireFormatRequest 클래스를 생성합니다."""
+    from quart import Request as AsyncRequest
+
+    class AsyncWireFormatRequest(AsyncRequest):
+        async def get_json(self, force: bool = False, silent: bool = False, cache: bool = True):
+            if not wire_format.is_binary(self.mimetype):
+                return await super().get_json(force=force, silent=silent, cache=cache)
+            try:
+                return wire_format.decode(await self.get_data(cache=cache), self.mimetype)
+            except Exception as e:
+                if silent:
+                    return None
+                raise BadRequest(f'Failed to decode {self.mimetype} body: {e}')
+
+    return AsyncWireFormatRequest
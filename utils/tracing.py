@@ -0,0 +1,392 @@
+"""
+분산 추적 유틸리티
+W3C traceparent 헤더로 은행 → 외부기관 → 증명 생성 → 블록체인 호출을 하나의 트레이스로 묶고,
+단계별 스팬을 JSONL 파일이나 수집기(HTTP)로 내보냅니다.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import random
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+TRACEPARENT_HEADER = 'traceparent'
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('current_span', default=None)
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    traceparent 헤더를 해석합니다.
+
+    Args:
+        value: 헤더 값 (예: 00-<trace-id 32자>-<span-id 16자>-01)
+
+    Returns:
+        (trace_id, parent_span_id, sampled) 또는 형식이 잘못된 경우 None
+    """
+    if not value:
+        return None
+    parts = value.strip().lower().split('-')
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == 'ff':
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    if version == '00' and len(parts) != 4:
+        return None
+    if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        int(trace_id, 16), int(span_id, 16), int(flags, 16)
+    except ValueError:
+        return None
+    if trace_id == '0' * 32 or span_id == '0' * 16:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 0x01)
+
+
+class Span:
+    """추적 구간 하나 (시작/종료 시각, 부모 스팬, 속성)"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 sampled: bool = True, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f'00-{self.trace_id}-{self.span_id}-{"01" if self.sampled else "00"}'
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = 'error'
+        self.attributes['error.type'] = type(error).__name__
+        self.attributes['error.message'] = str(error)
+
+    def end(self) -> None:
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_time': datetime.fromtimestamp(self.start_time, timezone.utc).isoformat(),
+            'duration_ms': round((self.duration or 0) * 1000, 3),
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class FileSpanExporter:
+    """스팬을 한 줄에 하나씩 JSONL 파일에 추가합니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Dict]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span, ensure_ascii=False, default=str) + '\n')
+
+
+def _otlp_value(value) -> Dict:
+    """속성 값을 OTLP AnyValue로 변환합니다."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [_otlp_value(item) for item in value]}}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_payload(spans: List[Dict]) -> Dict:
+    """
+    스팬 묶음을 OTLP/JSON(ExportTraceServiceRequest) 본문으로 변환합니다.
+    service.name 속성은 서비스별 리소스 속성으로 옮깁니다.
+
+    Args:
+        spans: Span.to_dict() 형식의 스팬 목록
+
+    Returns:
+        {'resourceSpans': [...]} 본문
+    """
+    by_service: Dict[str, List[Dict]] = {}
+    for span in spans:
+        attributes = dict(span['attributes'])
+        service_name = str(attributes.pop('service.name', 'unknown_service'))
+        start_ns = int(datetime.fromisoformat(span['start_time']).timestamp() * 1e9)
+        otlp_span = {
+            'traceId': span['trace_id'],
+            'spanId': span['span_id'],
+            'name': span['name'],
+            'kind': 1,
+            'startTimeUnixNano': str(start_ns),
+            'endTimeUnixNano': str(start_ns + int(span['duration_ms'] * 1e6)),
+            'attributes': _otlp_attributes(attributes),
+            # STATUS_CODE_OK = 1, STATUS_CODE_ERROR = 2
+            'status': {'code': 2, 'message': str(attributes.get('error.message', ''))}
+            if span['status'] == 'error' else {'code': 1}
+        }
+        if span['parent_id']:
+            otlp_span['parentSpanId'] = span['parent_id']
+        by_service.setdefault(service_name, []).append(otlp_span)
+    return {
+        'resourceSpans': [
+            {
+                'resource': {'attributes': _otlp_attributes({'service.name': service_name})},
+                'scopeSpans': [{'scope': {'name': 'zk-nft.tracing'}, 'spans': service_spans}]
+            }
+            for service_name, service_spans in by_service.items()
+        ]
+    }
+
+
+class HttpSpanExporter:
+    """스팬 묶음을 OTLP/HTTP JSON 형식으로 수집기 URL(예: http://localhost:4318/v1/traces)에 POST 합니다."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def export(self, spans: List[Dict]) -> None:
+        response = self.session.post(self.url, json=otlp_payload(spans), timeout=self.timeout)
+        response.raise_for_status()
+
+
+class BatchSpanProcessor:
+    """
+    종료된 스팬을 큐에 모아 백그라운드 스레드에서 내보냅니다.
+
+    요청 처리 스레드는 큐에 넣기만 하므로 파일 쓰기나 수집기 호출이 응답을 늦추지 않습니다.
+    """
+
+    def __init__(self, exporter, max_batch_size: int = 100, flush_interval: float = 1.0,
+                 max_queue_size: int = 10000):
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._start()
+        # pre-fork 서버에서 워커마다 내보내기 스레드를 다시 시작합니다
+        os.register_at_fork(after_in_child=self._start)
+
+    def _start(self) -> None:
+        self._queue: queue.Queue = queue.Queue(self.max_queue_size)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name='span-exporter', daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> List[Dict]:
+        batch = []
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self, batch: List[Dict]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception:
+            # 추적 실패가 서비스에 영향을 주지 않도록 묶음을 버립니다
+            self.dropped += len(batch)
+
+    def _worker(self) -> None:
+        while not self._stopped.is_set():
+            self._stopped.wait(self.flush_interval)
+            batch = self._drain()
+            while batch:
+                self._export(batch)
+                batch = self._drain()
+
+    def force_flush(self) -> None:
+        """큐에 남은 스팬을 호출 스레드에서 모두 내보냅니다."""
+        batch = self._drain()
+        while batch:
+            self._export(batch)
+            batch = self._drain()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+        self.force_flush()
+
+
+class Tracer:
+    """스팬 생성과 샘플링, 내보내기를 담당하는 추적기"""
+
+    def __init__(self, service_name: str = 'zk-nft', sample_rate: float = 1.0,
+                 processor: Optional[BatchSpanProcessor] = None):
+        self.service_name = service_name
+        self.sample_rate = sample_rate
+        self.processor = processor
+
+    def _new_span(self, name: str, parent: Optional[Tuple[str, str, bool]], attributes: Dict) -> Span:
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+            sampled = random.random() < self.sample_rate
+        attributes.setdefault('service.name', self.service_name)
+        return Span(name, trace_id, parent_id, sampled, attributes)
+
+    def begin_span(self, name: str, traceparent: Optional[str] = None, **attributes) -> Tuple[Span, contextvars.Token]:
+        """
+        현재 컨텍스트에서 스팬을 시작합니다. 요청 전/후 훅처럼 with 블록을 쓸 수 없을 때 사용합니다.
+
+        Args:
+            name: 스팬 이름
+            traceparent: 상위 서비스에서 받은 traceparent 헤더 (없으면 현재 스팬의 하위로 생성)
+            **attributes: 스팬 속성
+
+        Returns:
+            (스팬, end_span에 전달할 토큰)
+        """
+        parent = parse_traceparent(traceparent)
+        if parent is None:
+            current = _current_span.get()
+            if current is not None:
+                parent = (current.trace_id, current.span_id, current.sampled)
+        span = self._new_span(name, parent, attributes)
+        return span, _current_span.set(span)
+
+    def end_span(self, span: Span, token: Optional[contextvars.Token] = None) -> None:
+        """스팬을 종료하고 샘플링된 경우 내보내기 큐에 넣습니다."""
+        span.end()
+        if token is not None:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # 다른 컨텍스트에서 만든 토큰이면 현재 스팬만 되돌립니다
+                _current_span.set(None)
+        if span.sampled and self.processor is not None:
+            self.processor.on_end(span)
+
+    @contextmanager
+    def start_span(self, name: str, **attributes):
+        """
+        with 블록 동안 현재 스팬의 하위 스팬을 기록합니다. 예외가 발생하면 오류로 표시합니다.
+
+        Args:
+            name: 스팬 이름
+            **attributes: 스팬 속성
+        """
+        span, token = self.begin_span(name, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            self.end_span(span, token)
+
+
+def current_span() -> Optional[Span]:
+    """현재 컨텍스트의 스팬을 반환합니다."""
+    return _current_span.get()
+
+
+def inject_headers(headers: Optional[Dict] = None) -> Dict:
+    """
+    나가는 HTTP 요청 헤더에 현재 스팬의 traceparent를 추가합니다.
+
+    Args:
+        headers: 기존 헤더
+
+    Returns:
+        traceparent가 추가된 헤더
+    """
+    headers = dict(headers or {})
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.traceparent
+    return headers
+
+
+def create_exporter(kind: str):
+    """
+    TRACE_EXPORTER 설정에 맞는 내보내기 객체를 생성합니다.
+
+    Args:
+        kind: none, file, http 중 하나
+
+    Returns:
+        내보내기 객체 (none이면 None)
+    """
+    if kind == 'file':
+        return FileSpanExporter(os.getenv('TRACE_FILE') or 'data/traces.jsonl')
+    if kind == 'http':
+        return HttpSpanExporter(
+            os.getenv('TRACE_COLLECTOR_URL') or 'http://localhost:4318/v1/traces',
+            float(os.getenv('TRACE_EXPORT_TIMEOUT') or 5.0)
+        )
+    return None
+
+
+def create_tracer() -> Tracer:
+    """
+    환경변수 설정으로 추적기를 생성합니다.
+
+    환경변수:
+        TRACE_EXPORTER: none, file, http (기본값: none - traceparent 전달만 수행)
+        TRACE_FILE: file 내보내기 경로 (기본값: data/traces.jsonl)
+        TRACE_COLLECTOR_URL: http 내보내기 OTLP/HTTP 수집기 주소 (기본값: http://localhost:4318/v1/traces)
+        TRACE_SAMPLE_RATE: 새 트레이스 샘플링 비율 (0~1, 상위 서비스의 결정은 그대로 따릅니다)
+        TRACE_SERVICE_NAME: 스팬에 기록할 서비스 이름
+
+    Returns:
+        추적기
+    """
+    exporter = create_exporter((os.getenv('TRACE_EXPORTER') or 'none').lower())
+    processor = None
+    if exporter is not None:
+        processor = BatchSpanProcessor(exporter, flush_interval=float(os.getenv('TRACE_FLUSH_INTERVAL') or 1.0))
+        atexit.register(processor.shutdown)
+    return Tracer(
+        os.getenv('TRACE_SERVICE_NAME') or 'zk-nft',
+        float(os.getenv('TRACE_SAMPLE_RATE') or 1.0),
+        processor
+    )
+
+
+# 전역 추적기 인스턴스
+tracer = create_tracer()
@@ -0,0 +1,241 @@
+"""
+서비스 간 바이너리 전송 형식 (MessagePack / CBOR)
+Accept / Content-Type으로 형식을 협상하고, 설치되지 않은 형식은 자동으로 JSON으로 대체합니다.
+
+바이너리 형식에서는 소문자 16진수 문자열(zk_proof의 a/b/c 필드 원소, 해시, 트랜잭션 해시 등)을
+원시 바이트로 담아 보냅니다. 0x 접두사 여부를 확장 타입(CBOR는 태그)으로 구분하므로
+디코딩하면 원래 문자열로 정확히 복원됩니다.
+
+64비트를 넘는 정수(uint256 토큰 ID, 체인 값 등)는 MessagePack에서 확장 타입으로, CBOR에서는 bignum 태그로
+보냅니다. 그 밖에 바이너리 형식으로 인코딩할 수 없는 값은 encode_with_fallback이 JSON으로 대체합니다.
+"""
+
+import os
+import re
+import json
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 설치되지 않은 형식은 협상에서 제외됩니다
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+_CBOR_ERRORS = (cbor2.CBOREncodeError,) if cbor2 is not None else ()
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CBOR = 'application/cbor'
+
+# 같은 형식을 가리키는 다른 MIME 타입
+MIME_ALIASES = {
+    'application/x-msgpack': MSGPACK,
+    'application/vnd.msgpack': MSGPACK
+}
+
+# 16진수 문자열을 담는 MessagePack 확장 타입 번호와 CBOR 태그 (애플리케이션 전용 값)
+HEX_EXT_TYPE = 1
+PREFIXED_HEX_EXT_TYPE = 2
+BIGINT_EXT_TYPE = 3
+HEX_CBOR_TAG = 48001
+PREFIXED_HEX_CBOR_TAG = 48002
+
+# 짧은 문자열(고객 ID 등)이 바뀌지 않도록 16자(8바이트) 이상만 변환합니다
+_HEX_PATTERN = re.compile(r'(0x)?((?:[0-9a-f]{2}){8,})')
+
+
+def normalize_mimetype(mimetype: Optional[str]) -> Optional[str]:
+    """Content-Type 헤더에서 파라미터를 떼고 별칭을 정리합니다."""
+    if not mimetype:
+        return None
+    mimetype = mimetype.split(';')[0].strip().lower()
+    return MIME_ALIASES.get(mimetype, mimetype)
+
+
+def binary_formats() -> Tuple[str, ...]:
+    """현재 환경에서 사용할 수 있는 바이너리 형식"""
+    formats = []
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    if cbor2 is not None:
+        formats.append(CBOR)
+    return tuple(formats)
+
+
+def is_binary(mimetype: Optional[str]) -> bool:
+    return normalize_mimetype(mimetype) in binary_formats()
+
+
+def is_unsupported(mimetype: Optional[str]) -> bool:
+    """바이너리 형식이지만 이 환경에 코덱이 설치되지 않았는지 확인합니다 (415 응답 대상)."""
+    mimetype = normalize_mimetype(mimetype)
+    return mimetype in (MSGPACK, CBOR) and mimetype not in binary_formats()
+
+
+def _pack_hex(value: str) -> Optional[Tuple[bool, bytes]]:
+    match = _HEX_PATTERN.fullmatch(value)
+    if match is None:
+        return None
+    return bool(match.group(1)), bytes.fromhex(match.group(2))
+
+
+def _unpack_hex(prefixed: bool, raw: bytes) -> str:
+    return ('0x' if prefixed else '') + raw.hex()
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, int):
+        # MessagePack 정수 범위(-2**63 ~ 2**64-1)를 넘는 값은 부호 있는 빅엔디언 바이트로 보냅니다
+        return msgpack.ExtType(BIGINT_EXT_TYPE, obj.to_bytes(obj.bit_length() // 8 + 1, 'big', signed=True))
+    raise TypeError(f'Object of type {type(obj).__name__} is not MessagePack serializable')
+
+
+def _to_msgpack_tree(value: Any) -> Any:
+    if isinstance(value, str):
+        packed = _pack_hex(value)
+        if packed is None:
+            return value
+        return msgpack.ExtType(PREFIXED_HEX_EXT_TYPE if packed[0] else HEX_EXT_TYPE, packed[1])
+    if isinstance(value, dict):
+        return {key: _to_msgpack_tree(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_msgpack_tree(item) for item in value]
+    return value
+
+
+def _msgpack_ext_hook(code: int, data: bytes):
+    if code == HEX_EXT_TYPE:
+        return _unpack_hex(False, data)
+    if code == PREFIXED_HEX_EXT_TYPE:
+        return _unpack_hex(True, data)
+    if code == BIGINT_EXT_TYPE:
+        return int.from_bytes(data, 'big', signed=True)
+    return msgpack.ExtType(code, data)
+
+
+def _to_cbor_tree(value: Any) -> Any:
+    if isinstance(value, str):
+        packed = _pack_hex(value)
+        if packed is None:
+            return value
+        return cbor2.CBORTag(PREFIXED_HEX_CBOR_TAG if packed[0] else HEX_CBOR_TAG, packed[1])
+    if isinstance(value, dict):
+        return {key: _to_cbor_tree(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_cbor_tree(item) for item in value]
+    return value
+
+
+def _cbor_tag_hook(decoder, tag):
+    if tag.tag == HEX_CBOR_TAG:
+        return _unpack_hex(False, tag.value)
+    if tag.tag == PREFIXED_HEX_CBOR_TAG:
+        return _unpack_hex(True, tag.value)
+    return tag
+
+
+def encode(obj: Any, mimetype: str) -> bytes:
+    """
+    객체를 지정한 형식으로 인코딩합니다.
+
+    Args:
+        obj: 인코딩할 객체 (JSON으로 표현 가능한 값)
+        mimetype: application/msgpack, application/cbor 또는 application/json
+
+    Returns:
+        인코딩된 바이트
+    """
+    mimetype = normalize_mimetype(mimetype)
+    if mimetype == MSGPACK and msgpack is not None:
+        return msgpack.packb(_to_msgpack_tree(obj), default=_msgpack_default, use_bin_type=True)
+    if mimetype == CBOR and cbor2 is not None:
+        return cbor2.dumps(_to_cbor_tree(obj))
+    return json.dumps(obj, ensure_ascii=False, default=str).encode()
+
+
+def encode_with_fallback(obj: Any, mimetype: str) -> Tuple[bytes, str]:
+    """
+    객체를 지정한 형식으로 인코딩하고, 바이너리 형식으로 표현할 수 없는 값이 있으면 JSON으로 대체합니다.
+
+    Args:
+        obj: 인코딩할 객체
+        mimetype: 요청한 형식
+
+    Returns:
+        (인코딩된 바이트, 실제로 사용한 형식)
+    """
+    mimetype = normalize_mimetype(mimetype) or JSON
+    if mimetype in binary_formats():
+        try:
+            return encode(obj, mimetype), mimetype
+        except (TypeError, ValueError, OverflowError) + _CBOR_ERRORS:
+            pass
+    return encode(obj, JSON), JSON
+
+
+def decode(data: bytes, mimetype: Optional[str]) -> Any:
+    """
+    Content-Type에 맞게 본문을 디코딩합니다. 바이너리 형식이 아니면 JSON으로 해석합니다.
+
+    Args:
+        data: 본문
+        mimetype: Content-Type 헤더 값
+
+    Returns:
+        디코딩된 객체
+    """
+    mimetype = normalize_mimetype(mimetype)
+    if mimetype == MSGPACK and msgpack is not None:
+        return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+    if mimetype == CBOR and cbor2 is not None:
+        return cbor2.loads(data, tag_hook=_cbor_tag_hook)
+    return json.loads(data)
+
+
+def negotiate(accept_mimetypes) -> Optional[str]:
+    """
+    Accept 헤더에서 바이너리 형식을 골라냅니다. JSON이 더 선호되거나 같은 순위면 None을 반환합니다.
+
+    Args:
+        accept_mimetypes: werkzeug MIMEAccept (request.accept_mimetypes)
+
+    Returns:
+        선택한 바이너리 형식 또는 None (JSON 사용)
+    """
+    offers = (JSON,) + binary_formats() + tuple(
+        alias for alias, target in MIME_ALIASES.items() if target in binary_formats()
+    )
+    best = accept_mimetypes.best_match(offers)
+    if best is None or best == JSON:
+        return None
+    return normalize_mimetype(best)
+
+
+def service_wire_format() -> str:
+    """
+    서비스 간 호출에 사용할 형식 (SERVICE_WIRE_FORMAT: json, msgpack, cbor)
+    설치되지 않은 형식을 지정하면 JSON을 사용합니다.
+    """
+    preferred = {'msgpack': MSGPACK, 'cbor': CBOR}.get((os.getenv('SERVICE_WIRE_FORMAT') or 'json').lower(), JSON)
+    return preferred if preferred in binary_formats() else JSON
+
+
+def request_payload(obj: Any, mimetype: Optional[str] = None) -> Tuple[bytes, Dict[str, str]]:
+    """
+    서비스 간 요청 본문과 헤더를 생성합니다. 응답도 같은 형식을 우선 요청하되 JSON을 허용합니다.
+
+    Args:
+        obj: 요청 본문 객체
+        mimetype: 사용할 형식 (기본값: SERVICE_WIRE_FORMAT)
+
+    Returns:
+        (본문, 헤더)
+    """
+    mimetype = mimetype or service_wire_format()
+    accept = JSON if mimetype == JSON else f'{mimetype}, {JSON};q=0.5'
+    body, content_type = encode_with_fallback(obj, mimetype)
+    return body, {'Content-Type': content_type, 'Accept': accept}
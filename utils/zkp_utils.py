@@ -10,21 +10,133 @@ import subprocess
 import tempfile
 import time
 import uuid
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from .credit_circuit import (CIRCUIT_VERSIONS, circuit_version as resolve_circuit_version, credit_commitment,
+                             format_field, random_salt, uses_commitment)
+from .metrics import PROVER_QUEUE_DEPTH, run_subprocess, timed
+from .tracing import tracer
+
 class ZKPUtils:
     """Zero-Knowledge Proof 유틸리티 클래스"""
     
-    def __init__(self, zokrates_image: str = "zokrates/zokrates:0.8.17"):
+    def __init__(self, zokrates_image: str = "zokrates/zokrates:0.8.17",
+                 prover_workers: Optional[int] = None, circuit_version: Optional[str] = None):
         """
         ZKP 유틸리티 초기화
         
         Args:
             zokrates_image: ZoKrates Docker 이미지명
+            prover_workers: 증명 생성 스레드 풀 크기 (기본값: ZKP_PROVER_WORKERS 또는 CPU 수)
+            circuit_version: 신용등급 회로 버전 (기본값: ZKP_CIRCUIT_VERSION 또는 v1)
         """
         self.zokrates_image = zokrates_image
-        self.workspace_dir = os.path.join(os.getcwd(), 'zokrates')
+        self.circuit_version = resolve_circuit_version(circuit_version)
+        self.workspace_dir = self.workspace_for(self.circuit_version)
+        self.prover_workers = prover_workers if prover_workers is not None else \
+            int(os.getenv('ZKP_PROVER_WORKERS') or os.cpu_count() or 1)
+        self._circuit_artifacts: Dict[str, object] = {}
+        
+        self._prover_pool: Optional[ThreadPoolExecutor] = None
+        self._prover_pid: Optional[int] = None
+        self._prover_lock = threading.Lock()
+        self._queued = 0
+    
+    @staticmethod
+    def workspace_for(circuit_version: str) -> str:
+        """회로 버전의 ZoKrates 작업 디렉토리"""
+        return os.path.join(os.getcwd(), CIRCUIT_VERSIONS[resolve_circuit_version(circuit_version)])
+    
+    def circuit_artifacts(self, program: str = 'out'):
+        """
+        작업 디렉토리의 컴파일 결과, R1CS, witness 파일을 메모리 매핑해 엽니다 (프로그램별로 한 번).
+        
+        Args:
+            program: 컴파일 결과 파일명
+            
+        Returns:
+            CircuitArtifacts (없는 파일은 None)
+        """
+        from .zokrates_artifacts import CircuitArtifacts
+        
+        with self._prover_lock:
+            artifacts = self._circuit_artifacts.get(program)
+            if artifacts is None:
+                artifacts = CircuitArtifacts(self.workspace_dir, program)
+                self._circuit_artifacts[program] = artifacts
+            return artifacts
+    
+    def _get_prover_pool(self) -> ThreadPoolExecutor:
+        # fork 이후 부모의 스레드는 자식에 존재하지 않으므로 프로세스별로 새로 만듭니다
+        with self._prover_lock:
+            if self._prover_pool is None or self._prover_pid != os.getpid():
+                self._prover_pool = ThreadPoolExecutor(
+                    max_workers=max(1, self.prover_workers), thread_name_prefix='zkp-prover'
+                )
+                self._prover_pid = os.getpid()
+                self._queued = 0
+            return self._prover_pool
+    
+    def _run_queued(self, queued_at: float, fn, *args):
+        # 대기 시간과 실행 시간을 구분할 수 있도록 큐 대기 시간을 스팬에 남깁니다
+        with tracer.start_span('prover_job', queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 3)):
+            try:
+                return fn(*args)
+            finally:
+                with self._prover_lock:
+                    self._queued -= 1
+                PROVER_QUEUE_DEPTH.dec()
+    
+    def submit(self, fn, *args) -> Future:
+        """
+        증명 생성 스레드 풀에 작업을 제출합니다.
+        
+        Args:
+            fn: 실행할 함수 (증명 생성을 포함하는 작업)
+            *args: 함수 인자
+            
+        Returns:
+            작업 결과를 담을 Future
+        """
+        pool = self._get_prover_pool()
+        with self._prover_lock:
+            self._queued += 1
+        PROVER_QUEUE_DEPTH.inc()
+        # 요청 컨텍스트(로그 컨텍스트, 추적 스팬)를 작업 스레드로 전달합니다
+        context = contextvars.copy_context()
+        return pool.submit(context.run, self._run_queued, time.perf_counter(), fn, *args)
+    
+    def submit_credit_score_proof(self, credit_score: int, credit_grade: str,
+                                  max_loan_amount: int, salt: Optional[int] = None) -> Future:
+        """
+        증명 생성 스레드 풀에 신용등급 ZK-Proof 생성을 제출합니다.
+        
+        Args:
+            credit_score: 신용점수
+            credit_grade: 신용등급
+            max_loan_amount: 최대 대출 가능 금액
+            salt: 커밋먼트 솔트 (커밋먼트 회로에서만 사용)
+            
+        Returns:
+            create_credit_score_proof 결과를 담을 Future
+        """
+        return self.submit(self.create_credit_score_proof, credit_score, credit_grade, max_loan_amount, salt)
+    
+    def prover_queue_depth(self) -> int:
+        """실행 중이거나 대기 중인 증명 생성 작업 수를 반환합니다."""
+        with self._prover_lock:
+            return self._queued
+    
+    def shutdown_prover_pool(self, wait: bool = True) -> None:
+        """증명 생성 스레드 풀을 종료합니다."""
+        with self._prover_lock:
+            pool, self._prover_pool = self._prover_pool, None
+        if pool is not None and self._prover_pid == os.getpid():
+            pool.shutdown(wait=wait)
         
     def compile_zokrates_program(self, program_file: str) -> Dict:
         """
@@ -51,7 +163,7 @@ class ZKPUtils:
                 'zokrates', 'compile', '-i', program_file
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_subprocess(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 return {
@@ -92,7 +204,7 @@ class ZKPUtils:
                 'zokrates', 'setup', '-i', f'{program_file}.out'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_subprocess(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 return {
@@ -114,6 +226,7 @@ class ZKPUtils:
                 'error': str(e)
             }
     
+    @timed('witness')
     def compute_witness(self, program_file: str, inputs: List[str]) -> Dict:
         """
         ZoKrates 프로그램의 witness를 계산합니다.
@@ -134,7 +247,7 @@ class ZKPUtils:
                 'zokrates', 'compute-witness', '-i', f'{program_file}.out', '-a'
             ] + inputs
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_subprocess(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 return {
@@ -156,6 +269,7 @@ class ZKPUtils:
                 'error': str(e)
             }
     
+    @timed('prove')
     def generate_proof(self, program_file: str) -> Dict:
         """
         ZoKrates 프로그램의 proof를 생성합니다.
@@ -175,7 +289,7 @@ class ZKPUtils:
                 'zokrates', 'generate-proof', '-i', f'{program_file}.out'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_subprocess(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 # proof.json 파일 읽기
@@ -209,6 +323,7 @@ class ZKPUtils:
                 'error': str(e)
             }
     
+    @timed('verify')
     def verify_proof(self, program_file: str) -> Dict:
         """
         ZoKrates 프로그램의 proof를 검증합니다.
@@ -228,7 +343,7 @@ class ZKPUtils:
                 'zokrates', 'verify', '-i', f'{program_file}.out'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_subprocess(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 return {
@@ -250,46 +365,62 @@ class ZKPUtils:
                 'error': str(e)
             }
     
+    @timed('prove')
     def create_credit_score_proof(self, credit_score: int, credit_grade: str, 
-                                 max_loan_amount: int) -> Dict:
+                                 max_loan_amount: int, salt: Optional[int] = None) -> Dict:
         """
         신용등급 정보를 기반으로 ZK-Proof를 생성합니다.
+        커밋먼트 회로(v3)에서는 입력별 SHA-256 해시 대신 회로가 내보내는 Poseidon 커밋먼트를
+        공개 입력으로 사용합니다.
         
         Args:
             credit_score: 신용점수
             credit_grade: 신용등급
             max_loan_amount: 최대 대출 가능 금액
+            salt: 커밋먼트 솔트 (기본값: 무작위, 커밋먼트 회로에서만 사용)
             
         Returns:
-            ZK-Proof 생성 결과
+            ZK-Proof 생성 결과 (커밋먼트 회로에서는 커밋먼트를 열 수 있는 'salt' 포함, proof_data에는 넣지 않습니다)
         """
         try:
             # Mock ZK-Proof 생성 (실제로는 ZoKrates를 사용)
             proof_data = {
                 'proof_id': f'PROOF_{int(time.time() * 1000000)}_{str(uuid.uuid4())[:8]}',
-                'credit_score_hash': hashlib.sha256(str(credit_score).encode()).hexdigest(),
-                'credit_grade_hash': hashlib.sha256(credit_grade.encode()).hexdigest(),
-                'max_loan_amount_hash': hashlib.sha256(str(max_loan_amount).encode()).hexdigest(),
                 'proof_timestamp': datetime.now().isoformat(),
+                'circuit_version': self.circuit_version,
                 'zk_proof': {
                     'a': ['0x1234567890abcdef', '0xabcdef1234567890'],
                     'b': [['0x1111111111111111', '0x2222222222222222'], 
                           ['0x3333333333333333', '0x4444444444444444']],
                     'c': ['0x5555555555555555', '0x6666666666666666']
-                },
-                'public_inputs': [
-                    hashlib.sha256(str(credit_score).encode()).hexdigest(),
-                    hashlib.sha256(credit_grade.encode()).hexdigest(),
-                    hashlib.sha256(str(max_loan_amount).encode()).hexdigest()
-                ]
+                }
             }
-            
-            return {
+            result = {
                 'status': 'success',
                 'message': 'Credit score ZK-Proof generated successfully',
                 'proof_data': proof_data
             }
             
+            if uses_commitment(self.circuit_version):
+                salt = random_salt() if salt is None else salt
+                commitment = format_field(credit_commitment(credit_score, credit_grade, max_loan_amount, salt))
+                proof_data['commitment'] = commitment
+                proof_data['public_inputs'] = [commitment]
+                result['salt'] = str(salt)
+            else:
+                proof_data.update({
+                    'credit_score_hash': hashlib.sha256(str(credit_score).encode()).hexdigest(),
+                    'credit_grade_hash': hashlib.sha256(credit_grade.encode()).hexdigest(),
+                    'max_loan_amount_hash': hashlib.sha256(str(max_loan_amount).encode()).hexdigest(),
+                    'public_inputs': [
+                        hashlib.sha256(str(credit_score).encode()).hexdigest(),
+                        hashlib.sha256(credit_grade.encode()).hexdigest(),
+                        hashlib.sha256(str(max_loan_amount).encode()).hexdigest()
+                    ]
+                })
+            
+            return result
+            
         except Exception as e:
             return {
                 'status': 'error',
@@ -297,6 +428,7 @@ class ZKPUtils:
                 'error': str(e)
             }
     
+    @timed('verify')
     def verify_credit_score_proof(self, proof_data: Dict) -> Dict:
         """
         신용등급 ZK-Proof를 검증합니다.
@@ -310,12 +442,16 @@ class ZKPUtils:
         try:
             # Mock 검증 (실제로는 ZoKrates를 사용)
             if 'zk_proof' in proof_data and 'public_inputs' in proof_data:
-                # 간단한 검증 로직
+                # 간단한 검증 로직 (커밋먼트 회로는 커밋먼트 하나가 공개 입력)
+                if 'commitment' in proof_data:
+                    inputs_valid = proof_data['public_inputs'] == [proof_data['commitment']]
+                else:
+                    inputs_valid = len(proof_data['public_inputs']) == 3
                 is_valid = (
                     len(proof_data['zk_proof']['a']) == 2 and
                     len(proof_data['zk_proof']['b']) == 2 and
                     len(proof_data['zk_proof']['c']) == 2 and
-                    len(proof_data['public_inputs']) == 3
+                    inputs_valid
                 )
                 
                 if is_valid:
@@ -0,0 +1,459 @@
+"""
+ZoKrates 산출물 판독기
+컴파일된 프로그램(out), R1CS 제약식(out.r1cs), witness(out.wtns) 파일을 mmap으로 열어 헤더를 검증하고
+제약식 수, 와이어 수, witness 값을 복사 없는 memoryview / NumPy 배열로 제공합니다.
+
+파일 내용은 운영체제 페이지 캐시를 통해 모든 워커가 공유하므로 워커마다 사본을 만들지 않습니다.
+외부 도구 없이 프로세스 안에서 witness가 제약식을 만족하는지 확인하거나 회로 구조를 살펴볼 수 있습니다.
+
+형식:
+    out       ZoKrates 0.8 프로그램 (매직 ZOK\\0, 버전 3, 구획 표 + CBOR 구획)
+    out.r1cs  iden3 R1CS 바이너리 (매직 r1cs, 버전 1)
+    out.wtns  iden3 witness 바이너리 (매직 wtns, 버전 2)
+"""
+
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+PROGRAM_MAGIC = b'ZOK\x00'
+PROGRAM_VERSION = 3
+R1CS_MAGIC = b'r1cs'
+R1CS_VERSION = 1
+WTNS_MAGIC = b'wtns'
+WTNS_VERSION = 2
+
+# ZoKrates 0.8이 out 헤더에 기록하는 곡선 ID
+CURVE_IDS = {bytes.fromhex('b4f7b5bd'): 'bn128'}
+# out 구획 표의 구획 (헤더 순서)
+PROGRAM_SECTIONS = ('arguments', 'statements', 'solvers', 'module_map')
+PROGRAM_SECTION_SLOTS = 5
+
+# R1CS 구획 ID
+R1CS_HEADER_SECTION = 1
+R1CS_CONSTRAINTS_SECTION = 2
+R1CS_WIRE_LABELS_SECTION = 3
+# witness 구획 ID
+WTNS_HEADER_SECTION = 1
+WTNS_VALUES_SECTION = 2
+
+# 선형결합의 항 (와이어 번호, 계수) - 계수 크기는 파일의 필드 크기(n8)로 정해집니다
+Term = Tuple[int, int]
+LinearCombination = List[Term]
+
+
+class ArtifactFormatError(ValueError):
+    """산출물 파일의 형식이 올바르지 않은 경우"""
+
+
+class MappedArtifact:
+    """
+    읽기 전용으로 메모리 매핑한 산출물 파일
+
+    반환한 memoryview나 NumPy 배열이 남아 있으면 매핑을 닫을 수 없으므로,
+    close()는 그런 경우 가비지 컬렉터가 정리하도록 둡니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 파일 경로
+
+        Raises:
+            FileNotFoundError: 파일이 없는 경우
+            ArtifactFormatError: 빈 파일인 경우
+        """
+        self.path = path
+        self.size = os.path.getsize(path)
+        if self.size == 0:
+            raise ArtifactFormatError(f'{path}: empty file')
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+
+    def _unpack(self, fmt: str, offset: int) -> tuple:
+        if offset < 0 or offset + struct.calcsize(fmt) > self.size:
+            raise ArtifactFormatError(f'{self.path}: truncated at offset {offset}')
+        return struct.unpack_from(fmt, self.buffer, offset)
+
+    def _slice(self, offset: int, length: int) -> memoryview:
+        if offset < 0 or length < 0 or offset + length > self.size:
+            raise ArtifactFormatError(f'{self.path}: section [{offset}, {offset + length}) exceeds file size {self.size}')
+        return self.buffer[offset:offset + length]
+
+    def _read_iden3_sections(self, magic: bytes, version: int) -> Dict[int, Tuple[int, int]]:
+        """iden3 바이너리(매직, 버전, 구획 수, (ID, 크기, 내용)...)의 구획 위치를 읽습니다."""
+        found_magic, found_version, count = self._unpack('<4sII', 0)
+        if found_magic != magic:
+            raise ArtifactFormatError(f'{self.path}: bad magic {found_magic!r} (expected {magic!r})')
+        if found_version != version:
+            raise ArtifactFormatError(f'{self.path}: unsupported version {found_version} (expected {version})')
+        sections = {}
+        offset = 12
+        for _ in range(count):
+            section_id, length = self._unpack('<IQ', offset)
+            self._slice(offset + 12, length)
+            sections[section_id] = (offset + 12, length)
+            offset += 12 + length
+        return sections
+
+    def close(self) -> None:
+        try:
+            self.buffer.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_field_header(artifact: MappedArtifact, offset: int) -> Tuple[int, int]:
+    """(필드 크기 n8, 소수) 헤더를 읽습니다."""
+    (field_size,) = artifact._unpack('<I', offset)
+    if field_size == 0 or field_size % 8:
+        raise ArtifactFormatError(f'{artifact.path}: invalid field size {field_size}')
+    prime = int.from_bytes(artifact._slice(offset + 4, field_size), 'little')
+    return field_size, prime
+
+
+class R1CSFile(MappedArtifact):
+    """iden3 형식의 R1CS 제약식 파일 (out.r1cs)"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.sections = self._read_iden3_sections(R1CS_MAGIC, R1CS_VERSION)
+        for section_id in (R1CS_HEADER_SECTION, R1CS_CONSTRAINTS_SECTION):
+            if section_id not in self.sections:
+                raise ArtifactFormatError(f'{path}: missing section {section_id}')
+
+        header_offset, _ = self.sections[R1CS_HEADER_SECTION]
+        self.field_size, self.prime = _read_field_header(self, header_offset)
+        (self.n_wires, self.n_pub_out, self.n_pub_in, self.n_prv_in,
+         self.n_labels, self.n_constraints) = self._unpack('<IIIIQI', header_offset + 4 + self.field_size)
+
+        self._term_dtype = np.dtype([('wire', '<u4'), ('coefficient', f'V{self.field_size}')])
+        self._offsets: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def constraints_view(self) -> memoryview:
+        """제약식 구획 전체 (복사 없음)"""
+        return self._slice(*self.sections[R1CS_CONSTRAINTS_SECTION])
+
+    def wire_labels(self) -> Optional[np.ndarray]:
+        """R1CS 와이어 → ZoKrates 변수 번호 (uint64, 복사 없음). 구획이 없으면 None"""
+        if R1CS_WIRE_LABELS_SECTION not in self.sections:
+            return None
+        offset, length = self.sections[R1CS_WIRE_LABELS_SECTION]
+        if length != self.n_wires * 8:
+            raise ArtifactFormatError(f'{self.path}: wire label section has {length} bytes for {self.n_wires} wires')
+        return np.frombuffer(self._mmap, dtype='<u8', count=self.n_wires, offset=offset)
+
+    def _terms(self, offset: int) -> Tuple[np.ndarray, int]:
+        (count,) = self._unpack('<I', offset)
+        self._slice(offset + 4, count * self._term_dtype.itemsize)
+        terms = np.frombuffer(self._mmap, dtype=self._term_dtype, count=count, offset=offset + 4)
+        return terms, offset + 4 + count * self._term_dtype.itemsize
+
+    def constraint_offsets(self) -> np.ndarray:
+        """
+        각 제약식의 파일 내 시작 위치 (처음 호출할 때 제약식 구획을 한 번 훑어 계산합니다)
+
+        Raises:
+            ArtifactFormatError: 제약식 구획 크기가 헤더의 제약식 수와 맞지 않는 경우
+        """
+        with self._lock:
+            if self._offsets is None:
+                start, length = self.sections[R1CS_CONSTRAINTS_SECTION]
+                offsets = np.empty(self.n_constraints, dtype=np.int64)
+                offset = start
+                for index in range(self.n_constraints):
+                    offsets[index] = offset
+                    for _ in range(3):
+                        (count,) = self._unpack('<I', offset)
+                        offset += 4 + count * self._term_dtype.itemsize
+                if offset != start + length:
+                    raise ArtifactFormatError(
+                        f'{self.path}: constraint section is {length} bytes but {self.n_constraints} '
+                        f'constraints span {offset - start}'
+                    )
+                self._offsets = offsets
+            return self._offsets
+
+    def constraint_terms(self, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        제약식 A·w × B·w = C·w의 세 선형결합을 구조화 배열(wire, coefficient)로 반환합니다 (복사 없음).
+
+        Args:
+            index: 제약식 번호
+        """
+        offset = int(self.constraint_offsets()[index])
+        a, offset = self._terms(offset)
+        b, offset = self._terms(offset)
+        c, _ = self._terms(offset)
+        return a, b, c
+
+    def constraint(self, index: int) -> Tuple[LinearCombination, LinearCombination, LinearCombination]:
+        """제약식의 세 선형결합을 (와이어, 계수 정수) 목록으로 반환합니다."""
+        return tuple(
+            [(int(term['wire']), int.from_bytes(term['coefficient'].tobytes(), 'little')) for term in terms]
+            for terms in self.constraint_terms(index)
+        )
+
+    def iter_constraints(self) -> Iterator[Tuple[LinearCombination, LinearCombination, LinearCombination]]:
+        for index in range(self.n_constraints):
+            yield self.constraint(index)
+
+    def term_counts(self) -> np.ndarray:
+        """제약식별 (A, B, C) 항 수 배열 (n_constraints × 3)"""
+        counts = np.empty((self.n_constraints, 3), dtype=np.int64)
+        size = self._term_dtype.itemsize
+        for index, offset in enumerate(self.constraint_offsets().tolist()):
+            for side in range(3):
+                (count,) = struct.unpack_from('<I', self.buffer, offset)
+                counts[index, side] = count
+                offset += 4 + count * size
+        return counts
+
+    def summary(self) -> Dict:
+        return {
+            'path': self.path,
+            'size': self.size,
+            'field_size': self.field_size,
+            'prime': hex(self.prime),
+            'wires': self.n_wires,
+            'public_outputs': self.n_pub_out,
+            'public_inputs': self.n_pub_in,
+            'private_inputs': self.n_prv_in,
+            'labels': self.n_labels,
+            'constraints': self.n_constraints
+        }
+
+
+class WitnessFile(MappedArtifact):
+    """iden3 형식의 witness 파일 (out.wtns)"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.sections = self._read_iden3_sections(WTNS_MAGIC, WTNS_VERSION)
+        for section_id in (WTNS_HEADER_SECTION, WTNS_VALUES_SECTION):
+            if section_id not in self.sections:
+                raise ArtifactFormatError(f'{path}: missing section {section_id}')
+
+        header_offset, _ = self.sections[WTNS_HEADER_SECTION]
+        self.field_size, self.prime = _read_field_header(self, header_offset)
+        (self.n_witness,) = self._unpack('<I', header_offset + 4 + self.field_size)
+
+        self._values_offset, length = self.sections[WTNS_VALUES_SECTION]
+        if length != self.n_witness * self.field_size:
+            raise ArtifactFormatError(
+                f'{path}: value section has {length} bytes for {self.n_witness} values of {self.field_size} bytes'
+            )
+
+    def __len__(self) -> int:
+        return self.n_witness
+
+    def values_view(self) -> np.ndarray:
+        """witness 값의 리틀 엔디언 바이트 (n_witness × field_size uint8, 복사 없음)"""
+        return np.frombuffer(self._mmap, dtype=np.uint8, count=self.n_witness * self.field_size,
+                             offset=self._values_offset).reshape(self.n_witness, self.field_size)
+
+    def limbs(self) -> np.ndarray:
+        """witness 값의 64비트 리틀 엔디언 limb (n_witness × field_size/8 uint64, 복사 없음)"""
+        return np.frombuffer(self._mmap, dtype='<u8', count=self.n_witness * self.field_size // 8,
+                             offset=self._values_offset).reshape(self.n_witness, self.field_size // 8)
+
+    def value(self, index: int) -> int:
+        """witness 값 하나를 정수로 반환합니다."""
+        if not 0 <= index < self.n_witness:
+            raise IndexError(f'witness index {index} out of range')
+        offset = self._values_offset + index * self.field_size
+        return int.from_bytes(self.buffer[offset:offset + self.field_size], 'little')
+
+    def values(self) -> List[int]:
+        """모든 witness 값을 정수 목록으로 반환합니다 (제약식 검사용 사본)."""
+        data = self.buffer[self._values_offset:self._values_offset + self.n_witness * self.field_size]
+        return [int.from_bytes(data[i:i + self.field_size], 'little')
+                for i in range(0, len(data), self.field_size)]
+
+    def summary(self) -> Dict:
+        return {
+            'path': self.path,
+            'size': self.size,
+            'field_size': self.field_size,
+            'prime': hex(self.prime),
+            'values': self.n_witness
+        }
+
+
+class ProgramFile(MappedArtifact):
+    """ZoKrates 0.8 컴파일 결과 (out)"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        magic, version, self.curve_id, self.constraint_count, self.return_count = self._unpack('<4sI4sII', 0)
+        if magic != PROGRAM_MAGIC:
+            raise ArtifactFormatError(f'{path}: bad magic {magic!r} (expected {PROGRAM_MAGIC!r})')
+        if version != PROGRAM_VERSION:
+            raise ArtifactFormatError(f'{path}: unsupported version {version} (expected {PROGRAM_VERSION})')
+
+        # 구획 표: (구획 종류 u32, 위치 u64, 길이 u64) × 5, 쓰지 않는 칸은 0
+        self.sections: List[Tuple[int, int, int]] = []
+        for slot in range(PROGRAM_SECTION_SLOTS):
+            kind, offset, length = self._unpack('<IQQ', 20 + slot * 20)
+            if kind == 0:
+                break
+            self._slice(offset, length)
+            self.sections.append((kind, offset, length))
+        if len(self.sections) < len(PROGRAM_SECTIONS):
+            raise ArtifactFormatError(f'{path}: expected {len(PROGRAM_SECTIONS)} sections, found {len(self.sections)}')
+        self._lock = threading.Lock()
+        self._statements: Optional[List[Dict]] = None
+
+    @property
+    def curve(self) -> Optional[str]:
+        return CURVE_IDS.get(self.curve_id)
+
+    def section(self, name: str) -> memoryview:
+        """
+        구획 내용 (복사 없음)
+
+        Args:
+            name: arguments, statements, solvers, module_map
+        """
+        _, offset, length = self.sections[PROGRAM_SECTIONS.index(name)]
+        return self._slice(offset, length)
+
+    def _decode_section(self, name: str) -> List:
+        if cbor2 is None:
+            raise RuntimeError('cbor2 is required to decode ZoKrates program sections')
+        _, offset, length = self.sections[PROGRAM_SECTIONS.index(name)]
+        items = []
+        # mmap의 파일 위치를 옮겨가며 읽으므로 구획을 디코딩하는 동안 잠급니다
+        with self._lock:
+            self._mmap.seek(offset)
+            decoder = cbor2.CBORDecoder(self._mmap)
+            while self._mmap.tell() < offset + length:
+                items.append(decoder.decode())
+        return items
+
+    def arguments(self) -> List[Dict]:
+        """main 인자 목록 ({'id', 'private', 'span'})"""
+        return self._decode_section('arguments')[0]
+
+    def module_map(self) -> Dict[int, str]:
+        """span의 module 값 → 소스 파일명"""
+        return self._decode_section('module_map')[0].get('modules', {})
+
+    def statements(self) -> List[Dict]:
+        """
+        문장(Constraint, Directive) 목록. 처음 호출할 때 디코딩해 보관합니다.
+
+        Returns:
+            {'Constraint': {...}} 또는 {'Directive': {...}} 목록 (각 문장에 소스 span 포함)
+        """
+        if self._statements is None:
+            statements = self._decode_section('statements')
+            self._statements = statements
+        return self._statements
+
+    def summary(self) -> Dict:
+        return {
+            'path': self.path,
+            'size': self.size,
+            'version': PROGRAM_VERSION,
+            'curve': self.curve or self.curve_id.hex(),
+            'constraints': self.constraint_count,
+            'returns': self.return_count,
+            'sections': {name: length for name, (_, _, length) in zip(PROGRAM_SECTIONS, self.sections)}
+        }
+
+
+def check_witness(r1cs: R1CSFile, witness: WitnessFile, limit: int = 20) -> Dict:
+    """
+    witness가 모든 제약식 A·w × B·w = C·w (mod p)를 만족하는지 확인합니다.
+
+    Args:
+        r1cs: 제약식 파일
+        witness: witness 파일
+        limit: 결과에 포함할 위반 제약식 번호 수
+
+    Returns:
+        {'status': 'success'/'error', 'constraints', 'violations', 'failed'}
+    """
+    if r1cs.prime != witness.prime or r1cs.field_size != witness.field_size:
+        return {'status': 'error', 'message': 'R1CS와 witness의 필드가 다릅니다.',
+                'error': f'{hex(r1cs.prime)} != {hex(witness.prime)}'}
+    if len(witness) != r1cs.n_wires:
+        return {'status': 'error', 'message': 'witness 값 수가 와이어 수와 다릅니다.',
+                'error': f'{len(witness)} values for {r1cs.n_wires} wires'}
+
+    values = witness.values()
+    prime = r1cs.prime
+
+    def evaluate(terms: LinearCombination) -> int:
+        return sum(coefficient * values[wire] for wire, coefficient in terms) % prime
+
+    failed = []
+    violations = 0
+    for index, (a, b, c) in enumerate(r1cs.iter_constraints()):
+        if evaluate(a) * evaluate(b) % prime != evaluate(c):
+            violations += 1
+            if len(failed) < limit:
+                failed.append(index)
+    return {
+        'status': 'success' if violations == 0 else 'error',
+        'message': 'witness가 모든 제약식을 만족합니다.' if violations == 0 else f'{violations}개 제약식 위반',
+        'constraints': r1cs.n_constraints,
+        'violations': violations,
+        'failed': failed
+    }
+
+
+class CircuitArtifacts:
+    """한 회로 디렉토리의 산출물 (없는 파일은 None)"""
+
+    def __init__(self, directory: str, program: str = 'out'):
+        """
+        Args:
+            directory: ZoKrates 작업 디렉토리
+            program: 컴파일 결과 파일명 (R1CS와 witness는 같은 이름에 .r1cs, .wtns를 붙인 파일)
+        """
+        self.directory = directory
+
+        def open_if_exists(cls, name):
+            path = os.path.join(directory, name)
+            return cls(path) if os.path.exists(path) else None
+
+        self.program: Optional[ProgramFile] = open_if_exists(ProgramFile, program)
+        self.r1cs: Optional[R1CSFile] = open_if_exists(R1CSFile, f'{program}.r1cs')
+        self.witness: Optional[WitnessFile] = open_if_exists(WitnessFile, f'{program}.wtns')
+
+    def check_witness(self) -> Dict:
+        if self.r1cs is None or self.witness is None:
+            return {'status': 'error', 'message': 'R1CS 또는 witness 파일이 없습니다.',
+                    'error': f'{self.directory}: missing .r1cs or .wtns'}
+        return check_witness(self.r1cs, self.witness)
+
+    def summary(self) -> Dict:
+        return {
+            name: artifact.summary() if artifact is not None else None
+            for name, artifact in (('program', self.program), ('r1cs', self.r1cs), ('witness', self.witness))
+        }
+
+    def close(self) -> None:
+        for artifact in (self.program, self.r1cs, self.witness):
+            if artifact is not None:
+                artifact.close()